@@ -1,4 +1,5 @@
 from __future__ import annotations
+import logging
 import time
 from typing import Any, Dict
 from datetime import datetime
@@ -9,6 +10,9 @@ from pynput.mouse import Controller as MouseController # ADDED
 
 from aios.protocols.schema import Receipt, EventType, Event, ActionPlan, KeyPressParameters, MouseClickParameters, TypeStringParameters # ADDED new parameter schemas
 from aios.protocols.action_protocol import VerifiedActionPlan
+from aios.runtime.metrics import ACTIONS, ACTUATION_SECONDS
+
+logger = logging.getLogger(__name__)
 
 def execute_action(verified_action_plan: VerifiedActionPlan) -> Receipt:
     """
@@ -20,6 +24,12 @@ def execute_action(verified_action_plan: VerifiedActionPlan) -> Receipt:
     Returns:
         A Receipt object detailing the outcome of the execution.
     """
+    receipt = _execute_action(verified_action_plan)
+    ACTIONS.inc(action_type=verified_action_plan.action_plan.action_type, status=receipt.status)
+    ACTUATION_SECONDS.observe(receipt.latency_ms / 1000)
+    return receipt
+
+def _execute_action(verified_action_plan: VerifiedActionPlan) -> Receipt:
     start_time = time.perf_counter()
     action = verified_action_plan.action_plan
     
@@ -30,7 +40,7 @@ def execute_action(verified_action_plan: VerifiedActionPlan) -> Receipt:
         if verified_action_plan.status == "rejected_unsafe":
             receipt_status = "rejected_unsafe"
             receipt_message = "Action was rejected by Protocol2 as unsafe."
-            print(f"Actuator: {receipt_message}")
+            logger.info("Actuator: %s", receipt_message)
             return Receipt(
                 action_id=action.action_id,
                 status=receipt_status,
@@ -41,7 +51,7 @@ def execute_action(verified_action_plan: VerifiedActionPlan) -> Receipt:
         if verified_action_plan.status == "dry_run_completed":
             receipt_status = "dry_run_success"
             receipt_message = f"Action completed successfully in dry-run mode. Preview: {verified_action_plan.actuator_preview}"
-            print(f"Actuator: {receipt_message}")
+            logger.info("Actuator: %s", receipt_message)
             return Receipt(
                 action_id=action.action_id,
                 status=receipt_status,
@@ -50,7 +60,7 @@ def execute_action(verified_action_plan: VerifiedActionPlan) -> Receipt:
             )
 
         if verified_action_plan.status == "ready_for_execution":
-            print(f"Actuator: Executing action '{action.action_type}' (ID: {action.action_id})...")
+            logger.info("Actuator: Executing action '%s' (ID: %s)...", action.action_type, action.action_id)
             keyboard = KeyboardController()
             mouse = MouseController() # ADDED
             
@@ -91,7 +101,7 @@ def execute_action(verified_action_plan: VerifiedActionPlan) -> Receipt:
                             keyboard.press(actual_mod)
                         except AttributeError:
                             # Log warning for unknown modifier
-                            print(f"WARNING: Unknown modifier '{mod}' for KeyPress action.")
+                            logger.warning("Unknown modifier '%s' for KeyPress action.", mod)
                     
                     keyboard.press(actual_key)
                     keyboard.release(actual_key)
@@ -139,7 +149,7 @@ def execute_action(verified_action_plan: VerifiedActionPlan) -> Receipt:
             elif action.action_type == "Log":
                 message_to_log = action.parameters.get("message")
                 if message_to_log:
-                    print(f"Actuator Log (Actual Execution): {message_to_log}")
+                    logger.info("Actuator Log (Actual Execution): %s", message_to_log)
                     receipt_status = "success"
                     receipt_message = f"Successfully logged message: '{message_to_log}'"
                 else:
@@ -161,7 +171,7 @@ def execute_action(verified_action_plan: VerifiedActionPlan) -> Receipt:
     except Exception as e:
         receipt_status = "failure"
         receipt_message = f"Execution of action '{action.action_type}' failed: {e}"
-        print(f"Actuator ERROR: {receipt_message}")
+        logger.error("Actuator ERROR: %s", receipt_message)
         
     end_time = time.perf_counter()
     latency_ms = (end_time - start_time) * 1000
@@ -0,0 +1,36 @@
+"""
+The "none" actuator backend: records what would have been executed and touches no
+input devices. It has the interface of `aios.actuators.main_actuator`.
+"""
+from __future__ import annotations
+import logging
+import time
+
+from aios.protocols.schema import Receipt
+from aios.protocols.action_protocol import VerifiedActionPlan
+from aios.runtime.metrics import ACTIONS
+
+logger = logging.getLogger(__name__)
+
+def execute_action(verified_action_plan: VerifiedActionPlan) -> Receipt:
+    """
+    Acknowledges the VerifiedActionPlan without executing it.
+
+    Returns:
+        A "rejected_unsafe" receipt for rejected plans, else a "dry_run_success" receipt.
+    """
+    start_time = time.perf_counter()
+    action = verified_action_plan.action_plan
+    if verified_action_plan.status == "rejected_unsafe":
+        status, message = "rejected_unsafe", "Action was rejected by Protocol2 as unsafe."
+    else:
+        status = "dry_run_success"
+        message = f"No actuator backend; '{action.action_type}' was not executed. Parameters: {action.parameters}"
+    logger.info("Actuator: %s", message)
+    ACTIONS.inc(action_type=action.action_type, status=status)
+    return Receipt(
+        action_id=action.action_id,
+        status=status,
+        message=message,
+        latency_ms=(time.perf_counter() - start_time) * 1000
+    )
@@ -1,10 +1,13 @@
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Dict, Any, List
+import logging
 import uuid
 
-from aios.protocols.schema import ObservationEvent, ActionPlan
+from aios.protocols.schema import ObservationEvent, ActionPlan, RawSignal
 from aios.memory.graph import GraphMemory # Agent needs access to graph memory
-from aios.protocols.llm_connector import request_core_agent_llm_action
+from aios.protocols.llm_connector import request_core_agent_llm_action, request_fused_llm_observation_action
+
+logger = logging.getLogger(__name__)
 
 def decide_action(
     observation_event: ObservationEvent,
@@ -32,10 +35,10 @@ def decide_action(
     # --- Orient: Querying Graph Memory (Simplified for Iteration 5) ---
     # For now, we only use graph_memory to show it's accessible.
     # In future iterations, actual querying logic would go here.
-    print(f"Agent Orienting: Graph has {len(graph_memory.graph_updates)} recorded updates.")
+    logger.debug("Agent Orienting: Graph has %d recorded updates.", len(graph_memory.graph_updates))
 
     # --- Decide: LLM-based Decision Logic ---
-    print(f"Agent Decision: Requesting Core Agent LLM for action plan...")
+    logger.debug("Agent Decision: Requesting Core Agent LLM for action plan...")
     
     # Get a summary of graph memory for the LLM
     # For now, a very basic summary; will be enhanced in future iterations
@@ -53,7 +56,51 @@ def decide_action(
         core_llm_prompt_filename=core_llm_prompt_filename
     )
     
-    print(f"Agent LLM decided action: {action_plan.action_type}")
+    logger.info("Agent LLM decided action: %s", action_plan.action_type)
 
     return action_plan
 
+def decide_action_fused(
+    raw_signals: List[RawSignal],
+    graph_memory: GraphMemory,
+    user_instruction: str,
+    llm_api_key: str,
+    fused_llm_prompt_filename: str
+) -> tuple[ObservationEvent, ActionPlan]:
+    """
+    Fused perception+decision: parses the raw signals and decides on the next
+    action with a single LLM round trip.
+
+    Since no ObservationEvent exists yet, the graph memory summary is built from
+    the previous observation and the most recent graph updates instead.
+
+    Args:
+        raw_signals: The RawSignals collected by the observers for this cycle.
+        graph_memory: The current state of the Interaction Graph.
+
+    Returns:
+        A tuple of (ObservationEvent, ActionPlan).
+    """
+    logger.debug("Agent Orienting: Graph has %d recorded updates.", len(graph_memory.graph_updates))
+
+    previous_observation = graph_memory.previous_observation
+    recent_updates = graph_memory.query(limit=3)
+    graph_memory_summary = (
+        f"Graph contains {len(graph_memory.graph_updates)} recorded updates. "
+        f"Previous observation intent: {previous_observation.potential_intent if previous_observation else 'None'}. "
+        f"Previous UI summary: {previous_observation.ui_state_summary if previous_observation else 'None'}. "
+        f"Recent changes: {[gu.summary_of_change for gu in recent_updates]}."
+    )
+
+    logger.debug("Agent Decision: Requesting fused Protocol+Core LLM for observation and action plan...")
+    observation_event, action_plan = request_fused_llm_observation_action(
+        raw_signals=raw_signals,
+        graph_memory_summary=graph_memory_summary,
+        user_instruction=user_instruction,
+        llm_api_key=llm_api_key,
+        fused_llm_prompt_filename=fused_llm_prompt_filename
+    )
+
+    logger.info("Agent fused LLM decided action: %s", action_plan.action_type)
+
+    return observation_event, action_plan
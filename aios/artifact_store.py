@@ -0,0 +1,143 @@
+from __future__ import annotations
+import argparse
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+class ArtifactStore:
+    """
+    A content-addressed, deduplicating store for observer artifacts.
+
+    Objects are stored once per SHA256 digest under sharded directories
+    (`objects/ab/cd/<digest><suffix>`), written atomically via a temporary file
+    and `os.replace`. Each run records the digests it references in an
+    append-only `refs/<run_id>.refs` file; an object's reference count is the
+    number of runs referencing it, and `gc()` deletes unreferenced objects.
+    """
+
+    def __init__(self, root: Path | str):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.refs_dir = self.root / "refs"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.refs_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._run_refs: Dict[str, Set[str]] = {}
+        self._load_refs()
+
+    def _load_refs(self):
+        """Loads the reference sets of all runs from the refs directory."""
+        self._run_refs = {}
+        for refs_file in self.refs_dir.glob("*.refs"):
+            with open(refs_file, "r", encoding="utf-8") as f:
+                self._run_refs[refs_file.stem] = {line.strip() for line in f if line.strip()}
+
+    def object_path(self, digest: str, suffix: str = "") -> Path:
+        """Returns the sharded path an object with the given digest is stored at."""
+        return self.objects_dir / digest[:2] / digest[2:4] / f"{digest}{suffix}"
+
+    def put(self, data: bytes, suffix: str = "", run_id: Optional[str] = None, digest: Optional[str] = None) -> tuple[str, Path]:
+        """
+        Stores `data` unless an object with the same digest already exists.
+
+        Args:
+            data: The artifact bytes.
+            suffix: File suffix, e.g. ".png" or ".json".
+            run_id: If given, the run is recorded as referencing the object.
+            digest: The SHA256 of `data`, if the caller has already computed it. Objects
+                    are content addressed, so it must never be the hash of anything else.
+
+        Returns:
+            A tuple of (digest, object path).
+        """
+        if digest is None:
+            digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest, suffix)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_name, path) # Atomic: readers never see a partial object
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        if run_id is not None:
+            self.add_ref(run_id, digest)
+        return digest, path
+
+    def add_ref(self, run_id: str, digest: str):
+        """Records that `run_id` references the object `digest`."""
+        with self._lock:
+            refs = self._run_refs.setdefault(run_id, set())
+            if digest in refs:
+                return
+            refs.add(digest)
+            with open(self.refs_dir / f"{run_id}.refs", "a", encoding="utf-8") as f:
+                f.write(digest + "\n")
+
+    def resolve(self, digest: str) -> Optional[Path]:
+        """Returns the path of the object with the given digest, or None if it is not stored."""
+        shard_dir = self.object_path(digest).parent
+        if not shard_dir.exists():
+            return None
+        for path in shard_dir.glob(f"{digest}*"):
+            return path
+        return None
+
+    def exists(self, digest: str) -> bool:
+        return self.resolve(digest) is not None
+
+    def refcount(self, digest: str) -> int:
+        """Returns the number of runs referencing the object."""
+        with self._lock:
+            return sum(1 for refs in self._run_refs.values() if digest in refs)
+
+    def release_run(self, run_id: str):
+        """Drops all references held by a run. Objects are only deleted by `gc()`."""
+        with self._lock:
+            self._run_refs.pop(run_id, None)
+            (self.refs_dir / f"{run_id}.refs").unlink(missing_ok=True)
+
+    def gc(self) -> tuple[int, int]:
+        """
+        Deletes objects that no run references, plus leftover temporary files.
+        The refs are re-read from disk first, so runs recorded by other ArtifactStore
+        instances or processes since this one was created keep their objects. Should
+        not run concurrently with runs that are still storing artifacts.
+
+        Returns:
+            A tuple of (objects removed, bytes freed).
+        """
+        removed, freed = 0, 0
+        with self._lock: # Held throughout, so this instance's add_ref() calls wait for the sweep
+            self._load_refs()
+            referenced = set().union(*self._run_refs.values()) if self._run_refs else set()
+            for path in self.objects_dir.glob("*/*/*"):
+                digest = path.name.split(".")[0] if not path.name.startswith(".tmp-") else None
+                if digest in referenced:
+                    continue
+                freed += path.stat().st_size
+                path.unlink()
+                removed += 1
+        logger.info("ArtifactStore: GC removed %d objects (%d bytes) from %s", removed, freed, self.root)
+        return removed, freed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain a content-addressed AIOS artifact store.")
+    parser.add_argument("root", type=Path, help="Root directory of the artifact store.")
+    parser.add_argument("--release", nargs="*", default=[], metavar="RUN_ID",
+                        help="Drop the references held by these runs before collecting.")
+    args = parser.parse_args()
+
+    store = ArtifactStore(args.root)
+    for released_run_id in args.release:
+        store.release_run(released_run_id)
+    store.gc()
@@ -0,0 +1,96 @@
+"""
+Pluggable, lazily imported platform backends.
+
+The headless core (schemas, event stream, memory, protocols, agent and runtime)
+imports with pydantic alone. Anything that needs a platform or a heavy dependency
+is a backend module registered here by dotted name and imported on first use:
+
+    kind          backends                       needs
+    uia           windows, none, sim             comtypes, pywin32 (windows)
+    screenshot    mss, sim                       mss, numpy
+    actuator      pynput, none, sim              pynput (pynput)
+    llm           openai                         openai, tenacity
+
+Each kind's backends expose the same functions (e.g. every "uia" backend has
+`get_focused_uia_tree` and `initialize_uia_thread`). The backend used for a kind is
+the one named by the AIOS_<KIND>_BACKEND environment variable (e.g.
+AIOS_UIA_BACKEND=none), else the platform default.
+"""
+from __future__ import annotations
+import importlib
+import os
+import sys
+import threading
+from types import ModuleType
+from typing import Dict, List, Optional
+
+_registry: Dict[str, Dict[str, str]] = {
+    "uia": {"windows": "aios.observers.uia", "none": "aios.observers.headless_uia", "sim": "aios.simulator.backend"},
+    "screenshot": {"mss": "aios.observers.screenshot", "sim": "aios.simulator.backend"},
+    "actuator": {"pynput": "aios.actuators.main_actuator", "none": "aios.actuators.null_actuator",
+                 "sim": "aios.simulator.backend"},
+    "llm": {"openai": "aios.llm.llm_client"},
+}
+
+_defaults: Dict[str, str] = {
+    "uia": "windows" if sys.platform == "win32" else "none",
+    "screenshot": "mss",
+    "actuator": "pynput",
+    "llm": "openai",
+}
+
+_loaded: Dict[tuple, ModuleType] = {}
+_lock = threading.Lock()
+
+def register_backend(kind: str, name: str, module_name: str, default: bool = False):
+    """
+    Registers the module `module_name` as backend `name` of `kind`; it is not imported until used.
+
+    Args:
+        kind: The backend kind, e.g. "uia". A new kind may be introduced this way.
+        name: The backend name, e.g. "windows".
+        module_name: Dotted name of the module implementing the kind's functions.
+        default: Make it the kind's default backend.
+    """
+    with _lock:
+        _registry.setdefault(kind, {})[name] = module_name
+        _loaded.pop((kind, name), None)
+        if default or kind not in _defaults:
+            _defaults[kind] = name
+
+def backend_names(kind: str) -> List[str]:
+    """Returns the names of the backends registered for `kind`."""
+    return sorted(_registry.get(kind, {}))
+
+def selected_backend(kind: str) -> str:
+    """Returns the backend name used for `kind`: AIOS_<KIND>_BACKEND if set, else the default."""
+    return os.environ.get(f"AIOS_{kind.upper()}_BACKEND") or _defaults[kind]
+
+def load_backend(kind: str, name: Optional[str] = None) -> ModuleType:
+    """
+    Imports (once) and returns the backend module for `kind`.
+
+    Args:
+        kind: The backend kind, e.g. "uia".
+        name: A registered backend name; defaults to `selected_backend(kind)`.
+
+    Raises:
+        KeyError: If the kind or backend is not registered.
+        ImportError: If the backend's dependencies are not installed.
+    """
+    name = name or selected_backend(kind)
+    key = (kind, name)
+    module = _loaded.get(key)
+    if module is not None:
+        return module
+    try:
+        module_name = _registry[kind][name]
+    except KeyError:
+        raise KeyError(f"No '{name}' backend registered for '{kind}'; available: {backend_names(kind)}.") from None
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        raise ImportError(f"The '{name}' {kind} backend ({module_name}) cannot be imported: {e}") from e
+    with _lock:
+        _loaded[key] = module
+    return module
@@ -0,0 +1,92 @@
+"""
+Benchmarks instruction-to-first-action latency: a fresh `python aios_demo.py`
+subprocess per instruction (the current gui.py model) against a warm AIOS daemon.
+
+The latency is measured from submitting the instruction until the first ACTION
+event is logged. For the subprocess, that includes interpreter startup, the heavy
+imports and the demo's start delay (`--start_delay_s`, 5 s by default as shipped).
+The daemon runs in-process behind its HTTP API; one warm-up run is excluded.
+
+Needs the real observers (Windows desktop) and an LLM endpoint, e.g. the mock
+server via OPENAI_BASE_URL. Run from the project root:
+    python -m aios.benchmarks.bench_daemon --llm_api_key KEY [--iterations N] [--start_delay_s S]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from aios.runtime.daemon import AIOSDaemon, DaemonClient, make_http_server
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+def _subprocess_first_action_ms(instruction: str, llm_api_key: str, start_delay_s: float) -> float:
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(PROJECT_ROOT / "aios_demo.py"), "--user_instruction", instruction,
+         "--llm_api_key", llm_api_key, "--start_delay_s", str(start_delay_s)],
+        cwd=PROJECT_ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+    )
+    latency_ms = float("nan")
+    for line in process.stdout:
+        if "of type ACTION" in line:
+            latency_ms = (time.perf_counter() - start) * 1000
+            break
+    process.stdout.close()
+    process.wait()
+    return latency_ms
+
+def _daemon_first_action_ms(client: DaemonClient, instruction: str) -> float:
+    start = time.perf_counter()
+    run_id = client.submit(instruction)
+    latency_ms = None
+    for event in client.stream_events(run_id):
+        if event.get("event_type") == "ACTION" and latency_ms is None:
+            latency_ms = (time.perf_counter() - start) * 1000
+    # The stream is drained so the next run starts on an idle daemon
+    return latency_ms if latency_ms is not None else float("nan")
+
+def run(llm_api_key: str, iterations: int = 3, start_delay_s: float = 5.0,
+        instruction: str = "Demonstrating AIOS basic cycle") -> dict[str, dict[str, float]]:
+    """
+    Runs the benchmark.
+
+    Returns:
+        A mapping of "subprocess"/"daemon" to latency stats in milliseconds.
+    """
+    from aios_demo import run_aios_cycle
+
+    subprocess_ms = [_subprocess_first_action_ms(instruction, llm_api_key, start_delay_s) for _ in range(iterations)]
+
+    daemon = AIOSDaemon(PROJECT_ROOT / "aios_demo_runs", run_aios_cycle, llm_api_key=llm_api_key)
+    server = make_http_server(daemon, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = DaemonClient(f"http://127.0.0.1:{server.server_address[1]}")
+    try:
+        _daemon_first_action_ms(client, instruction) # Warm-up
+        daemon_ms = [_daemon_first_action_ms(client, instruction) for _ in range(iterations)]
+    finally:
+        server.shutdown()
+        server.server_close()
+        daemon.close()
+
+    return {
+        name: {"mean_ms": statistics.fmean(samples), "p50_ms": statistics.median(samples), "max_ms": max(samples)}
+        for name, samples in (("subprocess", subprocess_ms), ("daemon", daemon_ms))
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark instruction-to-first-action latency: subprocess vs warm daemon.")
+    parser.add_argument("--llm_api_key", type=str, required=True)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--start_delay_s", type=float, default=5.0,
+                        help="Start delay passed to each aios_demo.py subprocess (5 s as shipped).")
+    args = parser.parse_args()
+
+    results = run(args.llm_api_key, args.iterations, args.start_delay_s)
+    print(f"\n{'mode':<12}{'mean ms':>10}{'p50 ms':>10}{'max ms':>10}")
+    for name, stats in results.items():
+        print(f"{name:<12}{stats['mean_ms']:>10.1f}{stats['p50_ms']:>10.1f}{stats['max_ms']:>10.1f}")
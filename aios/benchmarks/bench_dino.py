@@ -0,0 +1,81 @@
+"""
+Benchmarks per-frame latency of the local Dino obstacle detector.
+
+Runs `DinoObstacleDetector.detect` on synthetic frames with an approaching
+obstacle, both on the game area alone and on the game area embedded in a
+full-HD BGRA screenshot (the `mss` grab), and compares the latter with the
+cost of building an ObservationEvent around the result. Mean latencies are
+checked against LATENCY_BUDGET_MS; the exit status is 1 if one is over budget.
+
+Usage:
+    python -m aios.benchmarks.bench_dino [--iterations N]
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from aios.benchmarks.fixtures import make_dino_frame
+from aios.perception.dino import DinoObstacleDetector
+
+GROUND_Y = 130
+
+# Mean per-frame budgets: the detector must leave most of a 60 Hz tick to the rest of the loop
+LATENCY_BUDGET_MS = {"detect/game_area": 1.0, "detect/full_hd": 5.0}
+
+def _frames(count: int) -> list[np.ndarray]:
+    return [make_dino_frame(ground_y=GROUND_Y, obstacles=[(560 - (i * 7) % 480, 17, 35)]) for i in range(count)]
+
+def _time(fn, frames: list[np.ndarray], iterations: int) -> dict[str, float]:
+    latencies = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(frames[i % len(frames)], i * 0.016)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {
+        "mean_ms": statistics.fmean(latencies),
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": sorted(latencies)[int(len(latencies) * 0.99) - 1],
+    }
+
+def run(iterations: int = 2000) -> dict[str, dict[str, float]]:
+    """
+    Runs the benchmark.
+
+    Returns:
+        A mapping of scenario name to latency stats in milliseconds.
+    """
+    game_frames = _frames(32)
+    screens = []
+    for frame in game_frames[:8]:
+        screen = np.full((1080, 1920, 4), 30, dtype=np.uint8)
+        screen[400:550, 600:1200] = frame
+        screens.append(screen)
+
+    game_detector = DinoObstacleDetector(ground_y=GROUND_Y, dino_x_end=64)
+    screen_detector = DinoObstacleDetector(ground_y=GROUND_Y, dino_x_end=64, region=(600, 400, 600, 150))
+    return {
+        "detect/game_area": _time(game_detector.detect, game_frames, iterations),
+        "detect/full_hd": _time(screen_detector.detect, screens, iterations),
+        "observe/full_hd": _time(screen_detector.observe, screens, iterations),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Dino obstacle detection latency.")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+    print(f"\n{'scenario':<20}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}{'budget ms':>11}")
+    over_budget = []
+    for name, stats in results.items():
+        budget = LATENCY_BUDGET_MS.get(name)
+        if budget is not None and stats["mean_ms"] > budget:
+            over_budget.append(name)
+        print(f"{name:<20}{stats['mean_ms']:>10.4f}{stats['p50_ms']:>10.4f}{stats['p99_ms']:>10.4f}"
+              f"{budget if budget is not None else '':>11}")
+    if over_budget:
+        print(f"\nOver budget: {', '.join(over_budget)}")
+        sys.exit(1)
@@ -0,0 +1,82 @@
+"""
+Benchmarks cold import time of the AIOS entry points and checks which heavy
+dependencies each one pulls in.
+
+Every measurement is a fresh interpreter (`python -c "import X"` from the project
+root), so nothing is cached in sys.modules; the median over the iterations is
+reported. The headless core and `aios_demo` should not load any of HEAVY_MODULES;
+the backends load them on first use.
+
+Usage:
+    python -m aios.benchmarks.bench_import [--iterations N] [--output results.json]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+HEAVY_MODULES = ("numpy", "mss", "pynput", "comtypes", "win32process", "openai", "tenacity")
+
+TARGETS = (
+    "aios.protocols.schema",
+    "aios.protocols.llm_connector",
+    "aios.agent.main_agent",
+    "aios.runtime.checkpoint",
+    "aios_demo",
+    "aios.observers.screenshot", # Backends, for comparison
+    "aios.llm.llm_client",
+)
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{"import_ms": elapsed_ms, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def _import_once(module: str) -> dict:
+    completed = subprocess.run([sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                               cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {"import_ms": None, "heavy": [], "error": completed.stderr.strip().splitlines()[-1]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def run(targets=TARGETS, iterations: int = 5) -> dict:
+    """
+    Runs the benchmark.
+
+    Returns:
+        Per module: median import time in ms (None if it cannot be imported here),
+        the heavy modules it loaded, and the import error if any.
+    """
+    results = {}
+    for module in targets:
+        samples = [_import_once(module) for _ in range(iterations)]
+        times = [s["import_ms"] for s in samples if s["import_ms"] is not None]
+        results[module] = {
+            "import_ms": statistics.median(times) if times else None,
+            "heavy": samples[-1]["heavy"],
+            "error": samples[-1].get("error"),
+        }
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark cold import time of the AIOS entry points.")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=None, help="Also write the results as JSON, to track them over time.")
+    args = parser.parse_args()
+
+    results = run(iterations=args.iterations)
+    print(f"\n{'module':<32}{'import ms':>12}   heavy dependencies loaded")
+    for module, result in results.items():
+        if result["import_ms"] is None:
+            print(f"{module:<32}{'n/a':>12}   {result['error']}")
+        else:
+            print(f"{module:<32}{result['import_ms']:>12.1f}   {', '.join(result['heavy']) or '-'}")
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
@@ -0,0 +1,79 @@
+"""
+Benchmarks capture-to-signal latency of the screenshot observer.
+
+Runs `build_screenshot_signal` (everything `capture_screenshot` does after the
+pixels are grabbed) on synthetic full-HD BGRA frames, for each image format in
+synchronous mode and with an ArtifactWriter. Needs no display.
+
+Usage:
+    python -m aios.benchmarks.bench_screenshot [--iterations N] [--width W] [--height H]
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from aios.observers.artifact_writer import ArtifactWriter, encode_frame
+from aios.observers.screenshot import build_screenshot_signal
+
+def _synthetic_frames(width: int, height: int, count: int) -> list[bytes]:
+    """Returns `count` distinct BGRA frames with desktop-like content."""
+    rng = np.random.default_rng(0)
+    frames = []
+    for _ in range(count):
+        frame = np.full((height, width, 4), 240, dtype=np.uint8)
+        for _ in range(20):
+            y, x = rng.integers(0, height - 64), rng.integers(0, width - 256)
+            frame[y:y + 64, x:x + 256, :3] = rng.integers(0, 255, 3, dtype=np.uint8)
+        frames.append(frame.tobytes())
+    return frames
+
+def run(iterations: int = 20, width: int = 1920, height: int = 1080) -> dict[str, dict[str, float]]:
+    """
+    Runs the benchmark.
+
+    Returns:
+        A mapping of "<format>/<mode>" to latency stats in milliseconds.
+    """
+    frames = _synthetic_frames(width, height, min(iterations, 8))
+    results = {}
+    for image_format in ("raw", "png", "jpeg"):
+        try:
+            encode_frame(bytes(4 * 16 * 16), (16, 16), image_format)
+        except RuntimeError as e: # e.g. Pillow missing for JPEG
+            print(f"Skipping {image_format}: {e}")
+            continue
+        for mode in ("sync", "async"):
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                writer = ArtifactWriter(max_workers=2, max_pending=iterations) if mode == "async" else None
+                latencies = []
+                try:
+                    for i in range(iterations):
+                        start = time.perf_counter()
+                        build_screenshot_signal(frames[i % len(frames)], (width, height), Path(tmp_dir),
+                                                image_format=image_format, writer=writer)
+                        latencies.append((time.perf_counter() - start) * 1000)
+                finally:
+                    if writer is not None:
+                        writer.close()
+                results[f"{image_format}/{mode}"] = {
+                    "mean_ms": statistics.fmean(latencies),
+                    "p50_ms": statistics.median(latencies),
+                    "max_ms": max(latencies),
+                }
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark screenshot capture-to-signal latency.")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.width, args.height)
+    print(f"\n{'format/mode':<14}{'mean ms':>10}{'p50 ms':>10}{'max ms':>10}")
+    for name, stats in results.items():
+        print(f"{name:<14}{stats['mean_ms']:>10.2f}{stats['p50_ms']:>10.2f}{stats['max_ms']:>10.2f}")
@@ -0,0 +1,68 @@
+"""
+Benchmarks aggregate cycle throughput of the SessionManager as sessions are added.
+
+Each cycle makes two LLM calls (Protocol LLM and Core Agent LLM) through the shared
+client. The LLM is simulated by a fixed-latency fake, so the benchmark isolates the
+runtime's scaling: throughput should grow near-linearly with the session count until
+the shared rate limit caps it.
+
+Usage:
+    python -m aios.benchmarks.bench_sessions [--llm_latency_ms MS] [--rate_limit_per_s R] [--cycles N]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from aios.protocols import llm_connector
+from aios.runtime.sessions import SessionManager
+
+class _FakeLLM:
+    model_name = "fake"
+    temperature = 0.0
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+
+    def generate(self, system_prompt, user_prompt, json_schema=None):
+        time.sleep(self.latency_s)
+        return {"ok": True}
+
+def _cycle(run_id, artifact_base_dir, llm_api_key=None, logger=None, graph=None, decision_cache=None):
+    client = llm_connector._get_llm_client(llm_api_key)
+    client.generate("protocol", f"{artifact_base_dir.name}/{run_id}/observe")
+    client.generate("core", f"{artifact_base_dir.name}/{run_id}/decide")
+    return True
+
+def run(session_counts=(1, 2, 4, 8, 16), llm_latency_ms: float = 50.0, rate_limit_per_s: float = 100.0,
+        cycles: int = 5) -> dict[int, float]:
+    """
+    Runs the benchmark.
+
+    Returns:
+        A mapping of session count to aggregate cycles/sec.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n in session_counts:
+            with SessionManager(Path(tmp_dir) / str(n), _cycle, llm_api_key=f"bench-sessions-{n}",
+                                llm_client=_FakeLLM(llm_latency_ms / 1000), max_workers=max(session_counts),
+                                rate_limit_per_s=rate_limit_per_s, cache_entries=0,
+                                max_llm_concurrency=max(session_counts)) as manager:
+                for _ in range(n):
+                    manager.add_session()
+                results[n] = manager.run(cycles_per_session=cycles)["cycles_per_s"]
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark multi-session throughput with a shared LLM pool.")
+    parser.add_argument("--llm_latency_ms", type=float, default=50.0)
+    parser.add_argument("--rate_limit_per_s", type=float, default=100.0)
+    parser.add_argument("--cycles", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run(llm_latency_ms=args.llm_latency_ms, rate_limit_per_s=args.rate_limit_per_s, cycles=args.cycles)
+    ceiling = args.rate_limit_per_s / 2 # Two LLM calls per cycle
+    print(f"\n{'sessions':>10}{'cycles/s':>12}{'speedup':>10}   (rate-limit ceiling: {ceiling:.1f} cycles/s)")
+    for n, rate in results.items():
+        print(f"{n:>10}{rate:>12.1f}{rate / results[min(results)]:>10.2f}")
@@ -0,0 +1,130 @@
+"""
+Benchmarks full closed-loop AIOS cycles against the simulated desktop.
+
+Every cycle runs the real pipeline end to end: the "sim" screenshot and UIA
+backends observe a scripted app (aios.simulator.desktop), the real LLMClient
+calls the local mock LLM server over HTTP, and the "sim" actuator applies the
+ActionPlan to the app, which scores it. Reported per scenario: cycles/s, the
+share of correct actions and the app's task progress. Runs on Linux without a
+display; needs flask and openai.
+
+Scenarios:
+    notepad    "Type Hello AIOS" into a NotepadApp
+    dino       "Play Chrome Dino" on a DinoRunnerApp
+
+Usage:
+    python -m aios.benchmarks.bench_sim_loop [--cycles N] [--fused] [--scenario notepad|dino] [--output PATH]
+"""
+import argparse
+import contextlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from aios.backends import load_backend
+from aios.event_stream import JsonlLogger
+from aios.memory.graph import GraphMemory
+from aios.observers.scheduler import ObserverScheduler
+from aios.protocols import llm_connector
+from aios.runtime.logs import configure_logging, shutdown_logging
+from aios.simulator import backend as sim_backend
+from aios.simulator.desktop import DinoRunnerApp, NotepadApp, SimulatedApp, SimulatedDesktop
+from aios.utils import mock_llm_server
+
+# name -> (user instruction, app factory)
+SCENARIOS: Dict[str, Tuple[str, Callable[[], SimulatedApp]]] = {
+    "notepad": ("Type Hello AIOS", lambda: NotepadApp("Hello AIOS")),
+    "dino": ("Play Chrome Dino", lambda: DinoRunnerApp(seed=0)),
+}
+
+SIM_LLM_API_KEY = "sim-loop-benchmark"
+
+@contextlib.contextmanager
+def _environment(**values: str):
+    previous = {name: os.environ.get(name) for name in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+@contextlib.contextmanager
+def sim_environment():
+    """
+    Points AIOS at the simulator and a mock LLM server for the duration of the block:
+    starts the server, selects the "sim" backends and registers an LLMClient for
+    SIM_LLM_API_KEY. Install the desktop to run against with `sim_backend.set_desktop()`.
+    """
+    server = mock_llm_server.serve()
+    try:
+        with _environment(OPENAI_BASE_URL=f"http://127.0.0.1:{server.port}/v1", AIOS_SCREENSHOT_BACKEND="sim",
+                          AIOS_UIA_BACKEND="sim", AIOS_ACTUATOR_BACKEND="sim"):
+            # A fresh client, since the base URL (the server's port) is read when a client is created
+            llm_connector.register_llm_client(SIM_LLM_API_KEY, load_backend("llm").LLMClient(api_key=SIM_LLM_API_KEY))
+            yield
+    finally:
+        server.shutdown()
+
+def run(scenarios: Iterable[str] = tuple(SCENARIOS), cycles: int = 20, fused: bool = False,
+        quiet: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Runs `cycles` AIOS cycles per scenario against the simulator and the mock LLM server.
+
+    Returns:
+        Per scenario: cycles, failed cycles, elapsed seconds, cycles/s and the
+        desktop's stats (actions, correct actions, accuracy, task progress).
+    """
+    from aios_demo import run_aios_cycle
+
+    configure_logging(quiet=quiet) # Quiet: no console output, warnings and errors are kept in memory
+    results = {}
+    try:
+        with sim_environment(), tempfile.TemporaryDirectory() as tmp_dir, \
+                ObserverScheduler() as scheduler: # One observer pool for every cycle, as a daemon keeps it
+            for name in scenarios:
+                instruction, make_app = SCENARIOS[name]
+                desktop = SimulatedDesktop(make_app())
+                sim_backend.set_desktop(desktop)
+                run_dir = Path(tmp_dir) / name
+                logger, graph = JsonlLogger(run_dir / "events.jsonl"), GraphMemory(run_dir / "graph_memory.json")
+                failures = 0
+                start = time.perf_counter()
+                for i in range(cycles):
+                    ok = run_aios_cycle(f"{name}-{i:04d}", run_dir, user_instruction=instruction,
+                                        llm_api_key=SIM_LLM_API_KEY, fused=fused, screenshot_format="raw",
+                                        logger=logger, graph=graph, observer_scheduler=scheduler)
+                    failures += int(not ok)
+                elapsed = time.perf_counter() - start
+                results[name] = {"cycles": cycles, "failed_cycles": failures, "seconds": elapsed,
+                                 "cycles_per_s": cycles / elapsed, **desktop.stats()}
+    finally:
+        shutdown_logging()
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark closed-loop AIOS cycles on the simulated desktop.")
+    parser.add_argument("--cycles", type=int, default=20, help="Cycles per scenario.")
+    parser.add_argument("--fused", action="store_true", help="Use the fused Protocol+Core LLM call.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append",
+                        help="Scenario to run (repeatable; default: all).")
+    parser.add_argument("--output", type=Path, default=None, help="Also write the results as JSON.")
+    args = parser.parse_args()
+
+    results = run(args.scenario or tuple(SCENARIOS), cycles=args.cycles, fused=args.fused)
+    print(f"\n{'scenario':<10}{'cycles/s':>10}{'failed':>8}{'actions':>9}{'correct':>9}{'accuracy':>10}   progress")
+    for name, row in results.items():
+        accuracy = f"{row['accuracy']:>10.1%}" if row["accuracy"] is not None else f"{'-':>10}"
+        progress = {k: v for k, v in row.items() if k not in
+                    ("cycles", "failed_cycles", "seconds", "cycles_per_s", "actions", "correct_actions", "accuracy")}
+        print(f"{name:<10}{row['cycles_per_s']:>10.2f}{row['failed_cycles']:>8}{row['actions']:>9}"
+              f"{row['correct_actions']:>9}{accuracy}   {progress}")
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nResults written to {args.output}")
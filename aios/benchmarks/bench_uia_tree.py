@@ -0,0 +1,65 @@
+"""
+Compares memory per node and class-name search time of nested UIA tree dicts
+against FlatUIATree on a large synthetic tree.
+
+Usage:
+    python -m aios.benchmarks.bench_uia_tree [--depth D] [--breadth B] [--searches N]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from aios.benchmarks.fixtures import make_synthetic_uia_tree
+from aios.protocols.llm_connector import _search_uia_tree_for_process
+from aios.protocols.uia_tree import FlatUIATree
+
+def _allocated_bytes(build):
+    """Returns (object, bytes allocated while building it)."""
+    tracemalloc.start()
+    obj = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+def _strip_runtime_ids(node: dict) -> dict:
+    """Observer artifacts carry no runtime ids; drop the fixture's to match them."""
+    node.pop("runtime_id", None)
+    for child in node["children"]:
+        _strip_runtime_ids(child)
+    return node
+
+def run(depth: int = 7, breadth: int = 5, searches: int = 200) -> dict:
+    serialized = json.dumps(_strip_runtime_ids(make_synthetic_uia_tree(depth=depth, breadth=breadth)))
+    tree, dict_bytes = _allocated_bytes(lambda: json.loads(serialized))
+    flat, flat_bytes = _allocated_bytes(lambda: FlatUIATree.from_dict(tree)) # Only the flat structure is counted
+    n_nodes = len(flat)
+
+    targets = ["Edit", "DoesNotExist"] # A common class and a miss, which forces a full scan
+    start = time.perf_counter()
+    for i in range(searches):
+        _search_uia_tree_for_process(tree, targets[i % 2])
+    dict_search_us = (time.perf_counter() - start) * 1e6 / searches
+
+    start = time.perf_counter()
+    for i in range(searches):
+        _search_uia_tree_for_process(flat, targets[i % 2])
+    flat_search_us = (time.perf_counter() - start) * 1e6 / searches
+
+    return {
+        "nodes": n_nodes,
+        "dict_bytes_per_node": dict_bytes / n_nodes,
+        "flat_bytes_per_node": flat_bytes / n_nodes,
+        "dict_search_us": dict_search_us,
+        "flat_search_us": flat_search_us,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark flattened UIA trees.")
+    parser.add_argument("--depth", type=int, default=7)
+    parser.add_argument("--breadth", type=int, default=5)
+    parser.add_argument("--searches", type=int, default=200)
+    args = parser.parse_args()
+
+    for key, value in run(args.depth, args.breadth, args.searches).items():
+        print(f"{key:<22}{value:>14.1f}")
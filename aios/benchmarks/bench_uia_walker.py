@@ -0,0 +1,77 @@
+"""
+Benchmarks full vs incremental UIA tree walks against an in-memory provider that
+simulates the cost of COM round trips. Needs no Windows.
+
+Usage:
+    python -m aios.benchmarks.bench_uia_walker [--depth D] [--breadth B] [--call_us US] [--cycles N]
+"""
+import argparse
+import time
+
+from aios.benchmarks.fixtures import make_synthetic_uia_tree
+from aios.observers.uia_walker import InMemoryUIAProvider, IncrementalUIAWalker, walk_provider_tree
+
+class SlowInMemoryUIAProvider(InMemoryUIAProvider):
+    """InMemoryUIAProvider that spins for `call_s` per COM-like round trip (8 per `properties`)."""
+
+    def __init__(self, call_s: float):
+        super().__init__()
+        self.call_s = call_s
+
+    def _spin(self, round_trips: int):
+        end = time.perf_counter() + self.call_s * round_trips
+        while time.perf_counter() < end:
+            pass
+
+    def runtime_id(self, element):
+        self._spin(1)
+        return super().runtime_id(element)
+
+    def bounding_rectangle(self, element):
+        self._spin(1)
+        return super().bounding_rectangle(element)
+
+    def children(self, element):
+        self._spin(1 + len(element.get("children", [])))
+        return super().children(element)
+
+    def properties(self, element):
+        self._spin(8)
+        return super().properties(element)
+
+def run(depth: int = 5, breadth: int = 5, call_us: float = 20.0, cycles: int = 5) -> dict:
+    tree = make_synthetic_uia_tree(depth=depth, breadth=breadth)
+    results = {}
+
+    provider = SlowInMemoryUIAProvider(call_us / 1e6)
+    start = time.perf_counter()
+    for _ in range(cycles):
+        walk_provider_tree(provider, tree, max_depth=depth)
+    results["full"] = {"ms_per_walk": (time.perf_counter() - start) * 1000 / cycles,
+                       "properties_calls": provider.calls["properties"] // cycles}
+
+    for reuse_subtrees in (False, True):
+        provider = SlowInMemoryUIAProvider(call_us / 1e6)
+        walker = IncrementalUIAWalker(reuse_subtrees=reuse_subtrees, full_refresh_interval=0)
+        walker.walk(provider, tree, max_depth=depth) # Warm the cache
+        provider.calls.clear()
+        start = time.perf_counter()
+        for _ in range(cycles):
+            walker.walk(provider, tree, max_depth=depth)
+        results["incremental_subtree" if reuse_subtrees else "incremental_node"] = {
+            "ms_per_walk": (time.perf_counter() - start) * 1000 / cycles,
+            "properties_calls": provider.calls["properties"] // cycles,
+        }
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark incremental UIA tree walking.")
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--breadth", type=int, default=5)
+    parser.add_argument("--call_us", type=float, default=20.0, help="Simulated cost of one COM round trip in microseconds.")
+    parser.add_argument("--cycles", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'mode':<22}{'ms/walk':>10}{'properties calls':>18}")
+    for mode, stats in run(args.depth, args.breadth, args.call_us, args.cycles).items():
+        print(f"{mode:<22}{stats['ms_per_walk']:>10.2f}{stats['properties_calls']:>18}")
@@ -0,0 +1,148 @@
+"""
+Synthetic but realistic fixtures for benchmarks: large UIA trees shaped like
+browser/IDE windows, observations and raw signals, long graph histories and event
+logs, all built deterministically from a seed, and Chrome Dino frames (rendered by
+aios.simulator.frames).
+"""
+import random
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+from aios.protocols.schema import (
+    ActionPlan, Event, EventType, GraphUpdate, LogData, ObservationEvent, RawSignal, Receipt, ScreenshotData, UIATreeData
+)
+from aios.simulator.frames import DINO_BACKGROUND, DINO_FOREGROUND, make_dino_frame # Re-exported for benchmarks
+
+# (control_type id, class_name) pairs seen in recorded trees
+_CONTROL_KINDS = [
+    (50033, "Pane"), (50032, "Window"), (50000, "Button"), (50004, "Edit"),
+    (50020, "Text"), (50007, "ListItem"), (50008, "List"), (50011, "MenuItem"),
+    (50018, "Tab"), (50019, "TabItem"), (50026, "Group"), (50025, "Custom"),
+]
+
+def make_synthetic_uia_tree(depth: int = 6, breadth: int = 5, seed: int = 0) -> Dict[str, Any]:
+    """
+    Builds a nested UIA tree dict in the format produced by the UIA observer,
+    with `runtime_id`s so it can be served by InMemoryUIAProvider.
+
+    The number of nodes is roughly breadth ** (depth - 1); branching varies per node.
+    """
+    rng = random.Random(seed)
+    counter = [0]
+
+    def build(level: int, left: int, top: int, width: int, height: int) -> Dict[str, Any]:
+        counter[0] += 1
+        control_type, class_name = _CONTROL_KINDS[rng.randrange(len(_CONTROL_KINDS))]
+        node = {
+            "runtime_id": [42, counter[0]],
+            "name": f"{class_name} {counter[0]}" if rng.random() < 0.6 else "",
+            "control_type": control_type,
+            "automation_id": f"auto_{counter[0]}" if rng.random() < 0.3 else "",
+            "class_name": class_name,
+            "process_id": 4242,
+            "is_enabled": 1,
+            "is_keyboard_focusable": int(control_type in (50000, 50004, 50007, 50011, 50019)),
+            "bounding_rectangle": [left, top, width, height],
+            "children": [],
+        }
+        if level < depth:
+            n_children = max(1, breadth + rng.randint(-2, 2))
+            child_height = max(1, height // n_children)
+            for i in range(n_children):
+                node["children"].append(build(level + 1, left, top + i * child_height, width, child_height))
+        return node
+
+    return build(1, 0, 0, 1920, 1080)
+
+_INTENTS = ["Type a note in Notepad", "Play Chrome Dino", "Search the web", "Edit a Python file", "Read email"]
+_UI_STATES = ["Notepad is open with {n} lines of text", "Chrome shows the Dino game, score {n}",
+              "Search results page {n} is visible", "VS Code has {n} open tabs", "Inbox shows {n} unread messages"]
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+def make_raw_signals(uia_tree: Dict[str, Any], log_lines: int = 200, seed: int = 0) -> List[RawSignal]:
+    """Returns a cycle's raw signals: a screenshot, the UIA tree and a log tail of `log_lines` lines."""
+    rng = random.Random(seed)
+    timestamp = datetime(2025, 1, 1, 12, 0, 0)
+    return [
+        RawSignal(timestamp=timestamp, observer_id="screenshot_observer_v1",
+                  artifact_path="artifacts/screenshots/screenshot_0001.png", artifact_hash=f"{rng.getrandbits(256):064x}",
+                  data=ScreenshotData(screen_size=(1920, 1080))),
+        RawSignal(timestamp=timestamp + timedelta(milliseconds=12), observer_id="uia_observer_v1",
+                  artifact_path="artifacts/uia_trees/uia_tree_0001.json", artifact_hash=f"{rng.getrandbits(256):064x}",
+                  data=UIATreeData(focused_window_title="Untitled - Notepad", tree_structure=uia_tree)),
+        RawSignal(timestamp=timestamp + timedelta(milliseconds=20), observer_id="log_tail_observer_v1",
+                  artifact_path="artifacts/logs/app_0001.log", artifact_hash=f"{rng.getrandbits(256):064x}",
+                  data=LogData(log_source="/var/log/app.log",
+                               new_lines=[f"2025-01-01 12:00:{i % 60:02d} INFO worker {rng.randrange(16)}: "
+                                          f"request {rng.getrandbits(32):08x} handled in {rng.randrange(1, 500)} ms"
+                                          for i in range(log_lines)])),
+    ]
+
+def make_observation_event(raw_signals: List[RawSignal], index: int = 0, seed: int = 0) -> ObservationEvent:
+    """Returns the ObservationEvent for the `index`-th cycle; consecutive indices differ in UI state."""
+    rng = random.Random(seed * 1_000_003 + index)
+    return ObservationEvent(
+        observation_id=_uuid(rng),
+        raw_signals=raw_signals,
+        ui_state_summary=_UI_STATES[index % len(_UI_STATES)].format(n=index),
+        environment_state_summary="Windows 11 desktop, 1920x1080",
+        potential_intent=_INTENTS[(index // 3) % len(_INTENTS)],
+    )
+
+def make_action_plan(origin_observation_id: str, index: int = 0) -> ActionPlan:
+    """Returns a TypeString, KeyPress or MouseClick plan, cycling with `index`."""
+    kind = index % 3
+    if kind == 0:
+        return ActionPlan(action_id=f"action-{index}", origin_observation_id=origin_observation_id,
+                          action_type="TypeString", parameters={"text": f"Note number {index}"})
+    if kind == 1:
+        return ActionPlan(action_id=f"action-{index}", origin_observation_id=origin_observation_id,
+                          action_type="KeyPress", parameters={"key": "space", "modifiers": []})
+    return ActionPlan(action_id=f"action-{index}", origin_observation_id=origin_observation_id,
+                      action_type="MouseClick", parameters={"x": 100 + index % 800, "y": 200, "button": "left", "clicks": 1})
+
+def make_graph_history(n_updates: int = 2000, seed: int = 0) -> Dict[str, Any]:
+    """Returns a GraphMemory state dict (see `GraphMemory.load_state_dict`) with `n_updates` updates."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    updates = []
+    for i in range(n_updates):
+        updates.append(GraphUpdate(
+            timestamp=start + timedelta(seconds=5 * i),
+            observation_id=_uuid(rng),
+            summary_of_change=(f"Intent changed from '{_INTENTS[i % len(_INTENTS)]}' to '{_INTENTS[(i + 1) % len(_INTENTS)]}'. "
+                               f"UI summary changed from '{_UI_STATES[i % len(_UI_STATES)].format(n=i)}' "
+                               f"to '{_UI_STATES[(i + 1) % len(_UI_STATES)].format(n=i + 1)}'."),
+            metadata={"observation_timestamp": (start + timedelta(seconds=5 * i)).isoformat()}
+        ).model_dump(mode="json"))
+    previous = make_observation_event([], index=n_updates, seed=seed)
+    return {"graph_updates": updates, "previous_observation": previous.model_dump(mode="json")}
+
+def make_event_log(path: Path, n_cycles: int = 1000, uia_tree: Dict[str, Any] = None, seed: int = 0) -> Path:
+    """
+    Writes an events.jsonl of `n_cycles` cycles (OBSERVATION, GRAPH_UPDATE, ACTION, RECEIPT each)
+    and returns its path. Observations carry `uia_tree` (a small one by default) as their UIA signal.
+    """
+    rng = random.Random(seed)
+    raw_signals = make_raw_signals(uia_tree or make_synthetic_uia_tree(depth=3, breadth=3, seed=seed), log_lines=20, seed=seed)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n_cycles):
+            observation = make_observation_event(raw_signals, index=i, seed=seed)
+            plan = make_action_plan(observation.observation_id, index=i)
+            payloads = [
+                (EventType.OBSERVATION, observation),
+                (EventType.GRAPH_UPDATE, GraphUpdate(observation_id=observation.observation_id,
+                                                     summary_of_change=f"UI summary changed to '{observation.ui_state_summary}'.")),
+                (EventType.ACTION, plan),
+                (EventType.RECEIPT, Receipt(action_id=plan.action_id, status="success", message="ok",
+                                            latency_ms=rng.uniform(1, 50))),
+            ]
+            for event_type, payload in payloads:
+                f.write(Event(event_id=_uuid(rng), event_type=event_type, payload=payload).model_dump_json() + "\n")
+    return path
@@ -0,0 +1,273 @@
+"""
+Per-stage microbenchmarks of the AIOS loop, on synthetic fixtures, with stored
+baselines and regression detection.
+
+Each benchmark times one stage in isolation (prompt construction, pydantic
+validation, GraphMemory update/query/save/load, JSONL logging and reading, the
+budgeted UIA walk, signal aggregation) against realistic fixtures: large UIA
+trees, long graph histories and big event logs. Nothing needs Windows or the
+network; the LLM is an in-process stand-in.
+
+Every benchmark is calibrated to run for at least `min_round_s` per round; the
+best per-call time of its rounds is compared with the baseline, and a benchmark
+more than `threshold` slower is reported as a regression (exit status 1).
+Baselines are per host and Python version, since timings do not transfer
+between machines.
+
+Usage:
+    python -m aios.benchmarks.suite [--filter TEXT] [--quick] [--threshold 0.25]
+                                    [--baseline PATH] [--save_baseline]
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from aios.benchmarks.fixtures import (
+    make_action_plan, make_event_log, make_graph_history, make_observation_event, make_raw_signals, make_synthetic_uia_tree
+)
+from aios.event_stream import JsonlLogger
+from aios.memory.graph import GraphMemory
+from aios.observers.uia_walker import InMemoryUIAProvider, walk_uia_tree_budgeted
+from aios.protocols import llm_connector
+from aios.protocols.aggregator import aggregate_signals
+from aios.protocols.schema import ActionPlan, Event, EventType, ObservationEvent
+from aios.runtime.checkpoint import read_event_tail
+from aios.runtime.logs import configure_logging, shutdown_logging
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+# name -> setup(workdir) returning the function to time
+BENCHMARKS: Dict[str, Callable[[Path], Callable[[], Any]]] = {}
+# name -> teardown() undoing process-wide state left by the setup
+TEARDOWNS: Dict[str, Callable[[], None]] = {}
+
+def benchmark(name: str, teardown: Optional[Callable[[], None]] = None):
+    """Registers a benchmark setup function under `name`, with an optional teardown run after timing."""
+    def register(setup: Callable[[Path], Callable[[], Any]]):
+        BENCHMARKS[name] = setup
+        if teardown is not None:
+            TEARDOWNS[name] = teardown
+        return setup
+    return register
+
+class _OfflineLLM:
+    """Answers every request with a fixed, schema-valid ActionPlan."""
+    model_name = "offline"
+
+    def generate(self, system_prompt: str, user_prompt: str, json_schema: dict = None) -> dict:
+        return make_action_plan("observation-0").model_dump(mode="json")
+
+@benchmark("prompt.protocol_signals")
+def _prompt_protocol_signals(workdir: Path):
+    raw_signals = make_raw_signals(make_synthetic_uia_tree(depth=6, breadth=5))
+    return lambda: llm_connector._construct_prompt_from_raw_signals(raw_signals)
+
+@benchmark("prompt.core_agent_request", teardown=lambda: llm_connector.unregister_llm_client("bench-suite-offline"))
+def _prompt_core_agent_request(workdir: Path):
+    llm_connector.register_llm_client("bench-suite-offline", _OfflineLLM())
+    observation = make_observation_event(make_raw_signals(make_synthetic_uia_tree(depth=4, breadth=4)))
+    summary = "\n".join(f"- UI summary changed to 'state {i}'." for i in range(20))
+    return lambda: llm_connector.request_core_agent_llm_action(
+        observation, summary, "Type hello world", "bench-suite-offline", "core_llm_prompt.txt")
+
+@benchmark("schema.observation_validate_json")
+def _observation_validate_json(workdir: Path):
+    payload = make_observation_event(make_raw_signals(make_synthetic_uia_tree(depth=6, breadth=5))).model_dump_json()
+    return lambda: ObservationEvent.model_validate_json(payload)
+
+@benchmark("schema.observation_dump_json")
+def _observation_dump_json(workdir: Path):
+    observation = make_observation_event(make_raw_signals(make_synthetic_uia_tree(depth=6, breadth=5)))
+    return observation.model_dump_json
+
+@benchmark("schema.action_plan_validate")
+def _action_plan_validate(workdir: Path):
+    plan = make_action_plan("observation-0", index=2).model_dump(mode="json")
+    return lambda: ActionPlan.model_validate(plan)
+
+@benchmark("graph.update")
+def _graph_update(workdir: Path):
+    graph = GraphMemory(workdir / "graph_update.json")
+    graph.load_state_dict(make_graph_history(5000))
+    observations = [make_observation_event([], index=i) for i in range(16)]
+    counter = [0]
+
+    def update():
+        counter[0] += 1
+        return graph.update(observations[counter[0] % len(observations)])
+    return update
+
+@benchmark("graph.query")
+def _graph_query(workdir: Path):
+    graph = GraphMemory(workdir / "graph_query.json")
+    graph.load_state_dict(make_graph_history(5000))
+    return lambda: graph.query(search_intent="Dino", limit=3)
+
+@benchmark("graph.save")
+def _graph_save(workdir: Path):
+    graph = GraphMemory(workdir / "graph_save.json")
+    graph.load_state_dict(make_graph_history(2000))
+    return graph.save
+
+@benchmark("graph.load")
+def _graph_load(workdir: Path):
+    graph = GraphMemory(workdir / "graph_load.json")
+    graph.load_state_dict(make_graph_history(2000))
+    graph.save()
+    return lambda: GraphMemory(workdir / "graph_load.json")
+
+@benchmark("event_log.log_event")
+def _event_log_log_event(workdir: Path):
+    logger = JsonlLogger(workdir / "log_event.jsonl")
+    observation = make_observation_event(make_raw_signals(make_synthetic_uia_tree(depth=4, breadth=4), log_lines=20))
+    event = Event(event_id="bench-event", event_type=EventType.OBSERVATION, payload=observation)
+    return lambda: logger.log_event(event)
+
+@benchmark("event_log.read_tail")
+def _event_log_read_tail(workdir: Path):
+    path = make_event_log(workdir / "read_tail.jsonl", n_cycles=1000)
+    return lambda: read_event_tail(path, repair=False)
+
+@benchmark("uia.budgeted_walk")
+def _uia_budgeted_walk(workdir: Path):
+    tree = make_synthetic_uia_tree(depth=6, breadth=5)
+    provider = InMemoryUIAProvider(tree)
+    return lambda: walk_uia_tree_budgeted(provider, tree, max_depth=8, max_nodes=2000)
+
+@benchmark("aggregate.signals")
+def _aggregate_signals(workdir: Path):
+    raw_signals = make_raw_signals(make_synthetic_uia_tree(depth=3, breadth=3), log_lines=5) * 50
+    return lambda: aggregate_signals(raw_signals, tolerance_ms=50.0)
+
+def time_benchmark(fn: Callable[[], Any], rounds: int = 7, min_round_s: float = 0.05) -> Dict[str, float]:
+    """
+    Times `fn`: after a warm-up call, the number of calls per round is doubled until a
+    round takes `min_round_s`, then `rounds` rounds are timed.
+
+    Returns:
+        Best and median per-call time in microseconds, and the calls per round.
+    """
+    fn()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_round_s or number >= 1 << 20:
+            break
+        number *= 2
+    per_call_us = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call_us.append((time.perf_counter() - start) / number * 1e6)
+    per_call_us.sort()
+    return {"best_us": per_call_us[0], "median_us": per_call_us[len(per_call_us) // 2], "number": number}
+
+def run(name_filter: str = "", rounds: int = 7, min_round_s: float = 0.05,
+        quiet: bool = True) -> Dict[str, Dict[str, float]]:
+    """
+    Runs the benchmarks whose name contains `name_filter`. With `quiet`, their
+    diagnostics are silenced through logging (see aios.runtime.logs).
+
+    Returns:
+        Per benchmark, the timings of `time_benchmark`.
+    """
+    results = {}
+    configure_logging(quiet=quiet) # Quiet: no console output, warnings and errors are kept in memory
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name, setup in BENCHMARKS.items():
+                if name_filter not in name:
+                    continue
+                workdir = Path(tmp_dir) / name
+                workdir.mkdir()
+                try:
+                    results[name] = time_benchmark(setup(workdir), rounds=rounds, min_round_s=min_round_s)
+                finally:
+                    if name in TEARDOWNS:
+                        TEARDOWNS[name]()
+    finally:
+        shutdown_logging()
+    return results
+
+def default_baseline_path() -> Path:
+    """The baseline file for this host and Python version."""
+    host = platform.node() or "unknown-host"
+    return BASELINE_DIR / f"{host}-py{sys.version_info.major}{sys.version_info.minor}.json"
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: Path) -> Path:
+    """Writes `results` as the baseline, merged into any existing baseline at `path`."""
+    baseline = load_baseline(path) or {"results": {}}
+    baseline.update({
+        "saved_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    })
+    baseline["results"].update(results)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True), encoding="utf-8")
+    return path
+
+def load_baseline(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Any]],
+            threshold: float = 0.25) -> Dict[str, Dict[str, Any]]:
+    """
+    Compares best per-call times with the baseline.
+
+    Returns:
+        Per benchmark: the current and baseline time (None if not in the baseline),
+        their ratio, and whether it regressed by more than `threshold` (0.25 = 25% slower).
+    """
+    baseline_results = (baseline or {}).get("results", {})
+    comparison = {}
+    for name, result in results.items():
+        baseline_us = baseline_results.get(name, {}).get("best_us")
+        ratio = result["best_us"] / baseline_us if baseline_us else None
+        comparison[name] = {
+            "best_us": result["best_us"],
+            "baseline_us": baseline_us,
+            "ratio": ratio,
+            "regressed": ratio is not None and ratio > 1.0 + threshold,
+        }
+    return comparison
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the per-stage AIOS microbenchmark suite.")
+    parser.add_argument("--filter", type=str, default="", help="Only run benchmarks whose name contains this text.")
+    parser.add_argument("--quick", action="store_true", help="Fewer, shorter rounds (noisier).")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Slowdown reported as a regression (0.25 = 25%%).")
+    parser.add_argument("--baseline", type=Path, default=None, help="Baseline file (default: per host under aios/benchmarks/baselines).")
+    parser.add_argument("--save_baseline", action="store_true", help="Store this run's results as the baseline.")
+    args = parser.parse_args()
+
+    baseline_path = args.baseline or default_baseline_path()
+    results = run(args.filter, rounds=3 if args.quick else 7, min_round_s=0.01 if args.quick else 0.05)
+    comparison = compare(results, load_baseline(baseline_path), args.threshold)
+
+    print(f"\n{'benchmark':<36}{'best µs':>12}{'median µs':>12}{'baseline µs':>14}{'change':>10}")
+    for name, row in comparison.items():
+        baseline_text = f"{row['baseline_us']:>14.1f}" if row["baseline_us"] else f"{'-':>14}"
+        change_text = f"{(row['ratio'] - 1) * 100:>+9.1f}%" if row["ratio"] else f"{'-':>10}"
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(f"{name:<36}{row['best_us']:>12.1f}{results[name]['median_us']:>12.1f}{baseline_text}{change_text}{flag}")
+
+    if args.save_baseline:
+        print(f"\nBaseline saved to {save_baseline(results, baseline_path)}")
+    regressions = [name for name, row in comparison.items() if row["regressed"]]
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
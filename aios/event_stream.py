@@ -1,5 +1,14 @@
+import json
+import logging
+import threading
+from datetime import datetime
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from aios.protocols.schema import Event
+from aios.runtime.metrics import EVENT_LOG_BYTES, EVENTS_LOGGED
+from aios.runtime.tracing import span
+
+logger = logging.getLogger(__name__)
 
 class JsonlLogger:
     """
@@ -10,7 +19,9 @@ class JsonlLogger:
         self.file_path = Path(file_path)
         # Ensure the directory exists
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
-        print(f"JSONL Logger initialized for file: {self.file_path}")
+        self._listeners: List[Callable[[Event, str], None]] = []
+        self._write_lock = threading.Lock() # Pipelined stages log from several threads
+        logger.info("JSONL Logger initialized for file: %s", self.file_path)
 
     def log_event(self, event: Event):
         """
@@ -19,11 +30,172 @@ class JsonlLogger:
         Args:
             event: An instance of the Event Pydantic model.
         """
-        # `model_dump_json` is the Pydantic v2 method to serialize to a JSON string
-        json_string = event.model_dump_json()
-        
-        with open(self.file_path, "a", encoding="utf-8") as f:
-            f.write(json_string + "\n")
+        with span("log_event", event_type=event.event_type.value):
+            # `model_dump_json` is the Pydantic v2 method to serialize to a JSON string
+            json_string = event.model_dump_json()
+
+            with self._write_lock, open(self.file_path, "a", encoding="utf-8") as f:
+                f.write(json_string + "\n")
+        EVENTS_LOGGED.inc(event_type=event.event_type.value)
+        EVENT_LOG_BYTES.inc(len(json_string.encode("utf-8")) + 1)
         
-        print(f"Logged event {event.event_id} of type {event.event_type.value}")
+        logger.info("Logged event %s of type %s", event.event_id, event.event_type.value,
+                    extra={"event_id": event.event_id, "event_type": event.event_type.value})
+
+        for listener in list(self._listeners):
+            try:
+                listener(event, json_string)
+            except Exception as e:
+                logger.warning("JSONL Logger listener failed for event %s: %s", event.event_id, e)
+
+    def add_listener(self, listener: Callable[[Event, str], None]):
+        """
+        Registers a callback invoked as `listener(event, json_string)` after each event is written,
+        e.g. to stream events to clients. Listener errors are reported but never fail the logging.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Event, str], None]):
+        """Unregisters a callback added with `add_listener`."""
+        self._listeners.remove(listener)
+
+class EventLogTailer:
+    """
+    Follows a JSONL event log while another process appends to it: each `read_new()`
+    returns the events written since the previous one, as plain dicts, by remembering
+    the byte offset after the last complete line. An unterminated last line is left
+    for the next read; a file that shrank (replaced by a new run) is read from the start.
+    """
+
+    def __init__(self, file_path: Path | str, offset: int = 0):
+        self.file_path = Path(file_path)
+        self.offset = offset
+
+    def read_new(self, max_bytes: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Reads the complete lines appended since the last read.
+
+        Args:
+            max_bytes: Read at most this many bytes, so a large backlog is consumed in chunks.
+
+        Returns:
+            The parsed events, oldest first. Lines that do not parse are skipped.
+        """
+        try:
+            size = self.file_path.stat().st_size
+        except FileNotFoundError:
+            return [] # The run has not logged anything yet
+        if size < self.offset:
+            self.offset = 0
+        if size == self.offset:
+            return []
+        with open(self.file_path, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read(max_bytes if max_bytes is not None else size - self.offset)
+            if b"\n" not in chunk:
+                chunk += f.readline() # The rest of a line longer than max_bytes
+
+        end = chunk.rfind(b"\n") + 1
+        events = []
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                logger.warning("Event tail: Skipped an unparsable line in %s.", self.file_path)
+        self.offset += end
+        return events
+
+# A row of an EventTimeline: (seq, time, event type, summary, latency ms, since observation ms, delta ms)
+EventRow = Tuple[int, str, str, str, str, str, str]
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+def _ms(start: Optional[datetime], end: Optional[datetime]) -> Optional[float]:
+    return (end - start).total_seconds() * 1000 if start is not None and end is not None else None
+
+def _format_ms(value: Optional[float]) -> str:
+    return f"{value:.1f}" if value is not None else ""
+
+def summarize_event(event: Dict[str, Any]) -> str:
+    """Returns a one-line description of a serialized Event."""
+    payload = event.get("payload") or {}
+    event_type = event.get("event_type")
+    if event_type == "OBSERVATION":
+        return payload.get("ui_state_summary", "")
+    if event_type == "ACTION":
+        return f"{payload.get('action_type')} {json.dumps(payload.get('parameters') or {})}"
+    if event_type == "RECEIPT":
+        return f"{payload.get('status')}: {payload.get('message', '')}"
+    if event_type == "GRAPH_UPDATE":
+        return payload.get("summary_of_change", "")
+    if event_type == "DEADLINE_MISS":
+        return (f"{payload.get('stage')} over its {payload.get('budget_ms')} ms budget "
+                f"(degradation: {payload.get('degradation', 'none')})")
+    return ""
+
+def event_latency_ms(event: Dict[str, Any]) -> Optional[float]:
+    """
+    Returns the latency an event reports: a Receipt's actuation latency, a DeadlineMiss's
+    elapsed time, or for an Observation the time from its first signal to the event.
+    """
+    payload = event.get("payload") or {}
+    if not isinstance(payload, dict):
+        return None
+    if "latency_ms" in payload:
+        return payload["latency_ms"]
+    if "elapsed_ms" in payload:
+        return payload["elapsed_ms"]
+    signals = payload.get("raw_signals")
+    signals = signals if isinstance(signals, list) else []
+    signal_times = [t for t in (_parse_time(s.get("timestamp")) for s in signals if isinstance(s, dict)) if t]
+    if signal_times:
+        return _ms(min(signal_times), _parse_time(event.get("timestamp")))
+    return None
+
+class EventTimeline:
+    """
+    The rows a live view of a run's events shows, one per event, with latency columns:
+    the latency the event reports (see `event_latency_ms`), the time since the cycle's
+    Observation and the time since the previous event. Rows are formatted once, when
+    the events are appended, so showing any slice of them is cheap.
+    """
+
+    def __init__(self, summary_chars: int = 120):
+        self.summary_chars = summary_chars
+        self._rows: List[EventRow] = []
+        self._previous_time: Optional[datetime] = None
+        self._observation_time: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def append(self, events: List[Dict[str, Any]]):
+        """Adds rows for `events`, which arrive in log order."""
+        for event in events:
+            time = _parse_time(event.get("timestamp"))
+            event_type = event.get("event_type", "")
+            if event_type == "OBSERVATION":
+                self._observation_time = time
+            summary = summarize_event(event)
+            if len(summary) > self.summary_chars:
+                summary = summary[:self.summary_chars - 3] + "..."
+            self._rows.append((
+                len(self._rows) + 1,
+                time.strftime("%H:%M:%S.%f")[:-3] if time else "",
+                event_type,
+                summary,
+                _format_ms(event_latency_ms(event)),
+                _format_ms(_ms(self._observation_time, time)),
+                _format_ms(_ms(self._previous_time, time)),
+            ))
+            self._previous_time = time or self._previous_time
 
+    def rows(self, start: int, count: int) -> List[EventRow]:
+        """Returns up to `count` rows from index `start`."""
+        return self._rows[max(start, 0):max(start, 0) + count]
@@ -4,6 +4,8 @@ import logging
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_exception, wait_exponential
 import time
 
+from aios.runtime.metrics import LLM_REQUESTS, LLM_SECONDS
+
 logger = logging.getLogger(__name__)
 
 class LLMClient:
@@ -37,12 +39,20 @@ class LLMClient:
         try:
             time.sleep(0.1) # Small delay to mitigate rate limits
             
-            completion = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=messages,
-                temperature=self.temperature,
-                response_format=response_format if response_format else openai.NOT_SPECIFIED
-            )
+            request_start = time.perf_counter()
+            try:
+                completion = self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=messages,
+                    temperature=self.temperature,
+                    response_format=response_format if response_format else openai.NOT_SPECIFIED
+                )
+            except Exception as e:
+                LLM_REQUESTS.inc(model=self.model_name, outcome=type(e).__name__)
+                raise
+            finally:
+                LLM_SECONDS.observe(time.perf_counter() - request_start, model=self.model_name)
+            LLM_REQUESTS.inc(model=self.model_name, outcome="success")
             
             response_text = completion.choices[0].message.content
             logger.debug(f"Raw LLM response text: {response_text}")
@@ -0,0 +1,137 @@
+from __future__ import annotations
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from aios.runtime.metrics import LLM_CACHE_LOOKUPS
+
+class RateLimiter:
+    """
+    A thread-safe token bucket: `rate_per_s` requests per second on average, with
+    bursts of up to `burst` requests.
+    """
+
+    def __init__(self, rate_per_s: float, burst: int = 1, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if rate_per_s <= 0:
+            raise ValueError("RateLimiter rate_per_s must be positive.")
+        self.rate_per_s = rate_per_s
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+        self.waited_s = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate_per_s)
+        self._updated_at = now
+
+    def acquire(self):
+        """Blocks until a request may be made."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait_s = (1.0 - self._tokens) / self.rate_per_s
+                self.waited_s += wait_s
+            self._sleep(wait_s)
+
+class ResponseCache:
+    """A thread-safe LRU cache of LLM responses keyed by a hash of the full request."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model_name: str, temperature: float, system_prompt: str, user_prompt: str, json_schema: Optional[dict]) -> str:
+        payload = json.dumps([model_name, temperature, system_prompt, user_prompt, json_schema], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                LLM_CACHE_LOOKUPS.inc(result="miss")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            LLM_CACHE_LOOKUPS.inc(result="hit")
+            return json.loads(json.dumps(response)) # Callers may mutate their copy
+
+    def put(self, key: str, response: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = json.loads(json.dumps(response))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+class SharedLLMClient:
+    """
+    Wraps one LLMClient (and so one HTTP connection pool) for use by many sessions.
+
+    Has the same `generate()` interface as LLMClient. Identical requests are answered
+    from a shared ResponseCache while the client samples at temperature 0 (sampled
+    responses are never replayed); the others wait for the shared RateLimiter and for
+    one of `max_concurrency` in-flight slots.
+    """
+
+    def __init__(self, client: Any, rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[ResponseCache] = None, max_concurrency: int = 8):
+        """
+        Args:
+            client: The LLMClient doing the actual requests.
+            rate_limiter: Optional limiter shared by all callers.
+            cache: Optional response cache shared by all callers.
+            max_concurrency: Maximum requests in flight at once.
+        """
+        self.client = client
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.client, "model_name", "")
+
+    def generate(self, system_prompt: str, user_prompt: str, json_schema: dict = None) -> dict:
+        key = None
+        temperature = getattr(self.client, "temperature", None)
+        if self.cache is not None and not temperature: # Sampled responses are never replayed
+            key = ResponseCache.key(self.model_name, temperature, system_prompt, user_prompt, json_schema)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        with self._slots:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            with self._lock:
+                self.requests += 1
+            response = self.client.generate(system_prompt, user_prompt, json_schema)
+
+        if key is not None:
+            self.cache.put(key, response)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache.hits if self.cache else 0,
+            "cache_misses": self.cache.misses if self.cache else 0,
+            "rate_limit_wait_s": self.rate_limiter.waited_s if self.rate_limiter else 0.0,
+        }
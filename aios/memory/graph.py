@@ -1,9 +1,13 @@
 import json # ADDED
 from pathlib import Path
 from typing import Any, Dict, List, Optional
+import logging
 import uuid
 
 from aios.protocols.schema import ObservationEvent, GraphUpdate # ADDED GraphUpdate
+from aios.runtime.metrics import GRAPH_BYTES, GRAPH_UPDATES
+
+logger = logging.getLogger(__name__)
 
 class GraphMemory:
     """
@@ -11,33 +15,66 @@ class GraphMemory:
     This iteration focuses on logging GraphUpdate events as part of the graph memory.
     """
 
-    def __init__(self, file_path: Path | str):
+    def __init__(self, file_path: Path | str, name: Optional[str] = None):
+        """
+        Args:
+            file_path: The JSON file the graph is loaded from and saved to.
+            name: Label of the graph's size metrics (e.g. "daemon"); unnamed graphs report none,
+                  so short-lived per-run graphs do not leave a metric series each.
+        """
         self.file_path = Path(file_path)
+        self.name = name
         self.graph_updates: List[GraphUpdate] = [] # Stores sequence of graph updates
         self._previous_observation: Optional[ObservationEvent] = None # For change detection
         self._load()
 
+    @property
+    def previous_observation(self) -> Optional[ObservationEvent]:
+        """The last observation passed to `update()` (or restored), or None."""
+        return self._previous_observation
+
+    @previous_observation.setter
+    def previous_observation(self, observation: Optional[ObservationEvent]):
+        self._previous_observation = observation
+
     def _load(self):
         """Loads the graph updates and previous observation from the specified file path if it exists."""
         if self.file_path.exists():
             with open(self.file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                self.graph_updates = [GraphUpdate.model_validate_json(json.dumps(gu)) for gu in data.get("graph_updates", [])] # Use model_validate_json
-                if data.get("previous_observation"):
-                    self._previous_observation = ObservationEvent.model_validate_json(json.dumps(data["previous_observation"])) # Use model_validate_json
-            print(f"GraphMemory loaded {len(self.graph_updates)} updates from {self.file_path}")
+                self.load_state_dict(json.load(f))
+            logger.info("GraphMemory loaded %d updates from %s", len(self.graph_updates), self.file_path)
         else:
-            print(f"No existing graph memory file found at {self.file_path}. Starting fresh.")
+            logger.info("No existing graph memory file found at %s. Starting fresh.", self.file_path)
 
-    def save(self):
-        """Saves the current graph memory state to the file path."""
-        data_to_save = {
+    def state_dict(self) -> Dict[str, Any]:
+        """Returns the graph state as JSON-compatible data (the format of the graph memory file)."""
+        return {
             "graph_updates": [json.loads(gu.model_dump_json()) for gu in self.graph_updates], # Use model_dump_json then json.loads
             "previous_observation": json.loads(self._previous_observation.model_dump_json()) if self._previous_observation else None # Use model_dump_json then json.loads
         }
+
+    def load_state_dict(self, data: Dict[str, Any]):
+        """Replaces the graph state with data produced by `state_dict()`."""
+        self.graph_updates = [GraphUpdate.model_validate(gu) for gu in data.get("graph_updates", [])]
+        self._previous_observation = None
+        if data.get("previous_observation"):
+            self._previous_observation = ObservationEvent.model_validate(data["previous_observation"])
+        self._report_size()
+
+    def _report_size(self, saved_bytes: Optional[int] = None):
+        if self.name is None:
+            return
+        GRAPH_UPDATES.set(len(self.graph_updates), graph=self.name)
+        if saved_bytes is not None:
+            GRAPH_BYTES.set(saved_bytes, graph=self.name)
+
+    def save(self):
+        """Saves the current graph memory state to the file path."""
+        data_to_save = self.state_dict()
         with open(self.file_path, "w", encoding="utf-8") as f:
             json.dump(data_to_save, f, indent=4)
-        print(f"GraphMemory saved {len(self.graph_updates)} updates to {self.file_path}")
+            self._report_size(f.tell())
+        logger.debug("GraphMemory saved %d updates to %s", len(self.graph_updates), self.file_path)
 
     def update(self, observation: ObservationEvent) -> Optional[GraphUpdate]:
         """
@@ -66,7 +103,7 @@ class GraphMemory:
             
             if not summary_of_change:
                 # No significant change detected
-                print(f"GraphMemory: No significant change detected from previous observation {self._previous_observation.observation_id}.")
+                logger.debug("GraphMemory: No significant change detected from previous observation %s.", self._previous_observation.observation_id)
                 self._previous_observation = observation # Still update previous to current
                 return None
         
@@ -78,7 +115,8 @@ class GraphMemory:
                 metadata={"observation_timestamp": observation.timestamp.isoformat()}
             )
             self.graph_updates.append(generated_graph_update)
-            print(f"GraphMemory updated: Generated GraphUpdate for observation {observation.observation_id}.")
+            self._report_size()
+            logger.debug("GraphMemory updated: Generated GraphUpdate for observation %s.", observation.observation_id)
         
         self._previous_observation = observation
         return generated_graph_update # Return the generated update for logging in the event stream
@@ -0,0 +1,137 @@
+from __future__ import annotations
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# File suffix per supported screenshot format.
+IMAGE_FORMAT_SUFFIXES = {
+    "png": ".png",
+    "jpeg": ".jpg",
+    "raw": ".bgra", # The BGRA buffer exactly as grabbed, no encoding
+}
+
+def bgra_to_rgb(raw: bytes, size: tuple[int, int]) -> bytes:
+    """Converts a packed BGRA buffer of the given (width, height) to packed RGB bytes."""
+    width, height = size
+    frame = np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4)
+    return frame[..., 2::-1].tobytes()
+
+def encode_frame(raw: bytes, size: tuple[int, int], image_format: str = "png", png_level: int = 6, jpeg_quality: int = 85) -> bytes:
+    """
+    Encodes a BGRA frame in memory.
+
+    Args:
+        raw: The packed BGRA pixel buffer, as returned by `mss` (`ScreenShot.raw`).
+        size: The (width, height) of the frame.
+        image_format: One of "png", "jpeg" or "raw".
+        png_level: zlib compression level for PNG.
+        jpeg_quality: Quality for JPEG (requires Pillow).
+
+    Returns:
+        The encoded bytes.
+    """
+    if image_format == "raw":
+        return bytes(raw)
+    if image_format == "png":
+        import mss.tools # Only needed for PNG encoding
+        return mss.tools.to_png(bgra_to_rgb(raw, size), size, level=png_level)
+    if image_format == "jpeg":
+        try:
+            from PIL import Image
+        except ImportError as e:
+            raise RuntimeError("JPEG screenshots require Pillow (pip install pillow).") from e
+        import io
+        buffer = io.BytesIO()
+        Image.frombuffer("RGB", size, bgra_to_rgb(raw, size), "raw", "RGB", 0, 1).save(buffer, format="JPEG", quality=jpeg_quality)
+        return buffer.getvalue()
+    raise ValueError(f"Unsupported image format: '{image_format}'")
+
+class ArtifactWriter:
+    """
+    A bounded thread-pool writer for observer artifacts.
+
+    Encoding and disk writes are handed off to worker threads so that observers
+    can return their RawSignal as soon as the raw data is captured. At most
+    `max_pending` jobs may be queued or running; `submit` blocks beyond that, which
+    applies back-pressure instead of buffering frames without limit.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aios-artifact-writer")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending: set[Future] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, file_path: Path | str, produce_bytes: Callable[[], bytes]) -> Future:
+        """
+        Schedules `produce_bytes()` to run on a worker thread and its result to be
+        written to `file_path`.
+
+        Returns:
+            A Future resolving to the written Path.
+        """
+        return self.submit_job(lambda: self._write(Path(file_path), produce_bytes))
+
+    def submit_job(self, job: Callable[[], Any]) -> Future:
+        """
+        Schedules an arbitrary persistence job (e.g. encode + ArtifactStore.put)
+        on a worker thread, subject to the same bound as `submit`.
+
+        Returns:
+            A Future resolving to the job's result.
+        """
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(job)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _write(self, file_path: Path, produce_bytes: Callable[[], bytes]) -> Path:
+        data = produce_bytes()
+        with open(file_path, "wb") as f:
+            f.write(data)
+        return file_path
+
+    def _on_done(self, future: Future):
+        with self._lock:
+            self._pending.discard(future)
+        self._slots.release()
+        if future.exception() is not None:
+            logger.error("ArtifactWriter: Failed to write artifact: %s", future.exception())
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs queued or in progress."""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """Blocks until all submitted jobs have completed."""
+        with self._lock:
+            pending = list(self._pending)
+        for future in pending:
+            try:
+                future.result()
+            except Exception:
+                pass # Already reported in _on_done
+
+    def close(self):
+        """Waits for outstanding jobs and shuts the worker threads down."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> ArtifactWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+from typing import Optional
+
+import numpy as np
+
+from aios.protocols.schema import RawSignal
+
+# ITU-R BT.601 luma weights, in the channel order of the source buffer.
+_LUMA_WEIGHTS = {
+    "BGRA": np.array([0.114, 0.587, 0.299, 0.0], dtype=np.float32),
+    "RGBA": np.array([0.299, 0.587, 0.114, 0.0], dtype=np.float32),
+    "BGR": np.array([0.114, 0.587, 0.299], dtype=np.float32),
+    "RGB": np.array([0.299, 0.587, 0.114], dtype=np.float32),
+}
+
+def downsample_grayscale(frame: np.ndarray, rows: int, cols: int, channel_order: str = "BGRA") -> np.ndarray:
+    """
+    Produces a small grayscale copy of a frame by area-averaging.
+
+    The frame is first stride-subsampled so that only a few pixels per output cell
+    are touched; this keeps the cost independent of the screen resolution.
+
+    Args:
+        frame: A (H, W) grayscale or (H, W, C) color array, e.g. the raw `mss` BGRA buffer.
+        rows: Number of output rows.
+        cols: Number of output columns.
+        channel_order: Channel layout of a color frame ("BGRA", "RGBA", "BGR" or "RGB").
+
+    Returns:
+        A (rows, cols) float32 array.
+    """
+    height, width = frame.shape[:2]
+    if height < rows or width < cols:
+        raise ValueError(f"Frame of size {width}x{height} is smaller than the {cols}x{rows} hash grid.")
+
+    # Keep ~4x4 samples per output cell before averaging.
+    step = max(1, min(height // (rows * 4), width // (cols * 4)))
+    sampled = frame[::step, ::step]
+
+    if sampled.ndim == 3:
+        weights = _LUMA_WEIGHTS[channel_order][: sampled.shape[2]]
+        gray = sampled.astype(np.float32) @ weights
+    else:
+        gray = sampled.astype(np.float32)
+
+    # Crop to a whole number of cells, then average each cell.
+    cell_h, cell_w = gray.shape[0] // rows, gray.shape[1] // cols
+    gray = gray[: cell_h * rows, : cell_w * cols]
+    return gray.reshape(rows, cell_h, cols, cell_w).mean(axis=(1, 3))
+
+def perceptual_hash(frame: np.ndarray, hash_size: int = 8, channel_order: str = "BGRA") -> int:
+    """
+    Computes a difference hash (dHash) of a frame.
+
+    Each bit records whether a cell of the downsampled grayscale image is brighter
+    than its right-hand neighbour, giving a `hash_size * hash_size` bit fingerprint
+    that is stable under small noise and compression artifacts.
+
+    Args:
+        frame: A grayscale or color frame array.
+        hash_size: Side length of the hash grid.
+        channel_order: Channel layout of a color frame.
+
+    Returns:
+        The hash as a Python int.
+    """
+    small = downsample_grayscale(frame, hash_size, hash_size + 1, channel_order)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+def hamming_distance(hash_a: int, hash_b: int) -> int:
+    """Returns the number of differing bits between two perceptual hashes."""
+    return (hash_a ^ hash_b).bit_count()
+
+class FrameDeduplicator:
+    """
+    Tracks the perceptual hash of the last emitted frame so that observers can
+    skip encoding, writing and downstream processing of unchanged frames.
+    """
+
+    def __init__(self, hamming_threshold: int = 4, hash_size: int = 8, channel_order: str = "BGRA"):
+        """
+        Args:
+            hamming_threshold: Frames whose hash differs from the last emitted frame by
+                               at most this many bits are considered unchanged.
+            hash_size: Side length of the hash grid (the hash has hash_size**2 bits).
+            channel_order: Channel layout of the frames passed to `check`.
+        """
+        self.hamming_threshold = hamming_threshold
+        self.hash_size = hash_size
+        self.channel_order = channel_order
+        self.last_hash: Optional[int] = None
+        self.last_signal: Optional[RawSignal] = None
+
+    def check(self, frame: np.ndarray) -> tuple[bool, int]:
+        """
+        Hashes a frame and compares it against the last emitted frame.
+
+        Returns:
+            A tuple of (is_duplicate, frame_hash). A frame is only a duplicate if a
+            previous signal is available to be referenced.
+        """
+        frame_hash = perceptual_hash(frame, self.hash_size, self.channel_order)
+        is_duplicate = (
+            self.last_hash is not None
+            and self.last_signal is not None
+            and hamming_distance(frame_hash, self.last_hash) <= self.hamming_threshold
+        )
+        return is_duplicate, frame_hash
+
+    def remember(self, frame_hash: int, signal: RawSignal):
+        """Records the hash and RawSignal of a newly emitted (changed) frame."""
+        self.last_hash = frame_hash
+        self.last_signal = signal
+
+    def reset(self):
+        """Forgets the last emitted frame, forcing the next frame to be emitted."""
+        self.last_hash = None
+        self.last_signal = None
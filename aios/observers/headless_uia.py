@@ -0,0 +1,22 @@
+"""
+The "none" UIA backend, for hosts without UI Automation (e.g. Linux replay and
+evaluation boxes). It has the interface of `aios.observers.uia` but observes nothing.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any
+
+from aios.protocols.schema import RawSignal, UIATreeData
+
+def initialize_uia_thread():
+    """Nothing to initialize without COM."""
+
+def get_focused_uia_tree(artifact_dir: Path, max_depth: int = 5, **kwargs: Any) -> RawSignal:
+    """Returns the empty UIA signal the Windows backend returns when it finds no target element."""
+    return RawSignal(
+        observer_id="uia_observer_v1_empty",
+        artifact_path="",
+        artifact_hash="",
+        data=UIATreeData(focused_window_title="Empty UIA Signal", tree_structure={},
+                         walk_stats={"backend": "none"})
+    )
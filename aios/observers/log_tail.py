@@ -0,0 +1,209 @@
+from __future__ import annotations
+import copy
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from aios.protocols.schema import RawSignal, LogData
+from aios.artifact_store import ArtifactStore
+
+logger = logging.getLogger(__name__)
+
+class LogTailObserver:
+    """
+    Tails many log files incrementally.
+
+    For every file the byte offset just after the last consumed line is tracked
+    (and optionally persisted), so each poll only reads bytes appended since the
+    previous one, in large blocks. Rotation (a new file behind the same path) and
+    truncation restart the file from offset 0. A trailing partial line is left
+    unconsumed until its newline arrives. At most `max_lines_per_signal` lines are
+    emitted per file and poll; the rest follow on the next polls.
+
+    `poll()` returns one signal per file; `observe()` merges them into the single
+    RawSignal an ObserverScheduler observer must return.
+    """
+
+    def __init__(
+        self,
+        log_paths: List[Path | str],
+        state_file: Optional[Path | str] = None,
+        max_lines_per_signal: int = 200,
+        block_size: int = 1 << 20,
+        from_beginning: bool = False,
+        artifact_dir: Optional[Path] = None,
+        artifact_store: Optional[ArtifactStore] = None,
+        run_id: Optional[str] = None,
+        encoding: str = "utf-8"
+    ):
+        """
+        Args:
+            log_paths: The files to tail.
+            state_file: Optional JSON file to persist offsets in, so restarts resume where they left off.
+            max_lines_per_signal: Maximum lines per emitted RawSignal.
+            block_size: Read size in bytes.
+            from_beginning: Whether files without saved state are read from the start (default: from the end).
+            artifact_dir: If given, the consumed bytes of each signal are saved under "<artifact_dir>/logs".
+            artifact_store: If given, the consumed bytes are stored in the content-addressed store instead.
+            run_id: The run referencing stored artifacts.
+            encoding: Text encoding of the log files; undecodable bytes are replaced.
+        """
+        self.log_paths = [Path(p) for p in log_paths]
+        self.state_file = Path(state_file) if state_file else None
+        self.max_lines_per_signal = max_lines_per_signal
+        self.block_size = block_size
+        self.from_beginning = from_beginning
+        self.artifact_dir = artifact_dir
+        self.artifact_store = artifact_store
+        self.run_id = run_id
+        self.encoding = encoding
+        self.offsets: Dict[str, Dict[str, int]] = {} # path -> {"offset", "inode", "device"}
+        self._saved_offsets: Dict[str, Dict[str, int]] = {} # As last loaded or saved
+        self._load_state()
+
+    def _load_state(self):
+        if self.state_file and self.state_file.exists():
+            try:
+                with open(self.state_file, "r", encoding="utf-8") as f:
+                    self.offsets = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("LogTailObserver: Ignoring unreadable state file %s (%s); starting from fresh offsets.",
+                               self.state_file, e)
+                return
+            self._saved_offsets = copy.deepcopy(self.offsets)
+            logger.info("LogTailObserver loaded offsets for %d files from %s", len(self.offsets), self.state_file)
+
+    def save_state(self):
+        """Atomically persists the current offsets to `state_file`."""
+        if not self.state_file:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_file.with_name(self.state_file.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.offsets, f)
+        os.replace(tmp_path, self.state_file)
+        self._saved_offsets = copy.deepcopy(self.offsets)
+
+    def poll(self) -> List[RawSignal]:
+        """
+        Reads new complete lines from every tailed file. The offsets are saved only
+        when they changed, so idle polls do not rewrite the state file.
+
+        Returns:
+            One RawSignal(LogData) per file that has new lines.
+        """
+        signals = []
+        for path in self.log_paths:
+            try:
+                signal = self._poll_file(path)
+            except OSError as e:
+                logger.warning("LogTailObserver: Failed to read %s: %s", path, e)
+                continue
+            if signal is not None:
+                signals.append(signal)
+        if self.offsets != self._saved_offsets:
+            self.save_state()
+        return signals
+
+    def observe(self) -> RawSignal:
+        """
+        Polls every tailed file and returns the new lines as one RawSignal, so the
+        observer can be registered with an ObserverScheduler. With several files, the
+        lines are concatenated per file, the artifact paths joined with ";" and the
+        hash taken over the per-file hashes; the offsets are per file, so they are 0.
+        """
+        signals = self.poll()
+        if len(signals) == 1:
+            return signals[0]
+        return RawSignal(
+            observer_id="log_tail_observer_v1",
+            artifact_path=";".join(signal.artifact_path for signal in signals),
+            artifact_hash=hashlib.sha256("".join(signal.artifact_hash for signal in signals).encode("ascii")).hexdigest(),
+            data=LogData(
+                log_source=";".join(signal.data.log_source for signal in signals) or ";".join(map(str, self.log_paths)),
+                new_lines=[line for signal in signals for line in signal.data.new_lines]
+            )
+        )
+
+    def _poll_file(self, path: Path) -> Optional[RawSignal]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+
+        key = str(path)
+        state = self.offsets.get(key)
+        if state is None:
+            state = {"offset": 0 if self.from_beginning else stat.st_size, "inode": stat.st_ino, "device": stat.st_dev}
+        elif (state["inode"], state["device"]) != (stat.st_ino, stat.st_dev):
+            logger.info("LogTailObserver: %s was rotated; reading the new file from the start.", path)
+            state = {"offset": 0, "inode": stat.st_ino, "device": stat.st_dev}
+        elif stat.st_size < state["offset"]:
+            logger.info("LogTailObserver: %s was truncated; reading from the start.", path)
+            state["offset"] = 0
+        self.offsets[key] = state
+
+        if stat.st_size == state["offset"]:
+            return None
+
+        start_offset = state["offset"]
+        chunk = self._read_lines(path, start_offset)
+        if not chunk:
+            return None # Only a partial line so far
+        state["offset"] = start_offset + len(chunk)
+
+        # Only b"\n" ends a line, as in _read_lines; str.splitlines() would also split on \r, \x0b, \u2028, ...
+        new_lines = [line.removesuffix(b"\r").decode(self.encoding, errors="replace") for line in chunk[:-1].split(b"\n")]
+        artifact_hash = hashlib.sha256(chunk).hexdigest()
+        artifact_path = key
+        if self.artifact_store is not None:
+            artifact_hash, stored_path = self.artifact_store.put(chunk, ".log", run_id=self.run_id)
+            artifact_path = str(stored_path)
+        elif self.artifact_dir is not None:
+            log_dir = self.artifact_dir / "logs"
+            log_dir.mkdir(parents=True, exist_ok=True)
+            artifact_file = log_dir / f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}.log"
+            with open(artifact_file, "wb") as f:
+                f.write(chunk)
+            artifact_path = str(artifact_file)
+
+        return RawSignal(
+            observer_id="log_tail_observer_v1",
+            artifact_path=artifact_path,
+            artifact_hash=artifact_hash,
+            data=LogData(
+                log_source=key,
+                new_lines=new_lines,
+                start_offset=start_offset,
+                end_offset=state["offset"]
+            )
+        )
+
+    def _read_lines(self, path: Path, offset: int) -> bytes:
+        """
+        Reads complete lines starting at `offset`, stopping after `max_lines_per_signal`
+        lines or at the end of the file.
+
+        Returns:
+            The raw bytes of the consumed lines, ending with a newline (or empty).
+        """
+        buffer = bytearray()
+        newlines = 0
+        with open(path, "rb") as f:
+            f.seek(offset)
+            while newlines < self.max_lines_per_signal:
+                block = f.read(self.block_size)
+                if not block:
+                    break
+                buffer += block
+                newlines += block.count(b"\n")
+
+        # Cut after the last complete line within the cap
+        end = -1
+        for _ in range(min(newlines, self.max_lines_per_signal)):
+            end = buffer.index(b"\n", end + 1)
+        return bytes(buffer[:end + 1])
@@ -0,0 +1,230 @@
+from __future__ import annotations
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+class FrameRingBuffer:
+    """
+    A preallocated ring buffer of frames and their capture timestamps.
+
+    Producers fill the slot returned by `acquire_slot()` in place and then call
+    `commit()`, so no array is allocated per frame. Consumers get read-only views
+    from `latest()`; a view stays valid until `capacity` newer frames have been
+    committed, which consumers can check against `frame_count`.
+    """
+
+    def __init__(self, capacity: int, height: int, width: int, channels: int = 4, dtype=np.uint8):
+        if capacity < 2:
+            raise ValueError("FrameRingBuffer capacity must be at least 2.")
+        self.capacity = capacity
+        self.frames = np.zeros((capacity, height, width, channels), dtype=dtype)
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self._read_only = self.frames.view()
+        self._read_only.flags.writeable = False
+        self._frame_count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def frame_count(self) -> int:
+        """Total number of frames committed so far (the sequence number of the next frame)."""
+        return self._frame_count
+
+    def acquire_slot(self) -> np.ndarray:
+        """Returns the writable slot the next frame must be written into."""
+        return self.frames[self._frame_count % self.capacity]
+
+    def commit(self, timestamp: float):
+        """Publishes the frame written into the acquired slot."""
+        with self._lock:
+            self.timestamps[self._frame_count % self.capacity] = timestamp
+            self._frame_count += 1
+
+    def latest(self, k: int = 1) -> List[Tuple[int, float, np.ndarray]]:
+        """
+        Returns up to the `k` most recent frames, oldest first, without copying.
+
+        Returns:
+            A list of (sequence number, timestamp, read-only frame view) tuples.
+        """
+        with self._lock:
+            newest = self._frame_count
+        k = min(k, newest, self.capacity - 1) # The slot being written is never returned
+        return [
+            (seq, float(self.timestamps[seq % self.capacity]), self._read_only[seq % self.capacity])
+            for seq in range(newest - k, newest)
+        ]
+
+class FrameSource(ABC):
+    """A pluggable source that grabs frames directly into caller-provided arrays."""
+
+    @property
+    @abstractmethod
+    def shape(self) -> Tuple[int, int, int]:
+        """The (height, width, channels) of the frames produced."""
+
+    @abstractmethod
+    def grab_into(self, out: np.ndarray):
+        """Captures one frame into `out`, which has shape `self.shape`."""
+
+    def close(self):
+        """Releases any resources held by the source."""
+
+class MssRegionSource(FrameSource):
+    """
+    Grabs a fixed screen rectangle with `mss` as BGRA frames.
+
+    `mss` itself returns a fresh buffer per grab; it is copied straight into the
+    ring buffer slot, so no further per-frame arrays are created. The `mss`
+    instance is opened lazily on the capturing thread, as it is not thread-safe.
+    """
+
+    def __init__(self, region: Dict[str, int]):
+        """
+        Args:
+            region: The rectangle to grab, as {"left", "top", "width", "height"} in pixels.
+        """
+        self.region = {key: int(region[key]) for key in ("left", "top", "width", "height")}
+        self._sct = None
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return (self.region["height"], self.region["width"], 4)
+
+    def grab_into(self, out: np.ndarray):
+        if self._sct is None:
+            import mss
+            self._sct = mss.mss()
+        sct_img = self._sct.grab(self.region)
+        np.copyto(out, np.frombuffer(sct_img.raw, dtype=np.uint8).reshape(self.shape))
+
+    def close(self):
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
+class SyntheticFrameSource(FrameSource):
+    """
+    Produces generated frames, for tests and benchmarks on machines without a display.
+
+    `render(frame_index, out)` must draw frame number `frame_index` into `out` in place.
+    The default renders a dark bar moving across a light background.
+    """
+
+    def __init__(self, height: int, width: int, channels: int = 4,
+                 render: Optional[Callable[[int, np.ndarray], None]] = None):
+        self._shape = (height, width, channels)
+        self._render = render or self._moving_bar
+        self.frame_index = 0
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self._shape
+
+    @staticmethod
+    def _moving_bar(frame_index: int, out: np.ndarray):
+        out.fill(247)
+        x = (frame_index * 4) % out.shape[1]
+        out[:, x:x + 8] = 83
+
+    def grab_into(self, out: np.ndarray):
+        self._render(self.frame_index, out)
+        self.frame_index += 1
+
+class ROICaptureLoop:
+    """
+    Captures frames from a FrameSource into a FrameRingBuffer at a fixed target rate
+    on a background thread.
+
+    If a grab overruns its period, the missed ticks are skipped rather than captured
+    late in a burst, and counted in `stats()["missed_ticks"]`.
+    """
+
+    def __init__(self, source: FrameSource, buffer: FrameRingBuffer, target_rate_hz: float = 60.0,
+                 clock: Callable[[], float] = time.perf_counter):
+        if buffer.frames.shape[1:] != source.shape:
+            raise ValueError(f"Ring buffer frame shape {buffer.frames.shape[1:]} does not match source shape {source.shape}.")
+        self.source = source
+        self.buffer = buffer
+        self.period = 1.0 / target_rate_hz
+        self._clock = clock
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._first_frame = threading.Event() # Set once the background thread has captured a frame
+        self._missed_ticks = 0
+        self._started_at: Optional[float] = None
+        self._stopped_at: Optional[float] = None
+
+    def capture_once(self):
+        """Grabs a single frame into the ring buffer on the calling thread."""
+        self.source.grab_into(self.buffer.acquire_slot())
+        self.buffer.commit(self._clock())
+
+    def _run(self):
+        next_tick = self._clock()
+        try:
+            while not self._stop.is_set():
+                self.capture_once()
+                self._first_frame.set()
+                next_tick += self.period
+                now = self._clock()
+                if now > next_tick:
+                    # Overran: drop the ticks we are already late for
+                    missed = int((now - next_tick) // self.period) + 1
+                    self._missed_ticks += missed
+                    next_tick += missed * self.period
+                self._stop.wait(max(0.0, next_tick - self._clock()))
+        finally:
+            self.source.close()
+            self._stopped_at = self._clock()
+
+    def start(self):
+        """Starts capturing on a background thread."""
+        if self._thread is not None:
+            raise RuntimeError("ROICaptureLoop is already running.")
+        self._stop.clear()
+        self._first_frame.clear()
+        self._started_at = self._clock()
+        self._stopped_at = None
+        self._thread = threading.Thread(target=self._run, name="aios-roi-capture", daemon=True)
+        self._thread.start()
+
+    def wait_for_frame(self, timeout_s: float = 5.0) -> np.ndarray:
+        """
+        Waits until the running loop has captured a frame, so a caller needing a first
+        frame never grabs on its own thread (the source may not be thread-safe).
+
+        Returns:
+            A copy of the newest frame.
+
+        Raises:
+            TimeoutError: If no frame was captured within `timeout_s`.
+        """
+        if not self._first_frame.wait(timeout_s):
+            raise TimeoutError(f"ROICaptureLoop captured no frame within {timeout_s}s.")
+        return self.buffer.latest(1)[0][2].copy()
+
+    def stop(self):
+        """Stops the background thread and waits for it to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> Dict[str, float]:
+        """Returns the number of captured frames, missed ticks and the achieved rate."""
+        elapsed = ((self._stopped_at or self._clock()) - self._started_at) if self._started_at is not None else 0.0
+        return {
+            "frames_captured": self.buffer.frame_count,
+            "missed_ticks": self._missed_ticks,
+            "achieved_rate_hz": self.buffer.frame_count / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def __enter__(self) -> ROICaptureLoop:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,134 @@
+from __future__ import annotations
+import contextvars
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from aios.backends import load_backend
+from aios.protocols.schema import RawSignal
+from aios.protocols.aggregator import ObservationFrame, aggregate_signals
+from aios.runtime.tracing import span
+
+logger = logging.getLogger(__name__)
+
+def initialize_uia_thread():
+    """
+    A thread initializer for a scheduler that outlives one cycle: runs the UIA backend
+    selected when the worker thread starts (e.g. initializes COM on Windows).
+    """
+    load_backend("uia").initialize_uia_thread()
+
+class ObserverScheduler:
+    """
+    Runs registered observers concurrently on a persistent thread pool, so a cycle's
+    observation latency is bounded by the slowest observer instead of their sum.
+
+    Signals are stamped with the time their capture started, so the signals of one
+    run describe the same moment however long a slow observer (e.g. a UIA walk) takes.
+    A scheduler can be kept across cycles: re-registering an observer id replaces it.
+    An observer still running from an earlier cycle (e.g. after a timeout) is not run
+    again until it finishes; it is reported as busy instead, so a hung observer neither
+    runs concurrently with itself nor queues behind its own abandoned call.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, thread_initializer: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            max_workers: Pool size. Defaults to one thread per registered observer.
+            thread_initializer: Called once on each worker thread, e.g. to initialize COM
+                                for the UIA observer.
+        """
+        self._observers: Dict[str, Callable[[], RawSignal]] = {}
+        self._max_workers = max_workers
+        self._thread_initializer = thread_initializer
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._running: Dict[str, Future] = {} # Observers still running from an earlier collect()
+
+    def register(self, observer_id: str, observe: Callable[[], RawSignal]):
+        """
+        Registers an observer; `observe()` must return one RawSignal. Once the scheduler
+        has run, only already registered observers can be replaced (the pool is sized).
+        """
+        if self._executor is not None and observer_id not in self._observers:
+            raise RuntimeError("New observers must be registered before the scheduler first runs.")
+        self._observers[observer_id] = observe
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers or max(1, len(self._observers)),
+                thread_name_prefix="aios-observer",
+                initializer=self._thread_initializer
+            )
+        return self._executor
+
+    def collect(self, timeout_s: Optional[float] = None) -> Tuple[List[RawSignal], Dict[str, float], Dict[str, str]]:
+        """
+        Runs all observers once, concurrently.
+
+        Args:
+            timeout_s: Optional wall-clock limit. Observers still running afterwards are
+                       reported as timed out and their results discarded; until they
+                       finish, later calls report them as busy without running them.
+
+        Returns:
+            A tuple of (signals, per-observer latency in ms, per-observer error messages).
+        """
+        executor = self._ensure_executor()
+
+        def timed(observer_id: str, observe: Callable[[], RawSignal]) -> Tuple[RawSignal, float]:
+            captured_at, start = datetime.utcnow(), time.perf_counter()
+            with span(f"observer.{observer_id}"):
+                signal = observe()
+            signal.timestamp = captured_at
+            return signal, (time.perf_counter() - start) * 1000
+
+        signals: List[RawSignal] = []
+        latencies: Dict[str, float] = {}
+        errors: Dict[str, str] = {}
+        futures: Dict[Future, str] = {}
+        for observer_id, observe in self._observers.items():
+            previous = self._running.get(observer_id)
+            if previous is not None and not previous.done():
+                errors[observer_id] = "Busy: still running from an earlier cycle"
+                continue
+            # Each observer runs in a copy of the caller's context, so its spans reach the caller's tracer
+            futures[executor.submit(contextvars.copy_context().run, timed, observer_id, observe)] = observer_id
+        done, not_done = wait(futures, timeout=timeout_s)
+
+        for future, observer_id in futures.items():
+            if future in not_done:
+                self._running[observer_id] = future
+                errors[observer_id] = f"Timed out after {timeout_s}s"
+                continue
+            self._running.pop(observer_id, None)
+            try:
+                signal, latencies[observer_id] = future.result()
+                signals.append(signal)
+            except Exception as e:
+                errors[observer_id] = str(e)
+                logger.error("Observer '%s' failed: %s", observer_id, e)
+        return signals, latencies, errors
+
+    def run_once(self, tolerance_ms: float = 50.0, timeout_s: Optional[float] = None) -> List[ObservationFrame]:
+        """Runs all observers once and aggregates their signals into ObservationFrames."""
+        signals, latencies, errors = self.collect(timeout_s)
+        frames = aggregate_signals(signals, tolerance_ms, latencies, errors)
+        if not frames and errors:
+            frames = [ObservationFrame(raw_signals=[], observer_latency_ms=latencies, observer_errors=errors)]
+        return frames
+
+    def close(self):
+        """Shuts the worker threads down."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._running = {}
+
+    def __enter__(self) -> ObserverScheduler:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,70 +1,67 @@
-import hashlib
+import logging
 from pathlib import Path
-from datetime import datetime
+from typing import Optional
 import mss
 
-from aios.protocols.schema import RawSignal, ScreenshotData
+from aios.protocols.schema import RawSignal
+from aios.artifact_store import ArtifactStore
+from aios.observers.frame_dedup import FrameDeduplicator
+from aios.observers.artifact_writer import ArtifactWriter
+from aios.observers.screenshot_signal import build_screenshot_signal # Kept importable from here
 
-def capture_screenshot(artifact_dir: Path) -> RawSignal:
+logger = logging.getLogger(__name__)
+
+def capture_screenshot(
+    artifact_dir: Path,
+    deduplicator: Optional[FrameDeduplicator] = None,
+    image_format: str = "png",
+    writer: Optional[ArtifactWriter] = None,
+    artifact_store: Optional[ArtifactStore] = None,
+    run_id: Optional[str] = None
+) -> RawSignal:
     """
     Captures a screenshot of the primary monitor using MSS.
 
     Args:
         artifact_dir: The root directory to save artifacts in. A "screenshots"
                       subdirectory will be created here.
+        deduplicator: Optional FrameDeduplicator. If the grabbed frame is perceptually
+                      identical to the last emitted one, encoding and the disk write
+                      are skipped and the returned RawSignal references the previous
+                      artifact with `data.unchanged` set.
+        image_format: Artifact format: "png", "jpeg" (requires Pillow) or "raw" (BGRA).
+        writer: Optional ArtifactWriter. If given, encoding and writing happen on its
+                worker threads and this function returns as soon as the pixels are grabbed
+                (with an `artifact_store`, only the write; see `build_screenshot_signal`).
+        artifact_store: Optional ArtifactStore. If given, the artifact is stored (once) under
+                        its hash in the shared store instead of a timestamp-named file in
+                        `artifact_dir`, and referenced by `run_id`.
+        run_id: The run referencing the stored artifact.
 
     Returns:
         A populated RawSignal object containing the screenshot data and metadata.
     """
     try:
-        # 1. Define artifact path and ensure directory exists
-        screenshot_dir = artifact_dir / "screenshots"
-        screenshot_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Generate a unique filename
-        timestamp_str = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
-        file_path = screenshot_dir / f"{timestamp_str}.png"
-
-        # 2. Capture the screenshot
+        # 1. Capture the screenshot
         with mss.mss() as sct:
             # Get information of monitor 1
             monitor_info = sct.monitors[1]
             
             # Grab the data
             sct_img = sct.grab(monitor_info)
-            
-            # Save to the picture file
-            mss.tools.to_png(sct_img.rgb, sct_img.size, output=str(file_path))
-            print(f"Screenshot saved to {file_path}")
-
-        # 3. Calculate SHA256 hash
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            # Read and update hash string value in blocks of 4K
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        
-        artifact_hash = sha256_hash.hexdigest()
-        print(f"Artifact hash: {artifact_hash}")
 
-        # 4. Populate Pydantic models
-        screenshot_data = ScreenshotData(
-            format="png",
-            screen_size=(sct_img.width, sct_img.height)
+        # 2. Build the RawSignal from the grabbed BGRA pixels
+        return build_screenshot_signal(
+            raw=sct_img.raw,
+            size=(sct_img.width, sct_img.height),
+            artifact_dir=artifact_dir,
+            deduplicator=deduplicator,
+            image_format=image_format,
+            writer=writer,
+            artifact_store=artifact_store,
+            run_id=run_id
         )
 
-        raw_signal = RawSignal(
-            observer_id="screenshot_observer_v1",
-            artifact_path=str(file_path),
-            artifact_hash=artifact_hash,
-            data=screenshot_data
-        )
-
-        return raw_signal
-
     except Exception as e:
-        print(f"An error occurred during screenshot capture: {e}")
-        # In a real scenario, you might want to return a failed signal
-        # or raise the exception. For now, we print and return None.
+        logger.error("An error occurred during screenshot capture: %s", e)
         raise
-
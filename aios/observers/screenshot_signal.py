@@ -0,0 +1,124 @@
+import hashlib
+import logging
+from pathlib import Path
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from aios.protocols.schema import RawSignal, ScreenshotData
+from aios.artifact_store import ArtifactStore
+from aios.observers.frame_dedup import FrameDeduplicator
+from aios.observers.artifact_writer import ArtifactWriter, IMAGE_FORMAT_SUFFIXES, encode_frame
+
+logger = logging.getLogger(__name__)
+
+def build_screenshot_signal(
+    raw: bytes,
+    size: tuple[int, int],
+    artifact_dir: Path,
+    deduplicator: Optional[FrameDeduplicator] = None,
+    image_format: str = "png",
+    writer: Optional[ArtifactWriter] = None,
+    artifact_store: Optional[ArtifactStore] = None,
+    run_id: Optional[str] = None
+) -> RawSignal:
+    """
+    Turns a grabbed BGRA frame into a RawSignal and persists its artifact.
+
+    The artifact hash never requires reading the file back:
+    - synchronously (no `writer`), the frame is encoded in memory, hashed, and written once;
+      the hash is the SHA256 of the artifact file.
+    - asynchronously (with a `writer`), the hash is the SHA256 of the raw BGRA pixels and
+      encoding + writing are queued on the writer, so the signal is returned immediately.
+      For the "raw" format both hashes coincide.
+    - with a `writer` and an `artifact_store`, objects are keyed by the SHA256 of their
+      bytes, so the frame is encoded (for "raw", a no-op) and hashed before returning
+      and only the write is queued.
+
+    Args:
+        raw: The packed BGRA pixel buffer.
+        size: The (width, height) of the frame.
+        artifact_dir: The root directory to save artifacts in.
+        deduplicator: Optional FrameDeduplicator, see `capture_screenshot`.
+        image_format: Artifact format: "png", "jpeg" or "raw".
+        writer: Optional ArtifactWriter for off-thread encoding and writing.
+        artifact_store: Optional ArtifactStore, see `capture_screenshot`.
+        run_id: The run referencing the stored artifact.
+
+    Returns:
+        A populated RawSignal object.
+    """
+    if image_format not in IMAGE_FORMAT_SUFFIXES:
+        raise ValueError(f"Unsupported image format: '{image_format}'")
+    width, height = size
+
+    # Compare against the previous frame before paying for encoding
+    frame_hash = None
+    if deduplicator is not None:
+        frame = np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4) # BGRA
+        is_duplicate, frame_hash = deduplicator.check(frame)
+        if is_duplicate:
+            previous_signal = deduplicator.last_signal
+            logger.debug("Screenshot unchanged; reusing artifact %s", previous_signal.artifact_path)
+            if artifact_store is not None and run_id is not None:
+                artifact_store.add_ref(run_id, previous_signal.artifact_hash) # The reused object is this run's too
+            return RawSignal(
+                observer_id="screenshot_observer_v1",
+                artifact_path=previous_signal.artifact_path,
+                artifact_hash=previous_signal.artifact_hash,
+                data=ScreenshotData(
+                    format=previous_signal.data.format,
+                    screen_size=size,
+                    unchanged=True
+                )
+            )
+
+    suffix = IMAGE_FORMAT_SUFFIXES[image_format]
+    if artifact_store is None:
+        # Define artifact path and ensure directory exists
+        screenshot_dir = artifact_dir / "screenshots"
+        screenshot_dir.mkdir(parents=True, exist_ok=True)
+        timestamp_str = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
+        file_path = screenshot_dir / f"{timestamp_str}{suffix}"
+
+    if writer is not None:
+        # Hash now; write (and without a store, encode) on the writer's threads
+        raw = bytes(raw) # Detach from the grab buffer before handing it to another thread
+        if artifact_store is not None:
+            encoded = encode_frame(raw, size, image_format) # Content addressed: the key is the stored bytes' hash
+            artifact_hash = hashlib.sha256(encoded).hexdigest()
+            file_path = artifact_store.object_path(artifact_hash, suffix)
+            writer.submit_job(lambda: artifact_store.put(encoded, suffix, run_id=run_id, digest=artifact_hash))
+        else:
+            artifact_hash = hashlib.sha256(raw).hexdigest()
+            writer.submit(file_path, lambda: encode_frame(raw, size, image_format))
+        logger.debug("Screenshot queued for writing to %s", file_path)
+    else:
+        encoded = encode_frame(raw, size, image_format)
+        if artifact_store is not None:
+            artifact_hash, file_path = artifact_store.put(encoded, suffix, run_id=run_id)
+        else:
+            artifact_hash = hashlib.sha256(encoded).hexdigest()
+            with open(file_path, "wb") as f:
+                f.write(encoded)
+        logger.debug("Screenshot saved to %s", file_path)
+    logger.debug("Artifact hash: %s", artifact_hash)
+
+    # Populate Pydantic models
+    screenshot_data = ScreenshotData(
+        format=image_format,
+        screen_size=size
+    )
+
+    raw_signal = RawSignal(
+        observer_id="screenshot_observer_v1",
+        artifact_path=str(file_path),
+        artifact_hash=artifact_hash,
+        data=screenshot_data
+    )
+
+    if deduplicator is not None:
+        deduplicator.remember(frame_hash, raw_signal)
+
+    return raw_signal
@@ -1,5 +1,6 @@
 import hashlib
 import json
+import logging
 from pathlib import Path
 from datetime import datetime
 from typing import Any, Dict
@@ -10,9 +11,20 @@ from comtypes.gen import UIAutomationClient as uia
 import win32process # New import
 
 from aios.protocols.schema import RawSignal, UIATreeData # Added ScreenshotData for empty signal
+from aios.artifact_store import ArtifactStore
+from aios.observers.uia_walker import UIAProvider, IncrementalUIAWalker, walk_uia_tree_budgeted
+
+logger = logging.getLogger(__name__)
 
 # --- Helper Functions ---
 
+def initialize_uia_thread():
+    """
+    Initializes COM on the calling thread. Must run on every non-main thread that
+    captures UIA trees, e.g. as the ObserverScheduler's thread initializer.
+    """
+    comtypes.CoInitialize()
+
 def get_uia_properties(element: IUnknown) -> Dict[str, Any]:
     """Extracts serializable properties from a UI Automation element."""
     try:
@@ -59,12 +71,65 @@ def walk_uia_tree(element: IUnknown, uia_instance: IUnknown, max_depth: int) ->
             
         return node
     except (COMError, OSError) as e: # OSError can happen on stale elements
-        print(f"Error while walking UIA tree for element: {e}")
+        logger.debug("Error while walking UIA tree for element: %s", e)
         return None
 
+class ComUIAProvider(UIAProvider):
+    """UIAProvider backed by the Windows UI Automation COM API."""
+
+    def __init__(self, uia_instance: IUnknown):
+        self.uia_instance = uia_instance
+        self.walker = uia_instance.ControlViewWalker
+
+    def runtime_id(self, element: IUnknown) -> tuple:
+        try:
+            return tuple(element.GetRuntimeId())
+        except COMError:
+            return (id(element),) # Some providers expose no runtime id; never matches a cache entry
+
+    def bounding_rectangle(self, element: IUnknown) -> tuple[int, int, int, int]:
+        try:
+            rect = element.CurrentBoundingRectangle
+            return (rect.left, rect.top, rect.right - rect.left, rect.bottom - rect.top)
+        except COMError:
+            return (0, 0, 0, 0)
+
+    def children(self, element: IUnknown) -> list:
+        children = []
+        try:
+            child = self.walker.GetFirstChildElement(element)
+            while child:
+                children.append(child)
+                child = self.walker.GetNextSiblingElement(child)
+        except (COMError, OSError) as e: # OSError can happen on stale elements
+            logger.debug("Error while listing UIA children: %s", e)
+        return children
+
+    def properties(self, element: IUnknown) -> Dict[str, Any]:
+        return get_uia_properties(element)
+
+    def focus_path(self) -> set:
+        path = set()
+        try:
+            element = self.uia_instance.GetFocusedElement()
+            while element:
+                path.add(self.runtime_id(element))
+                element = self.walker.GetParentElement(element)
+        except (COMError, OSError, ValueError):
+            pass # No focus or a stale element: traverse without the focus hint
+        return path
+
+    def is_interactive(self, element: IUnknown) -> bool:
+        try:
+            return bool(element.CurrentIsKeyboardFocusable) and bool(element.CurrentIsEnabled)
+        except COMError:
+            return False
+
 # --- Main Observer Function ---
 
-def get_focused_uia_tree(artifact_dir: Path, max_depth: int = 5) -> RawSignal:
+def get_focused_uia_tree(artifact_dir: Path, max_depth: int = 5, artifact_store: ArtifactStore | None = None,
+                         run_id: str | None = None, walker: IncrementalUIAWalker | None = None,
+                         deadline_s: float | None = None, max_nodes: int | None = None) -> RawSignal:
     """
     Captures the UIA tree of the Notepad window (if found) and packages it
     into a RawSignal. Falls back to focused element if Notepad not found.
@@ -72,6 +137,17 @@ def get_focused_uia_tree(artifact_dir: Path, max_depth: int = 5) -> RawSignal:
     Args:
         artifact_dir: The root directory to save artifacts in.
         max_depth: The maximum depth to traverse the UIA tree.
+        artifact_store: Optional ArtifactStore. If given, the serialized tree is stored
+                        under its hash in the shared store, so identical trees are kept once.
+        run_id: The run referencing the stored artifact.
+        walker: Optional IncrementalUIAWalker kept across cycles; only subtrees whose
+                fingerprints changed since its previous walk are re-fetched.
+        deadline_s: Optional wall-clock budget for the walk, in seconds.
+        max_nodes: Optional maximum number of nodes to fetch.
+                   With either budget, the walk is best-first (focused, visible and
+                   interactive elements first) and may return a partial tree flagged
+                   as `truncated`; with a `walker` as well, it reuses the walker's
+                   cached properties for unchanged nodes.
 
     Returns:
         A RawSignal object containing the UIA tree data, or a dummy if no Notepad found.
@@ -90,20 +166,20 @@ def get_focused_uia_tree(artifact_dir: Path, max_depth: int = 5) -> RawSignal:
         if notepad_elements.Length > 0:
             target_element = notepad_elements.GetElement(0) # Get the first Notepad window
             focused_window_title = target_element.CurrentName or "Untitled - Notepad"
-            print(f"UIA Observer: Found Notepad window: '{focused_window_title}'")
+            logger.debug("UIA Observer: Found Notepad window: '%s'", focused_window_title)
         else:
-            print("UIA Observer: Notepad window not found by class name. Falling back to focused element.")
+            logger.debug("UIA Observer: Notepad window not found by class name. Falling back to focused element.")
             focused_element = uia_instance.GetFocusedElement()
             if focused_element:
                 target_element = focused_element
                 focused_window_title = target_element.CurrentName or "Unknown (No Focus)"
             else:
-                print("UIA Observer: No focused element found. Falling back to desktop root.")
+                logger.info("UIA Observer: No focused element found. Falling back to desktop root.")
                 target_element = uia_instance.GetRootElement()
                 focused_window_title = target_element.CurrentName or "Desktop Root"
 
         if not target_element:
-            print("UIA Observer: Could not find any target element. Returning empty RawSignal.")
+            logger.warning("UIA Observer: Could not find any target element. Returning empty RawSignal.")
             return RawSignal(
                 observer_id="uia_observer_v1_empty",
                 artifact_path="",
@@ -111,33 +187,42 @@ def get_focused_uia_tree(artifact_dir: Path, max_depth: int = 5) -> RawSignal:
                 data=UIATreeData(focused_window_title="Empty UIA Signal", tree_structure={})
             )
             
-        tree_structure = walk_uia_tree(target_element, uia_instance, max_depth)
+        walk_stats: Dict[str, Any] = {}
+        if deadline_s is not None or max_nodes is not None:
+            tree_structure, walk_stats = walk_uia_tree_budgeted(
+                ComUIAProvider(uia_instance), target_element, max_depth, deadline_s=deadline_s, max_nodes=max_nodes,
+                walker=walker)
+            logger.debug("UIA Observer: Budgeted walk stats: %s", walk_stats)
+        elif walker is not None:
+            tree_structure = walker.walk(ComUIAProvider(uia_instance), target_element, max_depth)
+            walk_stats = dict(walker.last_stats)
+            logger.debug("UIA Observer: Incremental walk stats: %s", walk_stats)
+        else:
+            tree_structure = walk_uia_tree(target_element, uia_instance, max_depth)
         if not tree_structure:
             raise RuntimeError("Failed to walk the UIA tree for target element.")
 
-        # Serialize and save artifact
-        uia_dir = artifact_dir / "uia_trees"
-        uia_dir.mkdir(parents=True, exist_ok=True)
-        timestamp_str = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
-        file_path = uia_dir / f"{timestamp_str}.json"
-        
-        json_str = json.dumps(tree_structure, indent=4)
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(json_str)
-        print(f"UIA tree saved to {file_path}")
-
-        # Calculate hash from the file
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        artifact_hash = sha256_hash.hexdigest()
-        print(f"Artifact hash: {artifact_hash}")
+        # Serialize and save artifact, hashing the in-memory bytes
+        json_bytes = json.dumps(tree_structure, indent=4).encode("utf-8")
+        if artifact_store is not None:
+            artifact_hash, file_path = artifact_store.put(json_bytes, ".json", run_id=run_id)
+        else:
+            uia_dir = artifact_dir / "uia_trees"
+            uia_dir.mkdir(parents=True, exist_ok=True)
+            timestamp_str = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
+            file_path = uia_dir / f"{timestamp_str}.json"
+            artifact_hash = hashlib.sha256(json_bytes).hexdigest()
+            with open(file_path, "wb") as f:
+                f.write(json_bytes)
+        logger.debug("UIA tree saved to %s", file_path)
+        logger.debug("Artifact hash: %s", artifact_hash)
 
         # Populate Pydantic models
         uia_data = UIATreeData(
             focused_window_title=focused_window_title,
-            tree_structure=tree_structure
+            tree_structure=tree_structure,
+            truncated=bool(walk_stats.get("truncated", False)),
+            walk_stats=walk_stats
         )
 
         raw_signal = RawSignal(
@@ -150,7 +235,7 @@ def get_focused_uia_tree(artifact_dir: Path, max_depth: int = 5) -> RawSignal:
         return raw_signal
 
     except Exception as e:
-        print(f"An error occurred during UIA tree capture: {e}. Returning empty RawSignal.")
+        logger.error("An error occurred during UIA tree capture: %s. Returning empty RawSignal.", e)
         # Return an empty RawSignal to allow the pipeline to continue
         return RawSignal(
             observer_id="uia_observer_v1_error",
@@ -0,0 +1,365 @@
+from __future__ import annotations
+import heapq
+import itertools
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Properties exposed for every node, in the order produced by `get_uia_properties`.
+UIA_NODE_PROPERTIES = (
+    "name", "control_type", "automation_id", "class_name", "process_id",
+    "is_enabled", "is_keyboard_focusable", "bounding_rectangle",
+)
+
+class UIAProvider(ABC):
+    """
+    Abstract source of UI Automation elements.
+
+    Separates the tree-walking and caching logic from COM, so that it can run
+    against recorded or synthetic trees on any platform.
+    """
+
+    @abstractmethod
+    def runtime_id(self, element: Any) -> Tuple:
+        """Returns the element's runtime id, which is stable while the element exists."""
+
+    @abstractmethod
+    def bounding_rectangle(self, element: Any) -> Tuple[int, int, int, int]:
+        """Returns the element's bounding rectangle as (left, top, width, height)."""
+
+    @abstractmethod
+    def children(self, element: Any) -> List[Any]:
+        """Returns the element's children in the control view, in order."""
+
+    @abstractmethod
+    def properties(self, element: Any) -> Dict[str, Any]:
+        """Returns the full, serializable property dict of the element (without children)."""
+
+    def fingerprint(self, element: Any, children: List[Any]) -> Tuple:
+        """A cheap summary of the element used to decide whether its cached subtree is stale."""
+        return (self.runtime_id(element), tuple(self.bounding_rectangle(element)), len(children))
+
+    def focus_path(self) -> Set[Tuple]:
+        """Runtime ids of the focused element and its ancestors. Used to prioritise traversal."""
+        return set()
+
+    def is_interactive(self, element: Any) -> bool:
+        """A cheap guess whether the user can interact with the element. Used to prioritise traversal."""
+        return False
+
+class InMemoryUIAProvider(UIAProvider):
+    """
+    Serves elements from nested UIA tree dicts, as stored in `uia_trees/*.json` artifacts.
+
+    Nodes may carry a "runtime_id" list; otherwise the dict's identity is used.
+    Calls are counted in `calls` for tests and benchmarks.
+    """
+
+    def __init__(self, *roots: Dict[str, Any]):
+        """
+        Args:
+            roots: Trees whose "has_keyboard_focus" markers define `focus_path()`.
+        """
+        self.calls: Counter = Counter()
+        self.roots = list(roots)
+
+    def runtime_id(self, element: Dict[str, Any]) -> Tuple:
+        self.calls["runtime_id"] += 1
+        return tuple(element["runtime_id"]) if "runtime_id" in element else (id(element),)
+
+    def bounding_rectangle(self, element: Dict[str, Any]) -> Tuple[int, int, int, int]:
+        self.calls["bounding_rectangle"] += 1
+        return tuple(element.get("bounding_rectangle", (0, 0, 0, 0)))
+
+    def children(self, element: Dict[str, Any]) -> List[Dict[str, Any]]:
+        self.calls["children"] += 1
+        return element.get("children", [])
+
+    def properties(self, element: Dict[str, Any]) -> Dict[str, Any]:
+        self.calls["properties"] += 1
+        return {key: element.get(key) for key in UIA_NODE_PROPERTIES}
+
+    def focus_path(self) -> Set[Tuple]:
+        """Nodes marked with "has_keyboard_focus" and their ancestors."""
+        path: Set[Tuple] = set()
+        roots = getattr(self, "roots", [])
+        for root in roots:
+            self._collect_focus_path(root, path)
+        return path
+
+    def _collect_focus_path(self, node: Dict[str, Any], path: Set[Tuple]) -> bool:
+        on_path = bool(node.get("has_keyboard_focus"))
+        for child in node.get("children", []):
+            on_path = self._collect_focus_path(child, path) or on_path
+        if on_path:
+            path.add(tuple(node["runtime_id"]) if "runtime_id" in node else (id(node),))
+        return on_path
+
+    def is_interactive(self, element: Dict[str, Any]) -> bool:
+        return bool(element.get("is_keyboard_focusable")) and bool(element.get("is_enabled", 1))
+
+def walk_provider_tree(provider: UIAProvider, element: Any, max_depth: int) -> Optional[Dict[str, Any]]:
+    """
+    Walks a UIA tree through a provider, fetching every node. Produces the same
+    nested dict format as `aios.observers.uia.walk_uia_tree`.
+    """
+    if element is None or max_depth <= 0:
+        return None
+    node = provider.properties(element)
+    node["children"] = []
+    for child in provider.children(element):
+        child_node = walk_provider_tree(provider, child, max_depth - 1)
+        if child_node:
+            node["children"].append(child_node)
+    return node
+
+class IncrementalUIAWalker:
+    """
+    Walks UIA trees incrementally across cycles.
+
+    The previous walk's nodes are cached by runtime id together with a cheap
+    fingerprint (runtime id, bounding rectangle, child count). On the next walk a
+    node whose fingerprint and remaining depth are unchanged is reused, skipping
+    the per-property round trips:
+
+    - by default only its own properties are reused and its children are still
+      fingerprinted, so structural changes anywhere in the tree are picked up;
+    - with `reuse_subtrees=True` its whole cached subtree is reused without
+      descending further. This is fastest but misses changes below a node whose
+      own fingerprint is intact, so it suits trees that change rarely.
+
+    Property changes that do not affect the fingerprint (e.g. a renamed element)
+    are picked up by the full re-fetch forced every `full_refresh_interval` walks.
+
+    Walks (including budgeted walks given this walker) hold `lock`, so a walker shared
+    across threads never has two walks mutating its cache at once.
+    """
+
+    def __init__(self, reuse_subtrees: bool = False, full_refresh_interval: int = 30):
+        self.reuse_subtrees = reuse_subtrees
+        self.full_refresh_interval = full_refresh_interval
+        # runtime id -> (fingerprint, remaining depth, node dict, child runtime ids)
+        self._cache: Dict[Tuple, Tuple[Tuple, int, Dict[str, Any], List[Tuple]]] = {}
+        self.walk_count = 0
+        self.last_stats: Dict[str, int] = {}
+        self.lock = threading.RLock()
+
+    def invalidate(self):
+        """Drops the cache so the next walk re-fetches every node."""
+        self._cache = {}
+
+    def walk(self, provider: UIAProvider, root: Any, max_depth: int) -> Optional[Dict[str, Any]]:
+        """
+        Walks the tree under `root` down to `max_depth` levels.
+
+        Returns:
+            The nested tree dict (or None), with per-walk counters in `last_stats`.
+        """
+        with self.lock:
+            previous_cache = self._begin_walk()
+            stats = Counter(nodes_visited=0, nodes_fetched=0, nodes_reused=0, subtrees_reused=0)
+            tree = self._walk(provider, root, max_depth, previous_cache, stats)[1]
+            self.last_stats = dict(stats)
+            return tree
+
+    def _begin_walk(self) -> Dict:
+        """Starts a walk: returns the previous walk's cache and starts an empty one."""
+        if self.full_refresh_interval and self.walk_count % self.full_refresh_interval == 0:
+            self.invalidate()
+        self.walk_count += 1
+        previous_cache, self._cache = self._cache, {}
+        return previous_cache
+
+    def _walk(self, provider: UIAProvider, element: Any, depth: int, previous_cache: Dict, stats: Counter
+              ) -> Tuple[Optional[Tuple], Optional[Dict[str, Any]]]:
+        """Returns (runtime id, node dict) for the element, or (None, None) beyond max depth."""
+        if element is None or depth <= 0:
+            return None, None
+        stats["nodes_visited"] += 1
+
+        children = provider.children(element)
+        fingerprint = provider.fingerprint(element, children)
+        runtime_id = fingerprint[0]
+        cached = previous_cache.get(runtime_id)
+        is_fresh = cached is not None and cached[0] == fingerprint and cached[1] == depth
+
+        if is_fresh and self.reuse_subtrees:
+            stats["subtrees_reused"] += 1
+            self._carry_over(runtime_id, previous_cache)
+            return runtime_id, cached[2]
+
+        if is_fresh:
+            stats["nodes_reused"] += 1
+            node = {key: value for key, value in cached[2].items() if key != "children"}
+        else:
+            stats["nodes_fetched"] += 1
+            node = provider.properties(element)
+        node["children"] = []
+        child_ids = []
+        for child in children:
+            child_id, child_node = self._walk(provider, child, depth - 1, previous_cache, stats)
+            if child_node:
+                node["children"].append(child_node)
+                child_ids.append(child_id)
+
+        self._cache[runtime_id] = (fingerprint, depth, node, child_ids)
+        return runtime_id, node
+
+    def _carry_over(self, runtime_id: Tuple, previous_cache: Dict):
+        """Copies a reused subtree's cache entries into the new cache."""
+        pending = [runtime_id]
+        while pending:
+            entry = previous_cache.get(pending.pop())
+            if entry is None:
+                continue
+            self._cache[entry[0][0]] = entry
+            pending.extend(entry[3])
+
+def walk_uia_tree_budgeted(
+    provider: UIAProvider,
+    root: Any,
+    max_depth: int,
+    deadline_s: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    clock: Callable[[], float] = time.perf_counter,
+    walker: Optional[IncrementalUIAWalker] = None
+) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Walks a UIA tree best-first within a wall-clock and node budget.
+
+    Elements are expanded in priority order: on the path to the focused element
+    first, then visible (non-empty bounding rectangle), then interactive, then
+    shallower. When the budget runs out the walk stops and the nodes fetched so
+    far form a well-formed partial tree: siblings keep their UIA order and every
+    node whose children were not all fetched is marked with `"truncated": True`.
+    The root is always fetched.
+
+    With a `walker`, the walk uses and refreshes the walker's fingerprint cache: a node
+    whose fingerprint is unchanged since the walker's previous walk (budgeted or not)
+    takes its properties from the cache instead of fetching them. Subtrees are never
+    reused wholesale, since a budgeted walk may stop anywhere; only nodes whose whole
+    subtree was walked are kept in the cache for later subtree reuse.
+
+    Args:
+        provider: The UIAProvider to read elements from.
+        root: The element to start from.
+        max_depth: The maximum depth to traverse.
+        deadline_s: Wall-clock budget in seconds, measured from the call.
+        max_nodes: Maximum number of nodes to fetch.
+        clock: Monotonic clock, injectable for tests.
+        walker: Optional IncrementalUIAWalker kept across cycles.
+
+    Returns:
+        A tuple of (tree dict or None, stats dict). `stats["truncated"]` tells whether
+        the budget cut the walk short; with a walker, `stats["nodes_reused"]` counts the
+        nodes (of `nodes_fetched`) whose properties came from its cache.
+    """
+    if walker is None:
+        return _walk_uia_tree_budgeted(provider, root, max_depth, deadline_s, max_nodes, clock, None)
+    with walker.lock:
+        return _walk_uia_tree_budgeted(provider, root, max_depth, deadline_s, max_nodes, clock, walker)
+
+def _walk_uia_tree_budgeted(provider: UIAProvider, root: Any, max_depth: int, deadline_s: Optional[float],
+                            max_nodes: Optional[int], clock: Callable[[], float],
+                            walker: Optional[IncrementalUIAWalker]) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    start = clock()
+    deadline = start + deadline_s if deadline_s is not None else None
+    focus_path = provider.focus_path()
+    stats: Dict[str, Any] = {"nodes_fetched": 0, "nodes_pending": 0, "truncated": False,
+                             "deadline_hit": False, "node_limit_hit": False, "elapsed_ms": 0.0}
+    if root is None or max_depth <= 0:
+        return None, stats
+    previous_cache: Dict = {}
+    walked: List[Tuple[Tuple, Dict[str, Any]]] = [] # (runtime id, node) in fetch order, for the walker
+    if walker is not None:
+        previous_cache = walker._begin_walk()
+        stats["nodes_reused"] = 0
+
+    sequence = itertools.count()
+    # Heap entries: (priority key, tie-breaker, element, depth, parent node, sibling index)
+    heap = [((0, 0, 0, 0), next(sequence), root, 1, None, 0)]
+    tree: Optional[Dict[str, Any]] = None
+    while heap:
+        if max_nodes is not None and stats["nodes_fetched"] >= max_nodes:
+            stats["node_limit_hit"] = True
+            break
+        if deadline is not None and tree is not None and clock() >= deadline:
+            stats["deadline_hit"] = True
+            break
+
+        _, _, element, depth, parent, sibling_index = heapq.heappop(heap)
+        try:
+            children = provider.children(element) if depth < max_depth else []
+            if walker is None:
+                node = provider.properties(element)
+            else:
+                fingerprint = provider.fingerprint(element, children)
+                remaining_depth = max_depth - depth + 1
+                cached = previous_cache.get(fingerprint[0])
+                if cached is not None and cached[0] == fingerprint and cached[1] == remaining_depth:
+                    node = {key: value for key, value in cached[2].items() if key != "children"}
+                    stats["nodes_reused"] += 1
+                else:
+                    node = provider.properties(element)
+        except Exception as e: # Stale elements disappear mid-walk
+            logger.debug("Budgeted UIA walk: Skipping element: %s", e)
+            continue
+        stats["nodes_fetched"] += 1
+        if walker is not None:
+            walker._cache[fingerprint[0]] = (fingerprint, remaining_depth, node, [])
+            walked.append((fingerprint[0], node))
+            if parent is not None:
+                walker._cache[parent["_runtime_id"]][3].append(fingerprint[0])
+            node["_runtime_id"] = fingerprint[0]
+        node["children"] = []
+        node["_sibling_index"] = sibling_index
+        node["_expected_children"] = len(children)
+        if parent is None:
+            tree = node
+        else:
+            parent["children"].append(node)
+
+        for index, child in enumerate(children):
+            rect = provider.bounding_rectangle(child)
+            priority = (
+                -int(provider.runtime_id(child) in focus_path),
+                -int(rect[2] > 0 and rect[3] > 0),
+                -int(provider.is_interactive(child)),
+                depth,
+            )
+            heapq.heappush(heap, (priority, next(sequence), child, depth + 1, node, index))
+
+    stats["nodes_pending"] = len(heap)
+    stats["truncated"] = bool(heap)
+    stats["elapsed_ms"] = (clock() - start) * 1000
+    if tree is not None:
+        _finalize_budgeted_tree(tree)
+    if walker is not None:
+        _drop_incomplete_subtrees(walker, walked)
+        walker.last_stats = dict(stats)
+    return tree, stats
+
+def _drop_incomplete_subtrees(walker: IncrementalUIAWalker, walked: List[Tuple[Tuple, Dict[str, Any]]]):
+    """Removes the cache entries of nodes with a truncated subtree, so they are never reused as a whole."""
+    complete: Dict[int, bool] = {}
+    for runtime_id, node in reversed(walked): # Children were fetched after their parents
+        complete[id(node)] = not node.get("truncated") and all(complete.get(id(child), False) for child in node["children"])
+        if not complete[id(node)]:
+            walker._cache.pop(runtime_id, None)
+
+def _finalize_budgeted_tree(tree: Dict[str, Any]):
+    """Restores sibling order, flags incomplete nodes and drops bookkeeping keys."""
+    pending = [tree]
+    while pending:
+        node = pending.pop()
+        node["children"].sort(key=lambda child: child["_sibling_index"])
+        if len(node["children"]) < node["_expected_children"]:
+            node["truncated"] = True
+        del node["_sibling_index"], node["_expected_children"]
+        node.pop("_runtime_id", None)
+        pending.extend(node["children"])
@@ -0,0 +1,219 @@
+from __future__ import annotations
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from aios.protocols.schema import ObservationEvent, RawSignal
+
+class DinoPerception(BaseModel):
+    """Structured result of one DinoObstacleDetector frame."""
+    obstacle_present: bool
+    distance_px: Optional[int] = None # From the dino's front edge to the obstacle's left edge
+    width_px: Optional[int] = None
+    height_px: Optional[int] = None
+    elevation_px: Optional[int] = None # Gap between the ground line and the obstacle's bottom (birds)
+    speed_px_s: Optional[float] = None # Approach speed, smoothed across frames
+    time_to_collision_s: Optional[float] = None
+    should_jump: bool = False
+    night_mode: bool = False
+    latency_ms: float = 0.0
+
+def _foreground_mask(gray: np.ndarray, background: int, threshold: int) -> np.ndarray:
+    """Marks pixels differing from the background by more than the threshold, comparing in uint8 without widening."""
+    low, high = np.uint8(max(0, background - threshold - 1)), np.uint8(min(255, background + threshold + 1))
+    return (gray <= low) | (gray >= high)
+
+def locate_ground_row(frame: np.ndarray, threshold: int = 40) -> int:
+    """
+    Finds the ground line of a Dino frame: the row with the most foreground pixels.
+
+    Args:
+        frame: A (H, W) or (H, W, C) uint8 frame of the game area.
+        threshold: Minimum absolute difference from the background to count as foreground.
+
+    Returns:
+        The row index of the ground line.
+    """
+    gray = frame[..., 1] if frame.ndim == 3 else frame
+    mask = _foreground_mask(gray, int(np.median(gray[0, ::8])), threshold)
+    return int(mask.sum(axis=1).argmax())
+
+class DinoObstacleDetector:
+    """
+    Detects Chrome Dino obstacles on raw screenshot arrays, vectorized with NumPy.
+
+    Each frame is reduced to a band of rows just above the ground line. The band is
+    thresholded against the background (estimated from its top row, so night mode
+    works), projected onto columns, and the first run of occupied columns in front of
+    the dino is taken as the next obstacle. Its approach speed is estimated from the
+    distance change between frames, giving a time to collision and a jump decision.
+    """
+
+    def __init__(
+        self,
+        ground_y: int,
+        dino_x_end: int = 70,
+        band_height: int = 50,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        threshold: int = 40,
+        min_column_pixels: int = 2,
+        gap_tolerance: int = 4,
+        jump_lead_s: float = 0.25,
+        min_jump_distance_px: int = 30,
+        max_jump_elevation_px: int = 20,
+        speed_smoothing: float = 0.5
+    ):
+        """
+        Args:
+            ground_y: Row of the ground line, relative to `region` (see `locate_ground_row`).
+            dino_x_end: Column of the dino's front edge; columns left of it are ignored.
+            band_height: Height of the row band above the ground line that is scanned.
+            region: Optional (left, top, width, height) of the game inside the frame; defaults to the whole frame.
+            threshold: Minimum absolute difference from the background to count as foreground.
+            min_column_pixels: Foreground pixels a column needs to count as occupied.
+            gap_tolerance: Empty columns allowed inside one obstacle (e.g. between cactus arms).
+            jump_lead_s: Jump when the time to collision drops to this value.
+            min_jump_distance_px: Jump at this distance even without a speed estimate.
+            max_jump_elevation_px: Obstacles floating higher than this (birds) are not jumped over.
+            speed_smoothing: Weight of the newest measurement in the speed estimate.
+        """
+        self.ground_y = ground_y
+        self.dino_x_end = dino_x_end
+        self.band_height = band_height
+        self.region = region
+        self.threshold = threshold
+        self.min_column_pixels = min_column_pixels
+        self.gap_tolerance = gap_tolerance
+        self.jump_lead_s = jump_lead_s
+        self.min_jump_distance_px = min_jump_distance_px
+        self.max_jump_elevation_px = max_jump_elevation_px
+        self.speed_smoothing = speed_smoothing
+        self.reset()
+
+    def reset(self):
+        """Forgets the tracking state (e.g. after a game restart)."""
+        self._last_distance: Optional[int] = None
+        self._last_timestamp: Optional[float] = None
+        self._speed: Optional[float] = None
+
+    def detect(self, frame: np.ndarray, timestamp_s: Optional[float] = None) -> DinoPerception:
+        """
+        Runs detection on one frame.
+
+        Args:
+            frame: A (H, W) or (H, W, C) uint8 frame, e.g. the raw `mss` BGRA buffer.
+                   The green channel is used as luminance, so the channel order does not matter.
+            timestamp_s: Capture time in seconds; defaults to now. Used for speed estimation.
+
+        Returns:
+            A DinoPerception.
+        """
+        start_time = time.perf_counter()
+        if timestamp_s is None:
+            timestamp_s = start_time
+
+        if self.region is not None:
+            left, top, width, height = self.region
+            frame = frame[top:top + height, left:left + width]
+        top_row = max(0, self.ground_y - self.band_height)
+        band = frame[top_row:self.ground_y, :, 1] if frame.ndim == 3 else frame[top_row:self.ground_y]
+
+        background = int(np.median(band[0, ::8]))
+        mask = _foreground_mask(band, background, self.threshold)
+        occupied = mask[:, self.dino_x_end:].sum(axis=0) >= self.min_column_pixels
+        columns = np.flatnonzero(occupied)
+        night_mode = bool(background < 128)
+
+        if columns.size == 0:
+            return DinoPerception(
+                obstacle_present=False,
+                speed_px_s=self._speed,
+                night_mode=night_mode,
+                latency_ms=(time.perf_counter() - start_time) * 1000
+            )
+
+        # The first obstacle ends at the first gap wider than gap_tolerance
+        gaps = np.flatnonzero(np.diff(columns) > self.gap_tolerance + 1)
+        first, last = int(columns[0]), int(columns[gaps[0]] if gaps.size else columns[-1])
+        rows = np.flatnonzero(mask[:, self.dino_x_end + first:self.dino_x_end + last + 1].any(axis=1))
+        band_rows = band.shape[0]
+        height_px = band_rows - int(rows[0])
+        elevation_px = band_rows - 1 - int(rows[-1])
+        distance_px = first
+
+        self._update_speed(distance_px, timestamp_s)
+        time_to_collision_s = distance_px / self._speed if self._speed else None
+        should_jump = elevation_px <= self.max_jump_elevation_px and (
+            distance_px <= self.min_jump_distance_px
+            or (time_to_collision_s is not None and time_to_collision_s <= self.jump_lead_s)
+        )
+
+        return DinoPerception(
+            obstacle_present=True,
+            distance_px=distance_px,
+            width_px=last - first + 1,
+            height_px=height_px,
+            elevation_px=elevation_px,
+            speed_px_s=self._speed,
+            time_to_collision_s=time_to_collision_s,
+            should_jump=should_jump,
+            night_mode=night_mode,
+            latency_ms=(time.perf_counter() - start_time) * 1000
+        )
+
+    def _update_speed(self, distance_px: int, timestamp_s: float):
+        """Updates the smoothed approach speed; a farther obstacle means a new one, so the speed is kept."""
+        if self._last_distance is not None and self._last_timestamp is not None:
+            dt = timestamp_s - self._last_timestamp
+            closed_px = self._last_distance - distance_px
+            if dt > 0 and closed_px > 0:
+                measured = closed_px / dt
+                if self._speed is None:
+                    self._speed = measured
+                else:
+                    self._speed += self.speed_smoothing * (measured - self._speed)
+        self._last_distance = distance_px
+        self._last_timestamp = timestamp_s
+
+    def observe(
+        self,
+        frame: np.ndarray,
+        timestamp_s: Optional[float] = None,
+        raw_signals: Optional[List[RawSignal]] = None
+    ) -> ObservationEvent:
+        """
+        Runs detection and wraps the result in an ObservationEvent, replacing the
+        Protocol LLM call for the Dino scenario.
+
+        Args:
+            frame: The frame to analyse (see `detect`).
+            timestamp_s: Capture time in seconds.
+            raw_signals: The raw signals the frame came from, if any.
+
+        Returns:
+            An ObservationEvent whose `perception` field holds the DinoPerception.
+        """
+        return perception_to_observation_event(self.detect(frame, timestamp_s), raw_signals)
+
+def perception_to_observation_event(perception: DinoPerception, raw_signals: Optional[List[RawSignal]] = None) -> ObservationEvent:
+    """Builds an ObservationEvent with human-readable summaries from a DinoPerception."""
+    if perception.obstacle_present:
+        ttc = f"{perception.time_to_collision_s * 1000:.0f} ms" if perception.time_to_collision_s is not None else "unknown"
+        ui_state_summary = (
+            f"Chrome Dino game running. Obstacle {perception.distance_px}px ahead "
+            f"({perception.width_px}x{perception.height_px}px, elevation {perception.elevation_px}px), "
+            f"time to collision {ttc}."
+        )
+    else:
+        ui_state_summary = "Chrome Dino game running. No obstacle ahead."
+    return ObservationEvent(
+        observation_id=str(uuid.uuid4()),
+        raw_signals=raw_signals or [],
+        ui_state_summary=ui_state_summary,
+        environment_state_summary=f"Local Dino detector ({perception.latency_ms:.3f} ms, {'night' if perception.night_mode else 'day'} mode).",
+        potential_intent="Play Chrome Dino Game.",
+        perception=perception.model_dump()
+    )
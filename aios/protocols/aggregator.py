@@ -0,0 +1,69 @@
+from __future__ import annotations
+import uuid
+from typing import Dict, List, Optional
+
+from pydantic import Field
+
+from aios.protocols.schema import AIOSBaseModel, RawSignal
+
+class ObservationFrame(AIOSBaseModel):
+    """
+    A set of RawSignals from different observers that were captured close enough in
+    time to describe the same moment (ARCHITECTURE.md §4.1 Aggregation).
+    """
+    frame_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    raw_signals: List[RawSignal]
+    skew_ms: float = 0.0 # Spread between the earliest and latest signal timestamps
+    observer_latency_ms: Dict[str, float] = Field(default_factory=dict) # Per-observer capture latency
+    observer_errors: Dict[str, str] = Field(default_factory=dict) # Observers that failed or timed out
+
+def aggregate_signals(
+    raw_signals: List[RawSignal],
+    tolerance_ms: float = 50.0,
+    observer_latency_ms: Optional[Dict[str, float]] = None,
+    observer_errors: Optional[Dict[str, str]] = None
+) -> List[ObservationFrame]:
+    """
+    Groups RawSignals into ObservationFrames by timestamp.
+
+    Signals are taken in time order; a new frame is started when a signal is more
+    than `tolerance_ms` after the first signal of the current frame, or when its
+    observer already contributed to the current frame.
+
+    Args:
+        raw_signals: Signals from one or more observer runs.
+        tolerance_ms: Maximum skew allowed within a frame.
+        observer_latency_ms: Optional per-observer latencies, attached to every frame.
+        observer_errors: Optional per-observer errors, attached to every frame.
+
+    Returns:
+        The frames, oldest first.
+    """
+    frames: List[ObservationFrame] = []
+    current: List[RawSignal] = []
+    for signal in sorted(raw_signals, key=lambda s: s.timestamp):
+        if current and (
+            (signal.timestamp - current[0].timestamp).total_seconds() * 1000 > tolerance_ms
+            or any(s.observer_id == signal.observer_id for s in current)
+        ):
+            frames.append(_make_frame(current, observer_latency_ms, observer_errors))
+            current = []
+        current.append(signal)
+    if current:
+        frames.append(_make_frame(current, observer_latency_ms, observer_errors))
+    return frames
+
+def _make_frame(signals: List[RawSignal], observer_latency_ms: Optional[Dict[str, float]],
+                observer_errors: Optional[Dict[str, str]]) -> ObservationFrame:
+    return ObservationFrame(
+        raw_signals=signals,
+        skew_ms=(signals[-1].timestamp - signals[0].timestamp).total_seconds() * 1000,
+        observer_latency_ms=dict(observer_latency_ms or {}),
+        observer_errors=dict(observer_errors or {})
+    )
+
+def select_primary_frame(frames: List[ObservationFrame]) -> Optional[ObservationFrame]:
+    """Returns the frame with the most signals, preferring the most recent on ties."""
+    if not frames:
+        return None
+    return max(reversed(frames), key=lambda frame: len(frame.raw_signals))
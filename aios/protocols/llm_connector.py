@@ -2,19 +2,31 @@ from __future__ import annotations
 import json
 from typing import List, Any, Dict
 from pydantic import ValidationError
-from datetime import datetime
+import logging
 import uuid
 import os
 
 from aios.protocols.schema import RawSignal, ObservationEvent, AIOSBaseModel, UIATreeData, ScreenshotData, LogData
-from aios.llm.llm_client import LLMClient
+from aios.backends import load_backend
+from aios.runtime.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# The LLM backend (openai, tenacity) is slow to import; it is resolved on first use by _llm_client_class().
+LLMClient = None
 
 def _search_uia_tree_for_process(tree: Dict[str, Any], class_name_to_find: str) -> bool:
     """
     Helper function to recursively search a UIA tree structure for a node with a specific class name.
+    Also accepts a FlatUIATree, which answers from its class name index in O(1).
     """
     if tree is None:
         return False
+    if not isinstance(tree, dict):
+        from aios.protocols.uia_tree import FlatUIATree # Imports numpy, so only when given a flat tree
+        if not isinstance(tree, FlatUIATree):
+            raise TypeError(f"Expected a UIA tree dict or a FlatUIATree, got {type(tree).__name__}.")
+        return len(tree.find_by_class_name(class_name_to_find)) > 0
     
     current_class_name = tree.get("class_name")
     # print(f"DEBUG: Searching for '{class_name_to_find}', current node class_name: '{current_class_name}'") # DEBUG
@@ -53,6 +65,48 @@ def _construct_prompt_from_raw_signals(raw_signals: List[RawSignal]) -> str:
         
     return "\n".join(prompt_parts)
 
+# Warm LLM clients, reused across calls so a long-lived process keeps its HTTP connection pool.
+# Keyed by API key and base URL (OPENAI_BASE_URL, read by the client when it is created).
+_llm_clients: Dict[tuple, Any] = {}
+# Clients installed with register_llm_client(), by API key; they take precedence and need no LLM backend.
+_registered_llm_clients: Dict[str, Any] = {}
+
+def _llm_client_class():
+    global LLMClient
+    if LLMClient is None:
+        LLMClient = load_backend("llm").LLMClient
+    return LLMClient
+
+def _get_llm_client(llm_api_key: str) -> Any:
+    """Returns the cached LLMClient for an API key, creating it on first use."""
+    registered = _registered_llm_clients.get(llm_api_key)
+    if registered is not None:
+        return registered
+    key = (llm_api_key, os.environ.get("OPENAI_BASE_URL"))
+    client = _llm_clients.get(key)
+    if client is None:
+        client = _llm_clients[key] = _llm_client_class()(api_key=llm_api_key)
+    return client
+
+def clear_llm_clients():
+    """Drops the cached LLMClients (not registered ones), e.g. after a test patched LLMClient."""
+    _llm_clients.clear()
+
+def register_llm_client(llm_api_key: str, client: Any):
+    """
+    Makes all LLM calls made with `llm_api_key` go through `client` (anything with
+    LLMClient's `generate()`), e.g. a SharedLLMClient used by many sessions.
+    """
+    _registered_llm_clients[llm_api_key] = client
+
+def unregister_llm_client(llm_api_key: str, client: Any = None):
+    """
+    Undoes `register_llm_client`, so calls with `llm_api_key` use the default LLMClient
+    again. If `client` is given, only that client is removed (not one registered since).
+    """
+    if client is None or _registered_llm_clients.get(llm_api_key) is client:
+        _registered_llm_clients.pop(llm_api_key, None)
+
 def _load_prompt_from_file(file_path: str) -> str:
     """Loads a prompt from a given file path."""
     # Construct the full path relative to the current script's directory
@@ -80,29 +134,32 @@ def request_protocol_llm_observation(
     Returns:
         An ObservationEvent object.
     """
-    current_timestamp = datetime.utcnow()
     observation_id = str(uuid.uuid4())
     
-    print(f"[{current_timestamp.isoformat()}] LLM Connector: Requesting Protocol LLM for observation...")
+    logger.debug("LLM Connector: Requesting Protocol LLM for observation %s...", observation_id)
 
-    llm_client = LLMClient(api_key=llm_api_key)
+    llm_client = _get_llm_client(llm_api_key)
     
     # Load the system prompt
-    system_prompt = _load_prompt_from_file(f"prompts/{protocol_llm_prompt_filename}")
-    user_prompt = _construct_prompt_from_raw_signals(raw_signals)
-    if user_instruction:
-        user_prompt += f"\\n\\nUser Instruction: {user_instruction}" # Add user instruction to prompt
+    with span("prompt.build", llm="protocol") as prompt_span:
+        system_prompt = _load_prompt_from_file(f"prompts/{protocol_llm_prompt_filename}")
+        user_prompt = _construct_prompt_from_raw_signals(raw_signals)
+        if user_instruction:
+            user_prompt += f"\\n\\nUser Instruction: {user_instruction}" # Add user instruction to prompt
+        prompt_span.set(prompt_chars=len(system_prompt) + len(user_prompt))
     
     from aios.protocols.schema import ProtocolLLMOutput # Import here to avoid circular dependency
 
     try:
-        llm_output_dict = llm_client.generate(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            json_schema=ProtocolLLMOutput.model_json_schema() # Pass the schema for LLM to adhere to
-        )
+        with span("llm.generate", llm="protocol", model=getattr(llm_client, "model_name", "")):
+            llm_output_dict = llm_client.generate(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                json_schema=ProtocolLLMOutput.model_json_schema() # Pass the schema for LLM to adhere to
+            )
         
-        protocol_llm_output = ProtocolLLMOutput.model_validate(llm_output_dict)
+        with span("llm.validate", llm="protocol"):
+            protocol_llm_output = ProtocolLLMOutput.model_validate(llm_output_dict)
 
         llm_observation_event = ObservationEvent(
             observation_id=observation_id,
@@ -114,14 +171,30 @@ def request_protocol_llm_observation(
         return llm_observation_event
 
     except ValidationError as e:
-        print(f"LLM API response failed schema validation: {e}")
+        logger.error("LLM API response failed schema validation: %s", e)
         raise RuntimeError(f"LLM response invalid: {e}")
     except Exception as e:
-        print(f"LLM API call failed: {e}")
+        logger.error("LLM API call failed: %s", e)
         raise RuntimeError(f"LLM API call failed: {e}")
 
 from aios.protocols.schema import ActionPlan # Import here to avoid circular dependency
 
+def _construct_core_agent_user_prompt(observation_event: ObservationEvent, graph_memory_summary: str,
+                                      user_instruction: str) -> str:
+    """Constructs the user prompt for the Core Agent LLM."""
+    return f"""
+    Current Observation:
+    {observation_event.model_dump_json(indent=2)}
+
+    Graph Memory Summary:
+    {graph_memory_summary}
+
+    User Instruction:
+    {user_instruction}
+
+    Based on the above, provide a structured ActionPlan.
+    """
+
 def request_core_agent_llm_action(
     observation_event: ObservationEvent,
     graph_memory_summary: str,
@@ -132,36 +205,92 @@ def request_core_agent_llm_action(
     """
     Requests the Core Agent LLM to generate an ActionPlan.
     """
-    print(f"LLM Connector: Requesting Core Agent LLM for action plan...")
-    llm_client = LLMClient(api_key=llm_api_key)
+    logger.debug("LLM Connector: Requesting Core Agent LLM for action plan...")
+    llm_client = _get_llm_client(llm_api_key)
     
-    system_prompt = _load_prompt_from_file(f"prompts/{core_llm_prompt_filename}")
+    with span("prompt.build", llm="core") as prompt_span:
+        system_prompt = _load_prompt_from_file(f"prompts/{core_llm_prompt_filename}")
+        user_prompt = _construct_core_agent_user_prompt(observation_event, graph_memory_summary, user_instruction)
+        prompt_span.set(prompt_chars=len(system_prompt) + len(user_prompt))
     
-    # Construct user prompt for Core Agent LLM
-    user_prompt = f"""
-    Current Observation:
-    {observation_event.model_dump_json(indent=2)}
+    try:
+        with span("llm.generate", llm="core", model=getattr(llm_client, "model_name", "")):
+            llm_output_dict = llm_client.generate(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                json_schema=ActionPlan.model_json_schema() # Pass the schema for LLM to adhere to
+            )
+        with span("llm.validate", llm="core"):
+            return ActionPlan.model_validate(llm_output_dict)
+    except ValidationError as e:
+        logger.error("Core Agent LLM response failed schema validation: %s", e)
+        raise RuntimeError(f"Core Agent LLM response invalid: {e}")
+    except Exception as e:
+        logger.error("Core Agent LLM call failed: %s", e)
+        raise RuntimeError(f"Core Agent LLM call failed: {e}")
 
-    Graph Memory Summary:
-    {graph_memory_summary}
 
-    User Instruction:
-    {user_instruction}
+from aios.protocols.schema import FusedLLMOutput # Import here to avoid circular dependency
 
-    Based on the above, provide a structured ActionPlan.
+def request_fused_llm_observation_action(
+    raw_signals: List[RawSignal],
+    graph_memory_summary: str,
+    user_instruction: str,
+    llm_api_key: str,
+    fused_llm_prompt_filename: str
+) -> tuple[ObservationEvent, ActionPlan]:
     """
-    
+    Requests a single fused LLM call that both parses the raw signals and decides
+    the next action, replacing the sequential Protocol LLM + Core Agent LLM round trips.
+
+    Args:
+        raw_signals: A list of RawSignal objects from various observers.
+        graph_memory_summary: A textual summary of the Interaction Graph.
+        user_instruction: The instruction from the user.
+        llm_api_key: The API key for the LLM.
+        fused_llm_prompt_filename: Filename of the system prompt for the fused LLM.
+
+    Returns:
+        A tuple of (ObservationEvent, ActionPlan), emitted separately by the caller so
+        the event stream keeps the same shape as the two-call pipeline.
+    """
+    observation_id = str(uuid.uuid4())
+    logger.debug("LLM Connector: Requesting fused Protocol+Core LLM for observation %s...", observation_id)
+
+    llm_client = _get_llm_client(llm_api_key)
+
+    with span("prompt.build", llm="fused") as prompt_span:
+        system_prompt = _load_prompt_from_file(f"prompts/{fused_llm_prompt_filename}")
+        user_prompt = _construct_prompt_from_raw_signals(raw_signals)
+        user_prompt += f"\n\nObservation ID: {observation_id}"
+        user_prompt += f"\n\nGraph Memory Summary:\n{graph_memory_summary}"
+        if user_instruction:
+            user_prompt += f"\n\nUser Instruction: {user_instruction}"
+        prompt_span.set(prompt_chars=len(system_prompt) + len(user_prompt))
+
     try:
-        llm_output_dict = llm_client.generate(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            json_schema=ActionPlan.model_json_schema() # Pass the schema for LLM to adhere to
-        )
-        return ActionPlan.model_validate(llm_output_dict)
+        with span("llm.generate", llm="fused", model=getattr(llm_client, "model_name", "")):
+            llm_output_dict = llm_client.generate(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                json_schema=FusedLLMOutput.model_json_schema()
+            )
+        with span("llm.validate", llm="fused"):
+            fused_output = FusedLLMOutput.model_validate(llm_output_dict)
     except ValidationError as e:
-        print(f"Core Agent LLM response failed schema validation: {e}")
-        raise RuntimeError(f"Core Agent LLM response invalid: {e}")
+        logger.error("Fused LLM response failed schema validation: %s", e)
+        raise RuntimeError(f"Fused LLM response invalid: {e}")
     except Exception as e:
-        print(f"Core Agent LLM call failed: {e}")
-        raise RuntimeError(f"Core Agent LLM call failed: {e}")
+        logger.error("Fused LLM call failed: %s", e)
+        raise RuntimeError(f"Fused LLM call failed: {e}")
 
+    observation_event = ObservationEvent(
+        observation_id=observation_id,
+        raw_signals=raw_signals,
+        ui_state_summary=fused_output.ui_state_summary,
+        environment_state_summary="Not explicitly provided by FusedLLM",
+        potential_intent=fused_output.intent
+    )
+    # The LLM cannot be trusted to echo the id back, so link the plan explicitly.
+    action_plan = fused_output.action_plan.model_copy(update={"origin_observation_id": observation_id})
+    return observation_event, action_plan
@@ -14,18 +14,23 @@ class AIOSBaseModel(BaseModel):
 # --- Observer Schemas (Raw Signals) ---
 class ScreenshotData(BaseModel):
     """Data specific to a screenshot raw signal."""
-    format: Literal["png", "jpeg"] = "png"
+    format: Literal["png", "jpeg", "raw"] = "png" # "raw" is the packed BGRA buffer as grabbed
     screen_size: tuple[int, int]
+    unchanged: bool = False # True if the frame matched the previous one and reuses its artifact
 
 class UIATreeData(BaseModel):
     """Data specific to a UIA tree raw signal."""
     focused_window_title: str
     tree_structure: Dict[str, Any] # A nested dict representing the UIA tree
+    truncated: bool = False # True if a time/node budget cut the walk short
+    walk_stats: Dict[str, Any] = Field(default_factory=dict) # Walker statistics, e.g. nodes fetched and elapsed time
 
 class LogData(BaseModel):
     """Data specific to a log tail raw signal."""
     log_source: str # e.g., the path to the tailed file
     new_lines: List[str]
+    start_offset: int = 0 # Byte offset in log_source where new_lines start
+    end_offset: int = 0 # Byte offset just after the last line in new_lines
 
 class RawSignal(AIOSBaseModel):
     """A single raw signal from an observer."""
@@ -52,6 +57,7 @@ class ObservationEvent(AIOSBaseModel):
     ui_state_summary: str
     environment_state_summary: str
     potential_intent: str
+    perception: Dict[str, Any] = Field(default_factory=dict) # Structured output of local perception modules, e.g. obstacle distance
 
 # --- Graph Memory Schema ---
 class GraphUpdate(AIOSBaseModel):
@@ -87,6 +93,18 @@ class ActionPlan(AIOSBaseModel):
     constraints: Dict[str, Any] = Field(default_factory=dict)
     dry_run: bool = False
 
+# --- Fused Protocol1 + Agent Schema ---
+class FusedLLMOutput(BaseModel):
+    """
+    The structured output expected from the fused perception+decision LLM call.
+    Carries the ProtocolLLMOutput fields together with the ActionPlan, so one
+    round trip replaces the Protocol LLM and Core Agent LLM calls.
+    """
+    intent: str
+    ui_state_summary: str
+    confidence: float = Field(..., ge=0.0, le=1.0)
+    action_plan: ActionPlan
+
 # --- Actuator Schema ---
 class Receipt(AIOSBaseModel):
     """A receipt returned by an Actuator after executing an action."""
@@ -95,15 +113,25 @@ class Receipt(AIOSBaseModel):
     message: str
     latency_ms: float
 
+# --- Deadline Schema ---
+class DeadlineMiss(AIOSBaseModel):
+    """Records a cycle stage that overran its share of the cycle budget or degraded to stay within it."""
+    cycle_id: str
+    stage: str # e.g. "observe", "protocol1", "agent", "protocol2", "actuator"
+    budget_ms: float
+    elapsed_ms: float
+    degradation: str = "none" # e.g. "truncated_uia", "cached_decision", "no_action"
+
 # --- Event Stream Wrapper ---
 class EventType(str, Enum):
     OBSERVATION = "OBSERVATION"
     ACTION = "ACTION"
     RECEIPT = "RECEIPT"
     GRAPH_UPDATE = "GRAPH_UPDATE" # ADDED
+    DEADLINE_MISS = "DEADLINE_MISS"
 
 class Event(AIOSBaseModel):
     """A generic wrapper for any event in the system's JSONL log."""
     event_id: str
     event_type: EventType
-    payload: Union[ObservationEvent, ActionPlan, Receipt, GraphUpdate] # ADDED GraphUpdate
+    payload: Union[ObservationEvent, ActionPlan, Receipt, GraphUpdate, DeadlineMiss] # ADDED GraphUpdate
@@ -0,0 +1,191 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+# Standard node keys stored in columns; anything else is kept per node in `extras`.
+_STRING_COLUMNS = ("name", "automation_id", "class_name")
+_INT_COLUMNS = ("control_type", "process_id", "is_enabled", "is_keyboard_focusable")
+_INT_DTYPES = {"control_type": np.int32, "process_id": np.int32, "is_enabled": np.int8, "is_keyboard_focusable": np.int8}
+_INT_RANGES = {column: (np.iinfo(dtype).min, np.iinfo(dtype).max) for column, dtype in _INT_DTYPES.items()}
+_RECT_RANGE = (np.iinfo(np.int32).min, np.iinfo(np.int32).max)
+_STANDARD_KEYS = _STRING_COLUMNS + _INT_COLUMNS + ("bounding_rectangle", "children")
+# Bit per standard key in `FlatUIATree.present`, so missing keys are not invented by to_dict()
+_KEY_BITS = {key: 1 << i for i, key in enumerate(_STANDARD_KEYS)}
+
+class StringTable:
+    """Interns strings, mapping each distinct value to a small integer id."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+    def lookup(self, value: str) -> Optional[int]:
+        """Returns the id of `value`, or None if it was never interned."""
+        return self._ids.get(value)
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+class FlatUIATree:
+    """
+    A compact struct-of-arrays representation of a UIA tree (`UIATreeData.tree_structure`).
+
+    Nodes are numbered in pre-order (node 0 is the root). Topology is kept in the
+    `parent`, `first_child` and `next_sibling` int32 arrays (-1 for none), strings
+    are interned in one shared StringTable, and bounding rectangles live in an
+    (N, 4) int32 array. Nodes can be found by class name or automation id in O(1)
+    through prebuilt indexes, and `to_dict()` restores the nested dict form.
+
+    Conversion is lossless for JSON-shaped trees: values that do not fit their
+    column (e.g. None, bools, non-standard keys) are kept verbatim per node in
+    `extras`, and bounding rectangles are returned as lists, as in the artifacts.
+    """
+
+    def __init__(self, size: int):
+        self.strings = StringTable()
+        self.parent = np.full(size, -1, dtype=np.int32)
+        self.first_child = np.full(size, -1, dtype=np.int32)
+        self.next_sibling = np.full(size, -1, dtype=np.int32)
+        self.bounding_rectangles = np.zeros((size, 4), dtype=np.int32)
+        self.present = np.zeros(size, dtype=np.uint16) # Bitmask of standard keys present per node
+        self.string_ids = {column: np.full(size, -1, dtype=np.int32) for column in _STRING_COLUMNS} # -1: absent
+        self.int_values = {column: np.zeros(size, dtype=_INT_DTYPES[column]) for column in _INT_COLUMNS}
+        self.extras: Dict[int, Dict[str, Any]] = {} # Non-standard keys, e.g. runtime_id
+        self._index: Dict[str, Dict[int, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    @classmethod
+    def from_dict(cls, tree: Dict[str, Any]) -> FlatUIATree:
+        """Flattens a nested UIA tree dict. An empty dict yields an empty tree."""
+        if not tree:
+            return cls(0)
+        flat = cls(_count_nodes(tree))
+        next_id = 0
+        stack = [(tree, -1)] # (node dict, parent id); children pushed in reverse to keep pre-order
+        last_child: Dict[int, int] = {}
+        while stack:
+            node, parent_id = stack.pop()
+            node_id, next_id = next_id, next_id + 1
+
+            flat.parent[node_id] = parent_id
+            if parent_id >= 0:
+                previous = last_child.get(parent_id)
+                if previous is None:
+                    flat.first_child[parent_id] = node_id
+                else:
+                    flat.next_sibling[previous] = node_id
+                last_child[parent_id] = node_id
+
+            present = 0
+            extras = {}
+            for key, value in node.items():
+                if key in _STRING_COLUMNS and type(value) is str:
+                    flat.string_ids[key][node_id] = flat.strings.intern(value)
+                elif key in _INT_COLUMNS and type(value) is int and _INT_RANGES[key][0] <= value <= _INT_RANGES[key][1]:
+                    flat.int_values[key][node_id] = value
+                elif key == "bounding_rectangle" and _is_int32_rectangle(value):
+                    flat.bounding_rectangles[node_id] = value
+                elif key == "children" and type(value) is list:
+                    pass
+                else:
+                    extras[key] = value
+                    continue
+                present |= _KEY_BITS[key]
+            flat.present[node_id] = present
+            if extras:
+                flat.extras[node_id] = extras
+
+            for child in reversed(_children(node)):
+                stack.append((child, node_id))
+        flat._build_indexes()
+        return flat
+
+    def _build_indexes(self):
+        for column in ("class_name", "automation_id"):
+            ids = self.string_ids[column]
+            order = np.flatnonzero(ids >= 0) # Nodes without the column are not indexed
+            order = order[np.argsort(ids[order], kind="stable")]
+            values, starts = np.unique(ids[order], return_index=True)
+            groups = np.split(order.astype(np.int32), starts[1:])
+            self._index[column] = dict(zip(values.tolist(), groups))
+
+    def _find(self, column: str, value: str) -> np.ndarray:
+        string_id = self.strings.lookup(value)
+        if string_id is None:
+            return np.empty(0, dtype=np.int32)
+        return self._index[column].get(string_id, np.empty(0, dtype=np.int32))
+
+    def find_by_class_name(self, class_name: str) -> np.ndarray:
+        """Returns the ids (in pre-order) of all nodes with the given class name."""
+        return self._find("class_name", class_name)
+
+    def find_by_automation_id(self, automation_id: str) -> np.ndarray:
+        """Returns the ids (in pre-order) of all nodes with the given automation id."""
+        return self._find("automation_id", automation_id)
+
+    def children(self, node_id: int) -> Iterator[int]:
+        """Iterates over the ids of a node's children, in order."""
+        child = int(self.first_child[node_id])
+        while child >= 0:
+            yield child
+            child = int(self.next_sibling[child])
+
+    def node(self, node_id: int) -> Dict[str, Any]:
+        """Returns the properties of one node, without children."""
+        present = int(self.present[node_id])
+        node: Dict[str, Any] = {}
+        for column in _STRING_COLUMNS:
+            if present & _KEY_BITS[column]:
+                node[column] = self.strings.strings[self.string_ids[column][node_id]]
+        for column in _INT_COLUMNS:
+            if present & _KEY_BITS[column]:
+                node[column] = int(self.int_values[column][node_id])
+        if present & _KEY_BITS["bounding_rectangle"]:
+            node["bounding_rectangle"] = self.bounding_rectangles[node_id].tolist()
+        node.update(self.extras.get(node_id, {}))
+        return node
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Restores the nested dict form accepted by `UIATreeData.tree_structure`."""
+        if len(self) == 0:
+            return {}
+        nodes = [self.node(node_id) for node_id in range(len(self))]
+        has_children = (self.present & _KEY_BITS["children"]) != 0
+        for node_id in np.flatnonzero(has_children).tolist():
+            nodes[node_id]["children"] = []
+        for node_id in range(1, len(self)): # Pre-order keeps siblings in order
+            nodes[self.parent[node_id]]["children"].append(nodes[node_id])
+        return nodes[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the arrays and the string table."""
+        arrays = [self.parent, self.first_child, self.next_sibling, self.bounding_rectangles, self.present,
+                  *self.string_ids.values(), *self.int_values.values()]
+        return sum(a.nbytes for a in arrays) + sum(len(s.encode("utf-8")) + 49 for s in self.strings.strings)
+
+def _count_nodes(tree: Dict[str, Any]) -> int:
+    count, stack = 0, [tree]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(_children(node))
+    return count
+
+def _children(node: Dict[str, Any]) -> List[Dict[str, Any]]:
+    children = node.get("children") or []
+    return children if type(children) is list else [] # Anything else is kept in `extras`
+
+def _is_int32_rectangle(value: Any) -> bool:
+    return (isinstance(value, (list, tuple)) and len(value) == 4
+            and all(type(v) is int and _RECT_RANGE[0] <= v <= _RECT_RANGE[1] for v in value))
@@ -0,0 +1,198 @@
+"""
+Crash-safe checkpoints of a run's live loop state, and fast restart.
+
+A checkpoint holds the GraphMemory (including the previous observation), the
+decision cache, caller extras, and the byte offset of the event log it reflects.
+Restoring loads the newest intact checkpoint and replays only the event-log tail
+written after it. A torn last line (a crash mid-write) is detected and cut off,
+so appending can safely continue; invalid lines elsewhere are skipped, not cut.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from aios.memory.graph import GraphMemory
+from aios.protocols.schema import ActionPlan, Event, EventType, GraphUpdate, ObservationEvent
+from aios.runtime.deadline import DecisionCache
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+def _atomic_write(path: Path, data: bytes):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def read_event_tail(event_log_path: Path, offset: int = 0, repair: bool = True) -> Tuple[List[Event], int, int]:
+    """
+    Reads the events appended to a JSONL event log after `offset`.
+
+    An unterminated last line, or a last line that does not parse, is what a crash
+    during a write leaves behind; with `repair`, the file is truncated before it, so
+    later appends start on a clean line. A line that does not parse but has intact
+    lines after it is not a torn write: it is skipped with a warning and kept on disk.
+
+    Returns:
+        A tuple of (events, offset after the last intact line, number of torn bytes dropped).
+    """
+    if not event_log_path.exists():
+        return [], 0, 0
+    with open(event_log_path, "rb") as f:
+        f.seek(offset)
+        tail = f.read()
+
+    events: List[Event] = []
+    good_end = 0
+    position = 0
+    skipped = 0
+    while position < len(tail):
+        newline = tail.find(b"\n", position)
+        if newline < 0:
+            break # Unterminated last line
+        line = tail[position:newline]
+        if line.strip():
+            try:
+                events.append(Event.model_validate_json(line))
+            except ValidationError:
+                if not tail[newline + 1:].strip():
+                    break # Unparsable last line
+                skipped += 1
+        position = newline + 1
+        good_end = position
+
+    if skipped:
+        logger.warning("Checkpoint: Skipped %d invalid lines in the middle of %s.", skipped, event_log_path)
+
+    torn_bytes = len(tail) - good_end
+    if torn_bytes and repair:
+        with open(event_log_path, "r+b") as f:
+            f.truncate(offset + good_end)
+        logger.warning("Checkpoint: Dropped %d torn bytes from the end of %s.", torn_bytes, event_log_path)
+    return events, offset + good_end, torn_bytes
+
+class CheckpointManager:
+    """
+    Writes and restores checkpoints of a run directory's loop state.
+
+    The newest checkpoint is "checkpoint.json" and the one before it is kept as
+    "checkpoint.prev.json". Each carries a SHA-256 of its state, so a damaged file
+    is detected and the previous one is used instead.
+    """
+
+    def __init__(self, run_dir: Path | str, event_log_name: str = "events.jsonl"):
+        self.run_dir = Path(run_dir)
+        self.event_log_path = self.run_dir / event_log_name
+        self.path = self.run_dir / "checkpoint.json"
+        self.prev_path = self.run_dir / "checkpoint.prev.json"
+
+    def save(self, graph: GraphMemory, decision_cache: Optional[DecisionCache] = None,
+             extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Checkpoints the state together with the current end of the event log.
+
+        Returns:
+            The checkpoint's metadata (offset, sizes, timing).
+        """
+        start = time.perf_counter()
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        state = {
+            "graph": graph.state_dict(),
+            "decision_cache": decision_cache.state_dict() if decision_cache is not None else None,
+            "extra": extra or {},
+        }
+        state_json = json.dumps(state, sort_keys=True)
+        event_log_offset = self.event_log_path.stat().st_size if self.event_log_path.exists() else 0
+        checkpoint = {
+            "version": CHECKPOINT_VERSION,
+            "created_at": time.time(),
+            "event_log_offset": event_log_offset,
+            "state_sha256": hashlib.sha256(state_json.encode("utf-8")).hexdigest(),
+            "state": state,
+        }
+        if self.path.exists():
+            os.replace(self.path, self.prev_path)
+        _atomic_write(self.path, json.dumps(checkpoint).encode("utf-8"))
+        return {"event_log_offset": event_log_offset, "bytes": self.path.stat().st_size,
+                "elapsed_ms": (time.perf_counter() - start) * 1000}
+
+    def _load(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            state_json = json.dumps(checkpoint["state"], sort_keys=True)
+            if checkpoint.get("version") != CHECKPOINT_VERSION \
+                    or hashlib.sha256(state_json.encode("utf-8")).hexdigest() != checkpoint["state_sha256"]:
+                raise ValueError("checksum or version mismatch")
+            return checkpoint
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning("Checkpoint: Ignoring damaged checkpoint %s: %s", path, e)
+            return None
+
+    def restore(self, graph: GraphMemory, decision_cache: Optional[DecisionCache] = None) -> Dict[str, Any]:
+        """
+        Restores `graph` and `decision_cache` from the newest intact checkpoint, then
+        replays the event log written after it. Without a checkpoint, the whole log is replayed.
+
+        Replay applies GRAPH_UPDATE events to the graph, makes the last OBSERVATION the
+        previous observation, and re-caches each ACTION for the observation it answers.
+
+        Returns:
+            Restore metadata: which checkpoint was used, events replayed, torn bytes dropped,
+            the caller's extras and the elapsed time.
+        """
+        start = time.perf_counter()
+        checkpoint, source = self._load(self.path), "checkpoint.json"
+        if checkpoint is None:
+            checkpoint, source = self._load(self.prev_path), "checkpoint.prev.json"
+        if checkpoint is None:
+            source = None
+
+        offset = 0
+        extra: Dict[str, Any] = {}
+        if checkpoint is not None:
+            graph.load_state_dict(checkpoint["state"]["graph"])
+            if decision_cache is not None and checkpoint["state"].get("decision_cache"):
+                decision_cache.load_state_dict(checkpoint["state"]["decision_cache"])
+            extra = checkpoint["state"].get("extra", {})
+            offset = checkpoint["event_log_offset"]
+            if self.event_log_path.exists() and self.event_log_path.stat().st_size < offset:
+                logger.warning("Checkpoint: Event log is shorter than the checkpoint offset; replaying it from the start.")
+                offset = 0
+
+        events, end_offset, torn_bytes = read_event_tail(self.event_log_path, offset)
+        observations: Dict[str, ObservationEvent] = {}
+        for event in events:
+            if event.event_type == EventType.GRAPH_UPDATE and isinstance(event.payload, GraphUpdate):
+                graph.graph_updates.append(event.payload)
+            elif event.event_type == EventType.OBSERVATION and isinstance(event.payload, ObservationEvent):
+                graph.previous_observation = event.payload
+                observations[event.payload.observation_id] = event.payload
+            elif event.event_type == EventType.ACTION and isinstance(event.payload, ActionPlan) and decision_cache is not None:
+                observation = observations.get(event.payload.origin_observation_id)
+                if observation is not None:
+                    decision_cache.remember(observation.potential_intent, observation.ui_state_summary, event.payload)
+
+        result = {
+            "checkpoint": source,
+            "replayed_events": len(events),
+            "event_log_offset": end_offset,
+            "torn_bytes": torn_bytes,
+            "extra": extra,
+            "elapsed_ms": (time.perf_counter() - start) * 1000,
+        }
+        logger.info("Checkpoint: Restored from %s, replayed %d events in %.1f ms.",
+                    source or "the event log only", len(events), result["elapsed_ms"])
+        return result
@@ -0,0 +1,222 @@
+from __future__ import annotations
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Generic, Optional, Tuple, TypeVar
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Observation = TypeVar("Observation")
+
+def latency_summary(samples_ms) -> Dict[str, float]:
+    """Returns mean/p50/p99/max of a sequence of millisecond samples (zeros if empty)."""
+    if len(samples_ms) == 0:
+        return {"mean_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    samples = np.fromiter(samples_ms, dtype=np.float64, count=len(samples_ms))
+    p50, p99 = np.percentile(samples, [50, 99])
+    return {"mean_ms": float(samples.mean()), "p50_ms": float(p50), "p99_ms": float(p99), "max_ms": float(samples.max())}
+
+class BackgroundStrategy(Generic[Observation]):
+    """
+    Periodically recomputes a strategy from the latest observation on its own thread,
+    so slow work (e.g. an LLM call) never blocks the control loop.
+
+    The control loop publishes observations with `offer()` and reads the most recent
+    strategy via `current`; both are single reference assignments, so no lock is held
+    on the hot path.
+    """
+
+    def __init__(self, update: Callable[[Observation, Any], Any], interval_s: float = 2.0, initial: Any = None):
+        """
+        Args:
+            update: Called as `update(observation, current_strategy)`; returns the new strategy.
+            interval_s: Minimum time between updates.
+            initial: The strategy in effect before the first update.
+        """
+        self._update = update
+        self.interval_s = interval_s
+        self.current = initial
+        self.updates = 0
+        self.errors = 0
+        self._latest: Optional[Observation] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def offer(self, observation: Observation):
+        """Publishes the newest observation for the next update."""
+        self._latest = observation
+
+    def _run(self):
+        while not self._stop.is_set():
+            observation = self._latest
+            if observation is not None:
+                try:
+                    self.current = self._update(observation, self.current)
+                    self.updates += 1
+                except Exception as e:
+                    self.errors += 1
+                    logger.warning("BackgroundStrategy: Update failed, keeping the current strategy: %s", e)
+            self._stop.wait(self.interval_s)
+
+    def start(self):
+        if self._thread is not None:
+            raise RuntimeError("BackgroundStrategy is already running.")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="aios-strategy", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+class ControlLoop(Generic[Observation]):
+    """
+    Runs observe -> policy -> actuate at a fixed rate.
+
+    Each tick takes the newest observation. Observations that are not newer than the
+    last one handled, or older than `max_frame_age_s`, are skipped as stale rather
+    than acted upon. A tick that overruns its period is a deadline miss; the ticks it
+    overran are dropped instead of being run late in a burst.
+
+    Tick jitter (actual start minus scheduled start) and observation-to-actuation
+    latency (capture time to actuator return) are recorded for the last
+    `history` ticks and summarized by `stats()`.
+    """
+
+    def __init__(
+        self,
+        observe: Callable[[], Optional[Tuple[float, Observation]]],
+        policy: Callable[[Observation, Any], Any],
+        actuate: Callable[[Any], Any],
+        rate_hz: float = 60.0,
+        max_frame_age_s: Optional[float] = None,
+        strategy: Optional[BackgroundStrategy] = None,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Optional[Callable[[float], None]] = None,
+        history: int = 4096
+    ):
+        """
+        Args:
+            observe: Returns `(capture_time, observation)` using `clock`'s time base, or None if nothing is available.
+            policy: Called as `policy(observation, strategy)`; returns an action, or None to do nothing.
+            actuate: Executes an action returned by the policy.
+            rate_hz: Target tick rate.
+            max_frame_age_s: Observations older than this are skipped. Defaults to two periods.
+            strategy: Optional BackgroundStrategy fed with every fresh observation.
+            clock: Monotonic clock in seconds.
+            sleep: Sleep function; defaults to an interruptible wait.
+            history: Number of ticks kept for the jitter/latency statistics.
+        """
+        self.observe = observe
+        self.policy = policy
+        self.actuate = actuate
+        self.period = 1.0 / rate_hz
+        self.max_frame_age_s = max_frame_age_s if max_frame_age_s is not None else 2 * self.period
+        self.strategy = strategy
+        self._clock = clock
+        self._stop = threading.Event()
+        self._sleep = sleep or (lambda seconds: self._stop.wait(seconds))
+        self._thread: Optional[threading.Thread] = None
+        self._jitter_ms: Deque[float] = deque(maxlen=history)
+        self._latency_ms: Deque[float] = deque(maxlen=history)
+        self._last_capture_time: Optional[float] = None
+        self._counters = {"ticks": 0, "actions": 0, "stale_frames": 0, "no_frame": 0, "deadline_misses": 0, "skipped_ticks": 0}
+        self._started_at: Optional[float] = None
+        self._stopped_at: Optional[float] = None
+
+    def tick(self, scheduled: Optional[float] = None):
+        """Runs one observe -> policy -> actuate step on the calling thread."""
+        start = self._clock()
+        self._counters["ticks"] += 1
+        if scheduled is not None:
+            self._jitter_ms.append((start - scheduled) * 1000)
+
+        observed = self.observe()
+        if observed is None:
+            self._counters["no_frame"] += 1
+            return
+        capture_time, observation = observed
+        if (self._last_capture_time is not None and capture_time <= self._last_capture_time) \
+                or start - capture_time > self.max_frame_age_s:
+            self._counters["stale_frames"] += 1
+            return
+        self._last_capture_time = capture_time
+
+        if self.strategy is not None:
+            self.strategy.offer(observation)
+        action = self.policy(observation, self.strategy.current if self.strategy is not None else None)
+        if action is not None:
+            self.actuate(action)
+            self._counters["actions"] += 1
+            self._latency_ms.append((self._clock() - capture_time) * 1000)
+
+    def run(self, duration_s: Optional[float] = None, max_ticks: Optional[int] = None):
+        """
+        Runs ticks at the target rate on the calling thread until `stop()` is called,
+        `duration_s` has elapsed or `max_ticks` ticks have run.
+        """
+        self._stop.clear()
+        self._started_at = self._clock()
+        self._stopped_at = None
+        if self.strategy is not None:
+            self.strategy.start()
+        next_tick = self._started_at
+        ticks = 0
+        try:
+            while not self._stop.is_set():
+                if duration_s is not None and self._clock() - self._started_at >= duration_s:
+                    break
+                if max_ticks is not None and ticks >= max_ticks:
+                    break
+                self.tick(scheduled=next_tick)
+                ticks += 1
+                next_tick += self.period
+                now = self._clock()
+                if now > next_tick:
+                    # Overran the deadline: drop the ticks we are already late for
+                    missed = int((now - next_tick) // self.period) + 1
+                    self._counters["deadline_misses"] += 1
+                    self._counters["skipped_ticks"] += missed
+                    next_tick += missed * self.period
+                self._sleep(max(0.0, next_tick - self._clock()))
+        finally:
+            if self.strategy is not None:
+                self.strategy.stop()
+            self._stopped_at = self._clock()
+
+    def start(self, duration_s: Optional[float] = None):
+        """Runs the loop on a background thread."""
+        if self._thread is not None:
+            raise RuntimeError("ControlLoop is already running.")
+        self._thread = threading.Thread(target=self.run, kwargs={"duration_s": duration_s}, name="aios-control-loop", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the loop and waits for a background thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns tick counters, the achieved rate, and tick jitter and observation-to-actuation latency summaries."""
+        elapsed = ((self._stopped_at or self._clock()) - self._started_at) if self._started_at is not None else 0.0
+        stats: Dict[str, Any] = dict(self._counters)
+        stats["achieved_rate_hz"] = self._counters["ticks"] / elapsed if elapsed > 0 else 0.0
+        stats["jitter"] = latency_summary(self._jitter_ms)
+        stats["obs_to_act_latency"] = latency_summary(self._latency_ms)
+        if self.strategy is not None:
+            stats["strategy_updates"] = self.strategy.updates
+        return stats
+
+    def __enter__(self) -> ControlLoop:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,332 @@
+"""
+A long-lived AIOS service process.
+
+Keeps the interpreter, heavy imports, LLM clients and GraphMemory warm and accepts
+instructions over a localhost HTTP API, instead of `gui.py` spawning a fresh
+`python aios_demo.py` per instruction. Events of each run are streamed back as
+newline-delimited JSON while the run progresses.
+
+API:
+    GET  /health                 -> {"status": "ok", "queued": n, "runs": n}
+    GET  /metrics                -> Prometheus text format (see aios.runtime.metrics)
+    GET  /logs?limit=n&level=L   -> {"records": [...]}: the most recent log records (see aios.runtime.logs)
+    POST /instructions           <- {"user_instruction": str, "llm_api_key": str?, "fused": bool?}
+                                 -> 202 {"run_id": str}
+    GET  /runs/<run_id>          -> {"run_id", "status", "events"}
+    GET  /runs/<run_id>/events   -> NDJSON stream: one serialized Event per line, then a final
+                                    {"run_id", "status"} line once the run has finished.
+
+Usage (from the project root):
+    python -m aios.runtime.daemon [--host 127.0.0.1] [--port 8765] [--llm_api_key KEY] [--log_level LEVEL] [--quiet]
+"""
+from __future__ import annotations
+import argparse
+import json
+import logging
+import queue
+import threading
+import urllib.parse
+import urllib.request
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from aios.event_stream import JsonlLogger
+from aios.memory.graph import GraphMemory
+from aios.observers.scheduler import ObserverScheduler, initialize_uia_thread
+from aios.observers.uia_walker import IncrementalUIAWalker
+from aios.protocols.schema import Event
+from aios.runtime.logs import LEVEL_NAMES, configure_logging, recent_records
+from aios.runtime.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY
+
+log = logging.getLogger(__name__) # "logger" is a run's JsonlLogger in this module
+
+DEFAULT_PORT = 8765
+_TERMINAL_STATUSES = ("completed", "failed")
+
+class _RunRecord:
+    """Status and streamed event lines of one submitted instruction."""
+
+    def __init__(self, run_id: str, user_instruction: str):
+        self.run_id = run_id
+        self.user_instruction = user_instruction
+        self.status = "queued"
+        self.events: List[str] = []
+        self.changed = threading.Condition()
+
+    def publish(self, event: Event, json_string: str):
+        with self.changed:
+            self.events.append(json_string)
+            self.changed.notify_all()
+
+    def set_status(self, status: str):
+        with self.changed:
+            self.status = status
+            self.changed.notify_all()
+
+class AIOSDaemon:
+    """
+    Runs submitted instructions one at a time on a worker thread (there is one desktop
+    to act on), sharing a single warm GraphMemory, IncrementalUIAWalker and
+    ObserverScheduler across runs.
+    """
+
+    def __init__(
+        self,
+        artifact_base_dir: Path,
+        run_cycle: Callable[..., bool],
+        llm_api_key: Optional[str] = None,
+        cycle_options: Optional[Dict[str, Any]] = None,
+        max_runs: int = 100
+    ):
+        """
+        Args:
+            artifact_base_dir: Base directory for run directories and the shared graph memory.
+            run_cycle: The cycle to run per instruction, with the signature of `aios_demo.run_aios_cycle`.
+            llm_api_key: Default API key for instructions that do not carry one.
+            cycle_options: Extra keyword arguments passed to every `run_cycle` call.
+            max_runs: Number of finished runs kept for status and event replay.
+        """
+        self.artifact_base_dir = Path(artifact_base_dir)
+        self.artifact_base_dir.mkdir(parents=True, exist_ok=True)
+        self.run_cycle = run_cycle
+        self.llm_api_key = llm_api_key
+        self.cycle_options = cycle_options or {}
+        self.max_runs = max_runs
+        self.graph = GraphMemory(self.artifact_base_dir / "daemon_graph_memory.json", name="daemon")
+        # Runs act on one desktop, so its UIA cache carries over; a full re-fetch every
+        # `full_refresh_interval` walks bounds how long a reused subtree can be stale
+        self.uia_walker = IncrementalUIAWalker(reuse_subtrees=True)
+        self.observer_scheduler = ObserverScheduler(thread_initializer=initialize_uia_thread)
+        self._runs: Dict[str, _RunRecord] = {}
+        self._runs_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._work, name="aios-daemon-worker", daemon=True)
+        self._worker.start()
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, user_instruction: str, llm_api_key: Optional[str] = None, **options) -> str:
+        """
+        Queues an instruction.
+
+        Returns:
+            The run ID, usable with `status()` and `iter_events()`.
+        """
+        run_id = f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        record = _RunRecord(run_id, user_instruction)
+        with self._runs_lock:
+            self._runs[run_id] = record
+            finished = [r for r in self._runs.values() if r.status in _TERMINAL_STATUSES]
+            for old in finished[:max(0, len(self._runs) - self.max_runs)]:
+                del self._runs[old.run_id]
+        self._queue.put((record, llm_api_key or self.llm_api_key, options))
+        log.info("AIOS Daemon: Queued run %s.", run_id)
+        return run_id
+
+    def status(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the status of a run, or None if it is unknown."""
+        record = self._runs.get(run_id)
+        if record is None:
+            return None
+        return {"run_id": run_id, "status": record.status, "events": len(record.events)}
+
+    def iter_events(self, run_id: str, idle_timeout_s: Optional[float] = None) -> Iterator[str]:
+        """
+        Yields the serialized events of a run as they are logged, from the first one,
+        followed by a final status line once the run has finished.
+
+        Args:
+            idle_timeout_s: Stop if no new event arrives for this long (None waits indefinitely).
+        """
+        record = self._runs.get(run_id)
+        if record is None:
+            raise KeyError(run_id)
+        sent = 0
+        while True:
+            with record.changed:
+                if sent == len(record.events) and record.status not in _TERMINAL_STATUSES:
+                    if not record.changed.wait(idle_timeout_s):
+                        return
+                new_events = record.events[sent:]
+                status = record.status
+            for line in new_events:
+                yield line
+            sent += len(new_events)
+            if status in _TERMINAL_STATUSES and sent == len(record.events):
+                yield json.dumps({"run_id": run_id, "status": status})
+                return
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            record, llm_api_key, options = item
+            record.set_status("running")
+            logger = JsonlLogger(self.artifact_base_dir / record.run_id / "events.jsonl")
+            logger.add_listener(record.publish)
+            try:
+                succeeded = self.run_cycle(
+                    record.run_id, self.artifact_base_dir,
+                    user_instruction=record.user_instruction, llm_api_key=llm_api_key,
+                    logger=logger, graph=self.graph, uia_walker=self.uia_walker,
+                    observer_scheduler=self.observer_scheduler, **{**self.cycle_options, **options}
+                )
+            except Exception as e:
+                log.exception("AIOS Daemon: Run %s raised: %s", record.run_id, e)
+                succeeded = False
+            record.set_status("completed" if succeeded else "failed")
+            log.info("AIOS Daemon: Run %s %s.", record.run_id, record.status)
+
+    def close(self):
+        """Lets queued runs finish, then stops the worker thread and the observers' threads."""
+        self._queue.put(None)
+        self._worker.join()
+        self.observer_scheduler.close()
+
+def make_http_server(daemon: AIOSDaemon, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """Creates (but does not start) the HTTP server exposing `daemon`. Port 0 picks a free port."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.0" # Streams end when the connection closes
+
+        def _send_json(self, status: int, body: Dict[str, Any]):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            path, _, query = self.path.partition("?")
+            parts = [p for p in path.split("/") if p]
+            if parts == ["health"]:
+                self._send_json(200, {"status": "ok", "queued": daemon.queued, "runs": len(daemon._runs)})
+            elif parts == ["metrics"]:
+                body = REGISTRY.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", METRICS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            elif parts == ["logs"]:
+                params = urllib.parse.parse_qs(query)
+                try:
+                    limit = int(params.get("limit", ["200"])[0])
+                    records = recent_records(limit, params.get("level", ["NOTSET"])[0])
+                except (ValueError, TypeError):
+                    self._send_json(400, {"error": "expected an integer 'limit' and a level name"})
+                    return
+                self._send_json(200, {"records": records})
+            elif len(parts) == 2 and parts[0] == "runs":
+                status = daemon.status(parts[1])
+                if status is None:
+                    self._send_json(404, {"error": "unknown run"})
+                else:
+                    self._send_json(200, status)
+            elif len(parts) == 3 and parts[0] == "runs" and parts[2] == "events":
+                if daemon.status(parts[1]) is None:
+                    self._send_json(404, {"error": "unknown run"})
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.end_headers()
+                try:
+                    for line in daemon.iter_events(parts[1]):
+                        self.wfile.write(line.encode("utf-8") + b"\n")
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass # Client went away
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/instructions":
+                self._send_json(404, {"error": "not found"})
+                return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                user_instruction = body["user_instruction"]
+            except (ValueError, KeyError):
+                self._send_json(400, {"error": "expected a JSON body with 'user_instruction'"})
+                return
+            options = {"fused": bool(body["fused"])} if "fused" in body else {}
+            run_id = daemon.submit(user_instruction, llm_api_key=body.get("llm_api_key"), **options)
+            self._send_json(202, {"run_id": run_id})
+
+        def log_message(self, format, *args):
+            pass # Keep request logging out of the demo output
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+class DaemonClient:
+    """A minimal client for the daemon's HTTP API, e.g. for gui.py."""
+
+    def __init__(self, base_url: str = f"http://127.0.0.1:{DEFAULT_PORT}"):
+        self.base_url = base_url.rstrip("/")
+
+    def _request(self, path: str, body: Optional[Dict[str, Any]] = None, timeout_s: Optional[float] = 5.0):
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, headers={"Content-Type": "application/json"})
+        return urllib.request.urlopen(request, timeout=timeout_s)
+
+    def is_alive(self, timeout_s: float = 0.5) -> bool:
+        """Returns whether a daemon answers on `base_url`."""
+        try:
+            with self._request("/health", timeout_s=timeout_s) as response:
+                return response.status == 200
+        except OSError:
+            return False
+
+    def submit(self, user_instruction: str, llm_api_key: Optional[str] = None, **options) -> str:
+        """Submits an instruction and returns its run ID."""
+        body = {"user_instruction": user_instruction, **options}
+        if llm_api_key:
+            body["llm_api_key"] = llm_api_key
+        with self._request("/instructions", body) as response:
+            return json.loads(response.read())["run_id"]
+
+    def stream_events(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        """Yields the run's events as dicts, ending with the final {"run_id", "status"} dict."""
+        with self._request(f"/runs/{run_id}/events", timeout_s=None) as response:
+            for line in response:
+                if line.strip():
+                    yield json.loads(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the warm AIOS daemon.")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--llm_api_key", type=str, default=None, help="Default LLM API key for submitted instructions.")
+    parser.add_argument("--artifact_base_dir", type=Path, default=Path("./aios_demo_runs"))
+    parser.add_argument("--fused", action="store_true", help="Use the fused Protocol+Core LLM call by default.")
+    parser.add_argument("--trace", action="store_true", help="Write a trace.json of each run's stages to its run directory.")
+    parser.add_argument("--log_level", type=str.upper, default="INFO", choices=LEVEL_NAMES, help="Lowest level logged.")
+    parser.add_argument("--quiet", action="store_true",
+                        help="No console output; warnings and errors stay available at GET /logs.")
+    parser.add_argument("--log_json", action="store_true", help="Log one JSON object per line.")
+    args = parser.parse_args()
+    configure_logging(args.log_level, quiet=args.quiet, json_format=args.log_json)
+
+    from aios_demo import run_aios_cycle # Heavy imports happen once, here
+
+    daemon = AIOSDaemon(args.artifact_base_dir, run_aios_cycle, llm_api_key=args.llm_api_key,
+                        cycle_options={"fused": args.fused, "trace": args.trace})
+    server = make_http_server(daemon, args.host, args.port)
+    log.info("AIOS Daemon listening on http://%s:%d", args.host, server.server_address[1])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log.info("AIOS Daemon shutting down...")
+    finally:
+        server.server_close()
+        daemon.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+from __future__ import annotations
+import contextvars
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from aios.protocols.schema import ActionPlan, DeadlineMiss
+from aios.runtime.metrics import DEADLINE_MISSES, DECISION_CACHE_LOOKUPS, STAGE_SECONDS
+from aios.runtime.tracing import span
+
+logger = logging.getLogger(__name__)
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a stage's work does not finish before its deadline."""
+
+class Deadline:
+    """An absolute point in time on a monotonic clock; `expires_at=None` never expires."""
+
+    def __init__(self, expires_at: Optional[float], clock: Callable[[], float] = time.perf_counter):
+        self.expires_at = expires_at
+        self._clock = clock
+
+    @classmethod
+    def after(cls, seconds: Optional[float], clock: Callable[[], float] = time.perf_counter) -> Deadline:
+        """A deadline `seconds` from now (None for no deadline)."""
+        return cls(clock() + seconds if seconds is not None else None, clock)
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (never negative), or None if unbounded."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - self._clock())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and self._clock() >= self.expires_at
+
+    def cap(self, seconds: Optional[float]) -> Optional[float]:
+        """Returns `seconds` limited to the remaining time; either may be None for unbounded."""
+        remaining = self.remaining()
+        if remaining is None:
+            return seconds
+        return remaining if seconds is None else min(seconds, remaining)
+
+def call_with_deadline(deadline: Deadline, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Calls `fn(*args, **kwargs)` but gives up when `deadline` expires.
+
+    An unbounded deadline calls `fn` directly. Otherwise `fn` runs on its own daemon
+    thread; if it is still running at the deadline, DeadlineExceeded is raised and its
+    result is discarded when it eventually finishes (e.g. an LLM call stuck in retries).
+    Each call gets a fresh thread, so abandoned calls never delay later ones.
+    """
+    remaining = deadline.remaining()
+    if remaining is None:
+        return fn(*args, **kwargs)
+    if remaining <= 0:
+        raise DeadlineExceeded("Deadline already expired before the call started.")
+    future: Future = Future()
+    context = contextvars.copy_context() # Keeps the tracer
+
+    def run():
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(context.run(fn, *args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="aios-deadline", daemon=True).start()
+    try:
+        return future.result(timeout=remaining)
+    except FutureTimeoutError:
+        raise DeadlineExceeded(f"Call did not finish within {remaining * 1000:.0f} ms.") from None
+
+class StageContext:
+    """What a stage sees of the cycle budget: its deadline, and a way to report a degradation."""
+
+    def __init__(self, name: str, deadline: Deadline, budget_s: Optional[float]):
+        self.name = name
+        self.deadline = deadline
+        self.budget_s = budget_s
+        self.degradation: Optional[str] = None
+
+    def degrade(self, degradation: str):
+        """Records that the stage fell back to a cheaper result, e.g. "truncated_uia"."""
+        self.degradation = degradation
+
+class CycleBudget:
+    """
+    A per-cycle latency budget propagated to the cycle's stages.
+
+    Each stage gets a share of the time still left in the cycle, proportional to its
+    weight among the stages that have not run yet, so slack left by fast stages flows
+    to later ones, and no stage can run past the cycle deadline. A stage that overruns
+    its deadline or degrades is recorded as a DeadlineMiss and passed to `on_miss`
+    (e.g. to log it to the event stream).
+    """
+
+    DEFAULT_STAGE_WEIGHTS: Dict[str, float] = {
+        "observe": 0.15,
+        "protocol1": 0.35,
+        "agent": 0.35,
+        "protocol2": 0.05,
+        "actuator": 0.10,
+    }
+
+    def __init__(self, cycle_id: str, budget_s: Optional[float], stage_weights: Optional[Dict[str, float]] = None,
+                 on_miss: Optional[Callable[[DeadlineMiss], None]] = None, clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            cycle_id: Identifies the cycle in recorded misses (e.g. the run ID).
+            budget_s: Total cycle budget in seconds; None disables all deadlines.
+            stage_weights: Relative share of each stage, in execution order.
+            on_miss: Called with each DeadlineMiss as it is recorded.
+        """
+        self.cycle_id = cycle_id
+        self.budget_s = budget_s
+        self.stage_weights = dict(stage_weights or self.DEFAULT_STAGE_WEIGHTS)
+        self.on_miss = on_miss
+        self._clock = clock
+        self.deadline = Deadline.after(budget_s, clock)
+        self.misses: List[DeadlineMiss] = []
+        self._done: set = set()
+
+    def _allocate(self, name: str) -> Tuple[Deadline, Optional[float]]:
+        remaining = self.deadline.remaining()
+        if remaining is None:
+            return Deadline(None, self._clock), None
+        pending_weight = sum(w for stage, w in self.stage_weights.items() if stage not in self._done)
+        weight = self.stage_weights.get(name, 0.0)
+        share = remaining * weight / pending_weight if pending_weight > 0 and weight > 0 else remaining
+        return Deadline.after(share, self._clock), share
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageContext]:
+        """Runs a stage under its share of the remaining budget, in a "stage.<name>" tracing span."""
+        deadline, budget_s = self._allocate(name)
+        context = StageContext(name, deadline, budget_s)
+        start = self._clock()
+        try:
+            with span(f"stage.{name}", budget_ms=budget_s * 1000 if budget_s is not None else None) as stage_span:
+                yield context
+                if context.degradation is not None:
+                    stage_span.set(degradation=context.degradation)
+        finally:
+            self._done.add(name)
+            elapsed_s = self._clock() - start
+            STAGE_SECONDS.observe(elapsed_s, stage=name)
+            if budget_s is not None:
+                if context.degradation is not None or elapsed_s > budget_s:
+                    self._record(DeadlineMiss(
+                        cycle_id=self.cycle_id,
+                        stage=name,
+                        budget_ms=budget_s * 1000,
+                        elapsed_ms=elapsed_s * 1000,
+                        degradation=context.degradation or "none"
+                    ))
+
+    def _record(self, miss: DeadlineMiss):
+        self.misses.append(miss)
+        DEADLINE_MISSES.inc(stage=miss.stage, degradation=miss.degradation)
+        logger.warning("Deadline miss in stage '%s': %.0f ms of %.0f ms (degradation: %s).",
+                       miss.stage, miss.elapsed_ms, miss.budget_ms, miss.degradation)
+        if self.on_miss is not None:
+            self.on_miss(miss)
+
+class DecisionCache:
+    """
+    Remembers the last ActionPlan decided for a UI state, so an agent stage that runs
+    out of time can reuse it instead of acting on nothing.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self._plans: Dict[Tuple[str, str], ActionPlan] = {}
+        self.max_entries = max_entries
+
+    @staticmethod
+    def _key(potential_intent: str, ui_state_summary: str) -> Tuple[str, str]:
+        return (potential_intent.strip().lower(), ui_state_summary.strip().lower())
+
+    def remember(self, potential_intent: str, ui_state_summary: str, action_plan: ActionPlan):
+        key = self._key(potential_intent, ui_state_summary)
+        self._plans.pop(key, None)
+        self._plans[key] = action_plan
+        while len(self._plans) > self.max_entries:
+            del self._plans[next(iter(self._plans))]
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Returns the cached plans as JSON-compatible data, oldest first."""
+        return {"entries": [[intent, summary, plan.model_dump(mode="json")] for (intent, summary), plan in self._plans.items()]}
+
+    def load_state_dict(self, data: Dict[str, Any]):
+        """Replaces the cached plans with data produced by `state_dict()`."""
+        self._plans = {}
+        for intent, summary, plan in data.get("entries", []):
+            self.remember(intent, summary, ActionPlan.model_validate(plan))
+
+    def lookup(self, potential_intent: str, ui_state_summary: str, origin_observation_id: str) -> Optional[ActionPlan]:
+        """Returns a copy of the cached plan re-targeted at the new observation, or None."""
+        cached = self._plans.get(self._key(potential_intent, ui_state_summary))
+        DECISION_CACHE_LOOKUPS.inc(result="miss" if cached is None else "hit")
+        if cached is None:
+            return None
+        return cached.model_copy(update={"action_id": str(uuid.uuid4()), "origin_observation_id": origin_observation_id})
+
+def no_action_plan(origin_observation_id: str, reason: str) -> ActionPlan:
+    """The safe fallback when there is no time left to decide or act."""
+    return ActionPlan(
+        action_id=str(uuid.uuid4()),
+        origin_observation_id=origin_observation_id,
+        action_type="NoAction",
+        parameters={"reason": reason}
+    )
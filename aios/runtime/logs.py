@@ -0,0 +1,152 @@
+"""
+Leveled, structured diagnostic output for AIOS, configured once per process.
+
+Modules log through `logging.getLogger(__name__)` with lazy %-style arguments;
+`configure_logging()` routes every record through a QueueHandler, so the cycle's
+threads only enqueue, and a QueueListener thread formats and writes them to the
+console and keeps the most recent ones in a RingBufferHandler:
+
+    configure_logging("INFO")              # progress on the console, as text
+    configure_logging("DEBUG", json_format=True)
+    configure_logging(quiet=True)          # nothing on the console; warnings and errors
+                                           # are kept in the ring buffer
+
+In quiet mode the root level is WARNING, so the hot loop's info and debug calls
+return at the level check: no record is created, formatted or written. Recent
+records can always be read with `recent_records()`, e.g. after a failed cycle.
+"""
+from __future__ import annotations
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import IO, Any, Dict, List, Optional, Union
+
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+LEVEL_NAMES = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+# Attributes every LogRecord has; anything else was passed with `extra=` and is structured data.
+_STANDARD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+def record_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    """Returns a record as a flat dict: time, level, logger, message and its `extra=` fields."""
+    fields = {
+        "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+        "level": record.levelname,
+        "logger": record.name,
+        "message": record.getMessage(),
+        "thread": record.threadName,
+    }
+    fields.update((key, value) for key, value in vars(record).items() if key not in _STANDARD_ATTRIBUTES)
+    if record.exc_info and record.exc_info[0] is not None:
+        fields["exception"] = logging.Formatter().formatException(record.exc_info)
+    return fields
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line (see `record_fields`)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(record_fields(record), default=str)
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last `capacity` records in memory."""
+
+    def __init__(self, capacity: int = 1000, level: int = logging.NOTSET):
+        super().__init__(level)
+        self._records: deque = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord):
+        self._records.append(record)
+
+    def records(self, limit: Optional[int] = None, level: int = logging.NOTSET) -> List[logging.LogRecord]:
+        """Returns the buffered records at or above `level`, oldest first; the last `limit` if given."""
+        with self.lock:
+            records = [record for record in self._records if record.levelno >= level]
+        return records[-limit:] if limit else records
+
+    def clear(self):
+        with self.lock:
+            self._records.clear()
+
+_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_previous_root_level: Optional[int] = None
+_ring = RingBufferHandler()
+
+def _level_number(level: Union[int, str]) -> int:
+    """Resolves a level name (any case) or number; raises ValueError for an unknown name."""
+    if isinstance(level, int):
+        return level
+    number = logging.getLevelName(str(level).upper())
+    if not isinstance(number, int):
+        raise ValueError(f"Unknown log level: '{level}' (expected one of {', '.join(LEVEL_NAMES)}).")
+    return number
+
+def configure_logging(level: Union[int, str] = "INFO", quiet: bool = False, json_format: bool = False,
+                      ring_capacity: int = 1000, stream: Optional[IO[str]] = None) -> RingBufferHandler:
+    """
+    Routes all logging through a queue to the console and the ring buffer, replacing
+    any previous configuration made here.
+
+    Args:
+        level: The lowest level recorded (e.g. "DEBUG", "INFO").
+        quiet: Write nothing to the console and record only warnings and errors.
+        json_format: Write one JSON object per record instead of text lines.
+        ring_capacity: How many recent records the ring buffer keeps.
+        stream: The console stream; defaults to stdout, where gui.py reads the demo's output.
+
+    Returns:
+        The ring buffer handler.
+
+    Raises:
+        ValueError: If `level` is not a known level name; nothing is changed then.
+    """
+    global _listener, _queue_handler, _previous_root_level, _ring
+    level = _level_number(level)
+    if quiet:
+        level = max(level, logging.WARNING)
+    with _lock:
+        _stop()
+        _ring = RingBufferHandler(ring_capacity)
+        handlers: List[logging.Handler] = [_ring]
+        if not quiet:
+            console = logging.StreamHandler(stream or sys.stdout)
+            console.setFormatter(JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT))
+            handlers.append(console)
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        _queue_handler = logging.handlers.QueueHandler(records)
+        _listener = logging.handlers.QueueListener(records, *handlers)
+        root = logging.getLogger()
+        _previous_root_level = root.level
+        root.addHandler(_queue_handler)
+        root.setLevel(level)
+        _listener.start()
+    return _ring
+
+def _stop():
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        root = logging.getLogger()
+        root.removeHandler(_queue_handler)
+        root.setLevel(_previous_root_level)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop() # Drains the queue first
+        _listener = None
+
+def shutdown_logging():
+    """Flushes the queued records and undoes `configure_logging` (the ring buffer keeps its records)."""
+    with _lock:
+        _stop()
+
+atexit.register(shutdown_logging)
+
+def recent_records(limit: Optional[int] = None, level: Union[int, str] = logging.NOTSET) -> List[Dict[str, Any]]:
+    """Returns the ring buffer's records (see `RingBufferHandler.records`) as `record_fields` dicts."""
+    return [record_fields(record) for record in _ring.records(limit, _level_number(level))]
@@ -0,0 +1,223 @@
+"""
+In-process metrics (counters, gauges, histograms) exposed in the Prometheus text format.
+
+Metrics live in a MetricsRegistry; REGISTRY is the process-wide one that the AIOS
+metrics below are registered in and that `/metrics` serves. Each metric may have
+labels, given as keyword arguments when it is updated:
+
+    CYCLES.inc(result="success")
+    STAGE_SECONDS.observe(0.12, stage="observe")
+
+Percentiles are computed by the scraper from the histogram buckets, e.g.
+`histogram_quantile(0.99, rate(aios_stage_duration_seconds_bucket[5m]))`.
+"""
+from __future__ import annotations
+import bisect
+import logging
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric '{self.name}' takes labels {list(self.labelnames)}, got {sorted(labels)}.")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Returns (sample name, formatted labels, value) tuples."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {_escape(self.help)}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples())
+        return "\n".join(lines)
+
+class Counter(_Metric):
+    """A value that only goes up, e.g. requests served."""
+    type_name = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {} if labelnames else {(): 0.0}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        if amount < 0:
+            raise ValueError("Counters can only increase.")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, _format_labels(self.labelnames, key), value) for key, value in items]
+
+class Gauge(Counter):
+    """A value that goes up and down, e.g. the size of a memory."""
+    type_name = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+class Histogram(_Metric):
+    """Counts observations (e.g. latencies in seconds) into cumulative buckets, with their sum and count."""
+    type_name = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (the last is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, **labels: str) -> int:
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        samples = []
+        with self._lock:
+            items = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", _format_labels(self.labelnames + ("le",), key + (_format_value(bound),)),
+                                cumulative))
+            labels = _format_labels(self.labelnames, key)
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+class MetricsRegistry:
+    """A named collection of metrics. Registering an existing name returns the existing metric."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric_class, name: str, help: str, labelnames: Sequence[str], **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, help, labelnames, **kwargs)
+            elif type(metric) is not metric_class or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric '{name}' is already registered as a {metric.type_name} "
+                                 f"with labels {list(metric.labelnames)}.")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Returns all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+# --- AIOS metrics ---
+CYCLES = REGISTRY.counter("aios_cycles_total", "AIOS cycles run, by result (success, unchanged or failure).", ["result"])
+CYCLE_SECONDS = REGISTRY.histogram("aios_cycle_duration_seconds", "Wall time of a full AIOS cycle.")
+STAGE_SECONDS = REGISTRY.histogram("aios_stage_duration_seconds", "Wall time of each cycle stage.", ["stage"])
+DEADLINE_MISSES = REGISTRY.counter("aios_deadline_misses_total", "Stages that overran their budget or degraded.",
+                                   ["stage", "degradation"])
+LLM_REQUESTS = REGISTRY.counter("aios_llm_requests_total", "LLM API requests (attempts), by outcome.", ["model", "outcome"])
+LLM_SECONDS = REGISTRY.histogram("aios_llm_request_duration_seconds", "Latency of LLM API requests.", ["model"])
+LLM_CACHE_LOOKUPS = REGISTRY.counter("aios_llm_cache_lookups_total", "Shared LLM response cache lookups.", ["result"])
+DECISION_CACHE_LOOKUPS = REGISTRY.counter("aios_decision_cache_lookups_total",
+                                          "Decision cache lookups by late agent stages.", ["result"])
+EVENTS_LOGGED = REGISTRY.counter("aios_events_logged_total", "Events written to event logs.", ["event_type"])
+EVENT_LOG_BYTES = REGISTRY.counter("aios_event_log_bytes_total", "Bytes written to event logs.")
+GRAPH_UPDATES = REGISTRY.gauge("aios_graph_memory_updates", "GraphUpdates held by a GraphMemory, by graph file.", ["graph"])
+GRAPH_BYTES = REGISTRY.gauge("aios_graph_memory_bytes", "Size of a GraphMemory's last save, by graph file.", ["graph"])
+ACTIONS = REGISTRY.counter("aios_actions_total", "Actions handled by the actuator, by type and receipt status.",
+                           ["action_type", "status"])
+ACTUATION_SECONDS = REGISTRY.histogram("aios_actuation_duration_seconds", "Actuator latency per action.")
+
+def make_metrics_server(registry: MetricsRegistry = REGISTRY, host: str = "127.0.0.1", port: int = 9464) -> ThreadingHTTPServer:
+    """Creates (but does not start) an HTTP server answering GET /metrics; port 0 picks a free port."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass # Scrapes are frequent; keep them out of the demo output
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+def serve_metrics(registry: MetricsRegistry = REGISTRY, host: str = "127.0.0.1", port: int = 9464) -> ThreadingHTTPServer:
+    """Starts a metrics server on a daemon thread; stop it with `server.shutdown()`."""
+    server = make_metrics_server(registry, host, port)
+    threading.Thread(target=server.serve_forever, name="aios-metrics", daemon=True).start()
+    logger.info("Metrics: Serving Prometheus metrics on http://%s:%d/metrics", host, server.server_address[1])
+    return server
@@ -0,0 +1,260 @@
+from __future__ import annotations
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class PipelineItem:
+    """A payload moving through the pipeline, with its cycle number and creation time."""
+    __slots__ = ("seq", "created_at", "payload")
+
+    def __init__(self, seq: int, created_at: float, payload: Any):
+        self.seq = seq
+        self.created_at = created_at
+        self.payload = payload
+
+class LatestQueue:
+    """
+    A bounded queue that never blocks producers: when full, the oldest item is
+    discarded as superseded by the new one.
+    """
+
+    def __init__(self, maxsize: int = 1):
+        self._items: Deque[PipelineItem] = deque()
+        self._maxsize = maxsize
+        self._cond = threading.Condition()
+        self.discarded = 0
+
+    def put(self, item: PipelineItem, stop: Optional[threading.Event] = None):
+        with self._cond:
+            while len(self._items) >= self._maxsize:
+                self._items.popleft()
+                self.discarded += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout: float) -> Optional[PipelineItem]:
+        with self._cond:
+            if not self._items and not self._cond.wait(timeout):
+                return None
+            return self._items.popleft() if self._items else None
+
+class BlockingQueue:
+    """A bounded FIFO queue whose producers wait for space (back-pressure), until stopped."""
+
+    def __init__(self, maxsize: int = 1):
+        self._queue: "queue.Queue[PipelineItem]" = queue.Queue(maxsize)
+        self.discarded = 0
+
+    def put(self, item: PipelineItem, stop: Optional[threading.Event] = None):
+        while True:
+            try:
+                self._queue.put(item, timeout=0.05)
+                return
+            except queue.Full:
+                if stop is not None and stop.is_set():
+                    self.discarded += 1
+                    return
+
+    def get(self, timeout: float) -> Optional[PipelineItem]:
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class PipelineStage:
+    """
+    One stage of a PipelineRunner, run on its own thread.
+
+    `fn(payload)` returns the payload for the next stage, or None to drop the cycle
+    (e.g. an unchanged screen). The stage's input queue holds at most `queue_size`
+    items; with `latest_only` a full queue discards its oldest item (a superseded
+    observation), otherwise the upstream stage waits. Items older than `max_age_s`
+    when the stage picks them up are discarded as stale.
+    """
+
+    def __init__(self, name: str, fn: Callable[[Any], Any], queue_size: int = 1,
+                 latest_only: bool = False, max_age_s: Optional[float] = None):
+        self.name = name
+        self.fn = fn
+        self.input = LatestQueue(queue_size) if latest_only else BlockingQueue(queue_size)
+        self.max_age_s = max_age_s
+        self.processed = 0
+        self.dropped = 0
+        self.stale = 0
+        self.errors = 0
+        self.busy_s = 0.0
+
+class PipelineRunner:
+    """
+    Runs the OODA stages as a pipeline: a source (observation) thread and one thread
+    per stage connected by bounded queues, so cycle N+1's observation and perception
+    overlap with cycle N's decision and actuation.
+
+    A cycle completes when its item leaves the last stage. `stats()` reports the
+    sustained cycles/sec, end-to-end cycle latency, and per-stage utilisation
+    (busy time over wall time), processed/dropped/discarded counts.
+    """
+
+    def __init__(self, source: Callable[[], Any], stages: List[PipelineStage],
+                 source_name: str = "observe", min_source_interval_s: float = 0.0,
+                 clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            source: Produces a new observation payload each call, or None if there is nothing new.
+            stages: The downstream stages, in order.
+            source_name: Name of the source stage in the stats.
+            min_source_interval_s: Minimum time between source calls (a rate limit for observers).
+            clock: Monotonic clock in seconds.
+        """
+        if not stages:
+            raise ValueError("PipelineRunner needs at least one stage after the source.")
+        self.source = source
+        self.source_name = source_name
+        self.stages = stages
+        self.min_source_interval_s = min_source_interval_s
+        self._clock = clock
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._seq = 0
+        self._source_busy_s = 0.0
+        self._source_calls = 0
+        self._source_errors = 0
+        self._completed = 0
+        self._cycle_latency_ms: Deque[float] = deque(maxlen=4096)
+        self._lock = threading.Lock()
+        self._started_at: Optional[float] = None
+        self._stopped_at: Optional[float] = None
+
+    def _run_source(self):
+        first = self.stages[0]
+        while not self._stop.is_set():
+            start = self._clock()
+            try:
+                payload = self.source()
+            except Exception as e:
+                self._source_errors += 1
+                payload = None
+                logger.error("Pipeline: Source '%s' failed: %s", self.source_name, e)
+            self._source_busy_s += self._clock() - start
+            self._source_calls += 1
+            if payload is not None:
+                self._seq += 1
+                first.input.put(PipelineItem(self._seq, start, payload), self._stop)
+            remaining = self.min_source_interval_s - (self._clock() - start)
+            if remaining > 0:
+                self._stop.wait(remaining)
+
+    def _run_stage(self, index: int):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        while not self._stop.is_set():
+            item = stage.input.get(timeout=0.05)
+            if item is None:
+                continue
+            start = self._clock()
+            if stage.max_age_s is not None and start - item.created_at > stage.max_age_s:
+                stage.stale += 1
+                continue
+            try:
+                result = stage.fn(item.payload)
+            except Exception as e:
+                stage.errors += 1
+                result = None
+                logger.error("Pipeline: Stage '%s' failed on cycle %s: %s", stage.name, item.seq, e)
+            end = self._clock()
+            stage.busy_s += end - start
+            stage.processed += 1
+            if result is None:
+                stage.dropped += 1
+                continue
+            if next_stage is not None:
+                next_stage.input.put(PipelineItem(item.seq, item.created_at, result), self._stop)
+            else:
+                with self._lock:
+                    self._completed += 1
+                    self._cycle_latency_ms.append((end - item.created_at) * 1000)
+
+    def start(self):
+        """Starts the source and stage threads."""
+        if self._threads:
+            raise RuntimeError("PipelineRunner is already running.")
+        self._stop.clear()
+        self._started_at = self._clock()
+        self._stopped_at = None
+        self._threads = [threading.Thread(target=self._run_stage, args=(i,), name=f"aios-pipeline-{stage.name}", daemon=True)
+                         for i, stage in enumerate(self.stages)]
+        self._threads.append(threading.Thread(target=self._run_source, name=f"aios-pipeline-{self.source_name}", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Stops all threads; a stage call in progress is allowed to finish."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self._stopped_at = self._clock()
+
+    @property
+    def completed(self) -> int:
+        return self._completed
+
+    def run(self, duration_s: Optional[float] = None, max_cycles: Optional[int] = None, poll_s: float = 0.05):
+        """Runs until `duration_s` has elapsed or `max_cycles` cycles have completed (at least one must be given)."""
+        if duration_s is None and max_cycles is None:
+            raise ValueError("PipelineRunner.run needs duration_s or max_cycles.")
+        self.start()
+        try:
+            while True:
+                if duration_s is not None and self._clock() - self._started_at >= duration_s:
+                    break
+                if max_cycles is not None and self._completed >= max_cycles:
+                    break
+                time.sleep(poll_s)
+        finally:
+            self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns cycles completed, cycles/sec, cycle latency and per-stage utilisation."""
+        elapsed = ((self._stopped_at or self._clock()) - self._started_at) if self._started_at is not None else 0.0
+        with self._lock:
+            latencies = sorted(self._cycle_latency_ms)
+
+        def utilisation(busy_s: float) -> float:
+            return busy_s / elapsed if elapsed > 0 else 0.0
+
+        stages = {self.source_name: {
+            "utilisation": utilisation(self._source_busy_s),
+            "processed": self._source_calls,
+            "errors": self._source_errors,
+        }}
+        for stage in self.stages:
+            stages[stage.name] = {
+                "utilisation": utilisation(stage.busy_s),
+                "processed": stage.processed,
+                "mean_ms": stage.busy_s / stage.processed * 1000 if stage.processed else 0.0,
+                "dropped": stage.dropped,
+                "superseded": stage.input.discarded,
+                "stale": stage.stale,
+                "errors": stage.errors,
+            }
+        return {
+            "cycles_completed": self._completed,
+            "cycles_per_s": self._completed / elapsed if elapsed > 0 else 0.0,
+            "cycle_latency_p50_ms": latencies[len(latencies) // 2] if latencies else 0.0,
+            "cycle_latency_max_ms": latencies[-1] if latencies else 0.0,
+            "elapsed_s": elapsed,
+            "stages": stages,
+        }
+
+    def __enter__(self) -> PipelineRunner:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
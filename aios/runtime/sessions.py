@@ -0,0 +1,165 @@
+from __future__ import annotations
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from aios.event_stream import JsonlLogger
+from aios.memory.graph import GraphMemory
+from aios.llm.pool import RateLimiter, ResponseCache, SharedLLMClient
+from aios.runtime.deadline import DecisionCache
+
+log = logging.getLogger(__name__) # "logger" is a session's JsonlLogger in this module
+
+class Session:
+    """
+    One independent agent session: its own run directory, event log, GraphMemory and
+    decision cache. Its cycles run one after another.
+    """
+
+    def __init__(self, session_id: str, session_dir: Path, cycle_options: Optional[Dict[str, Any]] = None):
+        self.session_id = session_id
+        self.session_dir = Path(session_dir)
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        self.logger = JsonlLogger(self.session_dir / "events.jsonl")
+        self.graph = GraphMemory(self.session_dir / "graph_memory.json", name=f"session:{session_id}")
+        self.decision_cache = DecisionCache()
+        self.cycle_options = cycle_options or {}
+        self.cycles_run = 0
+        self.cycles_failed = 0
+        self.busy_s = 0.0
+
+class SessionManager:
+    """
+    Hosts many sessions in one process on a worker pool.
+
+    All sessions share one SharedLLMClient (one connection pool, response cache and rate
+    limiter), registered for `llm_api_key` so every LLM call the cycles make goes through it
+    until `close()`; use the manager as a context manager to unregister it.
+    Sessions run concurrently; aggregate throughput grows with the number of sessions until
+    the worker pool or the LLM rate limit is saturated.
+    """
+
+    def __init__(
+        self,
+        artifact_base_dir: Path,
+        run_cycle: Callable[..., bool],
+        llm_api_key: str,
+        llm_client: Optional[Any] = None,
+        max_workers: int = 8,
+        rate_limit_per_s: Optional[float] = None,
+        rate_limit_burst: int = 4,
+        cache_entries: int = 1024,
+        max_llm_concurrency: int = 8
+    ):
+        """
+        Args:
+            artifact_base_dir: Each session gets "<artifact_base_dir>/<session_id>".
+            run_cycle: The cycle to run, with the signature of `aios_demo.run_aios_cycle`.
+            llm_api_key: API key used by all sessions.
+            llm_client: The underlying client; defaults to an LLMClient for `llm_api_key`.
+            max_workers: Sessions running a cycle at the same time.
+            rate_limit_per_s: Shared LLM request rate limit (None for unlimited).
+            rate_limit_burst: Requests allowed in a burst under the rate limit.
+            cache_entries: Size of the shared response cache (0 disables it). Only used
+                           while the client samples at temperature 0.
+            max_llm_concurrency: LLM requests in flight at once.
+        """
+        from aios.protocols.llm_connector import register_llm_client
+
+        self.artifact_base_dir = Path(artifact_base_dir)
+        self.run_cycle = run_cycle
+        self.llm_api_key = llm_api_key
+        if llm_client is None:
+            from aios.llm.llm_client import LLMClient
+            llm_client = LLMClient(api_key=llm_api_key)
+        self.llm = SharedLLMClient(
+            llm_client,
+            rate_limiter=RateLimiter(rate_limit_per_s, rate_limit_burst) if rate_limit_per_s else None,
+            cache=ResponseCache(cache_entries) if cache_entries else None,
+            max_concurrency=max_llm_concurrency
+        )
+        register_llm_client(llm_api_key, self.llm)
+        self.max_workers = max_workers
+        self.sessions: Dict[str, Session] = {}
+        self._lock = threading.Lock()
+
+    def add_session(self, session_id: Optional[str] = None, **cycle_options) -> Session:
+        """Creates a session; `cycle_options` are passed to each of its `run_cycle` calls."""
+        with self._lock:
+            session_id = session_id or f"session_{len(self.sessions):03d}"
+            if session_id in self.sessions:
+                raise ValueError(f"Session '{session_id}' already exists.")
+            session = Session(session_id, self.artifact_base_dir / session_id, cycle_options)
+            self.sessions[session_id] = session
+        return session
+
+    def _run_session_cycle(self, session: Session) -> bool:
+        run_id = f"cycle_{session.cycles_run:04d}"
+        start = time.perf_counter()
+        try:
+            succeeded = self.run_cycle(
+                run_id, session.session_dir,
+                llm_api_key=self.llm_api_key, logger=session.logger, graph=session.graph,
+                decision_cache=session.decision_cache, **session.cycle_options
+            )
+        except Exception as e:
+            log.error("SessionManager: Session '%s' cycle %s raised: %s", session.session_id, run_id, e)
+            succeeded = False
+        session.busy_s += time.perf_counter() - start
+        session.cycles_run += 1
+        if not succeeded:
+            session.cycles_failed += 1
+        return succeeded
+
+    def _run_session(self, session: Session, cycles: int):
+        for _ in range(cycles):
+            self._run_session_cycle(session)
+
+    def run(self, cycles_per_session: int = 1) -> Dict[str, Any]:
+        """
+        Runs `cycles_per_session` cycles in every session, sessions concurrently.
+
+        Returns:
+            Aggregate and per-session throughput, plus shared LLM pool statistics.
+        """
+        sessions = list(self.sessions.values())
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(sessions))),
+                                thread_name_prefix="aios-session") as executor:
+            for future in [executor.submit(self._run_session, session, cycles_per_session) for session in sessions]:
+                future.result()
+        elapsed = time.perf_counter() - start
+
+        total = len(sessions) * cycles_per_session
+        return {
+            "sessions": len(sessions),
+            "cycles": total,
+            "failed": sum(s.cycles_failed for s in sessions),
+            "elapsed_s": elapsed,
+            "cycles_per_s": total / elapsed if elapsed > 0 else 0.0,
+            "per_session": {
+                s.session_id: {"cycles_run": s.cycles_run, "failed": s.cycles_failed, "busy_s": s.busy_s}
+                for s in sessions
+            },
+            "llm": self.llm.stats(),
+        }
+
+    def save(self):
+        """Persists every session's GraphMemory."""
+        for session in self.sessions.values():
+            session.graph.save()
+
+    def close(self):
+        """Unregisters the shared LLM client, so later calls with `llm_api_key` do not use it."""
+        from aios.protocols.llm_connector import unregister_llm_client
+
+        unregister_llm_client(self.llm_api_key, self.llm)
+
+    def __enter__(self) -> SessionManager:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,167 @@
+"""
+Lightweight hierarchical tracing of cycle stages.
+
+Code marks a unit of work with `span(name, **attributes)`; spans opened inside it
+on the same thread are its children. Spans go to the tracer made current with
+`use_tracer()` (or `activate()`), which is carried into worker threads by
+`contextvars.copy_context()`. Without one, `span()` returns a shared no-op span, so
+instrumentation costs a context-variable lookup when tracing is disabled.
+
+A Tracer writes its spans in the Chrome trace-event format, which chrome://tracing
+and https://ui.perfetto.dev open as a flamegraph per thread.
+"""
+from __future__ import annotations
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+class Span:
+    """A timed unit of work; ends when its `with` block exits (or on `end()`)."""
+    __slots__ = ("_tracer", "name", "attributes", "start_ns", "end_ns", "_thread")
+
+    def __init__(self, tracer: Tracer, name: str, attributes: Dict[str, Any]):
+        self._tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self._thread = threading.current_thread()
+        self.end_ns: Optional[int] = None
+        self.start_ns = tracer._clock()
+
+    def set(self, **attributes: Any):
+        """Adds or replaces attributes, e.g. a result size known only at the end."""
+        self.attributes.update(attributes)
+
+    def end(self):
+        if self.end_ns is None:
+            self.end_ns = self._tracer._clock()
+            self._tracer._record(self)
+
+    def __enter__(self) -> Span:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.attributes["error"] = f"{exc_type.__name__}: {exc}"
+        self.end()
+
+class _NullSpan:
+    """The span handed out when tracing is disabled; every operation is a no-op."""
+    __slots__ = ()
+
+    def set(self, **attributes: Any):
+        pass
+
+    def end(self):
+        pass
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class Tracer:
+    """
+    Collects finished spans with monotonic timestamps. Thread-safe.
+    """
+    enabled = True
+
+    def __init__(self, clock: Callable[[], int] = time.perf_counter_ns):
+        """
+        Args:
+            clock: Monotonic clock in nanoseconds.
+        """
+        self._clock = clock
+        self.origin_ns = clock()
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **attributes: Any) -> Span:
+        """Starts a span; use it as a context manager, or call `end()` on it."""
+        return Span(self, name, attributes)
+
+    def _record(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+
+    @property
+    def spans(self) -> List[Span]:
+        """Finished spans, in the order they ended."""
+        with self._lock:
+            return list(self._spans)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Returns the spans as a Chrome trace-event document (complete "X" events, times in µs)."""
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        thread_names: Dict[int, str] = {}
+        # Parents before children at equal start times, so viewers nest them correctly
+        for span in sorted(self.spans, key=lambda s: (s.start_ns, -s.end_ns)):
+            tid = span._thread.ident or 0
+            thread_names[tid] = span._thread.name
+            events.append({
+                "name": span.name,
+                "cat": "aios",
+                "ph": "X",
+                "ts": (span.start_ns - self.origin_ns) / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": pid,
+                "tid": tid,
+                "args": {k: v if isinstance(v, (str, int, float, bool)) or v is None else str(v)
+                         for k, v in span.attributes.items()},
+            })
+        for tid, name in thread_names.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path | str) -> Path:
+        """Writes `to_chrome_trace()` to `path` as JSON and returns the path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
+        return path
+
+class NullTracer(Tracer):
+    """A tracer that records nothing."""
+    enabled = False
+
+    def __init__(self):
+        super().__init__()
+
+    def span(self, name: str, **attributes: Any) -> _NullSpan:
+        return _NULL_SPAN
+
+NULL_TRACER = NullTracer()
+
+_current_tracer: contextvars.ContextVar[Tracer] = contextvars.ContextVar("aios_tracer", default=NULL_TRACER)
+
+def current_tracer() -> Tracer:
+    return _current_tracer.get()
+
+def span(name: str, **attributes: Any):
+    """Starts a span on the current tracer (a no-op span when tracing is disabled)."""
+    return _current_tracer.get().span(name, **attributes)
+
+def activate(tracer: Tracer) -> contextvars.Token:
+    """Makes `tracer` current in this context; undo with `deactivate(token)`."""
+    return _current_tracer.set(tracer)
+
+def deactivate(token: contextvars.Token):
+    _current_tracer.reset(token)
+
+@contextmanager
+def use_tracer(tracer: Tracer) -> Iterator[Tracer]:
+    """Makes `tracer` current for the `with` block."""
+    token = activate(tracer)
+    try:
+        yield tracer
+    finally:
+        deactivate(token)
@@ -0,0 +1,127 @@
+"""
+The "sim" backend: observes and acts on a SimulatedDesktop instead of the real one.
+
+It has the interfaces of the screenshot (`capture_screenshot`), UIA
+(`get_focused_uia_tree`, `initialize_uia_thread`) and actuator (`execute_action`)
+backends, so a whole cycle runs against the simulator with
+
+    AIOS_SCREENSHOT_BACKEND=sim AIOS_UIA_BACKEND=sim AIOS_ACTUATOR_BACKEND=sim
+
+The desktop shown is the one installed with `set_desktop()` (a NotepadApp by default).
+"""
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from aios.artifact_store import ArtifactStore
+from aios.observers.artifact_writer import ArtifactWriter
+from aios.observers.frame_dedup import FrameDeduplicator
+from aios.observers.screenshot_signal import build_screenshot_signal
+from aios.protocols.action_protocol import VerifiedActionPlan
+from aios.protocols.schema import RawSignal, Receipt, UIATreeData
+from aios.runtime.metrics import ACTIONS, ACTUATION_SECONDS
+from aios.simulator.desktop import NotepadApp, SimulatedDesktop
+
+logger = logging.getLogger(__name__)
+
+_desktop: Optional[SimulatedDesktop] = None
+
+def set_desktop(desktop: SimulatedDesktop):
+    """Makes the backend observe and act on `desktop`."""
+    global _desktop
+    _desktop = desktop
+
+def get_desktop() -> SimulatedDesktop:
+    """Returns the current desktop, creating a Notepad desktop on first use."""
+    global _desktop
+    if _desktop is None:
+        _desktop = SimulatedDesktop(NotepadApp())
+    return _desktop
+
+def capture_screenshot(
+    artifact_dir: Path,
+    deduplicator: Optional[FrameDeduplicator] = None,
+    image_format: str = "png",
+    writer: Optional[ArtifactWriter] = None,
+    artifact_store: Optional[ArtifactStore] = None,
+    run_id: Optional[str] = None
+) -> RawSignal:
+    """Captures the simulated screen; see `aios.observers.screenshot.capture_screenshot`."""
+    raw, size = get_desktop().frame()
+    return build_screenshot_signal(raw, size, artifact_dir, deduplicator=deduplicator, image_format=image_format,
+                                   writer=writer, artifact_store=artifact_store, run_id=run_id)
+
+def initialize_uia_thread():
+    """Nothing to initialize without COM."""
+
+def _count_nodes(tree: Dict[str, Any]) -> int:
+    count, stack = 0, [tree]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.get("children", []))
+    return count
+
+def get_focused_uia_tree(
+    artifact_dir: Path,
+    max_depth: int = 5,
+    artifact_store: Optional[ArtifactStore] = None,
+    run_id: Optional[str] = None,
+    **kwargs: Any
+) -> RawSignal:
+    """
+    Captures the simulated window's UIA tree and saves it as an artifact, like
+    `aios.observers.uia.get_focused_uia_tree`. The trees are tiny, so walk budgets are ignored.
+    """
+    tree_structure = get_desktop().uia_tree()
+    json_bytes = json.dumps(tree_structure, indent=4).encode("utf-8")
+    if artifact_store is not None:
+        artifact_hash, file_path = artifact_store.put(json_bytes, ".json", run_id=run_id)
+    else:
+        uia_dir = artifact_dir / "uia_trees"
+        uia_dir.mkdir(parents=True, exist_ok=True)
+        file_path = uia_dir / f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}.json"
+        artifact_hash = hashlib.sha256(json_bytes).hexdigest()
+        with open(file_path, "wb") as f:
+            f.write(json_bytes)
+
+    return RawSignal(
+        observer_id="uia_observer_v1",
+        artifact_path=str(file_path),
+        artifact_hash=artifact_hash,
+        data=UIATreeData(focused_window_title=tree_structure["name"], tree_structure=tree_structure,
+                         walk_stats={"backend": "sim", "nodes": _count_nodes(tree_structure)})
+    )
+
+def execute_action(verified_action_plan: VerifiedActionPlan) -> Receipt:
+    """
+    Applies the VerifiedActionPlan to the simulated desktop.
+
+    Returns:
+        A "success" receipt whose message says whether the action was the correct one,
+        "dry_run_success" for dry runs (nothing is applied), or "rejected_unsafe".
+    """
+    start_time = time.perf_counter()
+    action = verified_action_plan.action_plan
+    if verified_action_plan.status == "rejected_unsafe":
+        status, message = "rejected_unsafe", "Action was rejected by Protocol2 as unsafe."
+    elif action.dry_run or verified_action_plan.status == "dry_run_completed":
+        status, message = "dry_run_success", f"Dry run: '{action.action_type}' was not applied to the simulator."
+    else:
+        correct, effect = get_desktop().execute(action)
+        status, message = "success", f"Simulated '{action.action_type}' ({'correct' if correct else 'incorrect'}): {effect}"
+    logger.info("Actuator: %s", message)
+    latency_s = time.perf_counter() - start_time
+    ACTIONS.inc(action_type=action.action_type, status=status)
+    ACTUATION_SECONDS.observe(latency_s)
+    return Receipt(
+        action_id=action.action_id,
+        status=status,
+        message=message,
+        latency_ms=latency_s * 1000
+    )
@@ -0,0 +1,282 @@
+"""
+A scripted desktop for closed-loop runs without Windows.
+
+A SimulatedDesktop shows one SimulatedApp: it renders the app's BGRA frame and
+UIA tree for the observers, and applies ActionPlans to the app's state for the
+actuator, scoring each action against what the scripted app expected. Two apps
+are provided:
+
+    NotepadApp       an editor; the task is to type `goal_text`
+    DinoRunnerApp    a Chrome Dino-like runner; the task is to jump over obstacles
+
+Simulated time advances one tick per executed action, so a run's outcome depends
+only on the actions taken, never on how fast the host is. The apps keep their key
+state in the first children of the window's UIA tree (the ones the Protocol LLM
+prompt includes), where the mock LLM server (aios.utils.mock_llm_server) reads it.
+"""
+from __future__ import annotations
+import random
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+import numpy as np
+
+from aios.protocols.schema import ActionPlan
+from aios.simulator.frames import make_dino_frame
+
+# UIA control type ids used by the simulated trees
+_WINDOW, _EDIT, _TEXT, _MENU_BAR, _STATUS_BAR = 50032, 50004, 50020, 50010, 50017
+
+def _node(name: str, control_type: int, class_name: str, rect: List[int], **extra: Any) -> Dict[str, Any]:
+    node = {
+        "name": name,
+        "control_type": control_type,
+        "automation_id": "",
+        "class_name": class_name,
+        "process_id": 4242,
+        "is_enabled": 1,
+        "is_keyboard_focusable": int(control_type == _EDIT),
+        "bounding_rectangle": rect,
+        "children": [],
+    }
+    node.update(extra)
+    return node
+
+def _parameter(action: ActionPlan, name: str, default: Any = None) -> Any:
+    parameters = action.parameters
+    if isinstance(parameters, dict):
+        return parameters.get(name, default)
+    return getattr(parameters, name, default)
+
+class SimulatedApp:
+    """Base class of the scripted apps shown by a SimulatedDesktop."""
+    title = ""
+    class_name = ""
+    size: Tuple[int, int] = (640, 360)
+
+    def render(self) -> np.ndarray:
+        """Returns the app's current frame as a (height, width, 4) uint8 BGRA array."""
+        raise NotImplementedError
+
+    def uia_children(self) -> List[Dict[str, Any]]:
+        """Returns the UIA nodes under the app window, key state first."""
+        raise NotImplementedError
+
+    def apply(self, action: ActionPlan) -> Tuple[bool, str]:
+        """
+        Applies an action to the app's state.
+
+        Returns:
+            Whether the action was the correct one in the current state, and a description.
+        """
+        raise NotImplementedError
+
+    def tick(self):
+        """Advances the app's world by one tick."""
+
+    def status(self) -> Dict[str, Any]:
+        """Returns the app's task progress."""
+        return {}
+
+class NotepadApp(SimulatedApp):
+    """
+    A Notepad-like editor. TypeString appends to the text, "enter" adds a newline and
+    "backspace" deletes the last character. An action is correct if it moves the text
+    towards `goal_text` (or, once it is typed, if it does nothing).
+    """
+    class_name = "Notepad"
+    size = (640, 360)
+    _CELL = (8, 14) # Character cell (width, height) in pixels
+    _MARGIN = 30 # Menu bar height
+
+    def __init__(self, goal_text: str = "Hello AIOS"):
+        self.goal_text = goal_text
+        self.text = ""
+
+    @property
+    def title(self) -> str:
+        return f"{'*' if self.text else ''}Untitled - Notepad"
+
+    def _on_track(self, text: str) -> bool:
+        return self.goal_text.startswith(text)
+
+    def apply(self, action: ActionPlan) -> Tuple[bool, str]:
+        before = self.text
+        if action.action_type == "TypeString":
+            self.text += _parameter(action, "text", "")
+            correct = self.text != before and self._on_track(self.text)
+        elif action.action_type == "KeyPress" and _parameter(action, "key") == "backspace":
+            self.text = self.text[:-1]
+            correct = not self._on_track(before)
+        elif action.action_type == "KeyPress" and _parameter(action, "key") == "enter":
+            self.text += "\n"
+            correct = self._on_track(self.text)
+        else:
+            correct = action.action_type in ("NoAction", "Log") and self.text == self.goal_text
+        return correct, f"Editor text is {self.text!r}."
+
+    def render(self) -> np.ndarray:
+        width, height = self.size
+        frame = np.full((height, width, 4), 255, dtype=np.uint8)
+        frame[:self._MARGIN, :, :3] = 240 # Menu bar
+        cell_w, cell_h = self._CELL
+        for row, line in enumerate(self.text.split("\n")):
+            top = self._MARGIN + 4 + row * cell_h
+            if top + cell_h > height:
+                break
+            for col, char in enumerate(line[:(width - 8) // cell_w]):
+                if not char.isspace():
+                    # A glyph-sized block whose shade depends on the character, so different texts differ
+                    left = 4 + col * cell_w
+                    frame[top + 2:top + cell_h - 2, left + 1:left + cell_w - 1, :3] = ord(char) % 96
+        return frame
+
+    def uia_children(self) -> List[Dict[str, Any]]:
+        width, height = self.size
+        line_count = self.text.count("\n") + 1
+        column = len(self.text.split("\n")[-1]) + 1
+        return [
+            _node("Text Editor", _EDIT, "Edit", [0, self._MARGIN, width, height - self._MARGIN - 20], value=self.text),
+            _node(f"Ln {line_count}, Col {column}", _STATUS_BAR, "msctls_statusbar32", [0, height - 20, width, 20]),
+            _node("Application", _MENU_BAR, "MenuBar", [0, 0, width, self._MARGIN]),
+        ]
+
+    def status(self) -> Dict[str, Any]:
+        return {"text": self.text, "goal_text": self.goal_text, "done": self.text == self.goal_text}
+
+class DinoRunnerApp(SimulatedApp):
+    """
+    A Chrome Dino-like runner. Every tick the obstacles come `speed_px` closer. A jump
+    ("space" or "up") clears the nearest obstacle if it is within `jump_window_px` of the
+    dino, and is wasted otherwise; an obstacle that reaches the dino uncleared is a crash.
+    Not jumping is correct unless it is the last tick the nearest obstacle can be cleared.
+    """
+    title = "chrome://dino/ - Google Chrome"
+    class_name = "Chrome_WidgetWin_1"
+    size = (600, 150)
+    _GROUND_Y = 130
+    _DINO_X = 20
+    _DINO_W = 44
+
+    def __init__(self, seed: int = 0, speed_px: int = 60, jump_window_px: Tuple[int, int] = (40, 160),
+                 spacing_px: Tuple[int, int] = (300, 600)):
+        self._rng = random.Random(seed)
+        self.speed_px = speed_px
+        self.jump_window_px = jump_window_px
+        self.spacing_px = spacing_px
+        # Obstacles as [distance from the dino's front in px, width, height, cleared]
+        self.obstacles: List[List[Any]] = []
+        self.score = 0
+        self.crashes = 0
+        self.wasted_jumps = 0
+        self.crashed = False
+        self._spawn()
+
+    def _spawn(self):
+        while len(self.obstacles) < 2:
+            last = self.obstacles[-1][0] if self.obstacles else 0
+            self.obstacles.append([last + self._rng.randint(*self.spacing_px), self._rng.choice((17, 25, 34)),
+                                   self._rng.choice((35, 50)), False])
+
+    def _next_obstacle(self) -> List[Any] | None:
+        return next((obstacle for obstacle in self.obstacles if not obstacle[3]), None)
+
+    def _in_jump_window(self, distance: int) -> bool:
+        return self.jump_window_px[0] <= distance <= self.jump_window_px[1]
+
+    def apply(self, action: ActionPlan) -> Tuple[bool, str]:
+        obstacle = self._next_obstacle()
+        if action.action_type == "KeyPress" and _parameter(action, "key") in ("space", "up"):
+            if obstacle is not None and self._in_jump_window(obstacle[0]):
+                obstacle[3] = True
+                self.score += 1
+                return True, f"Jumped over the obstacle at {obstacle[0]} px. Score: {self.score}."
+            self.wasted_jumps += 1
+            return False, "Jumped with no obstacle in reach."
+        last_chance = (obstacle is not None and self._in_jump_window(obstacle[0])
+                       and obstacle[0] - self.speed_px < self.jump_window_px[0])
+        correct = action.action_type in ("NoAction", "Log") and not last_chance
+        return correct, f"Did not jump; nearest obstacle at {obstacle[0] if obstacle else 'none'} px."
+
+    def tick(self):
+        self.crashed = False
+        for obstacle in self.obstacles:
+            obstacle[0] -= self.speed_px
+        for obstacle in [o for o in self.obstacles if o[0] < 0]:
+            if not obstacle[3]:
+                self.crashes += 1
+                self.crashed = True
+            self.obstacles.remove(obstacle)
+        self._spawn()
+
+    def render(self) -> np.ndarray:
+        width, height = self.size
+        front = self._DINO_X + self._DINO_W
+        return make_dino_frame(width, height, ground_y=self._GROUND_Y, dino_x=self._DINO_X,
+                               obstacles=[(front + distance, w, h) for distance, w, h, _ in self.obstacles])
+
+    def uia_children(self) -> List[Dict[str, Any]]:
+        width, height = self.size
+        obstacle = self._next_obstacle()
+        distance = f"{obstacle[0]} px" if obstacle is not None else "none"
+        return [
+            _node(f"Obstacle distance: {distance}", _TEXT, "Static", [0, 0, width, 20]),
+            _node(f"Score: {self.score}", _TEXT, "Static", [width - 100, 0, 100, 20]),
+            _node(f"Game state: {'crashed' if self.crashed else 'running'}", _TEXT, "Static", [0, 20, width, height - 20]),
+        ]
+
+    def status(self) -> Dict[str, Any]:
+        return {"score": self.score, "crashes": self.crashes, "wasted_jumps": self.wasted_jumps}
+
+class SimulatedDesktop:
+    """
+    Shows one SimulatedApp to the observers and applies actions to it. Thread-safe:
+    the observers and the actuator run on different threads. Only the last
+    `history_size` executed actions are kept in `history`; the counters cover all.
+    """
+
+    def __init__(self, app: SimulatedApp, history_size: int = 1000):
+        self.app = app
+        self._lock = threading.Lock()
+        self.actions = 0
+        self.correct_actions = 0
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+
+    def frame(self) -> Tuple[bytes, Tuple[int, int]]:
+        """Returns the current screen as a packed BGRA buffer and its (width, height)."""
+        with self._lock:
+            frame = self.app.render()
+        return frame.tobytes(), (frame.shape[1], frame.shape[0])
+
+    def uia_tree(self) -> Dict[str, Any]:
+        """Returns the UIA tree of the focused (only) window."""
+        with self._lock:
+            width, height = self.app.size
+            return _node(self.app.title, _WINDOW, self.app.class_name, [0, 0, width, height],
+                         children=self.app.uia_children())
+
+    def execute(self, action: ActionPlan) -> Tuple[bool, str]:
+        """
+        Applies `action` to the app, then advances the world by one tick.
+
+        Returns:
+            Whether the action was correct, and a description of its effect.
+        """
+        with self._lock:
+            correct, message = self.app.apply(action)
+            self.app.tick()
+            self.actions += 1
+            self.correct_actions += int(correct)
+            self.history.append({"action_type": action.action_type, "correct": correct, "message": message})
+        return correct, message
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the action count, correctness and the app's task progress."""
+        with self._lock:
+            return {
+                "actions": self.actions,
+                "correct_actions": self.correct_actions,
+                "accuracy": self.correct_actions / self.actions if self.actions else None,
+                **self.app.status(),
+            }
@@ -0,0 +1,46 @@
+"""
+Synthetic screen frames rendered by the simulated apps, and reused as benchmark
+and test fixtures.
+"""
+from typing import List, Tuple
+
+import numpy as np
+
+# Chrome Dino palette (light mode); night mode inverts it
+DINO_BACKGROUND = 247
+DINO_FOREGROUND = 83
+
+def make_dino_frame(
+    width: int = 600,
+    height: int = 150,
+    ground_y: int = 130,
+    obstacles: List[Tuple[int, int, int]] = (),
+    dino_x: int = 20,
+    dino_size: Tuple[int, int] = (44, 47),
+    night: bool = False,
+    channels: int = 4,
+) -> np.ndarray:
+    """
+    Renders a Chrome Dino frame as a (height, width, channels) uint8 BGRA array.
+
+    Args:
+        ground_y: Row of the one-pixel ground line; sprites stand on it.
+        obstacles: (x, width, height) boxes resting on the ground line.
+        dino_x: Left edge of the dino; dino_size is its (width, height).
+        night: Render with the inverted night-mode palette.
+    """
+    background, foreground = (DINO_BACKGROUND, DINO_FOREGROUND) if not night else (255 - DINO_BACKGROUND, 255 - DINO_FOREGROUND)
+    frame = np.full((height, width, channels), background, dtype=np.uint8)
+    if channels == 4:
+        frame[..., 3] = 255
+    frame[ground_y, :, :3] = foreground
+    # Sparse ground texture below the line, as in the game
+    frame[ground_y + 2:ground_y + 4, ::37, :3] = foreground
+
+    dino_w, dino_h = dino_size
+    frame[ground_y - dino_h:ground_y, dino_x:dino_x + dino_w, :3] = foreground
+    for x, obstacle_w, obstacle_h in obstacles:
+        x0, x1 = max(0, x), min(width, x + obstacle_w)
+        if x0 < x1:
+            frame[ground_y - obstacle_h:ground_y, x0:x1, :3] = foreground
+    return frame
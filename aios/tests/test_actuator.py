@@ -1,3 +1,4 @@
+import logging
 import pytest
 import uuid
 import time
@@ -42,17 +43,17 @@ def test_execute_action_typestring_success(mock_verified_action_plan):
         assert "Successfully typed" in receipt.message
         assert receipt.latency_ms > 0
 
-def test_execute_action_log_success(mock_verified_action_plan, capsys):
+def test_execute_action_log_success(mock_verified_action_plan, caplog):
     """Tests successful execution of a Log action."""
     mock_verified_action_plan.action_plan.action_type = "Log"
     mock_verified_action_plan.action_plan.parameters = {"message": "Test Log Message"}
     mock_verified_action_plan.status = "ready_for_execution"
     mock_verified_action_plan.action_plan.dry_run = False
 
-    receipt = execute_action(mock_verified_action_plan)
+    with caplog.at_level(logging.INFO):
+        receipt = execute_action(mock_verified_action_plan)
     
-    captured = capsys.readouterr()
-    assert "Actuator Log (Actual Execution): Test Log Message" in captured.out
+    assert "Actuator Log (Actual Execution): Test Log Message" in caplog.text
     assert receipt.status == "success"
     assert "Successfully logged message" in receipt.message
     assert receipt.latency_ms > 0
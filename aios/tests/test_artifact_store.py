@@ -0,0 +1,100 @@
+import hashlib
+import pytest
+import numpy as np
+from pathlib import Path
+
+from aios.artifact_store import ArtifactStore
+from aios.observers.artifact_writer import ArtifactWriter
+from aios.observers.frame_dedup import FrameDeduplicator
+from aios.observers.screenshot import build_screenshot_signal
+
+@pytest.fixture
+def store(tmp_path) -> ArtifactStore:
+    return ArtifactStore(tmp_path / "store")
+
+def test_put_is_content_addressed_and_sharded(store):
+    digest, path = store.put(b"hello", ".txt", run_id="run1")
+    assert digest == hashlib.sha256(b"hello").hexdigest()
+    assert path == store.objects_dir / digest[:2] / digest[2:4] / f"{digest}.txt"
+    assert path.read_bytes() == b"hello"
+    assert store.resolve(digest) == path
+    assert store.resolve("0" * 64) is None
+
+def test_put_deduplicates(store):
+    _, first = store.put(b"same", ".bin", run_id="run1")
+    mtime = first.stat().st_mtime_ns
+    _, second = store.put(b"same", ".bin", run_id="run2")
+    assert first == second
+    assert first.stat().st_mtime_ns == mtime # Not rewritten
+    assert len(list(store.objects_dir.glob("*/*/*"))) == 1
+    assert not list(first.parent.glob(".tmp-*"))
+
+def test_refcount_and_refs_persist(store):
+    digest, _ = store.put(b"data", run_id="run1")
+    store.put(b"data", run_id="run1")
+    store.put(b"data", run_id="run2")
+    assert store.refcount(digest) == 2
+    assert (store.refs_dir / "run1.refs").read_text().split() == [digest]
+
+    reopened = ArtifactStore(store.root)
+    assert reopened.refcount(digest) == 2
+
+def test_gc_removes_only_unreferenced_objects(store):
+    kept, kept_path = store.put(b"kept", run_id="run1")
+    shared, shared_path = store.put(b"shared", run_id="run1")
+    store.put(b"shared", run_id="run2")
+    dropped, dropped_path = store.put(b"dropped", run_id="run2")
+
+    store.release_run("run2")
+    assert store.refcount(shared) == 1
+    removed, freed = store.gc()
+
+    assert removed == 1 and freed == len(b"dropped")
+    assert kept_path.exists() and shared_path.exists()
+    assert not dropped_path.exists()
+
+def test_gc_rereads_refs_recorded_since_construction(store):
+    other = ArtifactStore(store.root) # E.g. another process storing a new run
+    digest, path = other.put(b"new run", run_id="run3")
+    assert store.gc() == (0, 0)
+    assert path.exists() and store.refcount(digest) == 1
+
+def test_unchanged_screenshot_is_referenced_by_the_new_run(tmp_path, store):
+    frame = np.full((64, 96, 4), 128, dtype=np.uint8).tobytes()
+    deduplicator = FrameDeduplicator()
+    first = build_screenshot_signal(frame, (96, 64), tmp_path, deduplicator=deduplicator, artifact_store=store,
+                                    run_id="run1")
+    second = build_screenshot_signal(frame, (96, 64), tmp_path, deduplicator=deduplicator, artifact_store=store,
+                                     run_id="run2")
+    assert second.data.unchanged and second.artifact_hash == first.artifact_hash
+    store.release_run("run1")
+    store.gc()
+    assert Path(second.artifact_path).exists()
+
+def test_screenshot_signal_resolves_through_store(tmp_path, store):
+    frame = np.full((64, 96, 4), 128, dtype=np.uint8).tobytes()
+    first = build_screenshot_signal(frame, (96, 64), tmp_path, artifact_store=store, run_id="run1")
+    second = build_screenshot_signal(frame, (96, 64), tmp_path, artifact_store=store, run_id="run1")
+
+    assert first.artifact_hash == second.artifact_hash
+    assert store.resolve(first.artifact_hash) == Path(first.artifact_path)
+    assert not (tmp_path / "screenshots").exists()
+    assert len(list(store.objects_dir.glob("*/*/*"))) == 1
+
+    with ArtifactWriter() as writer:
+        raw_signal = build_screenshot_signal(frame, (96, 64), tmp_path, image_format="raw", writer=writer,
+                                             artifact_store=store, run_id="run2")
+        writer.flush()
+    assert Path(raw_signal.artifact_path).read_bytes() == frame
+    assert store.refcount(raw_signal.artifact_hash) == 1
+
+def test_async_encoded_screenshot_is_keyed_by_its_stored_bytes(tmp_path, store):
+    frame = np.arange(64 * 96 * 4, dtype=np.uint32).astype(np.uint8).tobytes()
+    with ArtifactWriter() as writer:
+        signal = build_screenshot_signal(frame, (96, 64), tmp_path, image_format="png", writer=writer,
+                                         artifact_store=store, run_id="run1")
+        writer.flush()
+    stored = Path(signal.artifact_path).read_bytes()
+    assert stored.startswith(b"\x89PNG")
+    assert signal.artifact_hash == hashlib.sha256(stored).hexdigest() != hashlib.sha256(frame).hexdigest()
+    assert store.resolve(signal.artifact_hash) == Path(signal.artifact_path)
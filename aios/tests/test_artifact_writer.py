@@ -0,0 +1,73 @@
+import hashlib
+import threading
+import time
+import pytest
+import numpy as np
+from pathlib import Path
+
+from aios.observers.artifact_writer import ArtifactWriter, bgra_to_rgb, encode_frame
+from aios.observers.screenshot import build_screenshot_signal
+
+WIDTH, HEIGHT = 320, 200
+
+@pytest.fixture
+def bgra_frame() -> bytes:
+    """A synthetic packed BGRA frame."""
+    frame = np.zeros((HEIGHT, WIDTH, 4), dtype=np.uint8)
+    frame[..., 0] = 10  # B
+    frame[..., 1] = 20  # G
+    frame[..., 2] = np.arange(WIDTH, dtype=np.uint8)[None, :]  # R
+    frame[..., 3] = 255
+    return frame.tobytes()
+
+def test_bgra_to_rgb(bgra_frame):
+    rgb = np.frombuffer(bgra_to_rgb(bgra_frame, (WIDTH, HEIGHT)), dtype=np.uint8).reshape(HEIGHT, WIDTH, 3)
+    assert rgb[0, 5].tolist() == [5, 20, 10]
+
+def test_encode_frame_formats(bgra_frame):
+    assert encode_frame(bgra_frame, (WIDTH, HEIGHT), "raw") == bgra_frame
+    assert encode_frame(bgra_frame, (WIDTH, HEIGHT), "png").startswith(b"\x89PNG")
+    with pytest.raises(ValueError):
+        encode_frame(bgra_frame, (WIDTH, HEIGHT), "bmp")
+
+def test_sync_signal_hash_matches_file(tmp_path: Path, bgra_frame):
+    signal = build_screenshot_signal(bgra_frame, (WIDTH, HEIGHT), tmp_path, image_format="png")
+    artifact_path = Path(signal.artifact_path)
+    assert artifact_path.suffix == ".png"
+    assert signal.data.format == "png"
+    assert signal.artifact_hash == hashlib.sha256(artifact_path.read_bytes()).hexdigest()
+
+def test_async_signal_returns_before_write(tmp_path: Path, bgra_frame):
+    with ArtifactWriter(max_workers=1, max_pending=4) as writer:
+        signal = build_screenshot_signal(bgra_frame, (WIDTH, HEIGHT), tmp_path, image_format="raw", writer=writer)
+        assert signal.artifact_hash == hashlib.sha256(bgra_frame).hexdigest()
+        writer.flush()
+        assert Path(signal.artifact_path).read_bytes() == bgra_frame
+
+        png_signal = build_screenshot_signal(bgra_frame, (WIDTH, HEIGHT), tmp_path, image_format="png", writer=writer)
+        writer.flush()
+        assert Path(png_signal.artifact_path).read_bytes().startswith(b"\x89PNG")
+
+def test_artifact_writer_is_bounded(tmp_path: Path):
+    release = threading.Event()
+    writer = ArtifactWriter(max_workers=1, max_pending=2)
+
+    def slow_bytes() -> bytes:
+        release.wait(timeout=5)
+        return b"data"
+
+    writer.submit(tmp_path / "a", slow_bytes)
+    writer.submit(tmp_path / "b", slow_bytes)
+    assert writer.pending == 2
+
+    blocked = threading.Thread(target=writer.submit, args=(tmp_path / "c", slow_bytes))
+    blocked.start()
+    time.sleep(0.1)
+    assert blocked.is_alive() # Third submit waits for a free slot
+
+    release.set()
+    blocked.join(timeout=5)
+    writer.flush()
+    writer.close()
+    assert writer.pending == 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a", "b", "c"]
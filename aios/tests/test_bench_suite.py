@@ -0,0 +1,37 @@
+import pytest
+
+from aios.benchmarks import suite
+from aios.protocols import llm_connector
+
+def test_every_benchmark_sets_up_and_runs_once(tmp_path):
+    for name, setup in suite.BENCHMARKS.items():
+        workdir = tmp_path / name
+        workdir.mkdir()
+        try:
+            setup(workdir)()
+        finally:
+            suite.TEARDOWNS.get(name, lambda: None)()
+
+def test_run_undoes_process_wide_setup():
+    suite.run("prompt.core_agent", rounds=1, min_round_s=0.001)
+    assert "bench-suite-offline" not in llm_connector._registered_llm_clients
+
+def test_run_times_selected_benchmarks():
+    results = suite.run("schema.action_plan", rounds=2, min_round_s=0.001)
+    assert list(results) == ["schema.action_plan_validate"]
+    timing = results["schema.action_plan_validate"]
+    assert 0 < timing["best_us"] <= timing["median_us"] and timing["number"] >= 1
+
+def test_baseline_round_trip_and_regressions(tmp_path):
+    path = tmp_path / "baseline.json"
+    suite.save_baseline({"a": {"best_us": 10.0, "median_us": 11.0, "number": 8},
+                         "b": {"best_us": 10.0, "median_us": 11.0, "number": 8}}, path)
+    suite.save_baseline({"b": {"best_us": 20.0, "median_us": 21.0, "number": 8}}, path) # Merges
+    baseline = suite.load_baseline(path)
+    assert baseline["results"]["a"]["best_us"] == 10.0 and baseline["results"]["b"]["best_us"] == 20.0
+
+    comparison = suite.compare({"a": {"best_us": 13.0}, "b": {"best_us": 21.0}, "c": {"best_us": 1.0}}, baseline, threshold=0.25)
+    assert comparison["a"]["regressed"] and comparison["a"]["ratio"] == pytest.approx(1.3)
+    assert not comparison["b"]["regressed"]
+    assert comparison["c"] == {"best_us": 1.0, "baseline_us": None, "ratio": None, "regressed": False}
+    assert suite.load_baseline(tmp_path / "missing.json") is None
@@ -0,0 +1,116 @@
+import json
+import time
+import uuid
+
+import pytest
+
+from aios.event_stream import JsonlLogger
+from aios.memory.graph import GraphMemory
+from aios.protocols.schema import ActionPlan, Event, EventType, ObservationEvent
+from aios.runtime.checkpoint import CheckpointManager, read_event_tail
+from aios.runtime.deadline import DecisionCache
+
+def _observation(intent: str, summary: str) -> ObservationEvent:
+    return ObservationEvent(observation_id=str(uuid.uuid4()), raw_signals=[], ui_state_summary=summary,
+                            environment_state_summary="", potential_intent=intent)
+
+def _run_cycle(logger: JsonlLogger, graph: GraphMemory, cache: DecisionCache, intent: str, summary: str):
+    """Logs what run_aios_cycle logs for one cycle and updates the live state the same way."""
+    observation = _observation(intent, summary)
+    logger.log_event(Event(event_id=str(uuid.uuid4()), event_type=EventType.OBSERVATION, payload=observation))
+    update = graph.update(observation)
+    if update:
+        logger.log_event(Event(event_id=str(uuid.uuid4()), event_type=EventType.GRAPH_UPDATE, payload=update))
+    plan = ActionPlan(action_id=str(uuid.uuid4()), origin_observation_id=observation.observation_id,
+                      action_type="TypeString", parameters={"text": summary})
+    cache.remember(intent, summary, plan)
+    logger.log_event(Event(event_id=str(uuid.uuid4()), event_type=EventType.ACTION, payload=plan))
+
+@pytest.fixture
+def run_dir(tmp_path):
+    return tmp_path / "run"
+
+def _state(run_dir):
+    return JsonlLogger(run_dir / "events.jsonl"), GraphMemory(run_dir / "graph_memory.json"), DecisionCache()
+
+def test_restore_from_checkpoint_plus_tail(run_dir):
+    logger, graph, cache = _state(run_dir)
+    checkpoint = CheckpointManager(run_dir)
+    _run_cycle(logger, graph, cache, "Type in Notepad", "Notepad is empty")
+    saved = checkpoint.save(graph, cache, extra={"last_cycle_id": "c1"})
+    assert saved["event_log_offset"] == (run_dir / "events.jsonl").stat().st_size
+    _run_cycle(logger, graph, cache, "Type in Notepad", "Notepad shows Hello") # Crash before the next checkpoint
+
+    _, restored_graph, restored_cache = _state(run_dir)
+    result = CheckpointManager(run_dir).restore(restored_graph, restored_cache)
+    assert result["checkpoint"] == "checkpoint.json"
+    assert result["replayed_events"] == 3 and result["torn_bytes"] == 0
+    assert result["extra"] == {"last_cycle_id": "c1"}
+    assert [u.summary_of_change for u in restored_graph.graph_updates] == [u.summary_of_change for u in graph.graph_updates]
+    assert restored_graph.previous_observation.ui_state_summary == "Notepad shows Hello"
+    assert restored_cache.lookup("Type in Notepad", "Notepad is empty", "o").parameters.text == "Notepad is empty"
+    assert restored_cache.lookup("Type in Notepad", "Notepad shows Hello", "o") is not None
+
+def test_torn_tail_is_detected_and_cut(run_dir):
+    logger, graph, cache = _state(run_dir)
+    _run_cycle(logger, graph, cache, "i", "s1")
+    intact_size = (run_dir / "events.jsonl").stat().st_size
+    with open(run_dir / "events.jsonl", "ab") as f:
+        f.write(b'{"event_id": "torn", "event_type": "OBSERV') # Crash mid-write
+
+    result = CheckpointManager(run_dir).restore(GraphMemory(run_dir / "g.json"), DecisionCache())
+    assert result["checkpoint"] is None
+    assert result["torn_bytes"] > 0
+    assert (run_dir / "events.jsonl").stat().st_size == intact_size
+    logger.log_event(Event(event_id="next", event_type=EventType.OBSERVATION, payload=_observation("i", "s2")))
+    events, _, torn = read_event_tail(run_dir / "events.jsonl")
+    assert torn == 0 and events[-1].event_id == "next"
+
+def test_unparseable_terminated_line_is_treated_as_torn(run_dir):
+    run_dir.mkdir()
+    (run_dir / "events.jsonl").write_bytes(b'{"not": "an event"}\n')
+    events, offset, torn = read_event_tail(run_dir / "events.jsonl", repair=False)
+    assert events == [] and offset == 0 and torn > 0
+
+def test_invalid_line_in_the_middle_is_skipped_not_cut(run_dir):
+    logger, graph, cache = _state(run_dir)
+    _run_cycle(logger, graph, cache, "i", "s1")
+    with open(run_dir / "events.jsonl", "ab") as f:
+        f.write(b'{"event_id": "x", "event_type": "UNKNOWN", "payload": {}}\n')
+    _run_cycle(logger, graph, cache, "i", "s2")
+    size = (run_dir / "events.jsonl").stat().st_size
+
+    events, offset, torn = read_event_tail(run_dir / "events.jsonl")
+    assert torn == 0 and offset == size
+    assert (run_dir / "events.jsonl").stat().st_size == size
+    assert [e.payload.ui_state_summary for e in events if e.event_type == EventType.OBSERVATION] == ["s1", "s2"]
+
+def test_damaged_checkpoint_falls_back_to_previous(run_dir):
+    logger, graph, cache = _state(run_dir)
+    checkpoint = CheckpointManager(run_dir)
+    _run_cycle(logger, graph, cache, "i", "first")
+    checkpoint.save(graph, cache)
+    _run_cycle(logger, graph, cache, "i", "second")
+    checkpoint.save(graph, cache)
+    data = json.loads(checkpoint.path.read_text())
+    data["state"]["graph"]["graph_updates"] = [] # Corrupt the newest checkpoint
+    checkpoint.path.write_text(json.dumps(data))
+
+    restored = GraphMemory(run_dir / "g.json")
+    result = checkpoint.restore(restored, DecisionCache())
+    assert result["checkpoint"] == "checkpoint.prev.json"
+    assert restored.previous_observation.ui_state_summary == "second" # Reached via the event-log tail
+    assert len(restored.graph_updates) == len(graph.graph_updates)
+
+def test_restore_is_fast(run_dir):
+    logger, graph, cache = _state(run_dir)
+    for i in range(300):
+        _run_cycle(logger, graph, cache, "i", f"state {i}")
+    CheckpointManager(run_dir).save(graph, cache)
+    for i in range(100):
+        _run_cycle(logger, graph, cache, "i", f"later {i}")
+
+    start = time.perf_counter()
+    result = CheckpointManager(run_dir).restore(GraphMemory(run_dir / "g.json"), DecisionCache())
+    assert time.perf_counter() - start < 0.5
+    assert result["replayed_events"] == 300 # Only the tail, not the 1200-event log
@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+
+from aios.runtime.control_loop import BackgroundStrategy, ControlLoop, latency_summary
+
+class FakeClock:
+    """A manual clock; sleeping advances it."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+def test_latency_summary():
+    assert latency_summary([]) == {"mean_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    summary = latency_summary([1.0, 2.0, 3.0])
+    assert summary["mean_ms"] == pytest.approx(2.0)
+    assert summary["max_ms"] == 3.0
+
+def test_fixed_rate_with_fresh_frames():
+    clock = FakeClock()
+    actions = []
+
+    def observe():
+        return clock.now, clock.now # A new frame captured right now, every tick
+
+    def actuate(action):
+        clock.now += 0.002 # Actuation takes 2 ms
+        actions.append(action)
+
+    loop = ControlLoop(observe, lambda obs, strategy: obs, actuate, rate_hz=50, clock=clock, sleep=clock.sleep)
+    loop.run(max_ticks=10)
+    stats = loop.stats()
+    assert stats["ticks"] == 10 and stats["actions"] == 10
+    assert stats["deadline_misses"] == 0 and stats["stale_frames"] == 0
+    assert stats["jitter"]["max_ms"] == pytest.approx(0.0)
+    assert stats["obs_to_act_latency"]["mean_ms"] == pytest.approx(2.0)
+    assert stats["achieved_rate_hz"] == pytest.approx(50.0)
+
+def test_stale_and_repeated_frames_are_skipped():
+    clock = FakeClock()
+    frames = iter([(0.0, "a"), (0.0, "a"), (-1.0, "old"), (0.06, "b")])
+    handled = []
+    loop = ControlLoop(lambda: next(frames), lambda obs, strategy: handled.append(obs), lambda action: None,
+                       rate_hz=50, clock=clock, sleep=clock.sleep)
+    loop.run(max_ticks=4)
+    assert handled == ["a", "b"]
+    assert loop.stats()["stale_frames"] == 2
+
+def test_missing_frame_is_counted():
+    clock = FakeClock()
+    loop = ControlLoop(lambda: None, lambda obs, strategy: obs, lambda action: None, clock=clock, sleep=clock.sleep)
+    loop.run(max_ticks=3)
+    assert loop.stats()["no_frame"] == 3
+
+def test_overrun_drops_missed_ticks():
+    clock = FakeClock()
+    calls = []
+
+    def observe():
+        calls.append(clock.now)
+        if len(calls) == 2:
+            clock.now += 0.035 # Second tick overruns its 10 ms period by 3.5 periods
+        return clock.now, len(calls)
+
+    loop = ControlLoop(observe, lambda obs, strategy: None, lambda action: None, rate_hz=100,
+                       max_frame_age_s=1.0, clock=clock, sleep=clock.sleep)
+    loop.run(max_ticks=4)
+    stats = loop.stats()
+    assert stats["deadline_misses"] == 1
+    assert stats["skipped_ticks"] == 3
+    assert calls[2] == pytest.approx(0.05) # Resumes on the schedule instead of catching up in a burst
+
+def test_background_strategy_updates_off_the_loop():
+    release = threading.Event()
+
+    def slow_update(observation, current):
+        release.wait(1.0) # Stands in for a slow LLM call
+        return f"seen {observation}"
+
+    strategy = BackgroundStrategy(slow_update, interval_s=0.01, initial="initial")
+    seen = []
+    counter = iter(range(1_000_000))
+
+    def observe():
+        return time.perf_counter(), next(counter)
+
+    loop = ControlLoop(observe, lambda obs, current: seen.append(current), lambda action: None,
+                       rate_hz=200, strategy=strategy)
+    loop.start()
+    time.sleep(0.1)
+    assert seen and all(current == "initial" for current in seen) # Loop kept ticking while the update blocked
+    release.set()
+    deadline = time.perf_counter() + 2.0
+    while strategy.updates == 0 and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    loop.stop()
+    assert strategy.updates >= 1
+    assert seen[-1].startswith("seen ")
+    assert loop.stats()["strategy_updates"] >= 1
+
+def test_background_strategy_keeps_current_on_error():
+    def failing(observation, current):
+        raise RuntimeError("LLM unavailable")
+
+    strategy = BackgroundStrategy(failing, interval_s=0.01, initial="keep")
+    strategy.offer("obs")
+    strategy.start()
+    time.sleep(0.05)
+    strategy.stop()
+    assert strategy.errors >= 1
+    assert strategy.current == "keep"
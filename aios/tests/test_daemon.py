@@ -0,0 +1,100 @@
+import json
+import threading
+import urllib.request
+import uuid
+
+import pytest
+
+from aios.event_stream import JsonlLogger
+from aios.protocols.schema import ActionPlan, Event, EventType
+from aios.runtime.daemon import AIOSDaemon, DaemonClient, make_http_server
+from aios.runtime.logs import configure_logging, shutdown_logging
+
+def _fake_cycle(calls):
+    """A stand-in for run_aios_cycle that logs one ACTION event per run."""
+    def run_cycle(run_id, artifact_base_dir, user_instruction="", llm_api_key=None, logger=None, graph=None, **options):
+        calls.append({"run_id": run_id, "instruction": user_instruction, "api_key": llm_api_key, "graph": graph, **options})
+        if user_instruction == "explode":
+            raise RuntimeError("boom")
+        plan = ActionPlan(action_id=str(uuid.uuid4()), origin_observation_id="obs", action_type="NoAction", parameters={})
+        logger.log_event(Event(event_id=str(uuid.uuid4()), event_type=EventType.ACTION, payload=plan))
+        return True
+    return run_cycle
+
+@pytest.fixture
+def daemon(tmp_path):
+    calls = []
+    daemon = AIOSDaemon(tmp_path, _fake_cycle(calls), llm_api_key="default-key", cycle_options={"fused": True})
+    daemon.calls = calls
+    yield daemon
+    daemon.close()
+
+def test_logger_listener_receives_events(tmp_path):
+    logger = JsonlLogger(tmp_path / "events.jsonl")
+    received = []
+    logger.add_listener(lambda event, line: received.append(json.loads(line)["event_id"]))
+    logger.add_listener(lambda event, line: 1 / 0) # Failing listeners never break logging
+    plan = ActionPlan(action_id="a", origin_observation_id="o", action_type="NoAction", parameters={})
+    logger.log_event(Event(event_id="e1", event_type=EventType.ACTION, payload=plan))
+    assert received == ["e1"]
+    assert (tmp_path / "events.jsonl").read_text().count("\n") == 1
+
+def test_runs_share_warm_graph_and_stream_events(daemon):
+    first = daemon.submit("Open Notepad")
+    second = daemon.submit("Type hello", llm_api_key="other-key", fused=False)
+    first_lines = [json.loads(line) for line in daemon.iter_events(first, idle_timeout_s=5)]
+    second_lines = [json.loads(line) for line in daemon.iter_events(second, idle_timeout_s=5)]
+
+    assert [line.get("event_type") for line in first_lines] == ["ACTION", None]
+    assert first_lines[-1] == {"run_id": first, "status": "completed"}
+    assert second_lines[-1]["status"] == "completed"
+    assert daemon.calls[0]["graph"] is daemon.calls[1]["graph"] is daemon.graph
+    assert daemon.calls[0]["uia_walker"] is daemon.calls[1]["uia_walker"] is daemon.uia_walker
+    assert daemon.calls[0]["observer_scheduler"] is daemon.calls[1]["observer_scheduler"] is daemon.observer_scheduler
+    assert (daemon.calls[0]["api_key"], daemon.calls[0]["fused"]) == ("default-key", True)
+    assert (daemon.calls[1]["api_key"], daemon.calls[1]["fused"]) == ("other-key", False)
+    assert daemon.status(first) == {"run_id": first, "status": "completed", "events": 1}
+
+def test_failing_run_is_reported(daemon):
+    run_id = daemon.submit("explode")
+    lines = list(daemon.iter_events(run_id, idle_timeout_s=5))
+    assert json.loads(lines[-1]) == {"run_id": run_id, "status": "failed"}
+
+def test_http_api_end_to_end(daemon):
+    server = make_http_server(daemon, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = DaemonClient(f"http://127.0.0.1:{server.server_address[1]}")
+        assert client.is_alive()
+        run_id = client.submit("Open Notepad", llm_api_key="k")
+        events = list(client.stream_events(run_id))
+        assert events[0]["event_type"] == "ACTION"
+        assert events[-1] == {"run_id": run_id, "status": "completed"}
+        assert daemon.calls[-1]["api_key"] == "k"
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            assert 'aios_events_logged_total{event_type="ACTION"}' in response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_logs_endpoint_serves_recent_errors(daemon):
+    configure_logging(quiet=True)
+    try:
+        run_id = daemon.submit("explode")
+        list(daemon.iter_events(run_id, idle_timeout_s=5))
+    finally:
+        shutdown_logging() # Flushes the queue into the ring buffer
+    server = make_http_server(daemon, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/logs?level=ERROR&limit=5") as response:
+            records = json.loads(response.read())["records"]
+        assert records[-1]["message"].startswith(f"AIOS Daemon: Run {run_id} raised: boom")
+        assert records[-1]["level"] == "ERROR" and "RuntimeError" in records[-1]["message"] # With the traceback
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_client_reports_missing_daemon():
+    assert not DaemonClient("http://127.0.0.1:9").is_alive(timeout_s=0.2)
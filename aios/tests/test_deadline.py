@@ -0,0 +1,113 @@
+import threading
+import time
+import uuid
+
+import pytest
+
+from aios.protocols.schema import ActionPlan, DeadlineMiss, Event, EventType
+from aios.runtime.deadline import (
+    CycleBudget, Deadline, DeadlineExceeded, DecisionCache, call_with_deadline, no_action_plan
+)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_deadline_remaining_and_cap():
+    clock = FakeClock()
+    deadline = Deadline.after(2.0, clock)
+    assert deadline.remaining() == 2.0
+    assert deadline.cap(5.0) == 2.0 and deadline.cap(1.0) == 1.0 and deadline.cap(None) == 2.0
+    clock.now += 3.0
+    assert deadline.expired() and deadline.remaining() == 0.0
+
+    unbounded = Deadline.after(None, clock)
+    assert unbounded.remaining() is None and not unbounded.expired()
+    assert unbounded.cap(1.5) == 1.5
+
+def test_call_with_deadline():
+    assert call_with_deadline(Deadline.after(None), lambda x: x * 2, 21) == 42
+    assert call_with_deadline(Deadline.after(1.0), lambda: "fast") == "fast"
+    start = time.perf_counter()
+    with pytest.raises(DeadlineExceeded):
+        call_with_deadline(Deadline.after(0.05), time.sleep, 0.5)
+    assert time.perf_counter() - start < 0.3 # Gave up at the deadline, not when the call finished
+    with pytest.raises(DeadlineExceeded):
+        call_with_deadline(Deadline.after(0.0), lambda: None)
+
+def test_abandoned_calls_do_not_delay_later_ones():
+    release = threading.Event()
+    for _ in range(8): # More than any fixed pool would hold
+        with pytest.raises(DeadlineExceeded):
+            call_with_deadline(Deadline.after(0.01), release.wait)
+    try:
+        assert call_with_deadline(Deadline.after(1.0), lambda: "fresh") == "fresh"
+    finally:
+        release.set()
+
+def test_call_with_deadline_propagates_errors():
+    def fail():
+        raise ValueError("bad")
+    with pytest.raises(ValueError):
+        call_with_deadline(Deadline.after(1.0), fail)
+
+def test_budget_shares_propagate_slack():
+    clock = FakeClock()
+    budget = CycleBudget("cycle", 1.0, stage_weights={"a": 1, "b": 1, "c": 2}, clock=clock)
+    with budget.stage("a") as stage:
+        assert stage.budget_s == pytest.approx(0.25)
+        clock.now += 0.05 # Fast stage leaves slack
+    with budget.stage("b") as stage:
+        assert stage.budget_s == pytest.approx(0.95 / 3)
+    with budget.stage("c") as stage:
+        assert stage.budget_s == pytest.approx(0.95) # Last stage gets whatever is left
+    assert budget.misses == []
+
+def test_overrun_and_degradation_are_recorded():
+    clock = FakeClock()
+    recorded = []
+    budget = CycleBudget("cycle-1", 1.0, on_miss=recorded.append, clock=clock)
+    with budget.stage("observe") as stage:
+        clock.now += 0.5 # Share is 0.15 s
+    with budget.stage("protocol1") as stage:
+        stage.degrade("previous_observation")
+    assert [m.stage for m in recorded] == ["observe", "protocol1"]
+    assert recorded[0].degradation == "none"
+    assert recorded[0].elapsed_ms == pytest.approx(500.0)
+    assert recorded[0].budget_ms == pytest.approx(150.0)
+    assert recorded[1].degradation == "previous_observation"
+    assert budget.misses == recorded
+
+def test_unbounded_budget_records_nothing():
+    budget = CycleBudget("cycle", None)
+    with budget.stage("agent") as stage:
+        stage.degrade("no_action")
+        assert stage.deadline.remaining() is None
+    assert budget.misses == []
+
+def _plan(action_type="KeyPress"):
+    return ActionPlan(action_id=str(uuid.uuid4()), origin_observation_id="obs-1", action_type=action_type,
+                      parameters={"key": "space", "modifiers": []})
+
+def test_decision_cache():
+    cache = DecisionCache(max_entries=2)
+    plan = _plan()
+    cache.remember("Play Dino", "Obstacle ahead", plan)
+    cached = cache.lookup(" play dino", "obstacle ahead ", "obs-2")
+    assert cached.action_type == "KeyPress"
+    assert cached.origin_observation_id == "obs-2" and cached.action_id != plan.action_id
+    assert cache.lookup("Play Dino", "Clear road", "obs-3") is None
+    cache.remember("b", "b", plan)
+    cache.remember("c", "c", plan)
+    assert cache.lookup("Play Dino", "Obstacle ahead", "obs-4") is None # Evicted
+
+def test_deadline_miss_event_round_trip():
+    miss = DeadlineMiss(cycle_id="c", stage="agent", budget_ms=100.0, elapsed_ms=140.0, degradation="no_action")
+    event = Event(event_id="e", event_type=EventType.DEADLINE_MISS, payload=miss)
+    restored = Event.model_validate_json(event.model_dump_json())
+    assert isinstance(restored.payload, DeadlineMiss)
+    assert restored.payload.degradation == "no_action"
+    assert no_action_plan("obs", "late").action_type == "NoAction"
@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from aios.benchmarks.fixtures import make_dino_frame
+from aios.perception.dino import DinoObstacleDetector, locate_ground_row
+
+GROUND_Y = 130
+DINO_X_END = 64 # dino_x=20 plus its 44px width
+
+@pytest.fixture
+def detector() -> DinoObstacleDetector:
+    return DinoObstacleDetector(ground_y=GROUND_Y, dino_x_end=DINO_X_END)
+
+def test_locate_ground_row():
+    assert locate_ground_row(make_dino_frame(ground_y=GROUND_Y)) == GROUND_Y
+
+def test_no_obstacle(detector):
+    perception = detector.detect(make_dino_frame(ground_y=GROUND_Y), timestamp_s=0.0)
+    assert not perception.obstacle_present
+    assert not perception.should_jump
+
+@pytest.mark.parametrize("night", [False, True])
+def test_obstacle_geometry(detector, night):
+    frame = make_dino_frame(ground_y=GROUND_Y, obstacles=[(300, 17, 35), (450, 25, 50)], night=night)
+    perception = detector.detect(frame, timestamp_s=0.0)
+    assert perception.obstacle_present
+    assert perception.distance_px == 300 - DINO_X_END
+    assert perception.width_px == 17
+    assert perception.height_px == 35
+    assert perception.elevation_px == 0
+    assert perception.night_mode == night
+
+def test_cactus_group_with_small_gaps_is_one_obstacle(detector):
+    frame = make_dino_frame(ground_y=GROUND_Y, obstacles=[(300, 10, 30), (312, 10, 40), (324, 10, 30)])
+    perception = detector.detect(frame, timestamp_s=0.0)
+    assert perception.width_px == 34
+    assert perception.height_px == 40
+
+def test_speed_and_jump_decision(detector):
+    # Obstacle approaches at 400 px/s, sampled every 25 ms
+    jumped_at = None
+    for i in range(40):
+        x = 500 - 10 * i
+        perception = detector.detect(make_dino_frame(ground_y=GROUND_Y, obstacles=[(x, 17, 35)]), timestamp_s=i * 0.025)
+        if i > 0:
+            assert perception.speed_px_s == pytest.approx(400.0)
+        if perception.should_jump:
+            jumped_at = x - DINO_X_END
+            break
+    assert jumped_at is not None
+    assert jumped_at <= 400.0 * detector.jump_lead_s
+    assert jumped_at > detector.min_jump_distance_px # Jumped on time to collision, not at the last moment
+
+def test_new_obstacle_keeps_speed(detector):
+    detector.detect(make_dino_frame(ground_y=GROUND_Y, obstacles=[(200, 17, 35)]), timestamp_s=0.0)
+    detector.detect(make_dino_frame(ground_y=GROUND_Y, obstacles=[(190, 17, 35)]), timestamp_s=0.025)
+    perception = detector.detect(make_dino_frame(ground_y=GROUND_Y, obstacles=[(550, 17, 35)]), timestamp_s=0.05)
+    assert perception.speed_px_s == pytest.approx(400.0)
+
+def test_high_bird_is_not_jumped(detector):
+    frame = make_dino_frame(ground_y=GROUND_Y)
+    frame[GROUND_Y - 48:GROUND_Y - 30, 80:120, :3] = 83 # Bird floating 30px above the ground, right in front
+    perception = detector.detect(frame, timestamp_s=0.0)
+    assert perception.obstacle_present
+    assert perception.elevation_px == 30
+    assert not perception.should_jump
+
+def test_region_inside_full_screenshot():
+    screen = np.full((1080, 1920, 4), 30, dtype=np.uint8)
+    screen[400:550, 600:1200] = make_dino_frame(ground_y=GROUND_Y, obstacles=[(300, 17, 35)])
+    detector = DinoObstacleDetector(ground_y=GROUND_Y, dino_x_end=DINO_X_END, region=(600, 400, 600, 150))
+    assert detector.detect(screen, timestamp_s=0.0).distance_px == 300 - DINO_X_END
+
+def test_observe_emits_observation_event(detector):
+    event = detector.observe(make_dino_frame(ground_y=GROUND_Y, obstacles=[(300, 17, 35)]), timestamp_s=0.0)
+    assert event.potential_intent == "Play Chrome Dino Game."
+    assert event.perception["distance_px"] == 300 - DINO_X_END
+    assert "236px ahead" in event.ui_state_summary
+
+def _recorded_screenshots(limit: int = 5) -> list[Path]:
+    runs_dir = Path(__file__).resolve().parents[2] / "aios_demo_runs"
+    return sorted(runs_dir.glob("*/artifacts/screenshots/*.png"))[:limit]
+
+def test_recorded_frames_from_demo_runs():
+    Image = pytest.importorskip("PIL.Image", reason="Decoding recorded PNG frames needs Pillow.")
+    screenshots = _recorded_screenshots()
+    if not screenshots:
+        pytest.skip("No recorded screenshots in aios_demo_runs.")
+    for path in screenshots:
+        frame = np.asarray(Image.open(path).convert("RGBA"))
+        detector = DinoObstacleDetector(ground_y=locate_ground_row(frame), dino_x_end=DINO_X_END)
+        perception = detector.detect(frame, timestamp_s=0.0)
+        if perception.obstacle_present:
+            assert 0 <= perception.distance_px < frame.shape[1]
@@ -0,0 +1,78 @@
+import csv
+import uuid
+
+import numpy as np
+
+from aios.event_stream import JsonlLogger
+from aios.protocols.schema import ActionPlan, DeadlineMiss, Event, EventType, Receipt
+from aios.utils.event_export import event_tables, export_csv, export_npz
+
+def _log_run(run_dir, latencies):
+    logger = JsonlLogger(run_dir / "events.jsonl")
+    for i, latency_ms in enumerate(latencies):
+        plan = ActionPlan(action_id=f"a{i}", origin_observation_id=f"o{i}", action_type="KeyPress",
+                          parameters={"key": "space"})
+        logger.log_event(Event(event_id=str(uuid.uuid4()), event_type=EventType.ACTION, payload=plan))
+        receipt = Receipt(action_id=f"a{i}", status="success" if i else "failure", message="x" * 500,
+                          latency_ms=latency_ms)
+        logger.log_event(Event(event_id=str(uuid.uuid4()), event_type=EventType.RECEIPT, payload=receipt))
+    miss = DeadlineMiss(cycle_id="c0", stage="agent", budget_ms=50.0, elapsed_ms=80.0, degradation="cached_decision")
+    logger.log_event(Event(event_id=str(uuid.uuid4()), event_type=EventType.DEADLINE_MISS, payload=miss))
+
+def test_export_tables_per_event_type(tmp_path):
+    runs = tmp_path / "aios_demo_runs"
+    _log_run(runs / "run_a", [10.0, 20.0])
+    _log_run(runs / "run_b", [30.0])
+    with open(runs / "run_b" / "events.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"event_id": "torn", "event_ty') # A crashed run's last line
+
+    counts = export_npz([runs], tmp_path / "events.npz", max_text_chars=50)
+    assert counts == {"action": 3, "receipt": 3, "deadline_miss": 2}
+    with np.load(tmp_path / "events.npz") as tables: # No pickled objects
+        receipts = tables["receipt"]
+        assert receipts["run_id"].tolist() == ["run_a", "run_a", "run_b"]
+        assert receipts["latency_ms"][receipts["status"] == "success"].sum() == 20.0
+        assert receipts["timestamp"].dtype == np.dtype("datetime64[us]")
+        assert receipts.dtype["message"] == np.dtype("U50")
+        assert tables["action"]["action_type"].tolist() == ["KeyPress"] * 3
+        assert tables["deadline_miss"]["elapsed_ms"].tolist() == [80.0, 80.0]
+
+    assert export_csv([runs / "run_a", runs / "run_b" / "events.jsonl"], tmp_path / "csv") == counts
+    with open(tmp_path / "csv" / "receipt.csv", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [(row["run_id"], row["status"], float(row["latency_ms"])) for row in rows] == \
+        [("run_a", "failure", 10.0), ("run_a", "success", 20.0), ("run_b", "failure", 30.0)]
+    assert len(rows[0]["message"]) == 500 # CSV keeps text in full
+
+    assert event_tables([tmp_path / "missing"]) == {}
+
+def test_chunked_tables_match_and_bad_numbers_are_nan(tmp_path, caplog):
+    run = tmp_path / "run"
+    _log_run(run, [10.0, 20.0, 30.0])
+    with open(run / "events.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"event_id": "e", "event_type": "RECEIPT", "timestamp": "2026-01-01T00:00:00", '
+                '"payload": {"action_id": "a9", "status": "success", "latency_ms": "fast", "message": "m"}}\n')
+
+    whole = event_tables([run])
+    chunked = event_tables([run], chunk_rows=1) # Text widths differ between chunks
+    assert chunked.keys() == whole.keys()
+    for name in whole:
+        assert chunked[name].dtype == whole[name].dtype
+        for field in whole[name].dtype.names:
+            np.testing.assert_array_equal(chunked[name][field], whole[name][field]) # Equal NaNs pass
+    latencies = chunked["receipt"]["latency_ms"]
+    assert latencies[:3].tolist() == [10.0, 20.0, 30.0] and np.isnan(latencies[3])
+    assert "Skipped 1 unreadable events or values" in caplog.text
+
+def test_bad_timestamps_and_payloads_do_not_abort_the_export(tmp_path, caplog):
+    run = tmp_path / "run"
+    _log_run(run, [10.0])
+    with open(run / "events.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"event_id": "e1", "event_type": "RECEIPT", "timestamp": "yesterday", '
+                '"payload": {"action_id": "a8", "status": "success", "latency_ms": 5, "message": "m"}}\n')
+        f.write('{"event_id": "e2", "event_type": "OBSERVATION", "timestamp": "2026-01-01T00:00:00", "payload": [1, 2]}\n')
+
+    receipts = event_tables([run])["receipt"]
+    assert receipts["action_id"].tolist()[-1] == "a8" and np.isnat(receipts["timestamp"][-1])
+    assert export_csv([run], tmp_path / "csv")["receipt"] == 2
+    assert "Skipped 2 unreadable events or values" in caplog.text
@@ -0,0 +1,59 @@
+import json
+import uuid
+from datetime import datetime, timedelta
+
+from aios.event_stream import EventLogTailer, EventTimeline, JsonlLogger
+from aios.protocols.schema import ActionPlan, Event, EventType, ObservationEvent, RawSignal, Receipt, ScreenshotData
+
+def _event(event_type: EventType, payload) -> Event:
+    return Event(event_id=str(uuid.uuid4()), event_type=event_type, payload=payload, timestamp=payload.timestamp)
+
+def test_tailer_reads_only_complete_new_lines(tmp_path):
+    path = tmp_path / "run" / "events.jsonl"
+    tailer = EventLogTailer(path)
+    assert tailer.read_new() == [] # Nothing logged yet
+
+    logger = JsonlLogger(path)
+    plan = ActionPlan(action_id="a1", origin_observation_id="o1", action_type="NoAction", parameters={})
+    logger.log_event(_event(EventType.ACTION, plan))
+    assert [e["payload"]["action_id"] for e in tailer.read_new()] == ["a1"]
+    assert tailer.read_new() == []
+
+    # A line still being written is left for the next read
+    line = _event(EventType.RECEIPT, Receipt(action_id="a1", status="success", message="ok", latency_ms=2.5)).model_dump_json()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line[:20])
+    assert tailer.read_new() == []
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line[20:] + "\n")
+    assert [e["event_type"] for e in tailer.read_new()] == ["RECEIPT"]
+
+    # A replaced (shorter) log is read from the start; max_bytes reads a backlog in chunks
+    path.write_text("".join(json.dumps({"event_type": "ACTION", "n": i}) + "\n" for i in range(3)), encoding="utf-8")
+    assert [e["n"] for e in tailer.read_new(max_bytes=10)] == [0] # Longer than max_bytes, still read whole
+    assert [e["n"] for e in tailer.read_new()] == [1, 2]
+
+def test_timeline_latency_columns():
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    signal = RawSignal(observer_id="screenshot_observer_v1", artifact_path="s.png", artifact_hash="h",
+                       data=ScreenshotData(screen_size=(10, 10)), timestamp=start)
+    observation = ObservationEvent(observation_id="o1", raw_signals=[signal], ui_state_summary="Notepad is open",
+                                   environment_state_summary="", potential_intent="type",
+                                   timestamp=start + timedelta(milliseconds=40))
+    plan = ActionPlan(action_id="a1", origin_observation_id="o1", action_type="TypeString",
+                      parameters={"text": "hi"}, timestamp=start + timedelta(milliseconds=240))
+    receipt = Receipt(action_id="a1", status="success", message="Typed.", latency_ms=12.5,
+                      timestamp=start + timedelta(milliseconds=260))
+    events = [json.loads(_event(t, p).model_dump_json()) for t, p in
+              ((EventType.OBSERVATION, observation), (EventType.ACTION, plan), (EventType.RECEIPT, receipt))]
+
+    timeline = EventTimeline()
+    timeline.append(events[:1])
+    timeline.append(events[1:])
+    assert len(timeline) == 3
+    rows = timeline.rows(0, 10)
+    # (seq, time, type, summary, latency ms, since observation ms, delta ms)
+    assert rows[0] == (1, "12:00:00.040", "OBSERVATION", "Notepad is open", "40.0", "0.0", "")
+    assert rows[1] == (2, "12:00:00.240", "ACTION", 'TypeString {"text": "hi"}', "", "200.0", "200.0")
+    assert rows[2] == (3, "12:00:00.260", "RECEIPT", "success: Typed.", "12.5", "220.0", "20.0")
+    assert timeline.rows(2, 10) == rows[2:]
@@ -0,0 +1,106 @@
+import pytest
+import numpy as np
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+from aios.observers.frame_dedup import downsample_grayscale, perceptual_hash, hamming_distance, FrameDeduplicator
+from aios.observers.screenshot import capture_screenshot
+from aios.protocols.schema import RawSignal, ScreenshotData
+
+def _synthetic_frame(height=720, width=1280, seed=0) -> np.ndarray:
+    """Returns a BGRA frame with a smooth gradient and a few solid blocks, like a desktop."""
+    rng = np.random.default_rng(seed)
+    frame = np.zeros((height, width, 4), dtype=np.uint8)
+    frame[..., :3] = np.linspace(0, 200, width, dtype=np.uint8)[None, :, None]
+    for _ in range(5):
+        y, x = rng.integers(0, height - 100), rng.integers(0, width - 200)
+        frame[y:y + 100, x:x + 200, :3] = rng.integers(0, 255, 3, dtype=np.uint8)
+    frame[..., 3] = 255
+    return frame
+
+def _frame_with_window(frame: np.ndarray) -> np.ndarray:
+    """Returns a copy of the frame with a large striped window opened over it."""
+    changed = frame.copy()
+    changed[80:640, 160:1120, :3] = 255
+    changed[80:640:40, 160:1120, :3] = 0
+    changed[80:640, 160:1120:60, :3] = 30
+    return changed
+
+def _fake_sct_img(frame: np.ndarray) -> MagicMock:
+    """Builds an object shaped like mss.screenshot.ScreenShot from a BGRA array."""
+    sct_img = MagicMock()
+    sct_img.raw = frame.tobytes()
+    sct_img.rgb = frame[..., 2::-1].tobytes()
+    sct_img.width, sct_img.height = frame.shape[1], frame.shape[0]
+    sct_img.size = (frame.shape[1], frame.shape[0])
+    return sct_img
+
+@pytest.fixture
+def mock_mss():
+    """Patches mss so that grab() returns frames pushed by the test."""
+    with patch("aios.observers.screenshot.mss.mss") as mock_mss_cls:
+        sct = mock_mss_cls.return_value.__enter__.return_value
+        sct.monitors = [{}, {"left": 0, "top": 0, "width": 1280, "height": 720}]
+        yield sct
+
+def test_downsample_grayscale_shape():
+    small = downsample_grayscale(_synthetic_frame(), 8, 9)
+    assert small.shape == (8, 9)
+    assert small.dtype == np.float32
+
+def test_downsample_grayscale_rejects_tiny_frames():
+    with pytest.raises(ValueError):
+        downsample_grayscale(np.zeros((4, 4), dtype=np.uint8), 8, 9)
+
+def test_perceptual_hash_identical_frames():
+    frame = _synthetic_frame()
+    assert perceptual_hash(frame) == perceptual_hash(frame.copy())
+
+def test_perceptual_hash_stable_under_noise():
+    frame = _synthetic_frame()
+    noise = np.random.default_rng(1).integers(-3, 4, frame.shape)
+    noisy = np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+    assert hamming_distance(perceptual_hash(frame), perceptual_hash(noisy)) <= 4
+
+def test_perceptual_hash_differs_for_changed_screen():
+    assert hamming_distance(perceptual_hash(_synthetic_frame(seed=0)), perceptual_hash(_frame_with_window(_synthetic_frame(seed=0)))) > 4
+
+def test_hamming_distance():
+    assert hamming_distance(0b1011, 0b0001) == 2
+    assert hamming_distance(5, 5) == 0
+
+def test_frame_deduplicator_requires_previous_signal():
+    dedup = FrameDeduplicator(hamming_threshold=4)
+    frame = _synthetic_frame()
+    is_duplicate, frame_hash = dedup.check(frame)
+    assert not is_duplicate
+
+    signal = RawSignal(observer_id="test", artifact_path="a.png", artifact_hash="h", data=ScreenshotData(screen_size=(1280, 720)))
+    dedup.remember(frame_hash, signal)
+    assert dedup.check(frame)[0]
+    assert not dedup.check(_frame_with_window(frame))[0]
+
+    dedup.reset()
+    assert not dedup.check(frame)[0]
+
+def test_capture_screenshot_skips_unchanged_frames(tmp_path: Path, mock_mss):
+    dedup = FrameDeduplicator()
+    frame = _synthetic_frame()
+    mock_mss.grab.return_value = _fake_sct_img(frame)
+
+    first = capture_screenshot(tmp_path, deduplicator=dedup)
+    assert not first.data.unchanged
+    assert Path(first.artifact_path).exists()
+
+    with patch("aios.observers.screenshot.mss.tools.to_png") as mock_to_png:
+        second = capture_screenshot(tmp_path, deduplicator=dedup)
+        mock_to_png.assert_not_called()
+    assert second.data.unchanged
+    assert second.artifact_path == first.artifact_path
+    assert second.artifact_hash == first.artifact_hash
+    assert len(list((tmp_path / "screenshots").iterdir())) == 1
+
+    mock_mss.grab.return_value = _fake_sct_img(_frame_with_window(frame))
+    third = capture_screenshot(tmp_path, deduplicator=dedup)
+    assert not third.data.unchanged
+    assert third.artifact_path != first.artifact_path
@@ -6,7 +6,7 @@ import json
 import os # Added for path manipulation
 
 from aios.protocols.schema import RawSignal, ObservationEvent, ScreenshotData, UIATreeData, LogData
-from aios.protocols.llm_connector import request_protocol_llm_observation, request_core_agent_llm_action, _construct_prompt_from_raw_signals, _load_prompt_from_file
+from aios.protocols.llm_connector import _get_llm_client, clear_llm_clients, request_protocol_llm_observation, request_core_agent_llm_action, request_fused_llm_observation_action, _construct_prompt_from_raw_signals, _load_prompt_from_file
 from aios.llm.llm_client import LLMClient
 from aios.protocols.schema import ProtocolLLMOutput, ActionPlan
 
@@ -42,9 +42,11 @@ TEST_API_KEY = "test-api-key"
 @pytest.fixture
 def mock_llm_client():
     """Mocks the LLMClient for isolated testing."""
+    clear_llm_clients() # A client cached by an earlier test would bypass the mock
     with patch('aios.protocols.llm_connector.LLMClient') as MockLLMClient:
         mock_instance = MockLLMClient.return_value
         yield mock_instance
+    clear_llm_clients()
 
 @pytest.fixture
 def mock_protocol_llm_prompt():
@@ -178,3 +180,75 @@ def test_request_core_agent_llm_action_invalid_response_raises_error(mock_llm_cl
             llm_api_key=TEST_API_KEY,
             core_llm_prompt_filename="core_llm_prompt.txt"
         )
+
+# --- Tests for request_fused_llm_observation_action ---
+@pytest.fixture
+def mock_fused_llm_prompt():
+    """Mocks loading of the fused LLM prompt file."""
+    with patch("aios.protocols.llm_connector._load_prompt_from_file", return_value="You are FusedAgentLLM.") as m_load:
+        yield m_load
+
+def test_request_fused_llm_observation_action_success(mock_llm_client, mock_fused_llm_prompt):
+    """Test that a single fused call yields both an ObservationEvent and a linked ActionPlan."""
+    mock_llm_client.generate.return_value = {
+        "intent": "Play Chrome Dino Game.",
+        "ui_state_summary": "Dino game is running.",
+        "confidence": 0.9,
+        "action_plan": {
+            "action_id": str(uuid.uuid4()),
+            "origin_observation_id": "made-up-by-llm",
+            "action_type": "KeyPress",
+            "parameters": {"key": "space"},
+            "constraints": {"safety_check": True},
+            "dry_run": False
+        }
+    }
+
+    observation_event, action_plan = request_fused_llm_observation_action(
+        raw_signals=[mock_screenshot_signal, mock_uia_signal],
+        graph_memory_summary="Graph summary here.",
+        user_instruction="Play Chrome Dino",
+        llm_api_key=TEST_API_KEY,
+        fused_llm_prompt_filename="fused_llm_prompt.txt"
+    )
+
+    mock_llm_client.generate.assert_called_once()
+    args, kwargs = mock_llm_client.generate.call_args
+    assert "Graph summary here." in kwargs['user_prompt']
+    assert "Play Chrome Dino" in kwargs['user_prompt']
+    assert observation_event.observation_id in kwargs['user_prompt']
+    assert "action_plan" in kwargs['json_schema']['properties']
+    assert isinstance(observation_event, ObservationEvent)
+    assert observation_event.potential_intent == "Play Chrome Dino Game."
+    assert observation_event.raw_signals == [mock_screenshot_signal, mock_uia_signal]
+    assert isinstance(action_plan, ActionPlan)
+    assert action_plan.action_type == "KeyPress"
+    assert action_plan.origin_observation_id == observation_event.observation_id
+
+def test_request_fused_llm_observation_action_invalid_response_raises_error(mock_llm_client, mock_fused_llm_prompt):
+    """Test that a fused response without a valid ActionPlan is rejected."""
+    mock_llm_client.generate.return_value = {
+        "intent": "Test Intent",
+        "ui_state_summary": "Test UI Summary",
+        "confidence": 0.5
+        # Missing action_plan
+    }
+    with pytest.raises(RuntimeError, match="Fused LLM response invalid"):
+        request_fused_llm_observation_action(
+            raw_signals=[mock_screenshot_signal],
+            graph_memory_summary="summary",
+            user_instruction="instruction",
+            llm_api_key=TEST_API_KEY,
+            fused_llm_prompt_filename="fused_llm_prompt.txt"
+        )
+
+def test_llm_clients_are_cached_per_api_key_and_base_url(monkeypatch):
+    clear_llm_clients()
+    monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
+    with patch('aios.protocols.llm_connector.LLMClient') as MockLLMClient:
+        assert _get_llm_client(TEST_API_KEY) is _get_llm_client(TEST_API_KEY)
+        monkeypatch.setenv("OPENAI_BASE_URL", "http://127.0.0.1:8000/v1")
+        _get_llm_client(TEST_API_KEY)
+        _get_llm_client("other-api-key")
+    assert MockLLMClient.call_count == 3
+    clear_llm_clients()
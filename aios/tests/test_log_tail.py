@@ -0,0 +1,129 @@
+import os
+import pytest
+
+from aios.observers.log_tail import LogTailObserver
+from aios.artifact_store import ArtifactStore
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"old line 1\nold line 2\n")
+    return path
+
+def _append(path, data: bytes):
+    with open(path, "ab") as f:
+        f.write(data)
+
+def test_starts_at_end_and_reads_only_new_lines(log_file):
+    observer = LogTailObserver([log_file])
+    assert observer.poll() == []
+
+    _append(log_file, b"new 1\nnew 2\n")
+    signals = observer.poll()
+    assert len(signals) == 1
+    data = signals[0].data
+    assert data.new_lines == ["new 1", "new 2"]
+    assert data.start_offset == len(b"old line 1\nold line 2\n")
+    assert data.end_offset == log_file.stat().st_size
+    assert observer.poll() == []
+
+def test_from_beginning(log_file):
+    observer = LogTailObserver([log_file], from_beginning=True)
+    assert observer.poll()[0].data.new_lines == ["old line 1", "old line 2"]
+
+def test_partial_line_waits_for_newline(log_file):
+    observer = LogTailObserver([log_file])
+    observer.poll()
+    _append(log_file, b"half")
+    assert observer.poll() == []
+    _append(log_file, b" done\nnext")
+    assert observer.poll()[0].data.new_lines == ["half done"]
+
+def test_caps_lines_per_signal(log_file):
+    observer = LogTailObserver([log_file], max_lines_per_signal=3, block_size=4)
+    observer.poll()
+    _append(log_file, b"".join(f"line {i}\n".encode() for i in range(7)))
+    batches = [observer.poll()[0].data.new_lines for _ in range(3)]
+    assert batches == [["line 0", "line 1", "line 2"], ["line 3", "line 4", "line 5"], ["line 6"]]
+    assert observer.poll() == []
+
+def test_truncation_restarts_from_zero(log_file):
+    observer = LogTailObserver([log_file])
+    observer.poll()
+    log_file.write_bytes(b"fresh\n")
+    signal = observer.poll()[0]
+    assert signal.data.new_lines == ["fresh"]
+    assert signal.data.start_offset == 0
+
+def test_rotation_reads_new_file_from_start(log_file):
+    observer = LogTailObserver([log_file])
+    observer.poll()
+    os.replace(log_file, log_file.with_suffix(".log.1"))
+    log_file.write_bytes(b"after rotation line that is long enough\n")
+    assert observer.poll()[0].data.new_lines == ["after rotation line that is long enough"]
+
+def test_offsets_persist_across_restarts(log_file, tmp_path):
+    state_file = tmp_path / "offsets.json"
+    LogTailObserver([log_file], state_file=state_file).poll()
+    _append(log_file, b"while stopped\n")
+
+    restarted = LogTailObserver([log_file], state_file=state_file)
+    assert restarted.poll()[0].data.new_lines == ["while stopped"]
+    assert restarted.poll() == []
+
+def test_state_is_saved_only_when_offsets_change(log_file, tmp_path):
+    state_file = tmp_path / "offsets.json"
+    observer = LogTailObserver([log_file], state_file=state_file)
+    observer.poll()
+    saved_at = state_file.stat().st_mtime_ns
+    os.utime(state_file, ns=(saved_at - 10**9, saved_at - 10**9))
+    observer.poll() # Nothing new
+    assert state_file.stat().st_mtime_ns == saved_at - 10**9
+    _append(log_file, b"new\n")
+    observer.poll()
+    assert state_file.stat().st_mtime_ns != saved_at - 10**9
+
+def test_unreadable_state_file_starts_fresh(log_file, tmp_path):
+    state_file = tmp_path / "offsets.json"
+    state_file.write_text("{not json")
+    observer = LogTailObserver([log_file], state_file=state_file, from_beginning=True)
+    assert observer.poll()[0].data.new_lines == ["old line 1", "old line 2"]
+    assert LogTailObserver([log_file], state_file=state_file).offsets == observer.offsets # Rewritten
+
+def test_lines_end_only_at_newlines(log_file):
+    observer = LogTailObserver([log_file])
+    observer.poll()
+    _append(log_file, "a\rb\x0bc\u2028d\r\ne\n".encode("utf-8"))
+    assert observer.poll()[0].data.new_lines == ["a\rb\x0bc\u2028d", "e"]
+
+def test_multiple_files_and_missing_file(log_file, tmp_path):
+    other = tmp_path / "other.log"
+    other.write_bytes(b"")
+    observer = LogTailObserver([log_file, other, tmp_path / "missing.log"])
+    observer.poll()
+    _append(log_file, b"a\n")
+    _append(other, b"b\n")
+    signals = observer.poll()
+    assert {s.data.log_source: s.data.new_lines[0] for s in signals} == {str(log_file): "a", str(other): "b"}
+
+def test_observe_merges_files_into_one_signal(log_file, tmp_path):
+    other = tmp_path / "other.log"
+    other.write_bytes(b"")
+    observer = LogTailObserver([log_file, other])
+    assert observer.observe().data.new_lines == []
+    _append(log_file, b"a\n")
+    assert observer.observe().data.log_source == str(log_file)
+    _append(log_file, b"b\n")
+    _append(other, b"c\n")
+    signal = observer.observe()
+    assert signal.data.new_lines == ["b", "c"]
+    assert signal.data.log_source == f"{log_file};{other}"
+
+def test_artifact_store(log_file, tmp_path):
+    store = ArtifactStore(tmp_path / "store")
+    observer = LogTailObserver([log_file], artifact_store=store, run_id="run1")
+    observer.poll()
+    _append(log_file, b"stored\n")
+    signal = observer.poll()[0]
+    assert store.exists(signal.artifact_hash)
+    assert open(signal.artifact_path, "rb").read() == b"stored\n"
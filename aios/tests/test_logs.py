@@ -0,0 +1,69 @@
+import io
+import json
+import logging
+import threading
+
+import pytest
+
+from aios.event_stream import JsonlLogger
+from aios.protocols.schema import ActionPlan, Event, EventType
+from aios.runtime.logs import configure_logging, recent_records, shutdown_logging
+
+def test_records_reach_console_and_ring_buffer_through_the_queue():
+    stream = io.StringIO()
+    ring = configure_logging("INFO", stream=stream, ring_capacity=3)
+    try:
+        logger = logging.getLogger("aios.test_logs")
+        logger.debug("hidden %s", "debug")
+        thread = threading.Thread(target=logger.info, args=("from a worker: %d", 7))
+        thread.start()
+        thread.join()
+        for i in range(3):
+            logger.warning("warning %d", i, extra={"cycle": i})
+    finally:
+        shutdown_logging()
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 4 and "INFO    aios.test_logs: from a worker: 7" in lines[0]
+    assert "hidden" not in stream.getvalue()
+    assert [record.getMessage() for record in ring.records()] == ["warning 0", "warning 1", "warning 2"]
+    last = recent_records(limit=1, level="WARNING")[0]
+    assert (last["message"], last["level"], last["cycle"]) == ("warning 2", "WARNING", 2)
+
+def test_json_format_keeps_structured_fields(tmp_path):
+    stream = io.StringIO()
+    configure_logging("INFO", json_format=True, stream=stream)
+    try:
+        plan = ActionPlan(action_id="a", origin_observation_id="o", action_type="NoAction", parameters={})
+        JsonlLogger(tmp_path / "events.jsonl").log_event(Event(event_id="e1", event_type=EventType.ACTION, payload=plan))
+    finally:
+        shutdown_logging()
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    logged = next(record for record in records if record["message"].startswith("Logged event"))
+    assert (logged["logger"], logged["event_id"], logged["event_type"]) == ("aios.event_stream", "e1", "ACTION")
+
+def test_quiet_mode_writes_nothing_and_skips_info_records():
+    root_level = logging.getLogger().level
+    stream = io.StringIO()
+    configure_logging("DEBUG", quiet=True, stream=stream)
+    try:
+        logger = logging.getLogger("aios.test_logs")
+        assert not logger.isEnabledFor(logging.INFO) # Hot-loop calls stop at the level check
+        logger.info("progress")
+        logger.error("failure")
+    finally:
+        shutdown_logging()
+
+    assert stream.getvalue() == ""
+    assert [record["message"] for record in recent_records()] == ["failure"]
+    assert logging.getLogger().level == root_level
+
+def test_unknown_level_is_rejected_before_any_change():
+    root = logging.getLogger()
+    handlers, root_level = list(root.handlers), root.level
+    for quiet in (False, True):
+        with pytest.raises(ValueError, match="verbose"):
+            configure_logging("verbose", quiet=quiet)
+    assert root.handlers == handlers and root.level == root_level
+    shutdown_logging() # Nothing to undo, and no error
@@ -0,0 +1,148 @@
+import re
+import threading
+import urllib.request
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from aios.backends import load_backend
+from aios.event_stream import JsonlLogger
+from aios.llm.pool import ResponseCache
+from aios.memory.graph import GraphMemory
+from aios.protocols.action_protocol import VerifiedActionPlan
+from aios.protocols.schema import ActionPlan, Event, EventType, ObservationEvent
+from aios.runtime.deadline import CycleBudget, DecisionCache
+from aios.runtime.metrics import CONTENT_TYPE, MetricsRegistry, REGISTRY, make_metrics_server
+
+_SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{(.*)\})? (\S+)$')
+_LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+def scrape(url: str) -> dict:
+    """A stand-in Prometheus scraper: fetches the endpoint and parses the text format strictly."""
+    with urllib.request.urlopen(url, timeout=5) as response:
+        assert response.headers["Content-Type"] == CONTENT_TYPE
+        text = response.read().decode("utf-8")
+    samples, types = {}, {}
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, metric_type = line.split(" ")
+            types[name] = metric_type
+        elif line and not line.startswith("#"):
+            match = _SAMPLE.match(line)
+            assert match, f"Malformed sample line: {line!r}"
+            name, _, labels, value = match.groups()
+            samples[(name, frozenset(_LABEL.findall(labels or "")))] = float(value)
+    return {"samples": samples, "types": types}
+
+def value(scraped: dict, name: str, **labels) -> float:
+    return scraped["samples"].get((name, frozenset((k, str(v)) for k, v in labels.items())), 0.0)
+
+@pytest.fixture
+def metrics_url():
+    server = make_metrics_server(REGISTRY, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/metrics"
+    server.shutdown()
+    server.server_close()
+
+def test_registry_exposition_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("app_requests_total", "Requests.", ["path"])
+    requests.inc(path='/a"b')
+    requests.inc(2, path='/a"b')
+    registry.gauge("app_queue_depth", "Queue depth.").set(3)
+    latency = registry.histogram("app_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.5, 5.0):
+        latency.observe(seconds)
+
+    text = registry.render()
+    assert '# TYPE app_requests_total counter\napp_requests_total{path="/a\\"b"} 3.0' in text
+    assert "app_queue_depth 3.0" in text
+    assert 'app_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'app_latency_seconds_bucket{le="1.0"} 2' in text
+    assert 'app_latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "app_latency_seconds_count 3" in text and "app_latency_seconds_sum 5.55" in text
+
+    assert registry.counter("app_requests_total", "Requests.", ["path"]) is requests
+    with pytest.raises(ValueError):
+        registry.gauge("app_requests_total", "Requests.", ["path"])
+    with pytest.raises(ValueError):
+        requests.inc(method="GET")
+    with pytest.raises(ValueError):
+        requests.inc(-1, path="/")
+
+def test_loop_components_are_scraped(tmp_path, metrics_url):
+    before = scrape(metrics_url)
+    run_dir = tmp_path / "metrics_run"
+
+    logger = JsonlLogger(run_dir / "events.jsonl")
+    graph = GraphMemory(run_dir / "graph_memory.json", name="metrics_run")
+    observation = ObservationEvent(observation_id=str(uuid.uuid4()), raw_signals=[], ui_state_summary="Notepad",
+                                   environment_state_summary="", potential_intent="Type")
+    graph.update(observation)
+    graph.save()
+    logger.log_event(Event(event_id=str(uuid.uuid4()), event_type=EventType.OBSERVATION, payload=observation))
+
+    budget = CycleBudget("c1", budget_s=None)
+    with budget.stage("observe"):
+        pass
+    decision_cache = DecisionCache()
+    decision_cache.lookup("Type", "Notepad", observation.observation_id)
+    cache = ResponseCache()
+    cache.put("k", {"ok": True})
+    cache.get("k")
+
+    plan = ActionPlan(action_id="a1", origin_observation_id=observation.observation_id, action_type="NoAction", parameters={})
+    load_backend("actuator", "none").execute_action(VerifiedActionPlan(action_plan=plan, status="ready_for_execution"))
+
+    after = scrape(metrics_url)
+    assert after["types"]["aios_stage_duration_seconds"] == "histogram"
+
+    def delta(name, **labels):
+        return value(after, name, **labels) - value(before, name, **labels)
+
+    assert delta("aios_events_logged_total", event_type="OBSERVATION") == 1
+    assert delta("aios_event_log_bytes_total") == (run_dir / "events.jsonl").stat().st_size
+    assert value(after, "aios_graph_memory_updates", graph="metrics_run") == 1
+    assert value(after, "aios_graph_memory_bytes", graph="metrics_run") == (run_dir / "graph_memory.json").stat().st_size
+    assert delta("aios_stage_duration_seconds_count", stage="observe") == 1
+    assert delta("aios_decision_cache_lookups_total", result="miss") == 1
+    assert delta("aios_llm_cache_lookups_total", result="hit") == 1
+    assert delta("aios_actions_total", action_type="NoAction", status="dry_run_success") == 1
+
+def test_llm_client_requests_and_errors(metrics_url):
+    llm_client = pytest.importorskip("aios.llm.llm_client")
+    client = llm_client.LLMClient(api_key="test-key", model_name="metrics-model")
+    replies = [SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='{"ok": true}'))])]
+
+    def create(**kwargs):
+        if not replies:
+            raise RuntimeError("server error")
+        return replies.pop()
+
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    before = scrape(metrics_url)
+    assert client.generate("system", "user", json_schema={"type": "object"}) == {"ok": True}
+    with pytest.raises(RuntimeError):
+        client.generate("system", "user", json_schema={"type": "object"})
+    after = scrape(metrics_url)
+
+    def delta(name, **labels):
+        return value(after, name, **labels) - value(before, name, **labels)
+
+    assert delta("aios_llm_requests_total", model="metrics-model", outcome="success") == 1
+    assert delta("aios_llm_requests_total", model="metrics-model", outcome="RuntimeError") == 1
+    assert delta("aios_llm_request_duration_seconds_count", model="metrics-model") == 2
+
+def test_graph_metrics_use_the_explicit_name(tmp_path):
+    from aios.runtime.metrics import GRAPH_BYTES
+    for directory in ("a", "b", "c"):
+        (tmp_path / directory / "run").mkdir(parents=True)
+    series_before = len(GRAPH_BYTES.samples())
+    GraphMemory(tmp_path / "a" / "run" / "graph_memory.json").save()
+    assert len(GRAPH_BYTES.samples()) == series_before # Unnamed graphs add no series
+
+    GraphMemory(tmp_path / "b" / "run" / "graph_memory.json", name="graph-b").save()
+    GraphMemory(tmp_path / "c" / "run" / "graph_memory.json", name="graph-c").save()
+    assert GRAPH_BYTES.value(graph="graph-b") > 0 and GRAPH_BYTES.value(graph="graph-c") > 0 # Same parent name, two series
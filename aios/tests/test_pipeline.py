@@ -0,0 +1,103 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+from aios.runtime.pipeline import BlockingQueue, LatestQueue, PipelineItem, PipelineRunner, PipelineStage
+
+def test_latest_queue_discards_superseded_items():
+    q = LatestQueue(maxsize=1)
+    q.put(PipelineItem(1, 0.0, "old"))
+    q.put(PipelineItem(2, 0.0, "new"))
+    assert q.get(timeout=0.1).payload == "new"
+    assert q.discarded == 1
+    assert q.get(timeout=0.01) is None
+
+def test_blocking_queue_gives_up_when_stopped():
+    q = BlockingQueue(maxsize=1)
+    stop = threading.Event()
+    q.put(PipelineItem(1, 0.0, "a"), stop)
+    stop.set()
+    q.put(PipelineItem(2, 0.0, "b"), stop)
+    assert q.discarded == 1
+
+def _sleeper(seconds, result=lambda payload: payload):
+    def fn(payload):
+        time.sleep(seconds)
+        return result(payload)
+    return fn
+
+def _source(seconds, counter):
+    def observe():
+        time.sleep(seconds)
+        return next(counter)
+    return observe
+
+def test_stages_overlap():
+    # Deciding cycle n waits until perceiving cycle n + 1 has started: only overlapping stages get there
+    started = [threading.Event() for _ in range(64)]
+    overlapped = []
+
+    def perceive(payload):
+        if payload < len(started):
+            started[payload].set()
+        return payload
+
+    def decide(payload):
+        if len(overlapped) < 3: # Later cycles run freely, so stopping never waits on them
+            overlapped.append(started[payload + 1].wait(timeout=5.0))
+        return payload
+
+    runner = PipelineRunner(source=_source(0.0, itertools.count()),
+                            stages=[PipelineStage("perceive", perceive), PipelineStage("decide", decide)],
+                            min_source_interval_s=0.001)
+    runner.run(max_cycles=3, duration_s=30.0)
+    stats = runner.stats()
+    assert overlapped == [True, True, True]
+    assert stats["stages"]["observe"]["processed"] >= stats["cycles_completed"]
+    assert 0.0 < stats["stages"]["perceive"]["utilisation"] <= 1.0
+
+def test_latest_only_discards_superseded_observations():
+    counter = itertools.count()
+    decided = []
+    runner = PipelineRunner(
+        source=_source(0.005, counter),
+        stages=[PipelineStage("decide", _sleeper(0.05, lambda p: decided.append(p) or p), latest_only=True)],
+    )
+    runner.run(duration_s=0.4)
+    stats = runner.stats()
+    assert stats["stages"]["decide"]["superseded"] > 0
+    assert decided == sorted(decided) # Always the newest, never out of order
+    assert decided[-1] - decided[0] > len(decided) # Intermediate observations were skipped
+
+def test_none_drops_cycle_and_errors_are_counted():
+    counter = itertools.count()
+
+    def perceive(payload):
+        if payload % 3 == 0:
+            return None # e.g. unchanged screen
+        if payload % 3 == 1:
+            raise RuntimeError("LLM failed")
+        return payload
+
+    runner = PipelineRunner(source=_source(0.002, counter), stages=[PipelineStage("perceive", perceive, queue_size=100)])
+    runner.run(max_cycles=5, duration_s=5)
+    stats = runner.stats()["stages"]["perceive"]
+    assert runner.completed >= 5
+    assert stats["errors"] >= 4 and stats["dropped"] >= 8
+
+def test_stale_items_are_discarded():
+    counter = itertools.count()
+    runner = PipelineRunner(
+        source=lambda: next(counter),
+        stages=[PipelineStage("slow", _sleeper(0.02), queue_size=50), PipelineStage("act", lambda p: p, max_age_s=0.05, queue_size=50)],
+        min_source_interval_s=0.001,
+    )
+    runner.run(duration_s=0.3)
+    assert runner.stats()["stages"]["act"]["stale"] > 0
+
+def test_run_requires_a_bound():
+    runner = PipelineRunner(source=lambda: None, stages=[PipelineStage("s", lambda p: p)])
+    with pytest.raises(ValueError):
+        runner.run()
@@ -0,0 +1,73 @@
+import threading
+import time
+import pytest
+import numpy as np
+
+from aios.observers.roi_capture import FrameRingBuffer, SyntheticFrameSource, ROICaptureLoop
+
+HEIGHT, WIDTH = 40, 160
+
+def test_ring_buffer_latest_is_ordered_and_zero_copy():
+    buffer = FrameRingBuffer(capacity=4, height=HEIGHT, width=WIDTH)
+    source = SyntheticFrameSource(HEIGHT, WIDTH, render=lambda i, out: out.fill(i))
+    for i in range(6):
+        source.grab_into(buffer.acquire_slot())
+        buffer.commit(float(i))
+
+    latest = buffer.latest(3)
+    assert [seq for seq, _, _ in latest] == [3, 4, 5]
+    assert [ts for _, ts, _ in latest] == [3.0, 4.0, 5.0]
+    for seq, _, frame in latest:
+        assert frame[0, 0, 0] == seq
+        assert np.shares_memory(frame, buffer.frames)
+        assert not frame.flags.writeable
+
+def test_ring_buffer_never_returns_slot_being_written():
+    buffer = FrameRingBuffer(capacity=3, height=HEIGHT, width=WIDTH)
+    for i in range(10):
+        buffer.acquire_slot()
+        buffer.commit(float(i))
+    assert len(buffer.latest(10)) == 2
+    assert buffer.latest(0) == []
+
+def test_ring_buffer_rejects_tiny_capacity():
+    with pytest.raises(ValueError):
+        FrameRingBuffer(capacity=1, height=HEIGHT, width=WIDTH)
+
+def test_capture_loop_with_synthetic_source():
+    buffer = FrameRingBuffer(capacity=16, height=HEIGHT, width=WIDTH)
+    source = SyntheticFrameSource(HEIGHT, WIDTH)
+    with ROICaptureLoop(source, buffer, target_rate_hz=200) as loop:
+        time.sleep(0.2)
+    stats = loop.stats()
+
+    assert stats["frames_captured"] >= 10
+    assert stats["achieved_rate_hz"] <= 260
+    timestamps = [ts for _, ts, _ in buffer.latest(8)]
+    assert timestamps == sorted(timestamps)
+
+def test_capture_loop_skips_missed_ticks():
+    buffer = FrameRingBuffer(capacity=4, height=HEIGHT, width=WIDTH)
+    source = SyntheticFrameSource(HEIGHT, WIDTH, render=lambda i, out: time.sleep(0.03))
+    with ROICaptureLoop(source, buffer, target_rate_hz=100) as loop:
+        time.sleep(0.2)
+    stats = loop.stats()
+    assert stats["missed_ticks"] > 0
+    assert stats["frames_captured"] < 10
+
+def test_capture_loop_rejects_mismatched_shapes():
+    with pytest.raises(ValueError):
+        ROICaptureLoop(SyntheticFrameSource(HEIGHT, WIDTH), FrameRingBuffer(4, HEIGHT, WIDTH + 1))
+
+def test_first_frame_comes_from_the_capture_thread():
+    grabbed_on = []
+
+    def render(frame_index, out):
+        grabbed_on.append(threading.current_thread())
+        out.fill(frame_index % 256)
+
+    buffer = FrameRingBuffer(capacity=4, height=HEIGHT, width=WIDTH)
+    with ROICaptureLoop(SyntheticFrameSource(HEIGHT, WIDTH, render=render), buffer, target_rate_hz=100) as loop:
+        first = loop.wait_for_frame(timeout_s=1.0)
+        assert first.shape == (HEIGHT, WIDTH, 4) and first.flags.writeable
+    assert threading.main_thread() not in grabbed_on
@@ -0,0 +1,119 @@
+import threading
+import time
+import pytest
+from datetime import datetime, timedelta
+
+from aios.observers.scheduler import ObserverScheduler
+from aios.protocols.aggregator import aggregate_signals, select_primary_frame
+from aios.protocols.schema import RawSignal, ScreenshotData, UIATreeData
+
+BASE_TIME = datetime(2026, 1, 1, 12, 0, 0)
+
+def _signal(observer_id: str, offset_ms: float = 0.0) -> RawSignal:
+    return RawSignal(
+        observer_id=observer_id,
+        artifact_path="",
+        artifact_hash="",
+        data=ScreenshotData(screen_size=(1, 1)),
+        timestamp=BASE_TIME + timedelta(milliseconds=offset_ms)
+    )
+
+def _slow_observer(observer_id: str, delay_s: float):
+    def observe() -> RawSignal:
+        time.sleep(delay_s)
+        return RawSignal(observer_id=observer_id, artifact_path="", artifact_hash="",
+                         data=UIATreeData(focused_window_title=observer_id, tree_structure={}))
+    return observe
+
+# --- Aggregation ---
+
+def test_aggregate_signals_within_tolerance():
+    frames = aggregate_signals([_signal("uia", 30), _signal("screenshot", 0)], tolerance_ms=50)
+    assert len(frames) == 1
+    assert [s.observer_id for s in frames[0].raw_signals] == ["screenshot", "uia"]
+    assert frames[0].skew_ms == pytest.approx(30)
+
+def test_aggregate_signals_splits_beyond_tolerance_and_repeats():
+    signals = [_signal("screenshot", 0), _signal("uia", 120), _signal("screenshot", 130)]
+    frames = aggregate_signals(signals, tolerance_ms=50)
+    assert [[s.observer_id for s in f.raw_signals] for f in frames] == [["screenshot"], ["uia", "screenshot"]]
+
+    frames = aggregate_signals([_signal("screenshot", 0), _signal("screenshot", 10)], tolerance_ms=50)
+    assert len(frames) == 2
+
+def test_select_primary_frame_prefers_complete_then_recent():
+    frames = aggregate_signals([_signal("a", 0), _signal("b", 10), _signal("a", 200)], tolerance_ms=50)
+    assert len(select_primary_frame(frames).raw_signals) == 2
+    frames = aggregate_signals([_signal("a", 0), _signal("a", 200)], tolerance_ms=50)
+    assert select_primary_frame(frames).raw_signals[0].timestamp == BASE_TIME + timedelta(milliseconds=200)
+    assert select_primary_frame([]) is None
+
+# --- Scheduler ---
+
+def test_scheduler_runs_observers_concurrently():
+    with ObserverScheduler() as scheduler:
+        scheduler.register("fast", _slow_observer("fast", 0.05))
+        scheduler.register("slow", _slow_observer("slow", 0.2))
+        start = time.perf_counter()
+        frames = scheduler.run_once(tolerance_ms=50)
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.2 + 0.15 # Bounded by the slowest observer, not the sum
+    assert len(frames) == 1 # Stamped at capture start, so the slow signal is not a frame of its own
+    frame = frames[0]
+    assert {s.observer_id for s in frame.raw_signals} == {"fast", "slow"}
+    assert frame.observer_latency_ms["slow"] >= 200
+    assert frame.observer_latency_ms["fast"] < frame.observer_latency_ms["slow"]
+    assert frame.skew_ms < 50
+
+def test_scheduler_reports_errors_and_timeouts():
+    def failing() -> RawSignal:
+        raise RuntimeError("no display")
+
+    with ObserverScheduler() as scheduler:
+        scheduler.register("ok", _slow_observer("ok", 0.0))
+        scheduler.register("broken", failing)
+        scheduler.register("stuck", _slow_observer("stuck", 1.0))
+        frames = scheduler.run_once(timeout_s=0.3)
+
+    assert [s.observer_id for s in frames[0].raw_signals] == ["ok"]
+    assert frames[0].observer_errors["broken"] == "no display"
+    assert "Timed out" in frames[0].observer_errors["stuck"]
+
+def test_scheduler_uses_thread_initializer():
+    initialized = []
+    with ObserverScheduler(thread_initializer=lambda: initialized.append(True)) as scheduler:
+        scheduler.register("ok", _slow_observer("ok", 0.0))
+        scheduler.run_once()
+        with pytest.raises(RuntimeError):
+            scheduler.register("late", _slow_observer("late", 0.0))
+    assert initialized
+
+def test_scheduler_kept_across_cycles_replaces_observers():
+    with ObserverScheduler() as scheduler:
+        scheduler.register("uia", _slow_observer("first", 0.0))
+        assert scheduler.run_once()[0].raw_signals[0].observer_id == "first"
+        scheduler.register("uia", _slow_observer("second", 0.0))
+        assert scheduler.run_once()[0].raw_signals[0].observer_id == "second"
+
+def test_scheduler_does_not_rerun_a_busy_observer():
+    release = threading.Event()
+    calls = []
+
+    def hung() -> RawSignal:
+        calls.append(True)
+        release.wait()
+        return _slow_observer("hung", 0.0)()
+
+    with ObserverScheduler() as scheduler:
+        scheduler.register("hung", hung)
+        scheduler.register("ok", _slow_observer("ok", 0.0))
+        assert "Timed out" in scheduler.run_once(timeout_s=0.05)[0].observer_errors["hung"]
+        frame = scheduler.run_once(timeout_s=0.05)[0]
+        assert "Busy" in frame.observer_errors["hung"]
+        assert [s.observer_id for s in frame.raw_signals] == ["ok"] # The pool still has a free worker
+        assert len(calls) == 1
+        release.set()
+        scheduler._running["hung"].result(timeout=1.0)
+        assert {s.observer_id for s in scheduler.run_once(timeout_s=1.0)[0].raw_signals} == {"hung", "ok"}
+        assert len(calls) == 2
@@ -0,0 +1,135 @@
+import threading
+import time
+
+import pytest
+
+from aios.llm.pool import RateLimiter, ResponseCache, SharedLLMClient
+from aios.protocols import llm_connector
+from aios.runtime.sessions import SessionManager
+
+class SlowFakeLLM:
+    """Stands in for LLMClient: each request takes `latency_s`."""
+    model_name = "fake"
+    temperature = 0.0
+
+    def __init__(self, latency_s: float = 0.02):
+        self.latency_s = latency_s
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, system_prompt, user_prompt, json_schema=None):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency_s)
+        return {"echo": user_prompt}
+
+def _llm_cycle(run_id, artifact_base_dir, llm_api_key=None, logger=None, graph=None, decision_cache=None, prompt=None):
+    """A cycle making one LLM call through the connector's client registry."""
+    client = llm_connector._get_llm_client(llm_api_key)
+    response = client.generate("system", prompt or f"{artifact_base_dir.name}/{run_id}")
+    return response["echo"] is not None
+
+def test_rate_limiter_token_bucket():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(rate_per_s=10, burst=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(4):
+        limiter.acquire()
+    assert sleeps == [pytest.approx(0.1), pytest.approx(0.1)] # Burst of 2, then 10/s
+    assert limiter.waited_s == pytest.approx(0.2)
+
+def test_response_cache_lru_and_copies():
+    cache = ResponseCache(max_entries=2)
+    k1, k2, k3 = (ResponseCache.key("m", 0.0, "s", u, None) for u in ("a", "b", "c"))
+    cache.put(k1, {"v": [1]})
+    cached = cache.get(k1)
+    cached["v"].append(2)
+    assert cache.get(k1) == {"v": [1]}
+    cache.put(k2, {"v": 2})
+    cache.put(k3, {"v": 3})
+    assert cache.get(k1) is None # Evicted
+    assert (cache.hits, cache.misses) == (2, 1)
+
+def test_shared_client_caches_identical_requests():
+    fake = SlowFakeLLM(latency_s=0.0)
+    shared = SharedLLMClient(fake, cache=ResponseCache())
+    assert shared.generate("s", "u", {"type": "object"}) == {"echo": "u"}
+    assert shared.generate("s", "u", {"type": "object"}) == {"echo": "u"}
+    shared.generate("s", "other")
+    assert fake.calls == 2
+    assert shared.stats()["cache_hits"] == 1
+
+def test_shared_client_does_not_replay_sampled_responses():
+    fake = SlowFakeLLM(latency_s=0.0)
+    fake.temperature = 0.7
+    shared = SharedLLMClient(fake, cache=ResponseCache())
+    shared.generate("s", "u")
+    shared.generate("s", "u")
+    assert fake.calls == 2
+    assert shared.stats()["cache_hits"] == 0
+
+def test_sessions_are_isolated(tmp_path):
+    with SessionManager(tmp_path, _llm_cycle, llm_api_key="sessions-isolated", llm_client=SlowFakeLLM(0.0)) as manager:
+        a, b = manager.add_session("a"), manager.add_session("b")
+        with pytest.raises(ValueError):
+            manager.add_session("a")
+        stats = manager.run(cycles_per_session=2)
+    assert stats["cycles"] == 4 and stats["failed"] == 0
+    assert a.graph is not b.graph and a.logger.file_path != b.logger.file_path
+    assert a.logger.file_path == tmp_path / "a" / "events.jsonl"
+    assert stats["per_session"]["b"]["cycles_run"] == 2
+
+def test_sessions_call_the_llm_concurrently(tmp_path):
+    barrier = threading.Barrier(4, timeout=5.0) # Serial sessions would never get all four requests in flight
+
+    class BarrierFakeLLM(SlowFakeLLM):
+        def generate(self, system_prompt, user_prompt, json_schema=None):
+            barrier.wait()
+            return super().generate(system_prompt, user_prompt, json_schema)
+
+    fake = BarrierFakeLLM(0.0)
+    with SessionManager(tmp_path, _llm_cycle, llm_api_key="sessions-concurrent", llm_client=fake, max_workers=8,
+                        cache_entries=0) as manager:
+        for _ in range(4):
+            manager.add_session()
+        stats = manager.run(cycles_per_session=3)
+    assert stats["cycles"] == 12 and stats["failed"] == 0 and fake.calls == 12
+
+def test_shared_rate_limit_caps_all_sessions(tmp_path):
+    now = [0.0]
+    clock_lock = threading.Lock()
+
+    def sleep(seconds):
+        with clock_lock:
+            now[0] += seconds
+
+    fake = SlowFakeLLM(0.0)
+    with SessionManager(tmp_path, _llm_cycle, llm_api_key="sessions-limited", llm_client=fake, max_workers=8,
+                        cache_entries=0) as manager:
+        # 4/s keeps the fake clock's arithmetic exact in binary floating point
+        manager.llm.rate_limiter = RateLimiter(rate_per_s=4, burst=1, clock=lambda: now[0], sleep=sleep)
+        for _ in range(8):
+            manager.add_session()
+        stats = manager.run(cycles_per_session=5)
+    assert fake.calls == 40
+    # The fake clock only moves while callers wait, so 40 requests at 4/s need at least 39/4 s of waiting
+    assert stats["llm"]["rate_limit_wait_s"] >= 39 / 4
+
+def test_shared_cache_across_sessions(tmp_path):
+    fake = SlowFakeLLM(0.0)
+    with SessionManager(tmp_path, _llm_cycle, llm_api_key="sessions-cache", llm_client=fake) as manager:
+        for i in range(3):
+            manager.add_session(prompt="same screen") # Identical requests from different sessions
+        stats = manager.run(cycles_per_session=2)
+    assert fake.calls < 6
+    assert stats["llm"]["cache_hits"] == 6 - fake.calls
+
+def test_closing_the_manager_unregisters_its_client(tmp_path):
+    with SessionManager(tmp_path, _llm_cycle, llm_api_key="sessions-close", llm_client=SlowFakeLLM(0.0)) as manager:
+        assert llm_connector._get_llm_client("sessions-close") is manager.llm
+    assert "sessions-close" not in llm_connector._registered_llm_clients
@@ -0,0 +1,141 @@
+import json
+
+import pytest
+
+from aios.protocols.action_protocol import VerifiedActionPlan
+from aios.protocols.schema import ActionPlan, ScreenshotData
+from aios.simulator import backend as sim_backend
+from aios.simulator.desktop import DinoRunnerApp, NotepadApp, SimulatedDesktop
+
+def _plan(action_type, **parameters):
+    return ActionPlan(action_id="a1", origin_observation_id="o1", action_type=action_type, parameters=parameters)
+
+def test_notepad_types_towards_goal():
+    desktop = SimulatedDesktop(NotepadApp("Hello AIOS"))
+    blank_frame, size = desktop.frame()
+    assert size == (640, 360)
+
+    assert desktop.execute(_plan("TypeString", text="Hello")) == (True, "Editor text is 'Hello'.")
+    assert desktop.execute(_plan("TypeString", text="!"))[0] is False # Off the goal
+    assert desktop.execute(_plan("KeyPress", key="backspace"))[0] is True
+    assert desktop.execute(_plan("NoAction"))[0] is False # Not done yet
+    desktop.execute(_plan("TypeString", text=" AIOS"))
+    assert desktop.execute(_plan("NoAction"))[0] is True
+
+    tree = desktop.uia_tree()
+    assert tree["name"] == "*Untitled - Notepad" and tree["children"][0]["value"] == "Hello AIOS"
+    assert desktop.frame()[0] != blank_frame
+    assert desktop.stats() == {"actions": 6, "correct_actions": 4, "accuracy": 4 / 6,
+                               "text": "Hello AIOS", "goal_text": "Hello AIOS", "done": True}
+
+def test_desktop_history_is_bounded():
+    desktop = SimulatedDesktop(NotepadApp("x"), history_size=3)
+    for _ in range(5):
+        desktop.execute(_plan("NoAction"))
+    assert len(desktop.history) == 3 and desktop.stats()["actions"] == 5
+
+def test_dino_jumps_clear_obstacles_and_misses_crash():
+    app = DinoRunnerApp(seed=1, speed_px=60, jump_window_px=(40, 160))
+    desktop = SimulatedDesktop(app)
+    while app.obstacles[0][0] > 160: # Approach the first obstacle
+        assert desktop.execute(_plan("NoAction"))[0] is True
+    assert desktop.uia_tree()["children"][0]["name"] == f"Obstacle distance: {app.obstacles[0][0]} px"
+    assert desktop.execute(_plan("KeyPress", key="space"))[0] is True
+    assert app.score == 1
+    assert desktop.execute(_plan("KeyPress", key="space"))[0] is False # Nothing in reach
+    assert app.wasted_jumps == 1
+
+    while app.obstacles[0][0] - app.speed_px >= 40 or app.obstacles[0][3]: # Wait for the next one's last chance
+        desktop.execute(_plan("NoAction"))
+    assert desktop.execute(_plan("NoAction"))[0] is False
+    while not app.crashes:
+        desktop.execute(_plan("NoAction"))
+    assert desktop.uia_tree()["children"][2]["name"] == "Game state: crashed"
+    assert desktop.frame()[1] == (600, 150)
+
+def test_sim_backend_observes_and_acts(tmp_path):
+    desktop = SimulatedDesktop(NotepadApp("hi"))
+    sim_backend.set_desktop(desktop)
+    screenshot = sim_backend.capture_screenshot(tmp_path, image_format="raw")
+    assert isinstance(screenshot.data, ScreenshotData) and screenshot.data.screen_size == (640, 360)
+    uia = sim_backend.get_focused_uia_tree(tmp_path, max_depth=8, deadline_s=0.1)
+    assert json.loads(open(uia.artifact_path, encoding="utf-8").read()) == uia.data.tree_structure
+
+    receipt = sim_backend.execute_action(VerifiedActionPlan(action_plan=_plan("TypeString", text="hi"), status="ready_for_execution"))
+    assert receipt.status == "success" and "(correct)" in receipt.message
+    dry_run = _plan("TypeString", text="!").model_copy(update={"dry_run": True})
+    assert sim_backend.execute_action(VerifiedActionPlan(action_plan=dry_run, status="dry_run_completed")).status == "dry_run_success"
+    assert desktop.app.text == "hi"
+
+def test_sim_walk_stats_count_the_whole_tree(tmp_path, monkeypatch):
+    desktop = SimulatedDesktop(NotepadApp())
+    sim_backend.set_desktop(desktop)
+    nested = {"name": "w", "children": [{"name": "a", "children": [{"name": "b"}, {"name": "c"}]}]}
+    monkeypatch.setattr(desktop, "uia_tree", lambda: nested)
+    assert sim_backend.get_focused_uia_tree(tmp_path).data.walk_stats["nodes"] == 4
+
+def test_mock_llm_server_follows_the_scripted_policy():
+    pytest.importorskip("flask")
+    from aios.protocols.schema import FusedLLMOutput, ProtocolLLMOutput
+    from aios.utils import mock_llm_server
+
+    tree = SimulatedDesktop(NotepadApp()).uia_tree()
+    tree["children"][0]["value"] = 'Say "hi'
+    prompt = f"Key elements: {json.dumps(tree['children'], indent=2)}\\n\\nUser Instruction: Type Say \"hi\" twice"
+    client = mock_llm_server.app.test_client()
+    response = client.post("/v1/chat/completions", json={"model": "m", "messages": [
+        {"role": "system", "content": "Schema: " + json.dumps(ProtocolLLMOutput.model_json_schema())},
+        {"role": "user", "content": prompt}]})
+    content = json.loads(response.get_json()["choices"][0]["message"]["content"])
+    assert ProtocolLLMOutput.model_validate(content).ui_state_summary == 'Notepad window is open and focused. Editor text: "Say \\"hi".'
+
+    action = mock_llm_server.complete("ActionPlan schema", prompt + '\n"observation_id": "o9"')
+    assert ActionPlan.model_validate(action).parameters.text == '" twice' and action["origin_observation_id"] == "o9"
+
+    dino_prompt = "Key elements: Obstacle distance: 120 px\n\nObservation ID: o3\n\nUser Instruction: Play Chrome Dino"
+    fused = FusedLLMOutput.model_validate(mock_llm_server.complete(json.dumps(FusedLLMOutput.model_json_schema()), dino_prompt))
+    assert fused.action_plan.action_type == "KeyPress" and fused.action_plan.origin_observation_id == "o3"
+    assert mock_llm_server.decide_action("Obstacle distance: 400 px", "o4")["action_type"] == "NoAction"
+
+def test_closed_loop_cycles_against_mock_llm_server():
+    pytest.importorskip("flask")
+    pytest.importorskip("openai")
+    from aios.benchmarks import bench_sim_loop
+
+    results = bench_sim_loop.run(["notepad"], cycles=2)
+    assert results["notepad"]["failed_cycles"] == 0
+    assert results["notepad"]["done"] is True and results["notepad"]["accuracy"] == 1.0
+
+def test_pipeline_runs_on_the_simulator(tmp_path):
+    pytest.importorskip("flask")
+    pytest.importorskip("openai")
+    from aios.benchmarks import bench_sim_loop
+    from aios_demo import run_aios_pipeline
+
+    with bench_sim_loop.sim_environment():
+        sim_backend.set_desktop(SimulatedDesktop(NotepadApp("Hello AIOS")))
+        stats = run_aios_pipeline("sim-pipeline", tmp_path, user_instruction="Type Hello AIOS",
+                                  llm_api_key=bench_sim_loop.SIM_LLM_API_KEY, max_cycles=1, duration_s=30.0)
+    assert stats["cycles_completed"] >= 1
+    event_types = [json.loads(line)["event_type"] for line in open(tmp_path / "sim-pipeline" / "events.jsonl")]
+    assert {"OBSERVATION", "ACTION", "RECEIPT"} <= set(event_types)
+    assert sim_backend.get_desktop().app.text == "Hello AIOS"
+
+def test_cycle_observes_tailed_logs(tmp_path):
+    pytest.importorskip("flask")
+    pytest.importorskip("openai")
+    from aios.benchmarks import bench_sim_loop
+    from aios.observers.log_tail import LogTailObserver
+    from aios_demo import run_aios_cycle
+
+    log_file = tmp_path / "app.log"
+    log_file.write_bytes(b"service started\n")
+    with bench_sim_loop.sim_environment():
+        sim_backend.set_desktop(SimulatedDesktop(NotepadApp("Hello AIOS")))
+        assert run_aios_cycle("sim-logs", tmp_path, user_instruction="Type Hello AIOS",
+                              llm_api_key=bench_sim_loop.SIM_LLM_API_KEY, screenshot_format="raw",
+                              log_tail_observer=LogTailObserver([log_file], from_beginning=True))
+    events = [json.loads(line) for line in open(tmp_path / "sim-logs" / "events.jsonl")]
+    observation = next(event for event in events if event["event_type"] == "OBSERVATION")
+    log_signals = [s for s in observation["payload"]["raw_signals"] if s["observer_id"] == "log_tail_observer_v1"]
+    assert log_signals[0]["data"]["new_lines"] == ["service started"]
@@ -0,0 +1,86 @@
+import json
+import threading
+import time
+
+import pytest
+
+from aios.event_stream import JsonlLogger
+from aios.observers.scheduler import ObserverScheduler
+from aios.protocols import llm_connector
+from aios.protocols.schema import RawSignal, ScreenshotData
+from aios.runtime.deadline import CycleBudget, Deadline, call_with_deadline
+from aios.runtime.tracing import NULL_TRACER, Tracer, current_tracer, span, use_tracer
+
+def _events_by_name(trace: dict) -> dict:
+    return {e["name"]: e for e in trace["traceEvents"] if e["ph"] == "X"}
+
+def _contains(parent: dict, child: dict) -> bool:
+    return parent["tid"] == child["tid"] and parent["ts"] <= child["ts"] \
+        and child["ts"] + child["dur"] <= parent["ts"] + parent["dur"]
+
+def test_nested_spans_in_chrome_trace_format(tmp_path):
+    tracer = Tracer()
+    with use_tracer(tracer):
+        with span("cycle", run_id="r1") as cycle:
+            with span("stage.observe"):
+                time.sleep(0.001)
+            with pytest.raises(ValueError), span("stage.agent"):
+                raise ValueError("bad plan")
+            cycle.set(result="ok")
+    assert current_tracer() is NULL_TRACER
+
+    trace = json.loads(tracer.write_chrome_trace(tmp_path / "trace.json").read_text())
+    events = _events_by_name(trace)
+    assert set(events) == {"cycle", "stage.observe", "stage.agent"}
+    assert _contains(events["cycle"], events["stage.observe"]) and _contains(events["cycle"], events["stage.agent"])
+    assert events["stage.observe"]["dur"] >= 1000 # Microseconds
+    assert events["cycle"]["args"] == {"run_id": "r1", "result": "ok"}
+    assert events["stage.agent"]["args"]["error"] == "ValueError: bad plan"
+    assert trace["traceEvents"][0]["name"] == "cycle" # Parents come first
+    assert any(e["ph"] == "M" and e["args"]["name"] == threading.current_thread().name for e in trace["traceEvents"])
+
+def test_spans_follow_work_onto_worker_threads(tmp_path):
+    tracer = Tracer()
+    signal = RawSignal(observer_id="screenshot", artifact_path="", artifact_hash="", data=ScreenshotData(screen_size=(1, 1)))
+    with use_tracer(tracer), ObserverScheduler() as scheduler:
+        scheduler.register("screenshot", lambda: signal)
+        budget = CycleBudget("r1", budget_s=5.0)
+        with budget.stage("observe"):
+            scheduler.collect()
+        with budget.stage("agent"):
+            call_with_deadline(Deadline.after(1.0), lambda: span("llm.generate").end())
+        JsonlLogger(tmp_path / "events.jsonl") # Constructing logs nothing
+
+    events = _events_by_name(tracer.to_chrome_trace())
+    assert {"stage.observe", "observer.screenshot", "stage.agent", "llm.generate"} <= set(events)
+    assert events["observer.screenshot"]["tid"] != events["stage.observe"]["tid"]
+    assert events["stage.observe"]["args"]["budget_ms"] == pytest.approx(5000 * 0.15, rel=0.01)
+
+def test_llm_connector_spans(monkeypatch):
+    class FakeLLM:
+        model_name = "fake-model"
+
+        def generate(self, system_prompt, user_prompt, json_schema=None):
+            return {"ui_state_summary": "Notepad is empty", "intent": "Type", "confidence": 0.9}
+
+    monkeypatch.setattr(llm_connector, "_get_llm_client", lambda key: FakeLLM())
+    monkeypatch.setattr(llm_connector, "_load_prompt_from_file", lambda path: "system")
+    tracer = Tracer()
+    with use_tracer(tracer), span("stage.protocol1"):
+        llm_connector.request_protocol_llm_observation([], "key", "protocol_llm_prompt.txt")
+
+    events = _events_by_name(tracer.to_chrome_trace())
+    assert events["llm.generate"]["args"] == {"llm": "protocol", "model": "fake-model"}
+    assert events["prompt.build"]["args"]["prompt_chars"] > 0
+    for name in ("prompt.build", "llm.generate", "llm.validate"):
+        assert _contains(events["stage.protocol1"], events[name])
+
+def test_disabled_tracing_is_near_free():
+    n = 100_000
+    start = time.perf_counter()
+    for _ in range(n):
+        with span("stage.observe"):
+            pass
+    per_span_us = (time.perf_counter() - start) / n * 1e6
+    assert per_span_us < 2.0
+    assert NULL_TRACER.spans == []
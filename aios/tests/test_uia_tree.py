@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from aios.benchmarks.fixtures import make_synthetic_uia_tree
+from aios.protocols.uia_tree import FlatUIATree
+from aios.protocols.llm_connector import _search_uia_tree_for_process
+
+RECORDED_TREES = sorted(Path(__file__).resolve().parents[2].glob("aios_demo_runs/*/artifacts/uia_trees/*.json"))
+
+@pytest.fixture
+def tree():
+    return make_synthetic_uia_tree(depth=5, breadth=4)
+
+def test_round_trip_is_lossless(tree):
+    flat = FlatUIATree.from_dict(tree)
+    assert flat.to_dict() == tree
+
+@pytest.mark.skipif(not RECORDED_TREES, reason="No recorded UIA trees in aios_demo_runs")
+def test_round_trip_recorded_tree():
+    recorded = json.loads(RECORDED_TREES[-1].read_text(encoding="utf-8"))
+    assert FlatUIATree.from_dict(recorded).to_dict() == recorded
+
+def test_round_trip_keeps_irregular_nodes():
+    tree = {"class_name": "Notepad", "children": [
+        {"root": "mock"},
+        {"name": None, "is_enabled": True, "bounding_rectangle": [1, 2, 3, 4], "children": []},
+    ]}
+    assert FlatUIATree.from_dict(tree).to_dict() == tree
+    assert FlatUIATree.from_dict({}).to_dict() == {}
+
+def test_topology_is_preorder(tree):
+    flat = FlatUIATree.from_dict(tree)
+    assert flat.parent[0] == -1
+    assert [flat.node(i)["name"] for i in flat.children(0)] == [c["name"] for c in tree["children"]]
+    assert np.all(flat.parent[1:] < np.arange(1, len(flat)))
+
+def test_indexed_lookups(tree):
+    flat = FlatUIATree.from_dict(tree)
+    buttons = flat.find_by_class_name("Button")
+    assert len(buttons) > 0
+    assert all(flat.node(i)["class_name"] == "Button" for i in buttons)
+    assert list(buttons) == sorted(buttons)
+    assert len(flat.find_by_class_name("DoesNotExist")) == 0
+
+    automation_ids = [flat.node(i)["automation_id"] for i in range(len(flat)) if flat.node(i)["automation_id"]]
+    found = flat.find_by_automation_id(automation_ids[0])
+    assert [flat.node(i)["automation_id"] for i in found] == [automation_ids[0]]
+
+def test_flat_tree_is_smaller_than_dicts(tree):
+    flat = FlatUIATree.from_dict(tree)
+    assert len(flat.strings) < len(flat) * 3 # Class names repeat and are interned
+    assert flat.nbytes < len(json.dumps(tree))
+
+def test_search_uia_tree_accepts_flat_tree(tree):
+    flat = FlatUIATree.from_dict({"class_name": "Root", "children": [{"class_name": "Notepad", "children": []}]})
+    assert _search_uia_tree_for_process(flat, "Notepad")
+    assert not _search_uia_tree_for_process(flat, "Chrome")
+
+def test_nodes_without_a_column_are_not_indexed():
+    tree = {"name": "Notepad", "children": [{"name": "x", "class_name": None}]}
+    flat = FlatUIATree.from_dict(tree)
+    assert len(flat.find_by_class_name("Notepad")) == 0 # "Notepad" is interned, but only as a name
+    assert _search_uia_tree_for_process(flat, "Notepad") == _search_uia_tree_for_process(tree, "Notepad") == False
+    assert flat.to_dict() == tree
+
+def test_unrepresentable_rectangles_and_children_round_trip():
+    tree = {"class_name": "Root", "children": [
+        {"bounding_rectangle": [0.5, 1, 2, 3], "children": None},
+        {"bounding_rectangle": [10**10, 0, 0, 0]},
+        {"bounding_rectangle": [None, 0, 0, 0], "children": []},
+    ]}
+    flat = FlatUIATree.from_dict(tree)
+    assert len(flat) == 4
+    assert flat.to_dict() == tree
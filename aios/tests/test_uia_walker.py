@@ -0,0 +1,194 @@
+import copy
+import pytest
+
+from aios.benchmarks.fixtures import make_synthetic_uia_tree
+from aios.observers.uia_walker import InMemoryUIAProvider, IncrementalUIAWalker, walk_provider_tree, walk_uia_tree_budgeted, UIA_NODE_PROPERTIES
+
+def _strip(tree):
+    """Drops keys the walkers do not emit, for comparison with the source fixture."""
+    node = {key: tree[key] for key in UIA_NODE_PROPERTIES}
+    node["bounding_rectangle"] = list(node["bounding_rectangle"])
+    node["children"] = [_strip(child) for child in tree["children"]]
+    return node
+
+def _normalize(tree):
+    tree = dict(tree)
+    tree["bounding_rectangle"] = list(tree["bounding_rectangle"])
+    tree["children"] = [_normalize(child) for child in tree["children"]]
+    return tree
+
+@pytest.fixture
+def tree():
+    return make_synthetic_uia_tree(depth=4, breadth=3)
+
+def test_walk_provider_tree_matches_source(tree):
+    walked = walk_provider_tree(InMemoryUIAProvider(), tree, max_depth=10)
+    assert _normalize(walked) == _strip(tree)
+
+def test_walk_provider_tree_respects_max_depth(tree):
+    walked = walk_provider_tree(InMemoryUIAProvider(), tree, max_depth=1)
+    assert walked["children"] == []
+    assert walk_provider_tree(InMemoryUIAProvider(), tree, max_depth=0) is None
+
+def test_incremental_walk_reuses_unchanged_tree(tree):
+    provider = InMemoryUIAProvider()
+    walker = IncrementalUIAWalker(reuse_subtrees=True, full_refresh_interval=0)
+    first = walker.walk(provider, tree, max_depth=10)
+    assert walker.last_stats["nodes_fetched"] == provider.calls["properties"]
+
+    provider.calls.clear()
+    second = walker.walk(provider, tree, max_depth=10)
+    assert provider.calls["properties"] == 0
+    assert walker.last_stats["subtrees_reused"] == 1
+    assert second == first
+
+    # Cache entries for the whole subtree carry over to the following walk
+    walker.walk(provider, tree, max_depth=10)
+    assert provider.calls["properties"] == 0
+
+def test_incremental_walk_refetches_changed_subtree_only(tree):
+    provider = InMemoryUIAProvider()
+    walker = IncrementalUIAWalker(full_refresh_interval=0)
+    walker.walk(provider, tree, max_depth=10)
+
+    changed = copy.deepcopy(tree)
+    target = changed["children"][1]
+    target["name"] = "Renamed"
+    target["bounding_rectangle"] = [1, 2, 3, 4]
+
+    provider.calls.clear()
+    walked = walker.walk(provider, changed, max_depth=10)
+    # Every node is fingerprinted, but only the moved node is re-fetched
+    assert walker.last_stats["nodes_reused"] == walker.last_stats["nodes_visited"] - 1
+    assert walked["children"][1]["name"] == "Renamed"
+    assert provider.calls["properties"] == 1
+    assert _normalize(walked) == _strip(changed)
+
+def test_incremental_walk_detects_added_children(tree):
+    provider = InMemoryUIAProvider()
+    walker = IncrementalUIAWalker(full_refresh_interval=0)
+    walker.walk(provider, tree, max_depth=10)
+
+    changed = copy.deepcopy(tree)
+    new_child = copy.deepcopy(changed["children"][0]["children"][0])
+    new_child["runtime_id"] = [42, 99999]
+    new_child["children"] = []
+    changed["children"][0]["children"].append(new_child)
+
+    walked = walker.walk(provider, changed, max_depth=10)
+    assert _normalize(walked) == _strip(changed)
+
+def test_subtree_mode_reuses_changed_subtree_with_intact_root(tree):
+    provider = InMemoryUIAProvider()
+    walker = IncrementalUIAWalker(reuse_subtrees=True, full_refresh_interval=0)
+    walker.walk(provider, tree, max_depth=10)
+
+    changed = copy.deepcopy(tree)
+    changed["children"][0]["children"][0]["bounding_rectangle"] = [9, 9, 9, 9]
+    walked = walker.walk(provider, changed, max_depth=10)
+    assert walked["children"][0]["children"][0]["bounding_rectangle"] != [9, 9, 9, 9] # Stale by design
+
+    # Once every ancestor's fingerprint changes, the stale node is re-checked
+    changed["bounding_rectangle"] = [0, 0, 800, 600]
+    changed["children"][0]["bounding_rectangle"] = [0, 0, 800, 300]
+    walked = walker.walk(provider, changed, max_depth=10)
+    assert _normalize(walked) == _strip(changed)
+
+def test_full_refresh_interval_forces_refetch(tree):
+    provider = InMemoryUIAProvider()
+    walker = IncrementalUIAWalker(full_refresh_interval=2)
+    walker.walk(provider, tree, max_depth=10)
+    walker.walk(provider, tree, max_depth=10)
+    provider.calls.clear()
+    walker.walk(provider, tree, max_depth=10)
+    assert provider.calls["properties"] == walker.last_stats["nodes_visited"]
+
+# --- Budgeted best-first walk ---
+
+def _count(tree):
+    return 1 + sum(_count(child) for child in tree["children"])
+
+def _assert_well_formed(walked, source):
+    """Every walked node matches the source node at the same position among its siblings."""
+    source_children = {tuple(child["runtime_id"]): child for child in source["children"]}
+    assert walked["name"] == source["name"]
+    for child in walked["children"]:
+        assert "_sibling_index" not in child
+    walked_order = [source["children"].index(source_children[tuple(c["runtime_id"])]) for c in walked["children"]]
+    assert walked_order == sorted(walked_order)
+    for child in walked["children"]:
+        _assert_well_formed(child, source_children[tuple(child["runtime_id"])])
+
+class _RuntimeIdProvider(InMemoryUIAProvider):
+    """Also emits runtime ids so walked nodes can be matched to the source."""
+
+    def properties(self, element):
+        node = super().properties(element)
+        node["runtime_id"] = element["runtime_id"]
+        return node
+
+def test_budgeted_walk_without_budget_is_complete(tree):
+    walked, stats = walk_uia_tree_budgeted(InMemoryUIAProvider(), tree, max_depth=10)
+    assert not stats["truncated"]
+    assert stats["nodes_fetched"] == _count(tree)
+    assert _normalize(walked) == _strip(tree)
+
+def test_budgeted_walk_node_limit_returns_partial_tree(tree):
+    walked, stats = walk_uia_tree_budgeted(_RuntimeIdProvider(), tree, max_depth=10, max_nodes=10)
+    assert stats["truncated"] and stats["node_limit_hit"]
+    assert _count(walked) == 10
+    flagged = []
+    pending = [walked]
+    while pending:
+        node = pending.pop()
+        flagged += [node] if node.get("truncated") else []
+        pending += node["children"]
+    assert flagged
+    _assert_well_formed(walked, tree)
+
+def test_budgeted_walk_prioritises_focus_path(tree):
+    focused = tree["children"][-1]["children"][-1]["children"][-1]
+    focused["has_keyboard_focus"] = True
+    walked, _ = walk_uia_tree_budgeted(_RuntimeIdProvider(tree), tree, max_depth=10, max_nodes=4)
+    path = walked
+    for _ in range(3):
+        path = path["children"][-1]
+    assert path["runtime_id"] == focused["runtime_id"]
+
+def test_budgeted_walk_prioritises_visible_interactive():
+    hidden = {"runtime_id": [1, 2], "name": "hidden", "bounding_rectangle": [0, 0, 0, 0], "is_keyboard_focusable": 1, "children": []}
+    passive = {"runtime_id": [1, 3], "name": "passive", "bounding_rectangle": [0, 0, 10, 10], "is_keyboard_focusable": 0, "children": []}
+    button = {"runtime_id": [1, 4], "name": "button", "bounding_rectangle": [0, 0, 10, 10], "is_keyboard_focusable": 1, "children": []}
+    root = {"runtime_id": [1, 1], "name": "root", "bounding_rectangle": [0, 0, 100, 100], "children": [hidden, passive, button]}
+    walked, _ = walk_uia_tree_budgeted(InMemoryUIAProvider(), root, max_depth=3, max_nodes=3)
+    assert [child["name"] for child in walked["children"]] == ["passive", "button"]
+
+def test_budgeted_walk_deadline(tree):
+    ticks = iter(range(1000))
+    walked, stats = walk_uia_tree_budgeted(InMemoryUIAProvider(), tree, max_depth=10, deadline_s=5,
+                                           clock=lambda: next(ticks))
+    assert stats["deadline_hit"] and stats["truncated"]
+    assert 1 <= stats["nodes_fetched"] < _count(tree)
+    assert walked is not None
+
+def test_budgeted_walk_always_fetches_root(tree):
+    walked, stats = walk_uia_tree_budgeted(InMemoryUIAProvider(), tree, max_depth=10, deadline_s=0)
+    assert stats["nodes_fetched"] == 1
+    assert walked["children"] == [] and walked["truncated"] is True
+
+def test_budgeted_walk_reuses_walker_cache(tree):
+    provider = InMemoryUIAProvider()
+    walker = IncrementalUIAWalker(full_refresh_interval=0)
+    first, _ = walk_uia_tree_budgeted(provider, tree, max_depth=10, max_nodes=1000, walker=walker)
+    provider.calls.clear()
+    second, stats = walk_uia_tree_budgeted(provider, tree, max_depth=10, max_nodes=1000, walker=walker)
+    assert provider.calls["properties"] == 0
+    assert stats["nodes_reused"] == stats["nodes_fetched"] == _count(tree)
+    assert second == first and walker.last_stats == stats
+
+def test_truncated_budgeted_walk_is_never_reused_as_a_subtree(tree):
+    provider = InMemoryUIAProvider()
+    walker = IncrementalUIAWalker(reuse_subtrees=True, full_refresh_interval=0)
+    walk_uia_tree_budgeted(provider, tree, max_depth=10, max_nodes=10, walker=walker)
+    walked = walker.walk(provider, tree, max_depth=10)
+    assert _normalize(walked) == _strip(tree)
@@ -1,45 +1,134 @@
+"""
+A local stand-in for the OpenAI chat completions API, for running full AIOS cycles
+offline (e.g. against the simulator, see aios.benchmarks.bench_sim_loop).
+
+It answers POST /v1/chat/completions in the OpenAI response format, so the real
+LLMClient talks to it when OPENAI_BASE_URL points here. The reply matches the
+schema named in the system prompt (ProtocolLLMOutput, ActionPlan or FusedLLMOutput)
+and follows a scripted policy read from the prompt:
+
+    "type <text>" instruction     TypeString of the part of <text> not yet in the editor
+    Dino obstacle within reach    KeyPress "space"
+    anything else                 NoAction
+
+Usage:
+    python -m aios.utils.mock_llm_server [--port 8080]
+"""
+import argparse
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
 from flask import Flask, request, jsonify
-from datetime import datetime
-import json # ADDED
-from aios.protocols.schema import LLMResponseMock # Assuming LLMResponseMock is defined in schema.py
+from werkzeug.serving import make_server
+
+# The policy jumps once the nearest Dino obstacle is this close
+DINO_JUMP_DISTANCE_PX = 150
 
 app = Flask(__name__)
 
-@app.route("/", methods=["GET"]) # ADDED FOR READINESS CHECK
+def _editor_text(prompt: str) -> Optional[str]:
+    match = re.search(r'"value":\s*"((?:[^"\\]|\\.)*)"', prompt)
+    return json.loads(f'"{match.group(1)}"') if match else None
+
+def _obstacle_distance(prompt: str) -> Optional[int]:
+    match = re.search(r"Obstacle distance: (\d+) px", prompt)
+    return int(match.group(1)) if match else None
+
+def _instruction(prompt: str) -> str:
+    match = re.search(r"User Instruction:\s*(.+)", prompt)
+    return match.group(1).strip() if match else ""
+
+def _text_to_type(instruction: str) -> Optional[str]:
+    match = re.search(r"\btype\s+(.+)", instruction, re.IGNORECASE)
+    return match.group(1).strip().strip("\"'").rstrip(".") if match else None
+
+def describe_ui(prompt: str) -> Dict[str, Any]:
+    """Returns the ProtocolLLMOutput fields for the UI state in `prompt`."""
+    instruction = _instruction(prompt)
+    distance = _obstacle_distance(prompt)
+    text = _editor_text(prompt)
+    if distance is not None or "chrome://dino" in prompt:
+        score = re.search(r"Score: (\d+)", prompt)
+        ui_state_summary = (f"Chrome Dino game is running. Nearest obstacle: "
+                            f"{f'{distance} px' if distance is not None else 'none'}. "
+                            f"Score: {score.group(1) if score else 0}.")
+        intent = "Play Chrome Dino Game."
+    elif text is not None or "notepad" in prompt.lower():
+        ui_state_summary = f"Notepad window is open and focused. Editor text: {json.dumps(text or '')}."
+        intent = "User wants to type in Notepad."
+    else:
+        ui_state_summary, intent = "Desktop is visible.", "Waiting for user instructions."
+    return {"ui_state_summary": ui_state_summary, "intent": instruction or intent, "confidence": 0.9}
+
+def decide_action(prompt: str, observation_id: str) -> Dict[str, Any]:
+    """Returns the ActionPlan fields the scripted policy chooses for `prompt`."""
+    action = {"action_id": str(uuid.uuid4()), "origin_observation_id": observation_id,
+              "action_type": "NoAction", "parameters": {}}
+    distance = _obstacle_distance(prompt)
+    goal_text = _text_to_type(_instruction(prompt))
+    if distance is not None:
+        if distance <= DINO_JUMP_DISTANCE_PX:
+            action.update(action_type="KeyPress", parameters={"key": "space"})
+    elif goal_text:
+        text = _editor_text(prompt) or ""
+        if not goal_text.startswith(text):
+            action.update(action_type="KeyPress", parameters={"key": "backspace"})
+        elif text != goal_text:
+            action.update(action_type="TypeString", parameters={"text": goal_text[len(text):]})
+    return action
+
+def complete(system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+    """Returns the JSON object answering a request, in the shape of the schema it asks for."""
+    if '"title": "FusedLLMOutput"' in system_prompt:
+        match = re.search(r"Observation ID: (\S+)", user_prompt)
+        return {**describe_ui(user_prompt), "action_plan": decide_action(user_prompt, match.group(1) if match else "")}
+    if '"title": "ProtocolLLMOutput"' in system_prompt:
+        return describe_ui(user_prompt)
+    match = re.search(r'"observation_id":\s*"([^"]+)"', user_prompt)
+    return decide_action(user_prompt, match.group(1) if match else "")
+
+@app.route("/", methods=["GET"]) # Readiness check
 def root():
     return "Mock LLM Server is running.", 200
 
 @app.route("/v1/chat/completions", methods=["POST"])
 def chat_completions():
     data = request.json
-    user_prompt = ""
-    for message in data.get("messages", []):
-        if message.get("role") == "user":
-            user_prompt = message.get("content", "")
-            break
-
-    # Default mock response
-    ui_summary = "Desktop is visible."
-    environment_summary = "System appears normal."
-    potential_intent = "Waiting for user instructions."
-
-    if "play chrome dino" in user_prompt.lower():
-        ui_summary = "Google Chrome with Dino game is active."
-        potential_intent = "Play Chrome Dino Game."
-    elif "notepad" in user_prompt.lower():
-        ui_summary = "Notepad window is open and focused."
-        potential_intent = "User wants to type in Notepad."
-    
-    mock_response = LLMResponseMock(
-        ui_state_summary=ui_summary,
-        environment_state_summary=environment_summary,
-        potential_intent=potential_intent
-    )
-
-    dumped_data = mock_response.model_dump_json() # Get JSON string from Pydantic
-    print("DEBUG: mock_response.model_dump_json() output:", dumped_data) # DEBUG
-    return jsonify(json.loads(dumped_data)) # Load JSON string back to dict for jsonify
+    messages = data.get("messages", [])
+    system_prompt = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+    user_prompt = next((m.get("content", "") for m in messages if m.get("role") == "user"), "")
+    content = json.dumps(complete(system_prompt, user_prompt))
+    return jsonify({
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": data.get("model", "mock"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": (len(system_prompt) + len(user_prompt)) // 4,
+                  "completion_tokens": len(content) // 4,
+                  "total_tokens": (len(system_prompt) + len(user_prompt) + len(content)) // 4},
+    })
+
+def serve(host: str = "127.0.0.1", port: int = 0):
+    """
+    Starts the server on a daemon thread; port 0 picks a free port.
+
+    Returns:
+        The server; its port is `server.port`, stop it with `server.shutdown()`.
+    """
+    logging.getLogger("werkzeug").setLevel(logging.WARNING) # No per-request log lines
+    server = make_server(host, port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="mock-llm-server", daemon=True).start()
+    return server
 
 if __name__ == "__main__":
-    print("Starting Mock LLM Server on http://127.0.0.1:8080")
-    app.run(host="127.0.0.1", port=8080, debug=False)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Serve a mock OpenAI chat completions API.")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    print(f"Starting Mock LLM Server on http://127.0.0.1:{args.port}")
+    app.run(host="127.0.0.1", port=args.port, debug=False)
@@ -5,6 +5,10 @@ from pathlib import Path
 import sys
 from datetime import datetime
 import argparse # ADDED
+import contextlib
+import json
+import logging
+from typing import TYPE_CHECKING
 
 # Ensure the project root is on the Python path for imports
 script_dir = Path(__file__).resolve().parent
@@ -12,33 +16,117 @@ if str(script_dir) not in sys.path:
     sys.path.insert(0, str(script_dir))
 
 from aios.protocols.schema import (
+    ActionPlan,
     Event,
     EventType,
     GraphUpdate, # ADDED
+    KeyPressParameters,
+    ObservationEvent,
+    ScreenshotData,
+    UIATreeData,
 )
 from aios.event_stream import JsonlLogger
+from aios.artifact_store import ArtifactStore
 from aios.memory.graph import GraphMemory
-from aios.observers.screenshot import capture_screenshot
-from aios.observers.uia import get_focused_uia_tree
+from aios.backends import load_backend, selected_backend
+from aios.observers.log_tail import LogTailObserver
+from aios.observers.scheduler import ObserverScheduler
+from aios.observers.uia_walker import IncrementalUIAWalker
+from aios.protocols.aggregator import select_primary_frame
 from aios.protocols.llm_connector import request_protocol_llm_observation
-from aios.agent.main_agent import decide_action
+from aios.agent.main_agent import decide_action, decide_action_fused
 from aios.protocols.action_protocol import process_action_plan
-from aios.actuators.main_actuator import execute_action
+from aios.runtime.pipeline import PipelineRunner, PipelineStage
+from aios.runtime.checkpoint import CheckpointManager
+from aios.runtime.logs import LEVEL_NAMES, configure_logging
+from aios.runtime.metrics import CYCLE_SECONDS, CYCLES, serve_metrics
+from aios.runtime.tracing import NULL_TRACER, Tracer, activate, deactivate, span
+from aios.runtime.deadline import CycleBudget, DeadlineExceeded, DecisionCache, call_with_deadline, no_action_plan
 
 from aios.protocols.llm_connector import request_protocol_llm_observation, request_core_agent_llm_action # ADDED
 
-def run_aios_cycle(run_id: str, artifact_base_dir: Path, user_instruction: str = "", llm_api_key: str = None):
+# Platform backends (screen capture, UIA, input) and numpy-based modules are imported
+# when first used, so this module also imports on headless hosts (see aios/backends.py).
+if TYPE_CHECKING:
+    from aios.observers.artifact_writer import ArtifactWriter
+    from aios.observers.frame_dedup import FrameDeduplicator
+
+# Named explicitly: run as a script, __name__ is "__main__". "logger" is the JsonlLogger throughout this module.
+log = logging.getLogger("aios_demo")
+
+def _fallback_observation(graph: GraphMemory, raw_signals: list) -> ObservationEvent:
+    """The observation to use when the LLM could not produce one in time: the previous one, re-attached to the new signals."""
+    previous = graph.previous_observation
+    if previous is not None:
+        return previous.model_copy(update={"observation_id": str(uuid.uuid4()), "raw_signals": raw_signals})
+    return ObservationEvent(
+        observation_id=str(uuid.uuid4()),
+        raw_signals=raw_signals,
+        ui_state_summary="Unknown (observation deadline exceeded).",
+        environment_state_summary="Unknown (observation deadline exceeded).",
+        potential_intent="Unknown"
+    )
+
+def run_aios_cycle(run_id: str, artifact_base_dir: Path, user_instruction: str = "", llm_api_key: str = None,
+                   fused: bool = False, frame_deduplicator: "FrameDeduplicator" = None,
+                   screenshot_format: str = "png", artifact_store: ArtifactStore = None,
+                   frame_tolerance_ms: float = 500.0, uia_deadline_s: float = 1.0, uia_max_nodes: int = 2000,
+                   logger: JsonlLogger = None, graph: GraphMemory = None,
+                   cycle_budget_s: float = None, decision_cache: DecisionCache = None,
+                   checkpoint: CheckpointManager = None, trace: bool = False,
+                   uia_walker: IncrementalUIAWalker = None, observer_scheduler: ObserverScheduler = None,
+                   artifact_writer: "ArtifactWriter" = None, log_tail_observer: LogTailObserver = None):
     """
     Executes one full cycle of the AIOS: Observe -> Parse -> Learn -> Decide -> Plan -> Act.
+
+    If `fused` is True, Parse and Decide share a single LLM round trip; the
+    ObservationEvent and ActionPlan are still logged as separate events.
+
+    Observers run concurrently; their RawSignals are aligned into an
+    ObservationFrame within `frame_tolerance_ms`. The UIA walk is bounded by
+    `uia_deadline_s` and `uia_max_nodes` (None disables a budget). A caller running
+    many cycles can pass a `uia_walker` kept across them, so UIA elements that did
+    not change since the previous cycle are not fetched again. Likewise, an
+    `observer_scheduler` kept across cycles saves starting its thread pool per cycle.
+    If a `log_tail_observer` is given (and kept across cycles, for its offsets), it
+    runs as a third observer and the log lines appended since its last poll join the
+    frame as one LogData signal.
+
+    If a `frame_deduplicator` is given and the screen has not changed since the
+    last emitted frame, the cycle ends after observation: no LLM calls or
+    actuation happen for an unchanged screen.
+
+    If an `artifact_store` is given, observer artifacts go to that shared
+    content-addressed store (referenced by `run_id`) instead of the run directory.
+    If an `artifact_writer` is given, the screenshot is written (and, outside the
+    store, encoded) on its threads; its files may appear after the cycle returns.
+
+    A long-lived caller (the AIOS daemon) can pass its own `logger` and warm `graph`;
+    otherwise both are created in the run directory.
+
+    If `cycle_budget_s` is given, every stage runs under its share of the remaining
+    budget and degrades instead of overrunning: the UIA walk is truncated, a late LLM
+    observation falls back to the previous one, a late decision reuses the
+    `decision_cache` entry for the same UI state (or becomes NoAction), and nothing is
+    actuated once the cycle budget is spent. Each miss is logged as a DEADLINE_MISS event.
+
+    If a `checkpoint` manager is given, the graph, previous observation and decision
+    cache are checkpointed with the event-log offset after a successful cycle, so a
+    crashed run can be resumed (see `--resume`).
+
+    If `trace` is True, the cycle's stages, observers, prompt construction, LLM calls,
+    validation, graph update/save and event logging are recorded as nested spans and
+    written to "trace.json" in the run directory (Chrome trace-event format).
     """
-    print(f"\n--- Starting AIOS Cycle: {run_id} ---")
+    log.info("--- Starting AIOS Cycle: %s ---", run_id, extra={"run_id": run_id})
     
     # Define prompt filenames
     PROTOCOL_LLM_PROMPT_FILENAME = "protocol_llm_prompt.txt"
     CORE_LLM_PROMPT_FILENAME = "core_llm_prompt.txt"
+    FUSED_LLM_PROMPT_FILENAME = "fused_llm_prompt.txt"
 
     if not llm_api_key:
-        print("ERROR: LLM API Key is missing. Cannot proceed with real LLM.")
+        log.error("LLM API Key is missing. Cannot proceed with real LLM.")
         return False
 
     # Define paths for artifacts for this specific run
@@ -48,90 +136,171 @@ def run_aios_cycle(run_id: str, artifact_base_dir: Path, user_instruction: str =
     graph_file_path = run_artifact_dir / "graph_memory.json"
     artifacts_path = run_artifact_dir / "artifacts"
     artifacts_path.mkdir(exist_ok=True)
+
+    tracer = Tracer() if trace else NULL_TRACER
+    tracer_token = activate(tracer)
+    cycle_span = tracer.span("cycle", run_id=run_id, fused=fused)
+    cycle_start, cycle_result = time.perf_counter(), "failure"
     
     try: # Added try block
         # 1. Initialize Components
-        print("\nStep 1: Initializing logger and graph memory...")
-        logger = JsonlLogger(log_file_path)
-        graph = GraphMemory(graph_file_path)
+        log.info("Step 1: Initializing logger and graph memory...")
+        if logger is None:
+            logger = JsonlLogger(log_file_path)
+        if graph is None:
+            graph = GraphMemory(graph_file_path, name="cycle")
+        if decision_cache is None:
+            decision_cache = DecisionCache()
+        stage_weights = None
+        if fused: # Protocol1 and the agent are one LLM call
+            stage_weights = {"observe": 0.15, "fused": 0.70, "protocol2": 0.05, "actuator": 0.10}
+        budget = CycleBudget(run_id, cycle_budget_s, stage_weights=stage_weights, on_miss=lambda miss: logger.log_event(
+            Event(event_id=str(uuid.uuid4()), event_type=EventType.DEADLINE_MISS, payload=miss)))
 
         # 2. Run Observers
-        print("\nStep 2: Running observers (Screenshot and UIA)...")
-        raw_signals = []
-        try:
-            screenshot_signal = capture_screenshot(artifacts_path)
-            print(f"Successfully captured screenshot.")
-            raw_signals.append(screenshot_signal)
-        except Exception as e:
-            print(f"Screenshot capture failed: {e}")
-
-        try:
+        log.info("Step 2: Running observers (Screenshot and UIA) concurrently...")
+        screenshot_backend, uia_backend = load_backend("screenshot"), load_backend("uia")
+        if observer_scheduler is None:
+            scheduler_context = ObserverScheduler(thread_initializer=uia_backend.initialize_uia_thread)
+        else:
+            scheduler_context = contextlib.nullcontext(observer_scheduler) # The caller closes it
+        with budget.stage("observe") as stage, scheduler_context as scheduler:
+            stage_uia_deadline_s = stage.deadline.cap(uia_deadline_s)
+            scheduler.register("screenshot", lambda: screenshot_backend.capture_screenshot(
+                artifacts_path, deduplicator=frame_deduplicator, image_format=screenshot_format,
+                writer=artifact_writer, artifact_store=artifact_store, run_id=run_id))
             # We use max_depth=8 for robustness in pilot script
-            uia_signal = get_focused_uia_tree(artifacts_path, max_depth=8) # Increased max_depth
-            print(f"Successfully captured UIA tree for '{uia_signal.data.focused_window_title}'.")
-            raw_signals.append(uia_signal)
-        except Exception as e:
-            print(f"UIA tree capture failed: {e}")
+            scheduler.register("uia", lambda: uia_backend.get_focused_uia_tree(
+                artifacts_path, max_depth=8, artifact_store=artifact_store, run_id=run_id,
+                walker=uia_walker, deadline_s=stage_uia_deadline_s, max_nodes=uia_max_nodes))
+            if log_tail_observer is not None:
+                scheduler.register("log_tail", log_tail_observer.observe)
+            frames = scheduler.run_once(tolerance_ms=frame_tolerance_ms, timeout_s=stage.deadline.remaining())
+
+            frame = select_primary_frame(frames)
+            raw_signals = frame.raw_signals if frame else []
+            uia_signal = next((sig for sig in raw_signals if isinstance(sig.data, UIATreeData)), None)
+            if stage.budget_s is not None and uia_signal and uia_signal.data.walk_stats.get("deadline_hit") \
+                    and stage_uia_deadline_s != uia_deadline_s:
+                stage.degrade("truncated_uia")
+            elif stage.budget_s is not None and frame and frame.observer_errors:
+                stage.degrade("dropped_observer")
+
+        for observer_id, error in (frame.observer_errors.items() if frame else []):
+            log.warning("Observer '%s' failed: %s", observer_id, error)
+        if frame:
+            log.info("Aggregated %d signals into frame %s (skew: %.1f ms, observer latency: %s).",
+                     len(raw_signals), frame.frame_id, frame.skew_ms, frame.observer_latency_ms)
+        if len(frames) > 1:
+            log.warning("Signals spanned %d frames beyond the %s ms tolerance; using the most complete one.", len(frames), frame_tolerance_ms)
+
+        screenshot_signal = next((sig for sig in raw_signals if isinstance(sig.data, ScreenshotData)), None)
+        if screenshot_signal and screenshot_signal.data.unchanged and graph.previous_observation is not None:
+            log.info("Screen unchanged since the previous frame. Skipping LLM calls for this cycle.")
+            cycle_result = "unchanged"
+            return True
 
         if not raw_signals:
-            print("No raw signals collected. Skipping further steps.")
+            log.warning("No raw signals collected. Skipping further steps.")
             return False # Indicate failure to collect signals
 
         # 3. Process Raw Signals with LLM Connector
-        print("\nStep 3: Processing raw signals with LLM Connector...")
-        # Use the new request_protocol_llm_observation
-        observation = request_protocol_llm_observation(
-            raw_signals=raw_signals,
-            user_instruction=user_instruction,
-            llm_api_key=llm_api_key,
-            protocol_llm_prompt_filename=PROTOCOL_LLM_PROMPT_FILENAME
-        )
-        print(f"LLM Connector produced ObservationEvent (ID: {observation.observation_id}).")
+        action_plan = None
+        observation_is_fresh = True
+        if fused:
+            log.info("Step 3: Processing raw signals and deciding action with fused LLM call...")
+            with budget.stage("fused") as stage:
+                try:
+                    observation, action_plan = call_with_deadline(
+                        stage.deadline, decide_action_fused,
+                        raw_signals=raw_signals,
+                        graph_memory=graph,
+                        user_instruction=user_instruction,
+                        llm_api_key=llm_api_key,
+                        fused_llm_prompt_filename=FUSED_LLM_PROMPT_FILENAME
+                    )
+                    decision_cache.remember(observation.potential_intent, observation.ui_state_summary, action_plan)
+                except DeadlineExceeded:
+                    observation, observation_is_fresh = _fallback_observation(graph, raw_signals), False
+                    action_plan = decision_cache.lookup(observation.potential_intent, observation.ui_state_summary,
+                                                        observation.observation_id)
+                    stage.degrade("cached_decision" if action_plan else "no_action")
+                    action_plan = action_plan or no_action_plan(observation.observation_id, "Fused LLM call exceeded its deadline.")
+        else:
+            log.info("Step 3: Processing raw signals with LLM Connector...")
+            with budget.stage("protocol1") as stage:
+                try:
+                    # Use the new request_protocol_llm_observation
+                    observation = call_with_deadline(
+                        stage.deadline, request_protocol_llm_observation,
+                        raw_signals=raw_signals,
+                        user_instruction=user_instruction,
+                        llm_api_key=llm_api_key,
+                        protocol_llm_prompt_filename=PROTOCOL_LLM_PROMPT_FILENAME
+                    )
+                except DeadlineExceeded:
+                    observation, observation_is_fresh = _fallback_observation(graph, raw_signals), False
+                    stage.degrade("previous_observation")
+        log.info("LLM Connector produced ObservationEvent (ID: %s).", observation.observation_id)
 
         # 4. Wrap and Log Observation Event
-        print("\nStep 4: Wrapping and logging observation event...")
+        log.info("Step 4: Wrapping and logging observation event...")
         event_obs = Event(event_id=str(uuid.uuid4()), event_type=EventType.OBSERVATION, payload=observation)
         logger.log_event(event_obs)
 
         # 5. Update Graph Memory with the new observation
-        print("\nStep 5: Updating graph memory with observation...")
-        generated_graph_update = graph.update(observation) # Capture the generated GraphUpdate
-        graph.save()
+        log.info("Step 5: Updating graph memory with observation...")
+        with span("graph.update", fresh=observation_is_fresh):
+            generated_graph_update = graph.update(observation) if observation_is_fresh else None # Capture the generated GraphUpdate
+        with span("graph.save"):
+            graph.save()
 
         # Log GraphUpdate if one was generated
         if generated_graph_update:
             event_graph_update = Event(event_id=str(uuid.uuid4()), event_type=EventType.GRAPH_UPDATE, payload=generated_graph_update)
             logger.log_event(event_graph_update)
-            print(f"GraphMemory produced and logged GraphUpdate (ID: {generated_graph_update.observation_id}).")
+            log.info("GraphMemory produced and logged GraphUpdate (ID: %s).", generated_graph_update.observation_id)
 
 
         # 6. Agent Decision-Making
-        print("\nStep 6: Agent deciding action...")
+        log.info("Step 6: Agent deciding action...")
         # Demonstrate graph querying in the Orient phase
         recent_dino_context = graph.query(search_intent="Dino", limit=3)
-        print(f"Agent Orienting: Recent 'Dino' related graph updates: {[gu.summary_of_change for gu in recent_dino_context]}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Agent Orienting: Recent 'Dino' related graph updates: %s", [gu.summary_of_change for gu in recent_dino_context])
         
-        action_plan = decide_action(
-            observation_event=observation,
-            graph_memory=graph,
-            user_instruction=user_instruction,
-            llm_api_key=llm_api_key,
-            core_llm_prompt_filename=CORE_LLM_PROMPT_FILENAME
-        )
-        print(f"Agent produced ActionPlan (Type: {action_plan.action_type}).")
+        if action_plan is None:
+            with budget.stage("agent") as stage:
+                try:
+                    action_plan = call_with_deadline(
+                        stage.deadline, decide_action,
+                        observation_event=observation,
+                        graph_memory=graph,
+                        user_instruction=user_instruction,
+                        llm_api_key=llm_api_key,
+                        core_llm_prompt_filename=CORE_LLM_PROMPT_FILENAME
+                    )
+                    decision_cache.remember(observation.potential_intent, observation.ui_state_summary, action_plan)
+                except DeadlineExceeded:
+                    action_plan = decision_cache.lookup(observation.potential_intent, observation.ui_state_summary,
+                                                        observation.observation_id)
+                    stage.degrade("cached_decision" if action_plan else "no_action")
+                    action_plan = action_plan or no_action_plan(observation.observation_id, "Agent exceeded its deadline.")
+        log.info("Agent produced ActionPlan (Type: %s).", action_plan.action_type)
 
         # 7. Wrap and Log ActionPlan Event
-        print("\nStep 7: Wrapping and logging action plan event...")
+        log.info("Step 7: Wrapping and logging action plan event...")
         event_action = Event(event_id=str(uuid.uuid4()), event_type=EventType.ACTION, payload=action_plan)
         logger.log_event(event_action)
 
         # 8. Protocol2 Action Planning
-        print("\nStep 8: Protocol2 processing ActionPlan...")
-        verified_action_plan = process_action_plan(action_plan)
-        print(f"Protocol2 produced VerifiedActionPlan (Status: {verified_action_plan.status}).")
+        log.info("Step 8: Protocol2 processing ActionPlan...")
+        with budget.stage("protocol2"):
+            verified_action_plan = process_action_plan(action_plan)
+        log.info("Protocol2 produced VerifiedActionPlan (Status: %s).", verified_action_plan.status)
 
         # 9. Wrap and Log VerifiedActionPlan Event (using ACTION type, but payload is VAP)
-        print("\nStep 9: Wrapping and logging verified action plan event...")
+        log.info("Step 9: Wrapping and logging verified action plan event...")
         event_verified_action = Event(
             event_id=str(uuid.uuid4()), 
             event_type=EventType.ACTION, # Using ACTION type, payload is ActionPlan from VerifiedActionPlan
@@ -140,51 +309,318 @@ def run_aios_cycle(run_id: str, artifact_base_dir: Path, user_instruction: str =
         logger.log_event(event_verified_action)
 
         # 10. Actuator Execution
-        print("\nStep 10: Actuator executing action...")
-        # Added prompt for Dino game if a jump action is planned
-        if (verified_action_plan.action_plan.action_type == "KeyPress" and 
+        log.info("Step 10: Actuator executing action...")
+        # Added prompt for Dino game if a jump action is planned (a simulated desktop needs no focusing)
+        if (cycle_budget_s is None and selected_backend("actuator") != "sim" and
+            verified_action_plan.action_plan.action_type == "KeyPress" and 
             verified_action_plan.action_plan.parameters.get("key") == "space" and
             verified_action_plan.status == "ready_for_execution"):
-            print(">>> Please ensure the Chrome Dino game window is focused and ready to receive keyboard input (spacebar to jump) <<<")
+            log.warning(">>> Please ensure the Chrome Dino game window is focused and ready to receive keyboard input (spacebar to jump) <<<")
             time.sleep(1) # Give user a moment to focus the window
 
-        receipt = execute_action(verified_action_plan)
-        print(f"Actuator produced Receipt (Status: {receipt.status}, Message: {receipt.message}).")
+        with budget.stage("actuator") as stage:
+            if budget.deadline.expired() and verified_action_plan.action_plan.action_type != "NoAction":
+                # The screen the plan was made for is stale by now; do not act on it
+                stage.degrade("no_action")
+                verified_action_plan = process_action_plan(no_action_plan(
+                    action_plan.origin_observation_id, "Cycle budget spent before actuation."))
+            receipt = load_backend("actuator").execute_action(verified_action_plan)
+        log.info("Actuator produced Receipt (Status: %s, Message: %s).", receipt.status, receipt.message)
 
         # 11. Wrap and Log Receipt Event
-        print("\nStep 11: Wrapping and logging receipt event...")
+        log.info("Step 11: Wrapping and logging receipt event...")
         event_receipt = Event(event_id=str(uuid.uuid4()), event_type=EventType.RECEIPT, payload=receipt)
         logger.log_event(event_receipt)
         
         # 12. Verification - simplified for demo
-        print(f"\n--- AIOS Cycle: {run_id} Completed Successfully ---")
+        if checkpoint is not None:
+            with span("checkpoint.save"):
+                checkpoint.save(graph, decision_cache, extra={"last_cycle_id": run_id})
+        log.info("--- AIOS Cycle: %s Completed Successfully ---", run_id, extra={"run_id": run_id})
+        cycle_result = "success"
         return True # Indicate success
 
     except Exception as e: # Catch any exceptions during the cycle
-        print(f"AIOS Cycle {run_id} failed: {e}")
+        cycle_span.set(error=str(e))
+        log.error("AIOS Cycle %s failed: %s", run_id, e, exc_info=True, extra={"run_id": run_id})
         return False # Indicate failure
 
-    
+    finally:
+        CYCLES.inc(result=cycle_result)
+        CYCLE_SECONDS.observe(time.perf_counter() - cycle_start)
+        cycle_span.end()
+        deactivate(tracer_token)
+        if tracer.enabled:
+            log.info("Trace written to %s", tracer.write_chrome_trace(run_artifact_dir / "trace.json"))
+
+
+def run_dino_control_loop(run_id: str, artifact_base_dir: Path, region: dict, user_instruction: str = "",
+                          llm_api_key: str = None, rate_hz: float = 60.0, duration_s: float = 30.0,
+                          strategy_interval_s: float = 5.0, jump_cooldown_s: float = 0.3):
+    """
+    Plays Chrome Dino in a continuous fixed-rate control loop instead of one LLM-driven cycle.
+
+    The game `region` is captured into a ring buffer at `rate_hz`; every tick the local
+    DinoObstacleDetector turns the newest frame into a perception and a local policy presses
+    space when a jump is due. The Core Agent LLM runs off the hot loop every
+    `strategy_interval_s` and only decides whether the policy should keep playing
+    (any action other than NoAction means play).
+    """
+    from aios.observers.roi_capture import FrameRingBuffer, MssRegionSource, ROICaptureLoop
+    from aios.perception.dino import DinoObstacleDetector, DinoPerception, locate_ground_row, perception_to_observation_event
+    from aios.runtime.control_loop import BackgroundStrategy, ControlLoop
+
+    log.info("--- Starting AIOS Control Loop: %s (%s Hz for %s s) ---", run_id, rate_hz, duration_s)
+    CORE_LLM_PROMPT_FILENAME = "core_llm_prompt.txt"
+
+    run_artifact_dir = artifact_base_dir / run_id
+    run_artifact_dir.mkdir(parents=True, exist_ok=True)
+    logger = JsonlLogger(run_artifact_dir / "events.jsonl")
+    graph = GraphMemory(run_artifact_dir / "graph_memory.json", name="control_loop")
+
+    source = MssRegionSource(region)
+    buffer = FrameRingBuffer(4, *source.shape)
+    capture = ROICaptureLoop(source, buffer, target_rate_hz=rate_hz)
+    detector = None # Set from the first frame, which the capture thread grabs (mss is not thread-safe)
+
+    def observe():
+        latest = buffer.latest(1)
+        if not latest:
+            return None
+        _, capture_time, frame = latest[0]
+        return capture_time, detector.detect(frame, capture_time)
+
+    def update_strategy(perception: DinoPerception, playing: bool) -> bool:
+        observation = perception_to_observation_event(perception)
+        logger.log_event(Event(event_id=str(uuid.uuid4()), event_type=EventType.OBSERVATION, payload=observation))
+        plan = decide_action(observation_event=observation, graph_memory=graph, user_instruction=user_instruction,
+                             llm_api_key=llm_api_key, core_llm_prompt_filename=CORE_LLM_PROMPT_FILENAME)
+        logger.log_event(Event(event_id=str(uuid.uuid4()), event_type=EventType.ACTION, payload=plan))
+        return plan.action_type != "NoAction"
+
+    last_jump = [float("-inf")]
+
+    def policy(perception: DinoPerception, playing: bool):
+        if not playing or not perception.should_jump or time.perf_counter() - last_jump[0] < jump_cooldown_s:
+            return None
+        last_jump[0] = time.perf_counter()
+        return ActionPlan(action_id=str(uuid.uuid4()), origin_observation_id="dino_control_loop",
+                          action_type="KeyPress", parameters=KeyPressParameters(key="space").model_dump())
+
+    execute_action = load_backend("actuator").execute_action
+
+    def actuate(action_plan: ActionPlan):
+        receipt = execute_action(process_action_plan(action_plan))
+        logger.log_event(Event(event_id=str(uuid.uuid4()), event_type=EventType.RECEIPT, payload=receipt))
+
+    strategy = BackgroundStrategy(update_strategy, interval_s=strategy_interval_s, initial=True) if llm_api_key else None
+    loop = ControlLoop(observe, policy, actuate, rate_hz=rate_hz, strategy=strategy)
+    with capture:
+        detector = DinoObstacleDetector(ground_y=locate_ground_row(capture.wait_for_frame()))
+        log.info("Detected the ground line at row %d of the game region.", detector.ground_y)
+        loop.run(duration_s=duration_s)
+
+    stats = {"control_loop": loop.stats(), "capture": capture.stats()}
+    with open(run_artifact_dir / "control_loop_stats.json", "w", encoding="utf-8") as f:
+        json.dump(stats, f, indent=2)
+    log.info("Control loop stats: %s", json.dumps(stats, indent=2))
+    log.info("--- AIOS Control Loop: %s Finished ---", run_id)
+    return stats
+
+def run_aios_pipeline(run_id: str, artifact_base_dir: Path, user_instruction: str = "", llm_api_key: str = None,
+                      fused: bool = False, max_cycles: int = 5, duration_s: float = 300.0,
+                      frame_tolerance_ms: float = 500.0, uia_deadline_s: float = 1.0, uia_max_nodes: int = 2000):
+    """
+    Runs AIOS cycles as a pipeline instead of strictly serially: while cycle N is in the
+    Core LLM or the actuator, cycle N+1 is already being observed and perceived.
+
+    Stages: observe -> perceive (Protocol LLM, graph update) -> decide (Core LLM) -> act
+    (Protocol2, actuator); with `fused`, perceive and decide are one stage. The decide
+    stage only keeps the newest perceived observation; older ones are discarded as
+    superseded. Observations of an unchanged screen are dropped right after observation.
+    """
+    from aios.observers.artifact_writer import ArtifactWriter
+    from aios.observers.frame_dedup import FrameDeduplicator
+
+    log.info("--- Starting AIOS Pipeline: %s (up to %d cycles) ---", run_id, max_cycles)
+    PROTOCOL_LLM_PROMPT_FILENAME = "protocol_llm_prompt.txt"
+    CORE_LLM_PROMPT_FILENAME = "core_llm_prompt.txt"
+    FUSED_LLM_PROMPT_FILENAME = "fused_llm_prompt.txt"
+
+    if not llm_api_key:
+        log.error("LLM API Key is missing. Cannot proceed with real LLM.")
+        return None
+
+    run_artifact_dir = artifact_base_dir / run_id
+    artifacts_path = run_artifact_dir / "artifacts"
+    artifacts_path.mkdir(parents=True, exist_ok=True)
+    logger = JsonlLogger(run_artifact_dir / "events.jsonl")
+    graph = GraphMemory(run_artifact_dir / "graph_memory.json", name="pipeline")
+    deduplicator = FrameDeduplicator()
+    uia_walker = IncrementalUIAWalker(reuse_subtrees=True) # Kept across cycles; refreshed fully every 30 walks
+    screenshot_backend, uia_backend, actuator_backend = (load_backend(kind) for kind in ("screenshot", "uia", "actuator"))
+
+    def log_event(event_type: EventType, payload):
+        logger.log_event(Event(event_id=str(uuid.uuid4()), event_type=event_type, payload=payload))
+
+    def observe():
+        frame = select_primary_frame(scheduler.run_once(tolerance_ms=frame_tolerance_ms))
+        if frame is None or not frame.raw_signals:
+            return None
+        screenshot_signal = next((sig for sig in frame.raw_signals if isinstance(sig.data, ScreenshotData)), None)
+        if screenshot_signal and screenshot_signal.data.unchanged:
+            return None
+        return frame.raw_signals
+
+    def record_observation(observation):
+        log_event(EventType.OBSERVATION, observation)
+        graph_update = graph.update(observation)
+        graph.save()
+        if graph_update:
+            log_event(EventType.GRAPH_UPDATE, graph_update)
+
+    def perceive(raw_signals):
+        observation = request_protocol_llm_observation(
+            raw_signals=raw_signals, user_instruction=user_instruction, llm_api_key=llm_api_key,
+            protocol_llm_prompt_filename=PROTOCOL_LLM_PROMPT_FILENAME)
+        record_observation(observation)
+        return observation
+
+    def decide(observation):
+        action_plan = decide_action(
+            observation_event=observation, graph_memory=graph, user_instruction=user_instruction,
+            llm_api_key=llm_api_key, core_llm_prompt_filename=CORE_LLM_PROMPT_FILENAME)
+        log_event(EventType.ACTION, action_plan)
+        return action_plan
+
+    def perceive_and_decide(raw_signals):
+        observation, action_plan = decide_action_fused(
+            raw_signals=raw_signals, graph_memory=graph, user_instruction=user_instruction,
+            llm_api_key=llm_api_key, fused_llm_prompt_filename=FUSED_LLM_PROMPT_FILENAME)
+        record_observation(observation)
+        log_event(EventType.ACTION, action_plan)
+        return action_plan
+
+    def act(action_plan):
+        verified_action_plan = process_action_plan(action_plan)
+        log_event(EventType.ACTION, verified_action_plan.action_plan)
+        receipt = actuator_backend.execute_action(verified_action_plan)
+        log_event(EventType.RECEIPT, receipt)
+        return receipt
+
+    if fused:
+        stages = [PipelineStage("perceive_decide", perceive_and_decide, latest_only=True), PipelineStage("act", act)]
+    else:
+        stages = [PipelineStage("perceive", perceive, latest_only=True),
+                  PipelineStage("decide", decide, latest_only=True),
+                  PipelineStage("act", act)]
+
+    # Screenshots are encoded and written off the observer threads, all of them by the end of the run
+    with ObserverScheduler(thread_initializer=uia_backend.initialize_uia_thread) as scheduler, ArtifactWriter() as writer:
+        scheduler.register("screenshot", lambda: screenshot_backend.capture_screenshot(
+            artifacts_path, deduplicator=deduplicator, writer=writer))
+        scheduler.register("uia", lambda: uia_backend.get_focused_uia_tree(
+            artifacts_path, max_depth=8, walker=uia_walker, deadline_s=uia_deadline_s, max_nodes=uia_max_nodes))
+        runner = PipelineRunner(observe, stages)
+        runner.run(duration_s=duration_s, max_cycles=max_cycles)
+
+    stats = runner.stats()
+    with open(run_artifact_dir / "pipeline_stats.json", "w", encoding="utf-8") as f:
+        json.dump(stats, f, indent=2)
+    log.info("Pipeline stats: %s", json.dumps(stats, indent=2))
+    log.info("--- AIOS Pipeline: %s Finished ---", run_id)
+    return stats
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run the AIOS Demo Cycle.")
     parser.add_argument("--user_instruction", type=str, default="Demonstrating AIOS basic cycle",
                         help="User instruction for the AIOS agent.")
     parser.add_argument("--llm_api_key", type=str, default=None, required=True, # Made API key required
                         help="LLM API Key for real LLM calls.")
+    parser.add_argument("--fused", action="store_true",
+                        help="Use a single fused Protocol+Core LLM call per cycle instead of two.")
+    parser.add_argument("--screenshot_format", choices=["png", "jpeg", "raw"], default="png",
+                        help="Image format for screenshot artifacts (jpeg requires Pillow).")
+    parser.add_argument("--artifact_store", action="store_true",
+                        help="Store artifacts once by hash in the shared content-addressed store under aios_demo_runs/artifact_store.")
+    parser.add_argument("--start_delay_s", type=float, default=5.0,
+                        help="Pause before the cycle starts, to focus the target window.")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Run several cycles with overlapping stages instead of a single serial cycle.")
+    parser.add_argument("--pipeline_cycles", type=int, default=5, help="Cycles to complete in --pipeline mode.")
+    parser.add_argument("--run_id", type=str, default=None,
+                        help="Name of the run's directory under aios_demo_runs (default: the current UTC time).")
+    parser.add_argument("--resume", type=str, default=None, metavar="RUN_ID",
+                        help="Continue an existing run from its last checkpoint plus the event-log tail.")
+    parser.add_argument("--trace", action="store_true",
+                        help="Record the cycle's stages as nested spans in trace.json (open in chrome://tracing or Perfetto).")
+    parser.add_argument("--metrics_port", type=int, default=None,
+                        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics while the demo runs.")
+    parser.add_argument("--cycle_budget_s", type=float, default=None,
+                        help="Latency budget per cycle; stages degrade instead of overrunning it.")
+    parser.add_argument("--tail_log", action="append", default=[], metavar="PATH",
+                        help="Tail this log file as an extra observer (repeatable); offsets persist across runs.")
+    parser.add_argument("--loop", action="store_true",
+                        help="Play Chrome Dino in a continuous fixed-rate control loop with a local policy.")
+    parser.add_argument("--dino_region", type=str, default="0,0,600,150",
+                        help="Game area for --loop as left,top,width,height in screen pixels.")
+    parser.add_argument("--loop_rate_hz", type=float, default=60.0, help="Control loop tick rate for --loop.")
+    parser.add_argument("--loop_duration_s", type=float, default=30.0, help="How long --loop runs.")
+
+    parser.add_argument("--log_level", type=str.upper, default="INFO", choices=LEVEL_NAMES, help="Lowest level logged.")
+    parser.add_argument("--quiet", action="store_true",
+                        help="No console output (only warnings and errors are kept, in memory); for high cycle rates.")
+    parser.add_argument("--log_json", action="store_true", help="Log one JSON object per line.")
 
     args = parser.parse_args()
+    configure_logging(args.log_level, quiet=args.quiet, json_format=args.log_json)
 
     # Create a unique run ID for this demonstration
-    demo_run_id = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    demo_run_id = args.resume or args.run_id or datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     base_artifact_dir = Path("./aios_demo_runs") # Store demo artifacts in a dedicated directory
 
-    print("--- Preparing AIOS Demo ---")
-    print(f"Demo artifacts will be stored in: {base_artifact_dir / demo_run_id}")
-    print("AIOS Demo will start in 5 seconds. Ensure no critical work is open.")
-    time.sleep(5) # Auto-start after a pause
+    log.info("--- Preparing AIOS Demo ---")
+    log.info("Demo artifacts will be stored in: %s", base_artifact_dir / demo_run_id)
+    log.info("AIOS Demo will start in %g seconds. Ensure no critical work is open.", args.start_delay_s)
+    time.sleep(args.start_delay_s) # Auto-start after a pause
+    if args.metrics_port is not None:
+        serve_metrics(port=args.metrics_port)
     
-    run_aios_cycle(demo_run_id, base_artifact_dir, 
-                   user_instruction=args.user_instruction, 
-                   llm_api_key=args.llm_api_key)
-    print("\nAIOS Demo Finished.")
-    print(f"Check logs and artifacts in {base_artifact_dir / demo_run_id}")
\ No newline at end of file
+    if args.loop:
+        left, top, width, height = (int(v) for v in args.dino_region.split(","))
+        run_dino_control_loop(demo_run_id, base_artifact_dir,
+                              region={"left": left, "top": top, "width": width, "height": height},
+                              user_instruction=args.user_instruction,
+                              llm_api_key=args.llm_api_key,
+                              rate_hz=args.loop_rate_hz,
+                              duration_s=args.loop_duration_s)
+    elif args.pipeline:
+        run_aios_pipeline(demo_run_id, base_artifact_dir,
+                          user_instruction=args.user_instruction,
+                          llm_api_key=args.llm_api_key,
+                          fused=args.fused,
+                          max_cycles=args.pipeline_cycles)
+    else:
+        run_dir = base_artifact_dir / demo_run_id
+        checkpoint = CheckpointManager(run_dir)
+        graph, decision_cache = None, DecisionCache()
+        if args.resume:
+            if not run_dir.exists():
+                parser.error(f"Cannot resume: {run_dir} does not exist.")
+            graph = GraphMemory(run_dir / "graph_memory.json", name="cycle")
+            checkpoint.restore(graph, decision_cache)
+        run_aios_cycle(demo_run_id, base_artifact_dir, 
+                       user_instruction=args.user_instruction, 
+                       llm_api_key=args.llm_api_key,
+                       fused=args.fused,
+                       cycle_budget_s=args.cycle_budget_s,
+                       trace=args.trace,
+                       graph=graph,
+                       decision_cache=decision_cache,
+                       checkpoint=checkpoint,
+                       screenshot_format=args.screenshot_format,
+                       log_tail_observer=LogTailObserver(args.tail_log, state_file=base_artifact_dir / "log_tail_offsets.json")
+                       if args.tail_log else None,
+                       artifact_store=ArtifactStore(base_artifact_dir / "artifact_store") if args.artifact_store else None)
+    log.info("AIOS Demo Finished.")
+    log.info("Check logs and artifacts in %s", base_artifact_dir / demo_run_id)
\ No newline at end of file
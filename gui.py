@@ -1,27 +1,69 @@
 import tkinter as tk
-from tkinter import scrolledtext, messagebox
+from tkinter import scrolledtext, messagebox, ttk
+import queue
 import subprocess
+import tempfile
 import threading
+import time
 import sys
 import os
+from datetime import datetime
 from pathlib import Path
 
+from aios.event_stream import EventLogTailer, EventTimeline
+from aios.runtime.daemon import DaemonClient
+
+FRAME_MS = 33 # The GUI applies queued events at most this often (~30 frames/s)
+MAX_EVENTS_PER_FRAME = 2000 # Bounds the work per frame, so a burst never freezes Tk
+TAIL_INTERVAL_S = 0.05 # How often a subprocess run's events.jsonl is checked for new events
+TAIL_MAX_BYTES = 1 << 20 # A large backlog is read in chunks of at most this many bytes
+
+# Worker threads never touch Tk: they put ("status", message), ("events", [event, ...])
+# or ("done", returncode) on the GUI's queue, which the Tk thread drains once per frame.
+# Event batches hold at most MAX_EVENTS_PER_FRAME events.
+
+def _put_events(updates, events):
+    for start in range(0, len(events), MAX_EVENTS_PER_FRAME):
+        updates.put(("events", events[start:start + MAX_EVENTS_PER_FRAME]))
+
+# --- Helper function to run an instruction on a warm AIOS daemon ---
+def _run_aios_via_daemon(updates, client, user_instruction, api_key):
+    try:
+        run_id = client.submit(user_instruction, llm_api_key=api_key)
+        updates.put(("status", f"Submitted to AIOS daemon as run {run_id}"))
+        status = "failed"
+        for event in client.stream_events(run_id):
+            if "event_type" in event:
+                updates.put(("events", [event]))
+            else:
+                status = event.get("status", status)
+    except OSError as e:
+        updates.put(("status", f"AIOS daemon request failed: {e}"))
+        status = "failed"
+    updates.put(("done", 0 if status == "completed" else 1))
+
 # --- Helper function to run AIOS demo as a subprocess ---
-def _run_aios_in_thread(gui_instance, user_instruction, api_key, on_complete_callback):
-    # Determine the path to aios_demo.py
-    # This assumes gui.py is in the project root and aios_demo.py is also in the project root
-    aios_demo_path = Path(__file__).parent / "aios_demo.py"
-    
-    # Use the current Python executable from the virtual environment
-    python_executable = sys.executable
-
-    # Prepare command with arguments
+def _run_aios_in_thread(updates, user_instruction, api_key):
+    # Prefer a running AIOS daemon (python -m aios.runtime.daemon), which keeps everything warm
+    client = DaemonClient()
+    if client.is_alive():
+        _run_aios_via_daemon(updates, client, user_instruction, api_key)
+        return
+
+    # gui.py and aios_demo.py are both in the project root, where the demo keeps aios_demo_runs/
+    project_dir = Path(__file__).parent
+    aios_demo_path = project_dir / "aios_demo.py"
+    run_id = f"gui_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
+
+    # The demo's events are read from its event log, so it needs no console output
     command = [
-        python_executable,
+        sys.executable,
         str(aios_demo_path),
         "--user_instruction", user_instruction,
+        "--run_id", run_id,
+        "--quiet",
     ]
-    
+
     # LLM will now use real API.
     # If no API key is provided, aios_demo.py should handle it (e.g., raise an error or use a default mock if designed).
     if api_key:
@@ -29,34 +71,100 @@ def _run_aios_in_thread(gui_instance, user_instruction, api_key, on_complete_cal
     else:
         # As per directive, no mock LLM is allowed. If API key is missing, aios_demo should fail.
         # This message is just for clarity in GUI.
-        gui_instance.log_status("Warning: No LLM API Key provided. AIOS Demo might fail without it.")
+        updates.put(("status", "Warning: No LLM API Key provided. AIOS Demo might fail without it."))
+
+    updates.put(("status", f"Executing: {' '.join(command)}"))
+
+    # stderr goes to a file, so an error report of any size can never block the demo
+    with tempfile.TemporaryFile("w+") as stderr:
+        process = subprocess.Popen(command, cwd=project_dir, stdout=subprocess.DEVNULL, stderr=stderr, text=True)
+        tailer = EventLogTailer(project_dir / "aios_demo_runs" / run_id / "events.jsonl")
+        while True:
+            finished = process.poll() is not None
+            while True:
+                events = tailer.read_new(max_bytes=TAIL_MAX_BYTES)
+                if not events:
+                    break
+                _put_events(updates, events)
+            if finished:
+                break # Read once more after the exit, so no event is missed
+            time.sleep(TAIL_INTERVAL_S)
+        stderr.seek(0)
+        for line in stderr.read().splitlines()[-20:]:
+            updates.put(("status", line))
 
+    updates.put(("done", process.returncode))
 
-    gui_instance.log_status(f"Executing: {' '.join(command)}")
-    
-    # Start the subprocess
-    process = subprocess.Popen(
-        command,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT, # Redirect stderr to stdout
-        text=True, # Decode stdout/stderr as text
-        bufsize=1 # Line-buffered output
-    )
+class EventTableView(ttk.Frame):
+    """
+    A table of an EventTimeline's rows that stays fast however many events arrive:
+    the Treeview only ever holds the rows on screen, which are refilled from the
+    timeline when it grows or is scrolled. While scrolled to the end it follows new events.
+    """
+    COLUMNS = (("#", 60), ("time", 95), ("type", 110), ("summary", 330),
+               ("latency ms", 80), ("since obs ms", 90), ("Δ ms", 70))
 
-    # Stream output to GUI
-    for line in iter(process.stdout.readline, ''):
-        gui_instance.master.after(0, gui_instance.log_status, line.strip()) # Update GUI from main thread
-    
-    process.stdout.close()
-    process.wait() # Wait for process to finish
+    def __init__(self, master, timeline, visible_rows=15):
+        super().__init__(master)
+        self.timeline = timeline
+        self.visible_rows = visible_rows
+        self.first = 0 # Index of the top row shown
+        self.follow = True
 
-    gui_instance.master.after(0, on_complete_callback, process.returncode) # Call callback when complete
+        self.tree = ttk.Treeview(self, columns=[name for name, _ in self.COLUMNS], show="headings",
+                                 height=visible_rows, selectmode="none")
+        for name, width in self.COLUMNS:
+            self.tree.heading(name, text=name)
+            self.tree.column(name, width=width, stretch=(name == "summary"),
+                             anchor=tk.W if name in ("type", "summary") else tk.E)
+        for i in range(visible_rows):
+            self.tree.insert("", tk.END, iid=str(i), values=())
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_wheel)
+
+    def _last_first(self):
+        return max(len(self.timeline) - self.visible_rows, 0)
+
+    def scroll_to(self, first):
+        self.first = min(max(int(first), 0), self._last_first())
+        self.follow = self.first == self._last_first()
+        self.refresh()
+
+    def _on_scrollbar(self, command, value, unit=None):
+        if command == "moveto":
+            self.scroll_to(float(value) * len(self.timeline))
+        else: # "scroll", n, "units" or "pages"
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_to(self.first + int(value) * step)
+
+    def _on_wheel(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.first - 3)
+        else:
+            self.scroll_to(self.first + 3)
+        return "break"
+
+    def refresh(self):
+        """Shows the rows from `first`, or the newest ones while following."""
+        if self.follow:
+            self.first = self._last_first()
+        rows = self.timeline.rows(self.first, self.visible_rows)
+        for i in range(self.visible_rows):
+            self.tree.item(str(i), values=rows[i] if i < len(rows) else ())
+        total = max(len(self.timeline), 1)
+        self.scrollbar.set(self.first / total, min((self.first + self.visible_rows) / total, 1.0))
 
 class AIOSGui:
     def __init__(self, master):
         self.master = master
         master.title("AIOS Demo Controller")
-        master.geometry("600x450")
+        master.geometry("900x720")
+        self.updates = queue.SimpleQueue()
+        self.timeline = EventTimeline()
+        self.pending_events = [] # Events taken off the queue but left for the next frame
 
         # LLM API Key Input
         self.api_key_label = tk.Label(master, text="LLM API Key (ignored for mock server):")
@@ -67,18 +175,26 @@ class AIOSGui:
         # User Instruction Input
         self.instruction_label = tk.Label(master, text="User Instruction:")
         self.instruction_label.pack()
-        self.instruction_text = scrolledtext.ScrolledText(master, wrap=tk.WORD, width=60, height=10)
+        self.instruction_text = scrolledtext.ScrolledText(master, wrap=tk.WORD, width=60, height=6)
         self.instruction_text.pack(pady=(0, 10))
 
         # Run Button
         self.run_button = tk.Button(master, text="Run AIOS Demo", command=self.run_aios_demo)
         self.run_button.pack(pady=(0, 10))
 
+        # Live Events
+        self.events_label = tk.Label(master, text="Events: 0")
+        self.events_label.pack()
+        self.event_table = EventTableView(master, self.timeline)
+        self.event_table.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
         # Status Output
         self.status_label = tk.Label(master, text="Status:")
         self.status_label.pack()
         self.status_output = scrolledtext.ScrolledText(master, wrap=tk.WORD, width=60, height=5, state=tk.DISABLED)
-        self.status_output.pack(pady=(0, 10))
+        self.status_output.pack(fill=tk.X, padx=10, pady=(0, 10))
+
+        self.master.after(FRAME_MS, self._apply_updates)
 
     def log_status(self, message):
         self.status_output.config(state=tk.NORMAL)
@@ -86,6 +202,33 @@ class AIOSGui:
         self.status_output.see(tk.END) # Scroll to the end
         self.status_output.config(state=tk.DISABLED)
 
+    def _apply_updates(self):
+        """Applies what the worker threads queued since the last frame, then redraws the table once."""
+        events = self.pending_events[:MAX_EVENTS_PER_FRAME]
+        self.pending_events = self.pending_events[MAX_EVENTS_PER_FRAME:]
+        handled = len(events)
+        while handled < MAX_EVENTS_PER_FRAME and not self.pending_events:
+            try:
+                kind, value = self.updates.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "events":
+                take = MAX_EVENTS_PER_FRAME - handled
+                events.extend(value[:take])
+                self.pending_events = value[take:] # Carried over to the next frame
+                handled += min(len(value), take)
+                continue
+            handled += 1
+            if kind == "status":
+                self.log_status(value)
+            elif kind == "done":
+                self._on_aios_complete(value)
+        if events:
+            self.timeline.append(events)
+            self.events_label.config(text=f"Events: {len(self.timeline)}")
+            self.event_table.refresh()
+        self.master.after(FRAME_MS, self._apply_updates)
+
     def run_aios_demo(self):
         api_key = self.api_key_entry.get()
         user_instruction = self.instruction_text.get("1.0", tk.END).strip()
@@ -98,10 +241,10 @@ class AIOSGui:
         self.log_status("AIOS Demo started...")
         self.log_status(f"LLM API Key: {'*' * len(api_key) if api_key else 'None Provided'}")
         self.log_status(f"User Instruction: {user_instruction}")
-        
+
         # Start the AIOS demo in a separate thread
-        self.aios_thread = threading.Thread(target=_run_aios_in_thread, 
-                                            args=(self, user_instruction, api_key, self._on_aios_complete))
+        self.aios_thread = threading.Thread(target=_run_aios_in_thread,
+                                            args=(self.updates, user_instruction, api_key))
         self.aios_thread.daemon = True # Allow program to exit even if thread is running
         self.aios_thread.start()
 
@@ -116,4 +259,4 @@ class AIOSGui:
 if __name__ == "__main__":
     root = tk.Tk()
     my_gui = AIOSGui(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()